@@ -6,14 +6,18 @@ from .types_and_enums import (
     Number,
     RecordType, 
     OutputFormat,
-    TelemetryRecord
+    TelemetryRecord,
+    TelemetryBatch,
+    TelemetryRecordView
 )
 
 # -------------------------
 # Schema & Binary Processing
 # -------------------------
+from .schema_model import TelemetrySchema, FieldSpec, load_schema, get_schema
 from .binary_schema import BinarySchemaProcessor
 from .binary_packer import BinaryRecordPacker
+from .record_layout import RecordLayout
 
 # -------------------------
 # GPU Acceleration
@@ -42,10 +46,43 @@ from .fault_injector import (
     FaultType,
     FaultConfig,
     FaultStatistics,
+    FaultStatisticsSnapshot,
+    FaultLog,
     create_development_fault_injector,
     create_testing_fault_injector,
     create_stress_fault_injector
 )
+from .fault_scenarios import (
+    ScenarioType,
+    FaultScenario,
+    FaultTimeline
+)
+
+# -------------------------
+# Value pools
+# -------------------------
+from .value_pools import (
+    DeviceIdPool,
+    EnumTable
+)
+
+# -------------------------
+# Field distributions
+# -------------------------
+from .distributions import (
+    FieldSampler,
+    compile_samplers
+)
+from .column_samplers import ColumnSamplerTable
+
+# -------------------------
+# Time series
+# -------------------------
+from .timeseries import (
+    TimeSeriesEngine,
+    MetricSeries,
+    ProcessModel
+)
 
 # -------------------------
 # Formatters
@@ -79,11 +116,38 @@ from .formats.leb128 import (
     LEB128Encoder,
     LEB128Decoder
 )
+from .formats.leb128_stream import (
+    LEB128StreamDecoder,
+    decode_leb128_record,
+    iter_leb128_records,
+    max_leb128_record_size
+)
+
+# -------------------------
+# Format Conversion
+# -------------------------
+from .converter import TelemetryConverter, detect_format, read_records
+
+# -------------------------
+# Checksums
+# -------------------------
+from .checksums import CrcField, crc32c, crc32c_masked, crc32c_batch
+from .verifier import BinaryFileVerifier
+
+# -------------------------
+# Binary Fault Injection
+# -------------------------
+from .binary_faults import BinaryFaultInjector, BinaryFaultConfig, BinaryFaultType
+from .fault_log import FaultLogWriter, read_fault_log
 
 # -------------------------
 # Utilities
 # -------------------------
 from .utilities import TelemetryUtilities, BenchmarkRunner, FactoryMethods
+from .benchmarks import BenchmarkSuite, BenchmarkResult
+from .bench_history import BenchmarkHistory, compare_runs
+from .instrumentation import Instrumentation, LatencyHistogram
+from .metrics_exporter import MetricsExporter, GenerationMetrics
 
 # -------------------------
 # CLI
@@ -109,11 +173,18 @@ __all__ = [
     'RecordType',
     'OutputFormat', 
     'TelemetryRecord',
+    'TelemetryBatch',
+    'TelemetryRecordView',
     'Number',
 
     # Core components
+    'TelemetrySchema',
+    'FieldSpec',
+    'load_schema',
+    'get_schema',
     'BinarySchemaProcessor',
     'BinaryRecordPacker',
+    'RecordLayout',
     'GPUAcceleratedGenerator',
     'GPUBatchGenerator',
     
@@ -131,9 +202,28 @@ __all__ = [
     'FaultType',
     'FaultConfig',
     'FaultStatistics',
+    'FaultStatisticsSnapshot',
+    'FaultLog',
     'create_development_fault_injector',
     'create_testing_fault_injector',
     'create_stress_fault_injector',
+    'ScenarioType',
+    'FaultScenario',
+    'FaultTimeline',
+    
+    # Value pools
+    'DeviceIdPool',
+    'EnumTable',
+    
+    # Field distributions
+    'FieldSampler',
+    'compile_samplers',
+    'ColumnSamplerTable',
+    
+    # Time series
+    'TimeSeriesEngine',
+    'MetricSeries',
+    'ProcessModel',
     
     # Formatters and writers
     'OutputFormatter',
@@ -157,10 +247,41 @@ __all__ = [
     'decode_signed_leb128',
     'LEB128Encoder',
     'LEB128Decoder',
+    'LEB128StreamDecoder',
+    'decode_leb128_record',
+    'iter_leb128_records',
+    'max_leb128_record_size',
+
+    # Format conversion
+    'TelemetryConverter',
+    'detect_format',
+    'read_records',
+
+    # Checksums
+    'CrcField',
+    'crc32c',
+    'crc32c_masked',
+    'crc32c_batch',
+    'BinaryFileVerifier',
+
+    # Binary fault injection
+    'BinaryFaultInjector',
+    'BinaryFaultConfig',
+    'BinaryFaultType',
+    'FaultLogWriter',
+    'read_fault_log',
 
     # Utilities
     'TelemetryUtilities',
     'BenchmarkRunner',
+    'BenchmarkSuite',
+    'BenchmarkResult',
+    'BenchmarkHistory',
+    'compare_runs',
+    'Instrumentation',
+    'LatencyHistogram',
+    'MetricsExporter',
+    'GenerationMetrics',
     'FactoryMethods',
 
     # CLI
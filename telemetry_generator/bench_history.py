@@ -0,0 +1,365 @@
+"""
+bench_history.py
+History of benchmark suite runs and regression checks between two runs
+
+Runs are appended to an NDJSON file, one suite report per line with a run
+id. Two runs are compared per benchmark on their round times, with a
+Mann-Whitney U test or a bootstrap confidence interval of the change in
+median time, corrected for testing every benchmark of the suite at once.
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import statistics
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_HISTORY = os.path.join('.telegen-bench', 'history.ndjson')
+
+METHODS = ('mannwhitney', 'bootstrap')
+
+# Multiple-comparison corrections across the benchmarks of a comparison
+CORRECTIONS = ('holm', 'none')
+
+# Exact Mann-Whitney p-values up to this many rounds per run (without ties)
+EXACT_MAX_ROUNDS = 40
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkHistory:
+    """Append-only store of suite reports"""
+
+    def __init__(self, path: str = DEFAULT_HISTORY):
+        self.path = path
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """All stored reports, oldest first"""
+        if not os.path.exists(self.path):
+            return []
+        runs = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    runs.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{self.path}:{line_number}: invalid history entry: {e}")
+        return runs
+
+    def save(self, report: Dict[str, Any], label: Optional[str] = None) -> int:
+        """
+        Append a suite report
+
+        Returns:
+            Run id of the stored report
+        """
+        runs = self.runs()
+        run_id = runs[-1]["run_id"] + 1 if runs else 1
+        entry = dict(report, run_id=run_id, label=label)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        return run_id
+
+    def get(self, ref: Union[int, str]) -> Dict[str, Any]:
+        """
+        A stored report
+
+        Args:
+            ref: Run id, negative position from the newest run (-1 is the
+                latest), 'latest' or 'previous'
+
+        Raises:
+            ValueError: If no such run is stored
+        """
+        runs = self.runs()
+        position = {'latest': -1, 'previous': -2}.get(ref, ref)
+        try:
+            position = int(position)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid run reference '{ref}'")
+
+        if position < 0:
+            if len(runs) >= -position:
+                return runs[position]
+        else:
+            for run in runs:
+                if run["run_id"] == position:
+                    return run
+        raise ValueError(f"No run '{ref}' in {self.path} ({len(runs)} run(s) stored)")
+
+
+def load_run(ref: str, history: BenchmarkHistory) -> Dict[str, Any]:
+    """A report from a JSON file path, or from the history by reference"""
+    if os.path.isfile(ref):
+        with open(ref, 'r', encoding='utf-8') as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid benchmark report {ref}: {e}")
+    return history.get(ref)
+
+
+# -------------------------
+# Statistics
+# -------------------------
+
+def _ranks(values: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """Average ranks (1-based) and the sizes of tied groups"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+def _u_distribution(m: int, n: int) -> List[int]:
+    """Number of orderings of m vs n samples giving each U statistic (no ties)"""
+    # counts[j][u] for the current i, built up one x sample at a time
+    counts = [[1] for _ in range(n + 1)]
+    for i in range(1, m + 1):
+        current = [[1]]  # j = 0: only U = 0
+        for j in range(1, n + 1):
+            size = i * j + 1
+            row = [0] * size
+            for u, ways in enumerate(counts[j]):
+                row[u + j] += ways
+            for u, ways in enumerate(current[j - 1]):
+                row[u] += ways
+            current.append(row)
+        counts = current
+    return counts[n]
+
+
+def mann_whitney_u(x: Sequence[float], y: Sequence[float]) -> Tuple[float, float]:
+    """
+    Two-sided Mann-Whitney U test
+
+    Exact p-value for small samples without ties, otherwise the normal
+    approximation with tie and continuity correction.
+
+    Returns:
+        (U statistic of x, p-value)
+    """
+    m, n = len(x), len(y)
+    if not m or not n:
+        raise ValueError("Mann-Whitney U needs two non-empty samples")
+
+    ranks, ties = _ranks(list(x) + list(y))
+    u = sum(ranks[:m]) - m * (m + 1) / 2
+    mn = m * n
+
+    if not ties and max(m, n) <= EXACT_MAX_ROUNDS:
+        distribution = _u_distribution(m, n)
+        tail = sum(distribution[:int(min(u, mn - u)) + 1])
+        return u, min(1.0, 2 * tail / math.comb(m + n, m))
+
+    total = m + n
+    tie_term = sum(t ** 3 - t for t in ties) / (total * (total - 1))
+    variance = mn / 12 * ((total + 1) - tie_term)
+    if variance <= 0:
+        return u, 1.0
+    z = max(abs(u - mn / 2) - 0.5, 0) / math.sqrt(variance)
+    return u, math.erfc(z / math.sqrt(2))
+
+
+def min_p_value(m: int, n: int) -> float:
+    """Smallest two-sided Mann-Whitney p-value samples of m and n rounds can reach"""
+    return mann_whitney_u(range(m), range(m, m + n))[1]
+
+
+def min_rounds(alpha: float, family: int = 1) -> int:
+    """Fewest rounds per run for which a change can be significant among family benchmarks (Holm)"""
+    rounds = 1
+    while min_p_value(rounds, rounds) * family >= alpha:
+        rounds += 1
+    return rounds
+
+
+def bootstrap_change_ci(
+    baseline: Sequence[float],
+    candidate: Sequence[float],
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """
+    Bootstrap confidence interval of the relative change in median
+
+    Returns:
+        (low, high) of candidate median / baseline median - 1
+    """
+    rng = random.Random(seed)
+    changes = []
+    for _ in range(resamples):
+        base = statistics.median(rng.choices(baseline, k=len(baseline)))
+        cand = statistics.median(rng.choices(candidate, k=len(candidate)))
+        changes.append(cand / base - 1 if base > 0 else 0.0)
+    changes.sort()
+    tail = (1 - confidence) / 2
+    low = changes[int(tail * (resamples - 1))]
+    high = changes[int(math.ceil((1 - tail) * (resamples - 1)))]
+    return low, high
+
+
+def holm_adjust(p_values: Sequence[float]) -> List[float]:
+    """
+    Holm-Bonferroni adjusted p-values
+
+    Controls the family-wise error rate: comparing each adjusted p-value
+    with alpha keeps the chance of any false positive below alpha.
+
+    Returns:
+        Adjusted p-values, in the order of p_values
+    """
+    count = len(p_values)
+    adjusted = [0.0] * count
+    running = 0.0
+    for rank, index in enumerate(sorted(range(count), key=p_values.__getitem__)):
+        running = max(running, min(1.0, (count - rank) * p_values[index]))
+        adjusted[index] = running
+    return adjusted
+
+
+@dataclass
+class Comparison:
+    """One benchmark in two runs"""
+    name: str
+    baseline_median_ns: float
+    candidate_median_ns: float
+    change: float
+    verdict: str
+    p_value: Optional[float] = None
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+    p_adjusted: Optional[float] = None
+
+    @property
+    def is_regression(self) -> bool:
+        return self.verdict == "regression"
+
+    @property
+    def is_inconclusive(self) -> bool:
+        return self.verdict == "inconclusive"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def compare_runs(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    method: str = 'mannwhitney',
+    alpha: float = 0.05,
+    threshold: float = 0.05,
+    correction: str = 'holm'
+) -> List[Comparison]:
+    """
+    Compare the benchmarks two reports have in common
+
+    A benchmark is a regression (or improvement) when its median round time
+    changed by more than threshold and the change is significant: adjusted
+    p < alpha for Mann-Whitney, or a bootstrap interval excluding zero.
+
+    With correction='holm', alpha is the family-wise level for the whole
+    comparison: Mann-Whitney p-values are Holm-adjusted, and bootstrap
+    intervals are widened to (1 - alpha / benchmarks) (Bonferroni). With
+    'none', alpha applies to each benchmark on its own.
+
+    A rank test on few rounds has a smallest possible p-value: a
+    Mann-Whitney benchmark whose rounds cannot reach significance even as
+    the most significant result (min_p_value x benchmarks >= alpha) gets
+    the verdict 'inconclusive' rather than 'unchanged', and a warning
+    names the rounds needed (see min_rounds).
+
+    Args:
+        baseline, candidate: Suite reports
+        method: 'mannwhitney' or 'bootstrap'
+        alpha: Significance level
+        threshold: Smallest relative change of the median reported (0.05 = 5%)
+        correction: 'holm' or 'none'
+
+    Returns:
+        One Comparison per common benchmark, in candidate order
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+    if correction not in CORRECTIONS:
+        raise ValueError(f"Unknown correction '{correction}', expected one of {CORRECTIONS}")
+    if not 0 < alpha < 1:
+        raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+    if threshold < 0:
+        raise ValueError(f"threshold must be non-negative, got {threshold}")
+
+    baseline_times = {result["name"]: result["times_ns"] for result in baseline.get("results", [])}
+    pairs = [(result["name"], baseline_times[result["name"]], result["times_ns"])
+             for result in candidate.get("results", []) if baseline_times.get(result["name"])]
+    family = len(pairs) if correction == 'holm' else 1
+
+    comparisons = []
+    for name, base, cand in pairs:
+        base_median, cand_median = statistics.median(base), statistics.median(cand)
+        change = cand_median / base_median - 1 if base_median > 0 else 0.0
+        comparison = Comparison(name, base_median, cand_median, change, "unchanged")
+        if method == 'mannwhitney':
+            _, comparison.p_value = mann_whitney_u(base, cand)
+        else:
+            comparison.ci_low, comparison.ci_high = bootstrap_change_ci(base, cand, confidence=1 - alpha / family)
+        comparisons.append(comparison)
+
+    if method == 'mannwhitney':
+        p_values = [comparison.p_value for comparison in comparisons]
+        adjusted = holm_adjust(p_values) if correction == 'holm' else p_values
+        for comparison, p_adjusted in zip(comparisons, adjusted):
+            comparison.p_adjusted = p_adjusted
+
+    undetectable = 0
+    for comparison, (_, base, cand) in zip(comparisons, pairs):
+        if method == 'mannwhitney':
+            significant = comparison.p_adjusted < alpha
+        else:
+            significant = comparison.ci_low > 0 or comparison.ci_high < 0
+        if significant and comparison.change > threshold:
+            comparison.verdict = "regression"
+        elif significant and comparison.change < -threshold:
+            comparison.verdict = "improvement"
+        elif method == 'mannwhitney' and min_p_value(len(base), len(cand)) * family >= alpha:
+            comparison.verdict = "inconclusive"
+            undetectable += 1
+
+    if undetectable:
+        logger.warning(
+            f"{undetectable} of {len(comparisons)} benchmarks have too few rounds to detect a change "
+            f"at alpha {alpha} (need {min_rounds(alpha, family)} rounds per run)"
+        )
+    return comparisons
+
+
+def setting_differences(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> List[str]:
+    """Settings and environment entries that differ between two runs (make timings incomparable)"""
+    differences = []
+    for section, keys in (("settings", ("schema_hash", "records")),
+                          ("environment", ("python", "numpy", "machine", "crc32c_backend"))):
+        for key in keys:
+            before = baseline.get(section, {}).get(key)
+            after = candidate.get(section, {}).get(key)
+            if before != after:
+                differences.append(f"{key}: {before} -> {after}")
+    return differences
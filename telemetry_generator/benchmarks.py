@@ -0,0 +1,624 @@
+"""
+benchmarks.py
+Repeatable microbenchmarks of every pipeline stage
+
+Each benchmark builds its inputs once, then times a round of work with
+time.perf_counter_ns(): warmup rounds first (not recorded), then the
+measured rounds, with garbage collection paused inside a round. Results
+are plain dicts, so a suite run can be saved as JSON and compared between
+releases.
+"""
+
+import fnmatch
+import gc
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .binary_packer import BinaryRecordPacker
+from .binary_reader import BinaryRecordReader
+from .binary_schema import BinarySchemaProcessor
+from .checksums import BACKEND as CRC_BACKEND
+from .checksums import CrcField
+from .data_generators import RecordDataPopulator
+from .fault_injector import FaultInjector
+from .formats.leb128_stream import iter_leb128_records
+from .formatters import OutputFormatter
+from .rate_control import RateLimiter
+from .rolling_writer import RollingFileWriter
+from .schema_model import clear_schema_cache, load_schema
+from .types_and_enums import RecordType, TelemetryBatch, TelemetryRecord
+
+RESULT_FORMAT_VERSION = 1
+
+# Measured rounds per benchmark: enough for a Mann-Whitney comparison of the
+# full suite to reach significance after the Holm correction (see bench_history)
+DEFAULT_ROUNDS = 10
+
+# GPU telemetry record used when no schema file is given (344 bits, CRC-protected)
+DEFAULT_SCHEMA = {
+    "schema_name": "benchmark",
+    "endianness": "little",
+    "total_bits": 344,
+    "validation": {"crc32c": {"field": "crc32c", "range_bits": "0-343"}},
+    "schema_version": {"type": "uint8", "bits": 8, "pos": "0-7"},
+    "gpu_index": {"type": "uint8", "bits": 8, "pos": "8-15"},
+    "scope": {"type": "enum", "bits": 2, "pos": "16-17", "values": ["DEVICE", "BLOCK", "THREAD"]},
+    "value_type": {"type": "enum", "bits": 6, "pos": "18-23", "values": ["FLOAT32", "UINT64", "INT64", "BOOL"]},
+    "unit_code": {"type": "uint8", "bits": 8, "pos": "24-31"},
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "32-63"},
+    "timestamp_ns": {"type": "uint64", "bits": 64, "pos": "64-127"},
+    "device_id_ascii": {"type": "bytes", "bits": 64, "pos": "128-191"},
+    "block_id": {"type": "uint16", "bits": 16, "pos": "192-207"},
+    "thread_id": {"type": "uint16", "bits": 16, "pos": "208-223"},
+    "metric_id": {"type": "uint16", "bits": 16, "pos": "224-239"},
+    "scale_1eN": {"type": "int8", "bits": 8, "pos": "240-247"},
+    "value_bits": {"type": "uint64", "bits": 64, "pos": "248-311"},
+    "crc32c": {"type": "uint32", "bits": 32, "pos": "312-343"}
+}
+
+# Rate the rate limiter benchmark asks for
+RATE_LIMITER_TARGET = 50000
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark, in nanoseconds per round"""
+    name: str
+    group: str
+    items: int
+    rounds: int
+    warmup: int
+    times_ns: List[int]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.times_ns)
+
+    @property
+    def items_per_second(self) -> float:
+        median = self.median_ns
+        return self.items * 1e9 / median if median > 0 else float('inf')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready result with summary statistics"""
+        times = sorted(self.times_ns)
+        result = asdict(self)
+        result.update({
+            "min_ns": times[0],
+            "max_ns": times[-1],
+            "mean_ns": statistics.fmean(times),
+            "median_ns": self.median_ns,
+            "stdev_ns": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "p95_ns": times[min(len(times) - 1, math.ceil(0.95 * len(times)) - 1)],
+            "items_per_second": self.items_per_second
+        })
+        return result
+
+
+@dataclass
+class Benchmark:
+    """
+    A registered benchmark
+
+    setup(context) builds the inputs and returns the timed callable; one
+    call is one round and processes `items` items (records, by default
+    context.records).
+    """
+    name: str
+    group: str
+    setup: Callable[['BenchmarkContext'], Callable[[], Any]]
+    items: Optional[Callable[['BenchmarkContext'], int]] = None
+    requires_numpy: bool = False
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, items: Optional[Callable] = None, requires_numpy: bool = False):
+    """Register a benchmark setup function"""
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, group, setup, items, requires_numpy)
+        return setup
+    return register
+
+
+def measure(func: Callable[[], Any], rounds: int = 5, warmup: int = 1) -> List[int]:
+    """
+    Time rounds of func with perf_counter_ns
+
+    Args:
+        func: One round of work
+        rounds: Measured rounds
+        warmup: Unrecorded rounds run first
+
+    Returns:
+        Nanoseconds per measured round
+    """
+    for _ in range(warmup):
+        func()
+
+    times = []
+    gc_enabled = gc.isenabled()
+    try:
+        for _ in range(rounds):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter_ns()
+            func()
+            times.append(time.perf_counter_ns() - start)
+            if gc_enabled:
+                gc.enable()
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return times
+
+
+class _PackerCodec:
+    """Serialization hook RollingFileWriter looks for in binary output"""
+
+    def __init__(self, packer: BinaryRecordPacker):
+        self.packer = packer
+
+    def pack_record_enhanced(self, record: TelemetryRecord) -> bytes:
+        return self.packer.pack_record(record.data)
+
+
+class BenchmarkContext:
+    """Inputs shared by the benchmarks of one suite run, built on first use"""
+
+    def __init__(self, schema_file: str, types_file: Optional[str], records: int, work_dir: str):
+        self.schema_file = schema_file
+        self.types_file = types_file
+        self.records = records
+        self.work_dir = work_dir
+        self._cache: Dict[str, Any] = {}
+
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def processor(self) -> BinarySchemaProcessor:
+        return self._cached("processor", lambda: BinarySchemaProcessor(
+            load_schema(self.schema_file, self.types_file)))
+
+    @property
+    def packer(self) -> BinaryRecordPacker:
+        return self._cached("packer", lambda: BinaryRecordPacker(self.processor))
+
+    @property
+    def formatter(self) -> OutputFormatter:
+        return self._cached("formatter", lambda: OutputFormatter(self.processor.schema_name))
+
+    @property
+    def telemetry_records(self) -> List[TelemetryRecord]:
+        """Clean generated records, the input of the later stages"""
+        def build():
+            populator = RecordDataPopulator(self.processor)
+            base = time.time_ns()
+            return [
+                TelemetryRecord(RecordType.UPDATE, base + i, i + 1, populator.populate_record_data(i + 1, base + i))
+                for i in range(self.records)
+            ]
+        return self._cached("telemetry_records", build)
+
+    @property
+    def packed(self) -> List[bytes]:
+        return self._cached("packed", lambda: [self.packer.pack_record(r.data) for r in self.telemetry_records])
+
+    @property
+    def batch(self) -> TelemetryBatch:
+        return self._cached("batch", lambda: TelemetryBatch.from_records(self.telemetry_records))
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.work_dir, name)
+
+
+# -------------------------
+# Benchmarks
+# -------------------------
+
+SCHEMA_LOADS = 50
+
+
+@benchmark("schema.load", "schema", items=lambda context: SCHEMA_LOADS)
+def _schema_load(context):
+    def run():
+        for _ in range(SCHEMA_LOADS):
+            clear_schema_cache()
+            BinarySchemaProcessor(load_schema(context.schema_file, context.types_file))
+    return run
+
+
+@benchmark("generate.clean", "generation")
+def _generate_clean(context):
+    populator = RecordDataPopulator(context.processor)
+
+    def run():
+        for i in range(context.records):
+            populator.populate_record_data(i, i)
+    return run
+
+
+@benchmark("generate.columns", "generation", requires_numpy=True)
+def _generate_columns(context):
+    from .column_samplers import ColumnSamplerTable
+    table = ColumnSamplerTable(context.processor, seed=0)
+    return lambda: table.sample(context.records)
+
+
+@benchmark("faults.record", "faults")
+def _faults_record(context):
+    injector = FaultInjector(context.processor, global_fault_rate=0.05, logger=logging.getLogger(__name__))
+    records = context.telemetry_records
+
+    def run():
+        for record in records:
+            injector.inject_faults(record)
+    return run
+
+
+@benchmark("faults.batch", "faults", requires_numpy=True)
+def _faults_batch(context):
+    injector = FaultInjector(context.processor, global_fault_rate=0.05, logger=logging.getLogger(__name__))
+    columns = context.batch.columns
+
+    # inject_faults_batch edits its columns; each round gets fresh copies
+    def run():
+        injector.inject_faults_batch({name: column.copy() for name, column in columns.items()})
+    return run
+
+
+@benchmark("pack.record", "packing")
+def _pack_record(context):
+    packer = context.packer
+    rows = [record.data for record in context.telemetry_records]
+
+    def run():
+        for row in rows:
+            packer.pack_record(row)
+    return run
+
+
+@benchmark("pack.columns", "packing", requires_numpy=True)
+def _pack_columns(context):
+    packer = context.packer
+    batch = context.batch
+    return lambda: packer.pack_batch(batch)
+
+
+@benchmark("crc.record", "crc")
+def _crc_record(context):
+    crc = CrcField.from_processor(context.processor)
+    if crc is None:
+        raise ValueError("schema has no crc32c field")
+    packed = context.packed
+
+    def run():
+        for record in packed:
+            crc.compute(record)
+    return run
+
+
+@benchmark("crc.batch", "crc", requires_numpy=True)
+def _crc_batch(context):
+    crc = CrcField.from_processor(context.processor)
+    if crc is None:
+        raise ValueError("schema has no crc32c field")
+    records = np.frombuffer(b"".join(context.packed), dtype=np.uint8).reshape(context.records, -1)
+    return lambda: crc.compute_batch(records)
+
+
+def _formatter_benchmark(name: str, method: str):
+    @benchmark(f"format.{name}", "formatting")
+    def setup(context):
+        format_record = getattr(context.formatter, method)
+        records = context.telemetry_records
+
+        def run():
+            for record in records:
+                format_record(record)
+        return run
+    return setup
+
+
+for _name, _method in (("json", "format_json"), ("ndjson", "format_ndjson"), ("influx", "format_influx_line")):
+    _formatter_benchmark(_name, _method)
+
+
+@benchmark("format.ndjson_batch", "formatting")
+def _format_ndjson_batch(context):
+    formatter = context.formatter
+    batch = context.batch
+    return lambda: formatter.format_ndjson_batch(batch)
+
+
+@benchmark("leb128.encode", "leb128")
+def _leb128_encode(context):
+    serializer = RollingFileWriter(context.path("leb128"), max_size_bytes=1, format="leb128")
+    records = context.telemetry_records
+
+    def run():
+        for record in records:
+            serializer.serialize_record(record)
+    return run
+
+
+@benchmark("leb128.decode", "leb128")
+def _leb128_decode(context):
+    serializer = RollingFileWriter(context.path("leb128"), max_size_bytes=1, format="leb128")
+    data = b"".join(serializer.serialize_record(record) for record in context.telemetry_records)
+    return lambda: sum(1 for _ in iter_leb128_records(data))
+
+
+def _writer_benchmark(name: str, fmt: str, compress: bool):
+    @benchmark(f"write.{name}", "writing")
+    def setup(context):
+        records = context.telemetry_records
+        codec = _PackerCodec(context.packer) if fmt == "binary" else None
+        directory = context.path(f"write_{name}")
+
+        def run():
+            shutil.rmtree(directory, ignore_errors=True)
+            writer = RollingFileWriter(os.path.join(directory, "bench"), max_size_bytes=64 * 1024 * 1024,
+                                       format=fmt, compress=compress, logger=logging.getLogger(__name__))
+            for record in records:
+                writer.write_record(record, codec)
+            writer.close()
+        return run
+    return setup
+
+
+for _name, _fmt, _compress in (("binary", "binary", False), ("binary_gzip", "binary", True),
+                               ("ndjson", "ndjson", False), ("ndjson_gzip", "ndjson", True)):
+    _writer_benchmark(_name, _fmt, _compress)
+
+
+@benchmark("reader.decode", "reading")
+def _reader_decode(context):
+    path = context.path("reader.bin")
+    with open(path, 'wb') as f:
+        f.write(b"".join(record + b"\n" for record in context.packed))
+    reader = BinaryRecordReader(context.schema_file, context.types_file)
+    return lambda: reader.read_all_records(path)
+
+
+@benchmark("reader.verify_crc", "reading", requires_numpy=True)
+def _reader_verify_crc(context):
+    path = context.path("reader.bin")
+    with open(path, 'wb') as f:
+        f.write(b"".join(record + b"\n" for record in context.packed))
+    reader = BinaryRecordReader(context.schema_file, context.types_file)
+    return lambda: reader.verify_crc(path)
+
+
+class _RateLimiterRound:
+    """Rounds of RateLimiter pacing; records the achieved rate of each"""
+
+    def __init__(self, records: int, batch_size: int = 100):
+        self.records = records
+        self.batch_size = batch_size
+        self.rates: List[float] = []
+
+    def __call__(self):
+        limiter = RateLimiter(RATE_LIMITER_TARGET, batch_size=self.batch_size, logger=logging.getLogger(__name__))
+        limiter.start()
+        start = time.perf_counter_ns()
+        for _ in range(self.records // self.batch_size):
+            limiter.wait_if_needed(self.batch_size)
+        elapsed = time.perf_counter_ns() - start
+        self.rates.append(self.records // self.batch_size * self.batch_size * 1e9 / elapsed)
+
+    def extra(self) -> Dict[str, Any]:
+        achieved = statistics.median(self.rates)
+        return {
+            "target_rate": RATE_LIMITER_TARGET,
+            "achieved_rate": achieved,
+            "error_percent": (achieved - RATE_LIMITER_TARGET) / RATE_LIMITER_TARGET * 100
+        }
+
+
+@benchmark("rate_limiter.accuracy", "rate_control",
+           items=lambda context: max(context.records // 100, 1) * 100)
+def _rate_limiter_accuracy(context):
+    # Paced at RATE_LIMITER_TARGET, so a round takes records / target seconds
+    return _RateLimiterRound(max(context.records // 100, 1) * 100)
+
+
+# -------------------------
+# Suite
+# -------------------------
+
+class BenchmarkSuite:
+    """Runs selected benchmarks and collects a JSON-ready report"""
+
+    def __init__(
+        self,
+        schema_file: Optional[str] = None,
+        types_file: Optional[str] = None,
+        records: int = 10000,
+        rounds: int = DEFAULT_ROUNDS,
+        warmup: int = 1,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the suite
+
+        Args:
+            schema_file: Binary schema to benchmark (default: DEFAULT_SCHEMA)
+            types_file: Optional types mapping file
+            records: Records per round
+            rounds: Measured rounds per benchmark
+            warmup: Unrecorded rounds before measuring
+            logger: Optional logger instance
+        """
+        if records < 1:
+            raise ValueError(f"records must be at least 1, got {records}")
+        if rounds < 1:
+            raise ValueError(f"rounds must be at least 1, got {rounds}")
+        if warmup < 0:
+            raise ValueError(f"warmup must be non-negative, got {warmup}")
+
+        self.schema_file = schema_file
+        self.types_file = types_file
+        self.records = records
+        self.rounds = rounds
+        self.warmup = warmup
+        self.logger = logger or logging.getLogger(__name__)
+
+    @staticmethod
+    def select(patterns: Optional[Sequence[str]] = None) -> List[Benchmark]:
+        """
+        Registered benchmarks whose name or group matches any glob pattern
+
+        Raises:
+            ValueError: If a pattern matches no benchmark
+        """
+        if not patterns:
+            return list(BENCHMARKS.values())
+        selected = []
+        for pattern in patterns:
+            matches = [b for b in BENCHMARKS.values()
+                       if fnmatch.fnmatch(b.name, pattern) or fnmatch.fnmatch(b.group, pattern)]
+            if not matches:
+                raise ValueError(f"No benchmark matches '{pattern}', available: {', '.join(BENCHMARKS)}")
+            selected.extend(b for b in matches if b not in selected)
+        return selected
+
+    def run(self, patterns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Run benchmarks
+
+        Args:
+            patterns: Glob patterns of benchmark names or groups (default: all)
+
+        Returns:
+            Report with environment, settings and one result per benchmark
+        """
+        selected = self.select(patterns)
+        work_dir = tempfile.mkdtemp(prefix="telegen-bench-")
+        results = []
+        skipped = {}
+        try:
+            schema_file = self.schema_file
+            if schema_file is None:
+                schema_file = os.path.join(work_dir, "schema.json")
+                with open(schema_file, 'w', encoding='utf-8') as f:
+                    json.dump(DEFAULT_SCHEMA, f)
+            context = BenchmarkContext(schema_file, self.types_file, self.records, work_dir)
+            schema_hash = load_schema(schema_file, self.types_file).content_hash
+
+            for bench in selected:
+                if bench.requires_numpy and not HAS_NUMPY:
+                    skipped[bench.name] = "requires numpy"
+                    continue
+                try:
+                    result = self.run_benchmark(bench, context)
+                except (ValueError, TypeError, KeyError, RuntimeError, OSError) as e:
+                    self.logger.warning(f"Benchmark {bench.name} skipped: {e}")
+                    skipped[bench.name] = str(e)
+                    continue
+                self.logger.info(f"{bench.name}: {result.items_per_second:,.0f} items/s "
+                                 f"(median {result.median_ns / 1e6:.2f} ms)")
+                results.append(result.to_dict())
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return {
+            "format_version": RESULT_FORMAT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "environment": environment(),
+            "settings": {
+                "schema_file": self.schema_file,
+                "schema_hash": schema_hash,
+                "records": self.records,
+                "rounds": self.rounds,
+                "warmup": self.warmup
+            },
+            "results": results,
+            "skipped": skipped
+        }
+
+    def run_benchmark(self, bench: Benchmark, context: BenchmarkContext) -> BenchmarkResult:
+        """Set up and time one benchmark"""
+        func = bench.setup(context)
+        times = measure(func, self.rounds, self.warmup)
+        items = bench.items(context) if bench.items else context.records
+        extra = func.extra() if hasattr(func, "extra") else {}
+        return BenchmarkResult(bench.name, bench.group, items, self.rounds, self.warmup, times, extra)
+
+
+def environment() -> Dict[str, Any]:
+    """Interpreter, platform and library versions of a run"""
+    from . import __version__
+    return {
+        "package_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "hostname": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__ if HAS_NUMPY else None,
+        "crc32c_backend": CRC_BACKEND,
+        "git_revision": git_revision()
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Commit of the package's source checkout, or None outside a git work tree"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    revision = result.stdout.strip()
+    return revision if result.returncode == 0 and revision else None
+
+
+def write_report(report: Dict[str, Any], path: str):
+    """Save a suite report as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def main():
+    """Run the suite: python -m telemetry_generator.benchmarks [output.json] [pattern ...]"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    output = sys.argv[1] if len(sys.argv) > 1 else None
+    report = BenchmarkSuite().run(sys.argv[2:] or None)
+    if output:
+        write_report(report, output)
+        print(f"Results written to {output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
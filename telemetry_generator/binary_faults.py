@@ -0,0 +1,350 @@
+"""
+binary_faults.py
+Post-pack fault injection on packed binary records: bit flips, torn
+(truncated) records, corrupted CRC fields, and dropped, duplicated or
+reordered records in the byte stream. Every fault is written to a sidecar
+ground-truth index so receivers' error handling can be scored.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, fields as dataclass_fields
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .binary_schema import BinarySchemaProcessor
+from .record_layout import RecordLayout
+
+# Separator written after every packed record by the binary writer
+RECORD_SEPARATOR = b'\n'
+
+# Default suffix of the ground-truth index next to the output file
+INDEX_SUFFIX = '.faults.ndjson'
+
+
+class BinaryFaultType(Enum):
+    """Faults applied to packed bytes"""
+    BIT_FLIP = "bit_flip"                   # Random bits inverted
+    TRUNCATION = "truncation"               # Torn record (tail bytes missing)
+    CRC_CORRUPTION = "crc_corruption"       # CRC field no longer matches
+    DROP = "drop"                           # Record missing from stream
+    DUPLICATE = "duplicate"                 # Record written twice
+    REORDER = "reorder"                     # Record moved later in stream
+
+
+@dataclass
+class BinaryFaultConfig:
+    """Per-record rates of binary faults"""
+    bit_flip_rate: float = 0.0
+    max_bit_flips: int = 1          # Bits flipped per affected record: 1..max_bit_flips
+    truncation_rate: float = 0.0
+    crc_corruption_rate: float = 0.0
+    drop_rate: float = 0.0
+    duplicate_rate: float = 0.0
+    reorder_rate: float = 0.0
+    reorder_window: int = 4         # Reordered records move 1..reorder_window positions later
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BinaryFaultConfig':
+        """Build from a dict, ignoring unknown keys"""
+        known = {f.name for f in dataclass_fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def validate(self):
+        """
+        Raises:
+            ValueError: If a rate or count is out of range
+        """
+        for name in ("bit_flip_rate", "truncation_rate", "crc_corruption_rate",
+                     "drop_rate", "duplicate_rate", "reorder_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0.0 and 1.0, got {value}")
+        if self.max_bit_flips < 1:
+            raise ValueError(f"max_bit_flips must be at least 1, got {self.max_bit_flips}")
+        if self.reorder_window < 1:
+            raise ValueError(f"reorder_window must be at least 1, got {self.reorder_window}")
+
+
+class BinaryFaultInjector:
+    """
+    Applies binary faults to batches of packed records
+
+    All draws for a batch are made at once over an (records x bytes) array;
+    only the faulty records are visited in Python to build the ground truth.
+    """
+
+    def __init__(
+        self,
+        processor: BinarySchemaProcessor,
+        config: Optional[BinaryFaultConfig] = None,
+        seed: Optional[int] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.processor = processor
+        self.config = config or BinaryFaultConfig()
+        self.config.validate()
+        self.logger = logger or logging.getLogger(__name__)
+        self.rng = np.random.default_rng(seed)
+
+        self.layout = RecordLayout(processor)
+        self.record_size = self.layout.record_size
+        self.crc_bytes = self._crc_byte_range()
+        if self.config.crc_corruption_rate and self.crc_bytes is None:
+            self.logger.warning("Schema has no crc32c field - CRC corruption disabled")
+
+        self.stats = {fault.value: 0 for fault in BinaryFaultType}
+        self.stats.update(records_in=0, records_out=0, faulty_records=0)
+
+    @classmethod
+    def from_schema_file(cls, schema_file: str, types_file: Optional[str] = None, **kwargs) -> 'BinaryFaultInjector':
+        return cls(BinarySchemaProcessor.from_file(schema_file, types_file), **kwargs)
+
+    def _crc_byte_range(self) -> Optional[Tuple[int, int]]:
+        """Byte range [start, end) of the crc32c field, if the schema has one"""
+        crc_field_name = self.processor.validation.get("crc32c", {}).get("field")
+        crc_field = self.processor.fields_by_name.get(crc_field_name) if crc_field_name else None
+        if not crc_field:
+            return None
+        return crc_field["start_bit"] // 8, (crc_field["end_bit"] + 8) // 8
+
+    def inject_batch(self, records: Sequence[bytes], first_index: int = 0) -> Tuple[List[bytes], List[Dict[str, Any]]]:
+        """
+        Apply faults to a batch of packed records
+
+        Args:
+            records: Packed records, all record_size bytes long
+            first_index: Stream index of the first record (for the ground truth)
+
+        Returns:
+            Tuple of (output records in stream order, ground-truth entries)
+        """
+        for i, record in enumerate(records):
+            if len(record) != self.record_size:
+                raise ValueError(f"Record {first_index + i} is {len(record)} bytes, expected {self.record_size}")
+
+        if not records:
+            return [], []
+        batch = np.frombuffer(b"".join(records), dtype=np.uint8).reshape(len(records), self.record_size)
+        return self.inject_array(batch, first_index)
+
+    def inject_array(self, batch: np.ndarray, first_index: int = 0, first_position: int = 0,
+                     first_offset: int = 0) -> Tuple[List[bytes], List[Dict[str, Any]]]:
+        """
+        Apply faults to an (n, record_size) uint8 array of packed records
+
+        Args:
+            batch: Packed records, one per row (not modified)
+            first_index: Stream index of the first input record
+            first_position: Output position of the first output record
+            first_offset: Output byte offset of the first output record
+
+        Returns:
+            Tuple of (output records in stream order, ground-truth entries)
+        """
+        data, lengths, output_rows, entries = self._apply_faults(batch, first_index, first_position, first_offset)
+        output = [data[row, :length].tobytes()
+                  for row, length in zip(output_rows.tolist(), lengths[output_rows].tolist())]
+        return output, entries
+
+    def inject_stream(self, batch: np.ndarray, first_index: int = 0, first_position: int = 0,
+                      first_offset: int = 0) -> Tuple[bytes, int, List[Dict[str, Any]]]:
+        """
+        Apply faults to an (n, record_size) uint8 array, returning the output stream bytes
+
+        Rows are framed with the separator and gathered in stream order as
+        one array; only torn records need a mask to drop their missing tail.
+
+        Returns:
+            Tuple of (output bytes including separators, output record count, ground-truth entries)
+        """
+        data, lengths, output_rows, entries = self._apply_faults(batch, first_index, first_position, first_offset)
+        count, size = data.shape
+        framed = np.empty((count, size + len(RECORD_SEPARATOR)), dtype=np.uint8)
+        framed[:, :size] = data
+        framed[:, size:] = np.frombuffer(RECORD_SEPARATOR, dtype=np.uint8)
+
+        output = framed[output_rows]
+        output_lengths = lengths[output_rows]
+        if (output_lengths < size).any():
+            keep = np.arange(framed.shape[1]) < output_lengths[:, None]
+            keep[:, size:] = True
+            output = output[keep]
+        return output.tobytes(), len(output_rows), entries
+
+    def _apply_faults(self, batch: np.ndarray, first_index: int, first_position: int,
+                      first_offset: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """Faulted rows, kept length per row, output order of rows and ground-truth entries"""
+        config = self.config
+        rng = self.rng
+        count, size = batch.shape
+        data = batch.copy()
+        faults = {}
+
+        # Bit flips: 1..max_bit_flips distinct bits per affected record
+        flip_rows = np.flatnonzero(rng.random(count) < config.bit_flip_rate)
+        flips_by_row = {}
+        if len(flip_rows):
+            flips = rng.integers(1, config.max_bit_flips + 1, len(flip_rows))
+            positions = np.unique(np.repeat(flip_rows, flips).astype(np.int64) * (size * 8)
+                                  + rng.integers(0, size * 8, int(flips.sum())))
+            rows, bits = np.divmod(positions, size * 8)
+            np.bitwise_xor.at(data, (rows, bits // 8), (1 << (bits % 8)).astype(np.uint8))
+            for row, bit in zip(rows.tolist(), bits.tolist()):
+                flips_by_row.setdefault(row, []).append(bit)
+            faults[BinaryFaultType.BIT_FLIP] = flip_rows
+
+        # CRC corruption: XOR every CRC byte with a non-zero mask
+        if self.crc_bytes is not None:
+            crc_rows = np.flatnonzero(rng.random(count) < config.crc_corruption_rate)
+            if len(crc_rows):
+                start, end = self.crc_bytes
+                masks = rng.integers(1, 256, (len(crc_rows), end - start), dtype=np.uint8)
+                data[crc_rows, start:end] ^= masks
+                faults[BinaryFaultType.CRC_CORRUPTION] = crc_rows
+
+        # Torn records keep 1..size-1 bytes
+        lengths = np.full(count, size, dtype=np.int64)
+        if size > 1:
+            torn_rows = np.flatnonzero(rng.random(count) < config.truncation_rate)
+            if len(torn_rows):
+                lengths[torn_rows] = rng.integers(1, size, len(torn_rows))
+                faults[BinaryFaultType.TRUNCATION] = torn_rows
+
+        # Stream order: reordered records move later, dropped ones vanish, duplicates repeat
+        keys = np.arange(count, dtype=np.float64)
+        reorder_rows = np.flatnonzero(rng.random(count) < config.reorder_rate)
+        if len(reorder_rows):
+            keys[reorder_rows] += rng.integers(1, config.reorder_window + 1, len(reorder_rows)) + 0.5
+            faults[BinaryFaultType.REORDER] = reorder_rows
+
+        dropped = rng.random(count) < config.drop_rate
+        duplicated = ~dropped & (rng.random(count) < config.duplicate_rate)
+        if dropped.any():
+            faults[BinaryFaultType.DROP] = np.flatnonzero(dropped)
+        if duplicated.any():
+            faults[BinaryFaultType.DUPLICATE] = np.flatnonzero(duplicated)
+
+        order = np.argsort(keys, kind='stable')
+        order = order[~dropped[order]]
+        output_rows = np.repeat(order, 1 + duplicated[order])
+
+        # Ground truth for faulty records only
+        faulty = np.zeros(count, dtype=bool)
+        for rows in faults.values():
+            faulty[rows] = True
+
+        output_lengths = lengths[output_rows] + len(RECORD_SEPARATOR)
+        offsets = first_offset + np.concatenate(([0], np.cumsum(output_lengths)[:-1]))
+        positions_by_row = {}
+        for position in np.flatnonzero(faulty[output_rows]).tolist():
+            positions_by_row.setdefault(int(output_rows[position]), []).append(position)
+
+        fault_names = {row: [] for row in np.flatnonzero(faulty).tolist()}
+        for fault_type, rows in faults.items():
+            self.stats[fault_type.value] += len(rows)
+            for row in rows.tolist():
+                fault_names[row].append(fault_type.value)
+
+        entries = []
+        for row, names in fault_names.items():
+            positions = positions_by_row.get(row, [])
+            entry = {
+                "index": first_index + row,
+                "seq_no": self._sequence_number(batch[row]),
+                "faults": names,
+                "output_positions": [first_position + p for p in positions],
+                "output_offsets": [int(offsets[p]) for p in positions]
+            }
+            if row in flips_by_row:
+                entry["flipped_bits"] = flips_by_row[row]
+            if lengths[row] != size:
+                entry["truncated_length"] = int(lengths[row])
+            entries.append(entry)
+
+        self.stats["records_in"] += count
+        self.stats["records_out"] += len(output_rows)
+        self.stats["faulty_records"] += len(entries)
+
+        return data, lengths, output_rows, entries
+
+    def _sequence_number(self, record: np.ndarray) -> Optional[int]:
+        """seq_no of the original (clean) record, if the schema has one"""
+        if "seq_no" not in self.processor.fields_by_name:
+            return None
+        try:
+            return int(self.layout.unpack(record.tobytes())["seq_no"])
+        except Exception:
+            return None
+
+    def iter_file_batches(self, input_path: str, batch_size: int = 4096) -> Iterator[np.ndarray]:
+        """
+        Read a binary telemetry file (records separated by newlines) in batches
+
+        Yields:
+            (n, record_size) uint8 arrays
+        """
+        stride = self.record_size + len(RECORD_SEPARATOR)
+        with open(input_path, 'rb') as f:
+            while True:
+                chunk = f.read(stride * batch_size)
+                whole = len(chunk) // stride
+                if whole:
+                    yield np.frombuffer(chunk, dtype=np.uint8, count=whole * stride).reshape(whole, stride)[:, :self.record_size]
+                if len(chunk) % stride:
+                    self.logger.warning(f"Ignoring {len(chunk) % stride} trailing bytes in {input_path}")
+                if len(chunk) < stride * batch_size:
+                    break
+
+    def process_file(
+        self,
+        input_path: str,
+        output_path: str,
+        index_path: Optional[str] = None,
+        batch_size: int = 4096
+    ) -> Dict[str, Any]:
+        """
+        Copy a binary telemetry file, applying faults, and write the ground-truth index
+
+        Args:
+            input_path: Clean binary file
+            output_path: Faulty binary file to write
+            index_path: Ground-truth NDJSON (default: output_path + INDEX_SUFFIX)
+            batch_size: Records per batch
+
+        Returns:
+            Statistics dictionary
+        """
+        index_path = index_path or output_path + INDEX_SUFFIX
+        index = position = offset = 0
+
+        with open(output_path, 'wb') as out, open(index_path, 'w', encoding='utf-8') as truth:
+            for batch in self.iter_file_batches(input_path, batch_size):
+                output, output_count, entries = self.inject_stream(batch, index, position, offset)
+
+                out.write(output)
+                offset += len(output)
+                for entry in entries:
+                    truth.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+                index += len(batch)
+                position += output_count
+
+        self.logger.info(
+            f"Injected binary faults into {self.stats['faulty_records']:,} of {self.stats['records_in']:,} "
+            f"records ({input_path} -> {output_path}, index {index_path})"
+        )
+        return dict(self.get_stats(), output_file=output_path, index_file=index_path,
+                    output_bytes=os.path.getsize(output_path))
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+def load_ground_truth(index_path: str) -> List[Dict[str, Any]]:
+    """Read a ground-truth index written by BinaryFaultInjector.process_file"""
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -3,11 +3,21 @@ Binary record packer with CRC and fixed bit support
 """
 import logging
 import math
+import numbers
 import struct
-import zlib
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 from .binary_schema import BinarySchemaProcessor
+from .checksums import CrcField
+from .record_layout import RecordLayout, FLOAT_TYPES
+from .types_and_enums import TelemetryBatch
+from .value_pools import encode_ascii
 
 class BinaryRecordPacker:
     """Packs records into binary format"""
@@ -16,48 +26,46 @@ class BinaryRecordPacker:
         self.processor = processor
         self.endian_prefix = '<' if processor.endianness == 'little' else '>'
         
+        # Compiled lazily, recompiled if the processor's field list changes
+        self._layout = None
+        self._layout_fields = None
+        self._layout_key = None
+        self._crc = None
+        self._crc_layout = None
+        self._crc_validation = None
+    
+    @property
+    def layout(self) -> RecordLayout:
+        """Compiled record layout for the processor's current fields"""
+        fields = self.processor.fields
+        key = (len(fields), self.processor.endianness, self.processor.total_bits)
+        if self._layout is None or fields is not self._layout_fields or key != self._layout_key:
+            self._layout = RecordLayout(self.processor)
+            self._layout_fields = fields
+            self._layout_key = key
+        return self._layout
+        
     def pack_record(self, data: Dict[str, Any]) -> bytes:
         """Pack a record into fixed binary format"""
         try:
-            # Create buffer with exact size
-            total_bytes = math.ceil(self.processor.total_bits / 8)
-            buffer = bytearray(total_bytes)
-            
-            # Fill the fields
-            for field in self.processor.fields:
-                value = data.get(field["name"], 0)
-                self._pack_field(buffer, field, value)
+            layout = self.layout
             
-            # Calculate CRC32C if required
-            if "crc32c" in self.processor.validation:
-                crc_config = self.processor.validation["crc32c"]
-                crc_field_name = crc_config.get("field")
+            try:
+                # Fast path: one struct.pack for aligned fields, shift/mask for bit fields
+                buffer = layout.pack(data)
+            except (struct.error, TypeError, ValueError, OverflowError):
+                # Some value needs coercion - fill field by field
+                total_bytes = math.ceil(self.processor.total_bits / 8)
+                buffer = bytearray(total_bytes)
                 
-                if crc_field_name and crc_field_name in self.processor.fields_by_name:
-                    crc_field = self.processor.fields_by_name[crc_field_name]
-                    
-                    # Calculate CRC on the defined range
-                    range_bits = crc_config.get("range_bits", "0-319")
-                    start_bit, end_bit = map(int, range_bits.split("-"))
-                    
-                    start_byte = start_bit // 8
-                    end_byte = (end_bit + 7) // 8
-                    
-                    # Prepare data for CRC (zero the CRC field first)
-                    temp_buffer = bytearray(buffer)
-                    crc_start_byte = crc_field["start_bit"] // 8
-                    crc_end_byte = (crc_field["end_bit"] + 7) // 8
-                    
-                    # Zero the CRC field
-                    for i in range(crc_start_byte, min(crc_end_byte, len(temp_buffer))):
-                        temp_buffer[i] = 0
-                    
-                    # Calculate CRC on the defined range
-                    crc_data = temp_buffer[start_byte:min(end_byte, len(temp_buffer))]
-                    crc_value = zlib.crc32(crc_data) & 0xffffffff
-                    
-                    # Write the CRC to the original buffer
-                    self._pack_field(buffer, crc_field, crc_value)
+                for field in self.processor.fields:
+                    value = data.get(field["name"], 0)
+                    self._pack_field(buffer, field, value)
+            
+            # Calculate CRC32C if required, with the CRC field read as zeros
+            crc = self.crc_field
+            if crc:
+                self._pack_field(buffer, crc.field, crc.compute(buffer))
             
             return bytes(buffer)
             
@@ -65,6 +73,79 @@ class BinaryRecordPacker:
             logging.error(f"Error packing record: {e}")
             raise
     
+    @property
+    def crc_field(self) -> Optional[CrcField]:
+        """The schema's CRC field, or None if it has none"""
+        layout = self.layout
+        validation = getattr(self.processor, 'validation', None)
+        if self._crc_layout is not layout or self._crc_validation is not validation:
+            self._crc = CrcField.from_processor(self.processor)
+            self._crc_layout = layout
+            self._crc_validation = validation
+        return self._crc
+    
+    def pack_columns(self, columns: Mapping[str, Any], num_rows: Optional[int] = None):
+        """
+        Pack a columnar batch (e.g. from GPUBatchGenerator.generate_columns)
+        
+        Fields are written column by column with numpy, with the same
+        coercions and CRC as pack_record. Batches with values that need
+        per-value coercion fall back to pack_record row by row.
+        
+        Args:
+            columns: Field name -> column (arrays or lists)
+            num_rows: Number of rows (default: length of the first column)
+            
+        Returns:
+            (num_rows, record_size) uint8 array; row i is pack_record of row i
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("pack_columns requires numpy")
+        if num_rows is None:
+            num_rows = len(next(iter(columns.values()))) if columns else 0
+        
+        layout = self.layout
+        crc = self.crc_field
+        if crc:
+            # The CRC field is computed below; pack it as 0 first
+            columns = {name: column for name, column in columns.items() if name != crc.name}
+        
+        try:
+            records = layout.pack_columns(columns, num_rows, trim=False)
+        except (TypeError, ValueError, OverflowError, UnicodeError):
+            # Some column needs per-value coercion
+            return self._pack_rows(columns, num_rows)
+        
+        if crc:
+            # One vectorized pass over all rows, CRC field bytes read as zeros
+            crc_values = crc.compute_batch(records[:, :layout.record_size])
+            layout.write_column(records, crc.name, crc_values)
+        
+        return records[:, :layout.record_size]
+    
+    def pack_batch(self, batch: TelemetryBatch):
+        """
+        Pack every record of a TelemetryBatch, column-wise
+        
+        Returns:
+            (len(batch), record_size) uint8 array (see pack_columns);
+            without NumPy, a list of packed records
+        """
+        if HAS_NUMPY:
+            return self.pack_columns(batch.columns, len(batch))
+        return [self.pack_record(record.data) for record in batch.records()]
+    
+    def _pack_rows(self, columns: Mapping[str, Any], num_rows: int):
+        """pack_columns fallback: pack_record per row"""
+        names = list(columns)
+        rows = zip(*(columns[name].tolist() if hasattr(columns[name], "tolist") else columns[name]
+                     for name in names))
+        packed = b''.join(
+            self.pack_record({name: value for name, value in zip(names, values) if value is not None})
+            for values in rows
+        )
+        return np.frombuffer(packed, dtype=np.uint8).reshape(num_rows, self.layout.record_size).copy()
+    
     def _pack_field(self, buffer: bytearray, field: Dict[str, Any], value: Any):
         """Pack a single field into the buffer"""
         try:
@@ -76,19 +157,19 @@ class BinaryRecordPacker:
             # Handle enums
             if field.get("enum"):
                 if isinstance(value, str):
-                    # Search for the key by value
-                    for key, val in field["enum"].items():
-                        if val == value:
-                            value = int(key)
-                            break
-                    else:
-                        value = 0  # default
+                    # Look up the key by value (first key wins, unknown labels pack as 0)
+                    codes = self.layout.enum_codes.get(field["name"])
+                    if codes is None:
+                        codes = {}
+                        for key, val in reversed(list(field["enum"].items())):
+                            codes[val] = int(key)
+                    value = codes.get(value, 0)
             
             # Handle different types
             if field_type == "np.bytes_":
                 # Handle bytes/string
                 if isinstance(value, str):
-                    value = value.encode('ascii')[:bits//8]
+                    value = encode_ascii(value)[:bits//8]
                 elif isinstance(value, (bytes, bytearray)):
                     value = bytes(value)[:bits//8]
                 else:
@@ -104,8 +185,8 @@ class BinaryRecordPacker:
                         buffer[start_byte + i] = byte_val
             
             else:
-                # Handle numeric values
-                if isinstance(value, float):
+                # Handle numeric values - floats are stored as IEEE 754 bits, matching RecordLayout
+                if field_type in FLOAT_TYPES and isinstance(value, numbers.Real):
                     if field_type == "np.float32":
                         value = struct.unpack('I', struct.pack('f', value))[0]
                     elif field_type == "np.float64":
@@ -5,52 +5,51 @@ Reads binary telemetry files generated with the new schema format
 """
 
 import json
+import logging
 import struct
-import math
 import sys
 import os
-from typing import Dict, Any, List, Generator, Union
+from typing import Dict, Any, List, Generator, Optional, Union
 from pathlib import Path
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .binary_schema import BinarySchemaProcessor
+from .checksums import CrcField
+from .schema_model import load_schema
+from .record_layout import RecordLayout
+
 class BinaryRecordReader:
     """קורא רשומות בינאריות לפי סכמה"""
     
-    def __init__(self, schema_file: str):
-        """Initialize reader with schema file"""
-        with open(schema_file, 'r') as f:
-            self.schema = json.load(f)
+    def __init__(self, schema_file: str, types_file: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        """Initialize reader with schema file (and optional types mapping, as used when packing)"""
+        self.logger = logger or logging.getLogger(__name__)
         
-        self.schema_name = self.schema.get("schema_name", "unknown")
-        self.endianness = self.schema.get("endianness", "little")
-        self.total_bits = self.schema.get("total_bits", 0)
-        self.record_size = math.ceil(self.total_bits / 8)
+        # Cached schema model - parsed once per process, shared with the packer
+        self.model = load_schema(schema_file, types_file)
+        self.schema = self.model.to_dict()
         
-        # Parse fields
-        self.fields = []
-        for field_name, field_info in self.schema.items():
-            if field_name in ["schema_name", "endianness", "total_bits", "validation"]:
-                continue
-            
-            pos_str = field_info.get("pos", "0-7")
-            start_bit, end_bit = map(int, pos_str.split("-"))
-            
-            field_data = {
-                "name": field_name,
-                "type": field_info.get("type", "np.uint8"),
-                "bits": field_info.get("bits", 8),
-                "start_bit": start_bit,
-                "end_bit": end_bit,
-                "enum": field_info.get("enum", {}),
-                "desc": field_info.get("desc", "")
-            }
-            self.fields.append(field_data)
+        # Same processor and compiled layout the packer uses, so decode matches encode
+        self.processor = BinarySchemaProcessor(self.model)
+        self.layout = RecordLayout(self.processor)
+        
+        self.schema_name = self.processor.schema_name
+        self.endianness = self.processor.endianness
+        self.total_bits = self.processor.total_bits
+        self.record_size = self.layout.record_size
         
-        # Sort by bit position
-        self.fields.sort(key=lambda x: x["start_bit"])
+        # Fields sorted by bit position
+        self.fields = self.processor.fields
         
-        print(f"Initialized reader for schema '{self.schema_name}'")
-        print(f"Record size: {self.record_size} bytes")
-        print(f"Fields: {len(self.fields)}")
+        self.logger.debug(
+            f"Initialized reader for schema '{self.schema_name}': "
+            f"{self.record_size} bytes per record, {len(self.fields)} fields"
+        )
 
     def read_file(self, file_path: str) -> Generator[Dict[str, Any], None, None]:
         """Read binary file with newline separators and yield records one by one"""
@@ -61,16 +60,18 @@ class BinaryRecordReader:
         record_size_with_separator = self.record_size + 1  # +1 for newline
         expected_records = file_size // record_size_with_separator
         
-        print(f"Reading {file_path}")
-        print(f"File size: {file_size:,} bytes")
-        print(f"Record size: {self.record_size} bytes + 1 separator = {record_size_with_separator} bytes")
-        print(f"Expected records: {expected_records:,}")
+        self.logger.debug(
+            f"Reading {file_path}: {file_size:,} bytes, "
+            f"{self.record_size} bytes + 1 separator per record, {expected_records:,} records expected"
+        )
         
         # Check if file size matches expected format
         if file_size % record_size_with_separator != 0:
-            print(f"Warning: File size not exact multiple of record+separator size")
-            print(f"Remainder: {file_size % record_size_with_separator} bytes")
-            print("Attempting line-by-line reading for error recovery...")
+            self.logger.warning(
+                f"{file_path}: file size not exact multiple of record+separator size "
+                f"(remainder {file_size % record_size_with_separator} bytes), "
+                f"attempting line-by-line reading for error recovery"
+            )
             
             # Fallback to line-by-line reading
             yield from self._read_file_by_lines(file_path)
@@ -87,7 +88,7 @@ class BinaryRecordReader:
                     break  # End of file
                 
                 if len(record_with_sep) != record_size_with_separator:
-                    print(f"Warning: Incomplete record {record_num} - got {len(record_with_sep)} bytes")
+                    self.logger.warning(f"Incomplete record {record_num} - got {len(record_with_sep)} bytes")
                     # Try to salvage partial data
                     if len(record_with_sep) >= self.record_size:
                         record_bytes = record_with_sep[:self.record_size]
@@ -98,7 +99,7 @@ class BinaryRecordReader:
                     if record_with_sep[-1:] == b'\n':
                         record_bytes = record_with_sep[:-1]  # Remove newline
                     else:
-                        print(f"Warning: Record {record_num} missing newline separator")
+                        self.logger.warning(f"Record {record_num} missing newline separator")
                         record_bytes = record_with_sep[:self.record_size]
                 
                 # Parse the record
@@ -108,8 +109,7 @@ class BinaryRecordReader:
                     yield record_data
                     record_num += 1
                 except Exception as e:
-                    print(f"Error parsing record {record_num}: {e}")
-                    print(f"Record hex: {record_bytes.hex()}")
+                    self.logger.error(f"Error parsing record {record_num}: {e} (record hex: {record_bytes.hex()})")
                     # Continue to next record instead of breaking
 
     def _read_file_by_lines(self, file_path: str) -> Generator[Dict[str, Any], None, None]:
@@ -132,12 +132,14 @@ class BinaryRecordReader:
                 
                 # Check record size
                 if len(record_bytes) != self.record_size:
-                    print(f"Warning: Record {record_num} has wrong size: {len(record_bytes)} bytes (expected {self.record_size})")
+                    self.logger.warning(
+                        f"Record {record_num} has wrong size: {len(record_bytes)} bytes (expected {self.record_size})"
+                    )
                     if len(record_bytes) == 0:
                         continue  # Skip empty lines
                     # Try to parse anyway if close to expected size
                     if len(record_bytes) < self.record_size // 2:
-                        print(f"Skipping record {record_num} - too small")
+                        self.logger.warning(f"Skipping record {record_num} - too small")
                         continue
                 
                 # Parse the record
@@ -148,144 +150,78 @@ class BinaryRecordReader:
                     yield record_data
                     record_num += 1
                 except Exception as e:
-                    print(f"Error parsing record {record_num}: {e}")
-                    print(f"Record size: {len(record_bytes)} bytes")
-                    print(f"Record hex: {record_bytes[:32].hex()}...")
+                    self.logger.error(
+                        f"Error parsing record {record_num} ({len(record_bytes)} bytes): {e} "
+                        f"(record hex: {record_bytes[:32].hex()}...)"
+                    )
                     # Continue to next record for error recovery
 
     def _parse_record(self, record_bytes: bytes) -> Dict[str, Any]:
         """Parse a single binary record"""
-        data = {}
-        
-        for field in self.fields:
-            value = self._extract_field(record_bytes, field)
-            data[field["name"]] = value
-        
-        return data
+        return self.layout.unpack(record_bytes)
 
-    # def _extract_field(self, record_bytes: bytes, field: Dict[str, Any]) -> Any:
-    #     """Extract a field value from binary data"""
-    #     start_bit = field["start_bit"]
-    #     end_bit = field["end_bit"]
-    #     bits = field["bits"]
-    #     field_type = field["type"]
-        
-    #     if field_type == "np.bytes_":
-    #         # Extract bytes/string
-    #         start_byte = start_bit // 8
-    #         num_bytes = bits // 8
-            
-    #         field_bytes = record_bytes[start_byte:start_byte + num_bytes]
-    #         # Remove null padding and decode
-    #         try:
-    #             return field_bytes.rstrip(b'\x00').decode('ascii')
-    #         except UnicodeDecodeError:
-    #             return field_bytes.hex()  # Return as hex if not ASCII
-        
-    #     else:
-    #         # Extract numeric value
-    #         if start_bit % 8 == 0 and bits % 8 == 0:
-    #             # Byte-aligned - optimized
-    #             value = self._extract_bytes(record_bytes, start_bit // 8, bits // 8)
-    #         else:
-    #             # Bit-aligned - general
-    #             value = self._extract_bits(record_bytes, start_bit, bits)
-            
-    #         # Handle signed integers
-    #         if "int8" in field_type and value >= (1 << (bits - 1)):
-    #             value = value - (1 << bits)  # Two's complement
-            
-    #         # Handle enums
-    #         if field.get("enum"):
-    #             enum_map = field["enum"]
-    #             return enum_map.get(str(value), f"unknown_{value}")
-            
-    #         # Handle special interpretations
-    #         if field["name"] == "value_bits":
-    #             # Don't interpret value_bits directly
-    #             return value
-            
-    #         return value
-    def _extract_field(self, record_bytes: bytes, field: Dict[str, Any]) -> Any:
-        """Extract a field value from binary data - מעודכן לפורמט חדש"""
-        start_bit = field["start_bit"]
-        end_bit = field["end_bit"]
-        bits = field["bits"]
-        field_type = field["type"]
+    def read_all_records(self, file_path: str) -> List[Dict[str, Any]]:
+        """Read all records from file into memory"""
+        return list(self.read_file(file_path))
+
+    def verify_crc(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Check the stored CRC32C of every record in a binary file
         
-        if field_type == "bytes":  # שונה מ-"np.bytes_"
-            # Extract bytes/string
-            start_byte = start_bit // 8
-            num_bytes = bits // 8
-            
-            field_bytes = record_bytes[start_byte:start_byte + num_bytes]
-            try:
-                return field_bytes.rstrip(b'\x00').decode('ascii')
-            except UnicodeDecodeError:
-                return field_bytes.hex()
+        With NumPy the file is checksummed in one batch pass over a strided
+        view of its records (separators skipped, CRC field masked in place).
         
-        else:
-            # Extract numeric value
-            if start_bit % 8 == 0 and bits % 8 == 0:
-                value = self._extract_bytes(record_bytes, start_bit // 8, bits // 8)
-            else:
-                value = self._extract_bits(record_bytes, start_bit, bits)
+        Returns:
+            One {"record", "stored", "computed"} dict per record whose CRC
+            doesn't match, in file order
             
-            # Handle signed integers - מעודכן
-            if field_type == "int8" and value >= (1 << (bits - 1)):
-                value = value - (1 << bits)  # Two's complement
-            
-            # Handle enums - מעודכן לפורמט חדש
-            if field.get("type") == "enum":
-                values = field.get("values", [])
-                if values and isinstance(value, int) and 0 <= value < len(values):
-                    return values[value]  # החזר את הערך במיקום המתאים
-                else:
-                    return f"unknown_{value}"
-            
-            return value
-    def _extract_bytes(self, data: bytes, start_byte: int, num_bytes: int) -> int:
-        """Extract byte-aligned integer"""
-        field_bytes = data[start_byte:start_byte + num_bytes]
-        
-        value = 0
-        if self.endianness == 'little':
-            for i, byte in enumerate(field_bytes):
-                value |= byte << (i * 8)
-        else:  # big endian
-            for i, byte in enumerate(field_bytes):
-                value |= byte << ((num_bytes - 1 - i) * 8)
+        Raises:
+            ValueError: If the schema has no crc32c field
+        """
+        crc = CrcField.from_processor(self.processor)
+        if crc is None:
+            raise ValueError(f"Schema '{self.schema_name}' has no crc32c field")
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
         
-        return value
-
-    def _extract_bits(self, data: bytes, start_bit: int, num_bits: int) -> int:
-        """Extract bit-aligned integer"""
-        value = 0
+        record_size_with_separator = self.record_size + 1  # +1 for newline
+        file_size = os.path.getsize(file_path)
+        if file_size % record_size_with_separator != 0:
+            self.logger.warning(
+                f"{file_path}: file size not exact multiple of record+separator size, "
+                f"verifying the first {file_size // record_size_with_separator:,} complete records"
+            )
         
-        for bit_offset in range(num_bits):
-            bit_pos = start_bit + bit_offset
-            byte_pos = bit_pos // 8
-            
-            if byte_pos >= len(data):
-                break
-            
-            if self.endianness == 'little':
-                bit_in_byte = bit_pos % 8
-                bit_value = (data[byte_pos] >> bit_in_byte) & 1
-                value |= bit_value << bit_offset
-            else:  # big endian
-                bit_in_byte = 7 - (bit_pos % 8)
-                bit_value = (data[byte_pos] >> bit_in_byte) & 1
-                value |= bit_value << (num_bits - 1 - bit_offset)
+        if HAS_NUMPY:
+            data = np.fromfile(file_path, dtype=np.uint8)
+            num_records = len(data) // record_size_with_separator
+            records = data[:num_records * record_size_with_separator].reshape(
+                num_records, record_size_with_separator)[:, :self.record_size]
+            stored = self.layout.read_column(records, crc.name)
+            computed = crc.compute_batch(records)
+            return [
+                {"record": int(i), "stored": int(stored[i]), "computed": int(computed[i])}
+                for i in np.flatnonzero(stored != computed)
+            ]
         
-        return value
-
-    def read_all_records(self, file_path: str) -> List[Dict[str, Any]]:
-        """Read all records from file into memory"""
-        return list(self.read_file(file_path))
+        failures = []
+        with open(file_path, 'rb') as f:
+            record_num = 0
+            while True:
+                record_with_sep = f.read(record_size_with_separator)
+                if len(record_with_sep) != record_size_with_separator:
+                    break
+                record_bytes = record_with_sep[:self.record_size]
+                stored = self._parse_record(record_bytes)[crc.name]
+                stored &= (1 << crc.field["bits"]) - 1
+                computed = crc.compute(record_bytes)
+                if stored != computed:
+                    failures.append({"record": record_num, "stored": stored, "computed": computed})
+                record_num += 1
+        return failures
 
-    def convert_to_json(self, binary_file: str, json_file: str, format_type: str = "ndjson"):
-        """Convert binary file to JSON format"""
+    def convert_to_json(self, binary_file: str, json_file: str, format_type: str = "ndjson") -> int:
+        """Convert binary file to JSON format, returning the number of records converted"""
         records_converted = 0
         
         # with open(json_file, 'w') as f:
@@ -316,7 +252,7 @@ class BinaryRecordReader:
                 record_str_keys = {str(k): v for k, v in record.items()}
 
                 if format_type == "ndjson":
-                    json.dump(record_str_keys, f, indent=2)
+                    json.dump(record_str_keys, f, separators=(',', ':'))
                     f.write('\n')
                 elif format_type == "json":
                     if i > 0:
@@ -328,13 +264,14 @@ class BinaryRecordReader:
             if format_type == "json":
                 f.write("\n]")
 
-        print(f"Converted {records_converted:,} records from {binary_file} to {json_file}")
+        self.logger.info(f"Converted {records_converted:,} records from {binary_file} to {json_file}")
+        return records_converted
 
 def main():
     """Example usage"""
     if len(sys.argv) < 3:
-        print("Usage: python binary_reader.py <schema.json> <binary_file.bin> [output.json]")
-        print("Example: python binary_reader.py gpu_telemetry_schema.json data/telemetry_0001.bin output.json")
+        print("Usage: python -m telemetry_generator.binary_reader <schema.json> <binary_file.bin> [output.json]")
+        print("Example: python -m telemetry_generator.binary_reader gpu_telemetry_schema.json data/telemetry_0001.bin output.json")
         sys.exit(1)
     
     schema_file = sys.argv[1]
@@ -347,7 +284,8 @@ def main():
         
         if output_file:
             # Convert to JSON
-            reader.convert_to_json(binary_file, output_file, "ndjson")
+            records_converted = reader.convert_to_json(binary_file, output_file, "ndjson")
+            print(f"Converted {records_converted:,} records from {binary_file} to {output_file}")
         else:
             # Just display first few records
             print(f"\nFirst 5 records from {binary_file}:")
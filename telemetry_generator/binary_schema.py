@@ -3,9 +3,16 @@
 Binary schema processor with fixed bit positions 
 """
 
-from typing import Dict, Any, Optional
-import json
-import os
+from typing import Dict, Any, Optional, Union
+import copy
+
+from .schema_model import (
+    TelemetrySchema,
+    get_schema,
+    load_type_mapping,
+    map_type,
+    enum_from_info
+)
 
 # Check numpy availability
 try:
@@ -17,59 +24,35 @@ except ImportError:
 class BinarySchemaProcessor:
     """Binary schema processor with fixed bit positions"""
     
-    def __init__(self, schema: Dict[str, Any], types_file: Optional[str] = None):
+    def __init__(self, schema: Union[Dict[str, Any], TelemetrySchema], types_file: Optional[str] = None):
         """
         Initialize the binary schema processor
         
         Args:
-            schema: Schema dictionary containing field definitions
+            schema: Schema dictionary containing field definitions, or an
+                already parsed TelemetrySchema
             types_file: Optional path to external types mapping file
         """
-        self.schema = schema
-        self.schema_name = schema.get("schema_name", "unknown")
-        self.endianness = schema.get("endianness", "little")
-        self.total_bits = schema.get("total_bits", 0)
-        self.validation = schema.get("validation", {})
-        
-        # Load type mapping
-        self.type_mapping = self._load_type_mapping(types_file)
-        
-        # Parse schema fields
-        self.fields = []
-        self.fields_by_name = {}
-        
-        for field_name, field_info in schema.items():
-            if field_name in ["schema_name", "endianness", "total_bits", "validation"]:
-                continue
-                
-            # Parse bit position
-            pos_str = field_info.get("pos", "0-7")
-            start_bit, end_bit = map(int, pos_str.split("-"))
-            
-            # Map type according to mapping
-            original_type = field_info.get("type", "uint8")
-            mapped_type = self._map_type(original_type)
-            
-            field_data = {
-                "name": field_name,
-                "type": mapped_type,
-                "original_type": original_type,
-                "bits": field_info.get("bits", 8),
-                "start_bit": start_bit,
-                "end_bit": end_bit,
-                "desc": field_info.get("desc", ""),
-                "enum": self._process_enum(field_info),
-                "original_info": field_info
-            }
-            
-            self.fields.append(field_data)
-            self.fields_by_name[field_name] = field_data
-        
-        # Sort by bit position
-        self.fields.sort(key=lambda x: x["start_bit"])
-        
-        # Validate schema
-        self._validate_schema()
+        # Parsed and validated once per distinct schema content
+        self.model = get_schema(schema, types_file)
+        
+        self.schema = schema if isinstance(schema, dict) else self.model.to_dict()
+        self.schema_name = self.model.schema_name
+        self.endianness = self.model.endianness
+        self.total_bits = self.model.total_bits
+        self.validation = copy.deepcopy(dict(self.model.validation))
+        self.series = copy.deepcopy(dict(self.model.series))
+        self.device_pool = copy.deepcopy(dict(self.model.device_pool))
+        self.type_mapping = dict(self.model.type_mapping)
+        
+        # Mutable per-processor copies, sorted by bit position
+        self.fields = [field.to_dict() for field in self.model.fields]
+        self.fields_by_name = {field["name"]: field for field in self.fields}
+    
+    @classmethod
+    def from_file(cls, schema_file: str, types_file: Optional[str] = None) -> 'BinarySchemaProcessor':
+        """Create a processor from a schema file, reusing the cached model"""
+        return cls(get_schema(schema_file, types_file))
     
     def _load_type_mapping(self, types_file: Optional[str]) -> Dict[str, str]:
         """
@@ -81,25 +64,7 @@ class BinarySchemaProcessor:
         Returns:
             Dictionary mapping original types to target types
         """
-        if types_file and os.path.exists(types_file):
-            try:
-                with open(types_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load types file: {e}")
-        
-        # Default mapping
-        return {
-            "uint8": "np.uint8",
-            "int8": "np.int8",
-            "uint16": "np.uint16",
-            "uint32": "np.uint32",
-            "uint64": "np.uint64",
-            "int64": "np.int64",
-            "float32": "np.float32",
-            "bytes": "np.bytes_",
-            "enum": "np.uint8"  # Default for enums
-        }
+        return load_type_mapping(types_file)
     
     def _map_type(self, original_type: str) -> str:
         """
@@ -111,9 +76,7 @@ class BinarySchemaProcessor:
         Returns:
             Mapped type string
         """
-        if original_type == "enum":
-            return "np.uint8"  # enums are stored as uint8
-        return self.type_mapping.get(original_type, "np.uint8")
+        return map_type(original_type, self.type_mapping)
     
     def _process_enum(self, field_info: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -125,50 +88,7 @@ class BinarySchemaProcessor:
         Returns:
             Dictionary mapping enum indices to values
         """
-        if field_info.get("type") != "enum":
-            return {}
-        
-        values = field_info.get("values", [])
-        if not values:
-            return {}
-        
-        # Create numeric mapping to values
-        enum_map = {}
-        for i, value in enumerate(values):
-            enum_map[str(i)] = value
-        
-        return enum_map
-    
-    def _validate_schema(self):
-        """
-        Validate the new schema format
-        
-        Raises:
-            ValueError: If schema validation fails
-        """
-        if not self.fields:
-            raise ValueError("Schema contains no valid fields")
-        
-        # Check for bit overlaps
-        for i in range(len(self.fields) - 1):
-            current = self.fields[i]
-            next_field = self.fields[i + 1]
-            
-            if current["end_bit"] >= next_field["start_bit"]:
-                raise ValueError(
-                    f"Bit overlap between {current['name']} ({current['start_bit']}-{current['end_bit']}) "
-                    f"and {next_field['name']} ({next_field['start_bit']}-{next_field['end_bit']})"
-                )
-        
-        # Check total bits
-        if self.fields:
-            last_field = self.fields[-1]
-            actual_bits = last_field["end_bit"] + 1
-            
-            if self.total_bits > 0 and actual_bits > self.total_bits:
-                raise ValueError(
-                    f"Schema fields extend beyond total_bits ({self.total_bits}): actual bits used = {actual_bits}"
-                )
+        return enum_from_info(field_info)
     
     def get_numpy_type(self, type_str: str):
         """
@@ -0,0 +1,241 @@
+"""
+checksums.py
+CRC-32C (Castagnoli) checksums for the schema's crc32c validation field
+
+Single buffers use the hardware-accelerated `crc32c` or `google-crc32c`
+package when one is installed, else a slicing-by-8 table implementation.
+crc32c_batch() checksums many packed records at once with NumPy.
+Masked byte ranges (the CRC field itself) are read as zeros without
+copying the record.
+"""
+
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Reflected Castagnoli polynomial
+POLYNOMIAL = 0x82F63B78
+
+_MASK32 = 0xFFFFFFFF
+
+
+def _make_tables() -> Tuple[Tuple[int, ...], ...]:
+    """Slicing-by-8 tables: table k maps a byte followed by k zero bytes"""
+    table0 = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ (POLYNOMIAL if crc & 1 else 0)
+        table0.append(crc)
+    tables = [table0]
+    for _ in range(7):
+        previous = tables[-1]
+        tables.append([(value >> 8) ^ table0[value & 0xFF] for value in previous])
+    return tuple(tuple(table) for table in tables)
+
+
+_TABLES = _make_tables()
+
+_BLOCKS = struct.Struct('<II')
+
+
+def _extend_python(crc: int, data) -> int:
+    """Slicing-by-8 CRC-32C of data, continuing from crc"""
+    t0, t1, t2, t3, t4, t5, t6, t7 = _TABLES
+    data = memoryview(data).cast('B')
+    crc ^= _MASK32
+    blocks = len(data) - len(data) % 8
+    for low, high in _BLOCKS.iter_unpack(data[:blocks]):
+        low ^= crc
+        crc = (t7[low & 0xFF] ^ t6[(low >> 8) & 0xFF] ^ t5[(low >> 16) & 0xFF] ^ t4[low >> 24]
+               ^ t3[high & 0xFF] ^ t2[(high >> 8) & 0xFF] ^ t1[(high >> 16) & 0xFF] ^ t0[high >> 24])
+    for byte in data[blocks:]:
+        crc = t0[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ _MASK32
+
+
+try:
+    import crc32c as _crc32c_package
+
+    def _extend(crc: int, data) -> int:
+        return _crc32c_package.crc32c(data, crc)
+
+    BACKEND = "crc32c"
+except ImportError:
+    try:
+        import google_crc32c as _google_crc32c
+
+        if getattr(_google_crc32c, "implementation", "c") != "c":
+            raise ImportError("google-crc32c without its C extension")
+        _extend = _google_crc32c.extend
+        BACKEND = "google-crc32c"
+    except ImportError:
+        _extend = _extend_python
+        BACKEND = "python"
+
+
+@lru_cache(maxsize=32)
+def _zeros(length: int) -> bytes:
+    return bytes(length)
+
+
+def crc32c(data, crc: int = 0) -> int:
+    """
+    CRC-32C of a bytes-like object
+
+    Args:
+        data: Bytes to checksum
+        crc: CRC of the preceding data, to continue a checksum (0 to start)
+    """
+    return _extend(crc, data)
+
+
+def crc32c_masked(data, start: int = 0, end: Optional[int] = None,
+                  mask: Optional[Tuple[int, int]] = None) -> int:
+    """
+    CRC-32C of data[start:end] with the bytes of mask read as zeros
+
+    Args:
+        data: Bytes-like record (not copied)
+        start, end: Checksummed byte range (end defaults to len(data))
+        mask: Byte range [mask_start, mask_end) treated as zeros
+    """
+    view = memoryview(data).cast('B')
+    end = len(view) if end is None else min(end, len(view))
+    if mask is None or max(mask[0], start) >= min(mask[1], end):
+        return _extend(0, view[start:end])
+
+    mask_start, mask_end = max(mask[0], start), min(mask[1], end)
+    if _extend is _extend_python:
+        # One pass keeps the table loop on 8-byte blocks; records are small
+        record = b''.join((view[start:mask_start], _zeros(mask_end - mask_start), view[mask_end:end]))
+        return _extend_python(0, record)
+    crc = _extend(0, view[start:mask_start])
+    crc = _extend(crc, _zeros(mask_end - mask_start))
+    return _extend(crc, view[mask_end:end])
+
+
+@lru_cache(maxsize=1)
+def _numpy_tables():
+    return np.array(_TABLES, dtype=np.uint32)
+
+
+def crc32c_batch(records, start: int = 0, end: Optional[int] = None,
+                 mask: Optional[Tuple[int, int]] = None) -> 'np.ndarray':
+    """
+    CRC-32C of every row of a 2-D uint8 array
+
+    Rows are processed in lockstep, eight bytes per step (slicing-by-8 over
+    columns). Rows may be a strided view, e.g. the records of a file with
+    separators, and masked bytes are read as zeros: nothing is copied.
+
+    Args:
+        records: (num_records, record_size) uint8 array
+        start, end: Checksummed byte range of each record
+        mask: Byte range [mask_start, mask_end) treated as zeros
+
+    Returns:
+        uint32 array of num_records checksums
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("crc32c_batch requires numpy")
+    records = np.asarray(records)
+    if records.ndim != 2 or records.dtype != np.uint8:
+        raise ValueError("crc32c_batch expects a 2-D uint8 array")
+    end = records.shape[1] if end is None else min(end, records.shape[1])
+    masked = range(*mask) if mask else range(0)
+
+    # Row slices small enough for the per-step temporaries to stay in cache
+    crcs = np.empty(len(records), dtype=np.uint32)
+    for row in range(0, len(records), _BATCH_ROWS):
+        crcs[row:row + _BATCH_ROWS] = _crc32c_rows(records[row:row + _BATCH_ROWS], start, end, masked)
+    return crcs
+
+
+_BATCH_ROWS = 32768
+
+
+def _crc32c_rows(records, start: int, end: int, masked: range) -> 'np.ndarray':
+    tables = _numpy_tables()
+
+    def column(index):
+        return None if index in masked else records[:, index]
+
+    crc = np.full(len(records), _MASK32, dtype=np.uint32)
+    position = start
+    while end - position >= 8:
+        low = crc
+        for k in range(4):
+            byte = column(position + k)
+            if byte is not None:
+                low = low ^ (byte.astype(np.uint32) << np.uint32(8 * k))
+        crc = (tables[7][low & 0xFF] ^ tables[6][(low >> 8) & 0xFF]
+               ^ tables[5][(low >> 16) & 0xFF] ^ tables[4][low >> 24])
+        for k in range(4, 8):
+            byte = column(position + k)
+            if byte is not None:
+                # Zero bytes contribute tables[j][0] == 0
+                crc ^= tables[7 - k][byte]
+        position += 8
+
+    while position < end:
+        byte = column(position)
+        index = crc & 0xFF if byte is None else (crc ^ byte) & 0xFF
+        crc = tables[0][index] ^ (crc >> 8)
+        position += 1
+
+    return crc ^ np.uint32(_MASK32)
+
+
+@dataclass(frozen=True)
+class CrcField:
+    """A schema's crc32c field and the record bytes its checksum covers"""
+    name: str
+    field: Dict[str, Any]
+    start_byte: int
+    end_byte: int
+    mask: Tuple[int, int]
+
+    @classmethod
+    def from_processor(cls, processor) -> Optional['CrcField']:
+        """
+        CRC settings from the schema's validation block
+
+        Returns:
+            CrcField, or None if the schema has no CRC field
+        """
+        validation = getattr(processor, 'validation', None)
+        if not isinstance(validation, Mapping) or not isinstance(validation.get("crc32c"), Mapping):
+            return None
+        crc_config = validation["crc32c"]
+        name = crc_config.get("field")
+        if not name or name not in processor.fields_by_name:
+            return None
+
+        field = processor.fields_by_name[name]
+        range_bits = crc_config.get("range_bits", "0-319")
+        start_bit, end_bit = map(int, range_bits.split("-"))
+        # The CRC field's bytes are zeroed while checksumming
+        mask = (field["start_bit"] // 8, (field["end_bit"] + 7) // 8)
+        return cls(name, field, start_bit // 8, (end_bit + 7) // 8, mask)
+
+    @property
+    def value_mask(self) -> int:
+        """Stored CRCs are truncated to the field width"""
+        return (1 << min(self.field["bits"], 32)) - 1
+
+    def compute(self, record) -> int:
+        """CRC of one packed record"""
+        return crc32c_masked(record, self.start_byte, self.end_byte, self.mask) & self.value_mask
+
+    def compute_batch(self, records) -> 'np.ndarray':
+        """CRCs of a (num_records, record_size) uint8 array, as uint64"""
+        crcs = crc32c_batch(records, self.start_byte, self.end_byte, self.mask).astype(np.uint64)
+        return crcs & np.uint64(self.value_mask)
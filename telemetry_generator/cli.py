@@ -11,9 +11,22 @@ from typing import Optional, Dict, Any
 
 from .telemetry_generator import EnhancedTelemetryGeneratorPro, OutputFormat, RecordType, BinarySchemaProcessor
 from .rolling_writer import RollingFileWriter
+from .gpu_batch_generator import GPUBatchGenerator
 from .rate_control import RateLimiter
 from .load_profiles import LOAD_PROFILES, LoadProfile
 from .fault_injector import FaultType
+from .formats.leb128_stream import DEFAULT_MAX_RECORD_SIZE, LEB128StreamDecoder, max_leb128_record_size
+from .schema_model import load_schema
+from .converter import TelemetryConverter, FORMATS
+from .binary_faults import BinaryFaultConfig, BinaryFaultInjector
+from .fault_log import FaultLogWriter, to_jsonable
+from .verifier import BinaryFileVerifier, CHECKS
+from .instrumentation import Instrumentation, PER_RECORD_SAMPLE_EVERY, format_ns, null_stage
+from .metrics_exporter import GenerationMetrics, MetricsExporter
+from .benchmarks import BenchmarkSuite, DEFAULT_ROUNDS, write_report
+from .bench_history import (
+    BenchmarkHistory, CORRECTIONS, DEFAULT_HISTORY, METHODS, compare_runs, load_run, setting_differences
+)
 
 # Configure logging
 logging.basicConfig(
@@ -200,11 +213,22 @@ def cli():
               help='Predefined fault injection profile')
 @click.option('--save-fault-report', type=click.Path(),
               help='Path to save fault injection report')
+@click.option('--fault-log/--no-fault-log', default=True,
+              help='Stream every injected fault to a .faults.ndjson file next to each data file (default: on)')
+@click.option('--instrument', is_flag=True,
+              help='Time each pipeline stage; prints a periodic stats line and saves a JSON stage report')
+@click.option('--instrument-report', type=click.Path(),
+              help='Path of the stage report (default: <out-dir>/<prefix>_instrumentation.json)')
+@click.option('--metrics-port', type=click.IntRange(0, 65535),
+              help='Serve Prometheus metrics at http://<metrics-host>:PORT/metrics while generating')
+@click.option('--metrics-host', default='127.0.0.1',
+              help='Interface for --metrics-port (default: 127.0.0.1)')
 def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed, 
             load_profile, compress, batch_size, prefix, workers, quiet, 
             verbose, gpu, record_type_ratio, measurement_name,
             # NEW: Fault injection parameters
-            enable_faults, fault_rate, fault_types, fault_config, fault_profile, save_fault_report):
+            enable_faults, fault_rate, fault_types, fault_config, fault_profile, save_fault_report,
+            fault_log, instrument, instrument_report, metrics_port, metrics_host):
     """Generate telemetry data with binary schema format and optional fault injection"""
 
     # Set logging level
@@ -358,6 +382,8 @@ def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed,
     # Initialize resources
     writer = None
     rate_limiter = None
+    metrics_exporter = None
+    run_metrics = None
     
     # Calculate total records and estimate storage
     total_records = rate * duration
@@ -412,8 +438,26 @@ def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed,
             width=0
         )
     
-    # Storage for fault details
-    all_fault_details = []
+    # Fault ground truth is streamed next to the data files, not kept in memory
+    fault_log_writer = None
+    
+    # Stage timings: per batch here, sampled per record inside the fault injector
+    instrumentation = Instrumentation() if instrument else None
+    stage = instrumentation.stage if instrumentation else null_stage
+    write_stage = 'compression' if compress else 'write'
+    if instrumentation:
+        injector = getattr(generator, 'fault_injector', None)
+        for method in ('inject_faults', 'inject_faults_in_place'):
+            instrumentation.wrap(injector, method, 'fault_injection', sample_every=PER_RECORD_SAMPLE_EVERY)
+        instrumentation.wrap(injector, 'inject_faults_batch', 'fault_injection')
+    
+    # Accelerated batches bypass per-record generation (and its record objects) entirely
+    batch_generator = None
+    if gpu and generator.gpu_generator:
+        batch_generator = GPUBatchGenerator(
+            processor, generator.gpu_generator,
+            fault_injector=getattr(generator, 'fault_injector', None)
+        )
     
     # Generation loop with proper cleanup
     try:
@@ -423,20 +467,39 @@ def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed,
             max_size_bytes=max_file_size,
             format=format,
             compress=compress,
-            logger=logger
+            logger=logger,
+            instrumentation=instrumentation
         )
+        if enable_faults and fault_log:
+            fault_log_writer = FaultLogWriter(compress=compress, logger=logger).attach(writer)
         
         # Initialize rate limiter
         rate_limiter = RateLimiter(rate, batch_size=batch_size, logger=logger)
         rate_limiter.start()
         
+        # Live metrics for scrapers
+        if metrics_port is not None:
+            injector = getattr(generator, 'fault_injector', None)
+            run_metrics = GenerationMetrics(
+                rate,
+                writer=writer,
+                rate_limiter=rate_limiter,
+                fault_statistics=getattr(injector, 'statistics', None),
+                fault_log_writer=fault_log_writer,
+                instrumentation=instrumentation
+            )
+            metrics_exporter = MetricsExporter(run_metrics.collect, port=metrics_port, host=metrics_host,
+                                               logger=logger)
+            metrics_exporter.start()
+            if not quiet:
+                click.echo(f"Metrics: {metrics_exporter.url}")
+        
         with progress_bar:
             while records_generated < total_records:
                 batch_records = min(batch_size, total_records - records_generated)
                 
-                # Generate batch of records with fault injection
-                if gpu and generator.gpu_generator:
-                    # Use GPU acceleration if available (currently doesn't support fault injection)
+                if batch_generator:
+                    # Accelerated batches stay columnar from generation to the writer
                     rand_val = random.random()
                     cumulative = 0
                     record_type = RecordType.UPDATE
@@ -446,73 +509,108 @@ def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed,
                             record_type = rtype
                             break
                     
-                    records = generator.generate_batch_gpu_accelerated(
-                        batch_records, record_type
-                    )
-                    fault_details = []  # GPU mode doesn't support faults yet
-                else:
-                    # Regular generation with fault support
-                    records = []
-                    batch_fault_details = []
-                    
-                    for _ in range(batch_records):
-                        rand_val = random.random()
-                        cumulative = 0
-                        record_type = RecordType.UPDATE
-                        for rtype, ratio in ratio_dict.items():
-                            cumulative += ratio
-                            if rand_val <= cumulative:
-                                record_type = rtype
-                                break
-                        
-                        record, fault_details = generator.generate_enhanced_record(
-                            record_type=record_type
+                    with stage('generation', items=batch_records):
+                        batch = batch_generator.generate_telemetry_batch(
+                            batch_records, record_type, next_seq_id=records_generated + 1
                         )
-                        records.append(record)
+                    batch_faults = batch_generator.last_fault_log
+                    if batch_faults is not None:
+                        faulty_records += len(batch_faults.faulty_rows)
+                    
+                    if run_metrics:
+                        run_metrics.batch_in_flight = len(batch)
+                    
+                    # The batch's faults go to the fault log of the file it ends in
+                    bytes_before = writer.total_bytes_written
+                    with stage(write_stage, items=len(batch)) as timer:
+                        writer.write_batch(batch, generator)
+                        if fault_log_writer and batch_faults is not None and len(batch_faults):
+                            fault_log_writer.write_fault_log(batch_faults, batch.sequence_ids)
+                        timer.nbytes = writer.total_bytes_written - bytes_before
+                else:
+                    # Generate batch of records with fault injection
+                    with stage('generation', items=batch_records):
+                        records = []
+                        record_faults = []
                         
-                        if fault_details:
-                            batch_fault_details.extend(fault_details)
-                            faulty_records += 1
+                        for _ in range(batch_records):
+                            rand_val = random.random()
+                            cumulative = 0
+                            record_type = RecordType.UPDATE
+                            for rtype, ratio in ratio_dict.items():
+                                cumulative += ratio
+                                if rand_val <= cumulative:
+                                    record_type = rtype
+                                    break
+                            
+                            record, fault_details = generator.generate_enhanced_record(
+                                record_type=record_type
+                            )
+                            records.append(record)
+                            record_faults.append(fault_details)
+                            
+                            if fault_details:
+                                faulty_records += 1
                     
-                    all_fault_details.extend(batch_fault_details)
-                
-                # Write records
-                for record in records:
-                    writer.write_record(record, generator)
+                    if run_metrics:
+                        run_metrics.batch_in_flight = len(records)
+                    
+                    # Write records; each record's faults go to the fault log of the file it lands in
+                    with stage('serialization', items=len(records)):
+                        serialized = [writer.serialize_record(record, generator) for record in records]
+                    
+                    bytes_before = writer.total_bytes_written
+                    with stage(write_stage, items=len(records)) as timer:
+                        for data, record, fault_details in zip(serialized, records, record_faults):
+                            writer.write_serialized(data)
+                            if fault_log_writer and fault_details:
+                                fault_log_writer.write(fault_details, seq_no=record.sequence_id)
+                        timer.nbytes = writer.total_bytes_written - bytes_before
                 
                 records_generated += batch_records
                 progress_bar.update(batch_records)
+                if run_metrics:
+                    run_metrics.records_generated = records_generated
+                    run_metrics.faulty_records = faulty_records
+                    run_metrics.batch_in_flight = 0
                 
                 # Rate limiting
-                rate_limiter.wait_if_needed(batch_records)
+                with stage('rate_limit_sleep', items=batch_records):
+                    rate_limiter.wait_if_needed(batch_records)
                 
                 # Progress reporting
                 current_time = time.time()
-                if verbose and (current_time - last_report_time) >= report_interval:
-                    elapsed = current_time - start_time
-                    actual_rate = records_generated / elapsed if elapsed > 0 else 0
+                if (verbose or instrumentation) and (current_time - last_report_time) >= report_interval:
+                    if instrumentation:
+                        logger.info(f"Stages: {instrumentation.stats_line()}")
                     
-                    logger.debug(
-                        f"Progress: {records_generated:,}/{total_records:,} records "
-                        f"({100*records_generated/total_records:.1f}%)"
-                    )
-                    logger.debug(
-                        f"Rate: target={rate:,}, actual={actual_rate:.1f} rec/s"
-                    )
-                    logger.debug(
-                        f"Files: {writer.file_count}, Size: {writer.total_bytes_written:,} bytes "
-                        f"({writer.total_bytes_written/(1024*1024):.1f} MB)"
-                    )
-                    
-                    if enable_faults:
-                        fault_rate_actual = (faulty_records / records_generated * 100) if records_generated > 0 else 0
-                        logger.debug(f"Faults: {faulty_records:,} records ({fault_rate_actual:.1f}%)")
+                    if verbose:
+                        elapsed = current_time - start_time
+                        actual_rate = records_generated / elapsed if elapsed > 0 else 0
+                        
+                        logger.debug(
+                            f"Progress: {records_generated:,}/{total_records:,} records "
+                            f"({100*records_generated/total_records:.1f}%)"
+                        )
+                        logger.debug(
+                            f"Rate: target={rate:,}, actual={actual_rate:.1f} rec/s"
+                        )
+                        logger.debug(
+                            f"Files: {writer.file_count}, Size: {writer.total_bytes_written:,} bytes "
+                            f"({writer.total_bytes_written/(1024*1024):.1f} MB)"
+                        )
+                        
+                        if enable_faults:
+                            fault_rate_actual = (faulty_records / records_generated * 100) if records_generated > 0 else 0
+                            logger.debug(f"Faults: {faulty_records:,} records ({fault_rate_actual:.1f}%)")
                     
                     last_report_time = current_time
         
         # Flush writer before cleanup
         if writer:
             writer.flush()
+        if fault_log_writer:
+            fault_log_writer.flush()
             
     except KeyboardInterrupt:
         logger.warning("Generation interrupted by user")
@@ -532,6 +630,12 @@ def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed,
             except Exception as e:
                 logger.error(f"Error closing writer: {e}")
         
+        if fault_log_writer:
+            fault_log_writer.close()
+        
+        if metrics_exporter:
+            metrics_exporter.stop()
+        
         if rate_limiter and hasattr(rate_limiter, 'stop'):
             try:
                 rate_limiter.stop()
@@ -589,11 +693,46 @@ def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed,
         if fault_statistics['affected_fields']:
             affected_count = len(fault_statistics['affected_fields'])
             click.echo(f"Fields affected:    {affected_count}")
+        
+        if fault_log_writer:
+            click.echo(f"Fault log:          {fault_log_writer.faults_written:,} faults in "
+                       f"{len(fault_log_writer.files)} file(s)")
+    
+    # Stage timing summary
+    stage_report = instrumentation.snapshot() if instrumentation else None
+    if stage_report:
+        click.echo("\nSTAGE TIMINGS")
+        click.echo("-" * 30)
+        for name, stats in stage_report['stages'].items():
+            latency = stats['latency_ns']
+            click.echo(f"{name + ':':<19} {stats['share_percent']:5.1f}% of wall time, "
+                       f"{format_ns(stats['ns_per_item'] or 0)}/item, "
+                       f"p50 {format_ns(latency['p50'])}, p99 {format_ns(latency['p99'])}")
+        click.echo(f"Limiting stage:     {stage_report['limiting_stage']}")
     
     click.echo("="*70)
     
+    # Save stage report
+    if stage_report:
+        report_path = instrument_report or os.path.join(out_dir, f"{prefix}_instrumentation.json")
+        stage_report.update({
+            "records_generated": records_generated,
+            "target_rate": rate,
+            "actual_rate": actual_rate,
+            "batch_size": batch_size,
+            "format": format,
+            "compress": compress,
+            "fault_sample_every": PER_RECORD_SAMPLE_EVERY
+        })
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(stage_report, f, indent=2)
+            click.echo(f"Stage report saved: {report_path}")
+        except OSError as e:
+            logger.error(f"Failed to save stage report: {e}")
+    
     # Save fault report if requested
-    if save_fault_report and enable_faults and all_fault_details:
+    if save_fault_report and enable_faults:
         try:
             fault_report = {
                 "generation_summary": {
@@ -604,11 +743,13 @@ def generate(schema, types, rate, duration, out_dir, rotate_size, format, seed,
                     "generation_time_seconds": elapsed_time
                 },
                 "fault_statistics": fault_statistics,
-                "fault_details": all_fault_details[:1000]  # Limit to first 1000 faults to avoid huge files
+                # Per-fault ground truth lives in the streamed fault logs
+                "fault_log_files": fault_log_writer.files if fault_log_writer else [],
+                "faults_logged": fault_log_writer.faults_written if fault_log_writer else 0
             }
             
             with open(save_fault_report, 'w', encoding='utf-8') as f:
-                json.dump({str(k): str(v) for k, v in fault_report.items()}, f, indent=2, ensure_ascii=False)
+                json.dump(to_jsonable(fault_report), f, indent=2, ensure_ascii=False)
             
             click.echo(f"Fault report saved: {save_fault_report}")
             logger.info(f"Detailed fault report written to {save_fault_report}")
@@ -1080,5 +1221,379 @@ def info(schema_file):
     else:
         click.echo("Unknown or invalid schema format.")
 
+@cli.command()
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', type=click.Path(),
+              help='Write decoded records to an NDJSON file instead of stdout')
+@click.option('--limit', '-n', type=int,
+              help='Stop after this many records (default: all)')
+@click.option('--chunk-size', default='1MB',
+              help='Read chunk size for compressed or unmapped files (default: 1MB)')
+@click.option('--no-mmap', is_flag=True,
+              help='Read uncompressed files in chunks instead of memory-mapping them')
+@click.option('--skip-errors', is_flag=True,
+              help='Skip malformed records instead of stopping at the first one')
+@click.option('--schema', '-s', type=click.Path(exists=True),
+              help='Schema of the records: longer records are treated as corrupt (default limit: 1MB)')
+@click.option('--count-only', is_flag=True,
+              help='Only count records, do not output them')
+def read_leb128(files, output, limit, chunk_size, no_mmap, skip_errors, schema, count_only):
+    """Stream-decode LEB128 telemetry files (.leb128 / .leb128.gz) to NDJSON"""
+    
+    try:
+        chunk_bytes = parse_size(chunk_size)
+        max_record_size = max_leb128_record_size(load_schema(schema)) if schema else DEFAULT_MAX_RECORD_SIZE
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    
+    out = None
+    total_records = 0
+    total_bytes = 0
+    total_errors = 0
+    start_time = time.time()
+    
+    try:
+        if output and not count_only:
+            out = open(output, 'w', encoding='utf-8')
+        
+        for file_path in files:
+            if limit is not None and total_records >= limit:
+                break
+            
+            decoder = LEB128StreamDecoder(
+                file_path,
+                chunk_size=chunk_bytes,
+                use_mmap=not no_mmap,
+                skip_errors=skip_errors,
+                max_record_size=max_record_size
+            )
+            
+            try:
+                for record in decoder:
+                    if not count_only:
+                        line = json.dumps(record, separators=(',', ':'))
+                        if out:
+                            out.write(line + '\n')
+                        else:
+                            click.echo(line)
+                    
+                    total_records += 1
+                    if limit is not None and total_records >= limit:
+                        break
+            except ValueError as e:
+                raise click.ClickException(f"{file_path}: {e}")
+            finally:
+                stats = decoder.get_stats()
+                total_bytes += stats['bytes_consumed']
+                total_errors += stats['errors']
+            
+            if stats['errors']:
+                click.echo(f"{file_path}: skipped {stats['errors']} malformed records "
+                           f"({stats['skipped_bytes']:,} bytes)", err=True)
+    finally:
+        if out:
+            out.close()
+    
+    elapsed = time.time() - start_time
+    rate = total_bytes / elapsed / (1024 * 1024) if elapsed > 0 else 0
+    click.echo(f"Decoded {total_records:,} records ({total_bytes:,} bytes) from {len(files)} file(s) "
+               f"in {elapsed:.2f}s ({rate:.1f} MB/s)", err=True)
+    if total_errors:
+        click.echo(f"Malformed records skipped: {total_errors:,}", err=True)
+    if output and not count_only:
+        click.echo(f"Records written to {output}", err=True)
+
+@cli.command()
+@click.argument('inputs', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--to', 'output_format', required=True, type=click.Choice(FORMATS),
+              help='Output format')
+@click.option('--from', 'input_format', type=click.Choice(FORMATS),
+              help='Input format (default: detect from file extension)')
+@click.option('--schema', '-s', type=click.Path(exists=True),
+              help='Binary schema file (required to read or write binary)')
+@click.option('--out-dir', '-o', default='converted/', type=click.Path(),
+              help='Output directory (default: converted/)')
+@click.option('--prefix', default='converted',
+              help='Output filename prefix (default: converted)')
+@click.option('--rotate-size', default='512MB',
+              help='File rotation size (default: 512MB)')
+@click.option('--compress', is_flag=True,
+              help='Compress output files with gzip')
+@click.option('--workers', '-w', default=4, type=int,
+              help='Worker processes, 1 converts in-process (default: 4)')
+@click.option('--chunk-size', default='16MB',
+              help='Input bytes per work unit (default: 16MB)')
+@click.option('--measurement-name', default='telemetry',
+              help='InfluxDB measurement name (default: telemetry)')
+def convert(inputs, output_format, input_format, schema, out_dir, prefix, rotate_size,
+            compress, workers, chunk_size, measurement_name):
+    """Convert telemetry files between output formats"""
+    
+    try:
+        converter = TelemetryConverter(
+            output_format=output_format,
+            out_dir=out_dir,
+            prefix=prefix,
+            schema_file=schema,
+            compress=compress,
+            max_size_bytes=parse_size(rotate_size),
+            workers=workers,
+            chunk_size=parse_size(chunk_size),
+            measurement=measurement_name
+        )
+        stats = converter.convert(list(inputs), input_format=input_format)
+    except (ValueError, OSError) as e:
+        raise click.ClickException(str(e))
+    
+    rate = stats['input_bytes'] / stats['elapsed_seconds'] / (1024 * 1024) if stats['elapsed_seconds'] > 0 else 0
+    click.echo(f"Converted {stats['records_converted']:,} records from {stats['input_files']} file(s) "
+               f"to {stats['output_files']} {output_format} file(s) in {stats['elapsed_seconds']:.2f}s "
+               f"({stats['records_per_second']:,.0f} records/s, {rate:.1f} MB/s)")
+    if stats['records_failed']:
+        click.echo(f"Records that could not be converted: {stats['records_failed']:,}", err=True)
+    click.echo(f"Output written to {out_dir}")
+
+@cli.command()
+@click.argument('input_file', type=click.Path(exists=True, dir_okay=False))
+@click.argument('output_file', type=click.Path(dir_okay=False))
+@click.option('--schema', '-s', required=True, type=click.Path(exists=True),
+              help='Binary schema the input was packed with')
+@click.option('--types', '-t', type=click.Path(exists=True),
+              help='Types mapping file')
+@click.option('--index', type=click.Path(dir_okay=False),
+              help='Ground-truth index file (default: OUTPUT_FILE.faults.ndjson)')
+@click.option('--fault-config', type=click.Path(exists=True),
+              help='JSON file with binary fault rates (overrides the rate options)')
+@click.option('--bit-flip-rate', default=0.0, type=float, help='Records with flipped bits')
+@click.option('--max-bit-flips', default=1, type=int, help='Maximum bits flipped per record (default: 1)')
+@click.option('--truncation-rate', default=0.0, type=float, help='Torn (truncated) records')
+@click.option('--crc-rate', default=0.0, type=float, help='Records with a corrupted crc32c field')
+@click.option('--drop-rate', default=0.0, type=float, help='Records dropped from the stream')
+@click.option('--duplicate-rate', default=0.0, type=float, help='Records written twice')
+@click.option('--reorder-rate', default=0.0, type=float, help='Records moved later in the stream')
+@click.option('--reorder-window', default=4, type=int, help='Maximum positions a record moves (default: 4)')
+@click.option('--batch-size', '-b', default=4096, type=int, help='Records per batch (default: 4096)')
+@click.option('--seed', type=int, help='Random seed for reproducible faults')
+def inject_binary_faults(input_file, output_file, schema, types, index, fault_config, bit_flip_rate,
+                         max_bit_flips, truncation_rate, crc_rate, drop_rate, duplicate_rate,
+                         reorder_rate, reorder_window, batch_size, seed):
+    """Apply wire-level faults to a packed binary file and write a ground-truth index"""
+    
+    try:
+        if fault_config:
+            with open(fault_config, 'r', encoding='utf-8') as f:
+                config = BinaryFaultConfig.from_dict(json.load(f))
+        else:
+            config = BinaryFaultConfig(
+                bit_flip_rate=bit_flip_rate,
+                max_bit_flips=max_bit_flips,
+                truncation_rate=truncation_rate,
+                crc_corruption_rate=crc_rate,
+                drop_rate=drop_rate,
+                duplicate_rate=duplicate_rate,
+                reorder_rate=reorder_rate,
+                reorder_window=reorder_window
+            )
+        
+        injector = BinaryFaultInjector.from_schema_file(schema, types, config=config, seed=seed, logger=logger)
+        stats = injector.process_file(input_file, output_file, index, batch_size)
+    except (ValueError, OSError) as e:
+        raise click.ClickException(str(e))
+    
+    click.echo(f"Processed {stats['records_in']:,} records -> {stats['records_out']:,} written "
+               f"({stats['faulty_records']:,} faulty)")
+    for fault in ('bit_flip', 'truncation', 'crc_corruption', 'drop', 'duplicate', 'reorder'):
+        if stats[fault]:
+            click.echo(f"  {fault}: {stats[fault]:,}")
+    click.echo(f"Output written to {stats['output_file']}")
+    click.echo(f"Ground truth written to {stats['index_file']}")
+
+@cli.command()
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--schema', '-s', required=True, type=click.Path(exists=True),
+              help='Binary schema the files were packed with')
+@click.option('--types', '-t', type=click.Path(exists=True),
+              help='Types mapping file')
+@click.option('--workers', '-w', default=4, type=int,
+              help='Worker processes, 1 verifies in-process (default: 4)')
+@click.option('--block-size', default='64MB',
+              help='Bytes per work unit (default: 64MB)')
+@click.option('--max-errors', default=10, type=int,
+              help='Error examples listed per file (default: 10)')
+@click.option('--report', type=click.Path(dir_okay=False),
+              help='Write the full report as JSON')
+def verify(files, schema, types, workers, block_size, max_errors, report):
+    """Check CRC32C, framing and seq_no/timestamp ordering of binary files"""
+    
+    try:
+        verifier = BinaryFileVerifier(
+            schema,
+            types,
+            workers=workers,
+            block_size=parse_size(block_size),
+            max_errors=max_errors,
+            logger=logger
+        )
+        result = verifier.verify(list(files))
+    except (ValueError, OSError) as e:
+        raise click.ClickException(str(e))
+    
+    for summary in result['files']:
+        status = "OK" if summary['ok'] else "FAILED"
+        click.echo(f"{summary['file']}: {status} - {summary['records']:,} records")
+        for check in CHECKS:
+            if summary[f'{check}_errors']:
+                click.echo(f"  {check} errors: {summary[f'{check}_errors']:,}")
+        if summary['seq_gaps']:
+            click.echo(f"  seq_no gaps: {summary['seq_gaps']:,}")
+        if summary['trailing_bytes']:
+            click.echo(f"  trailing partial record: {summary['trailing_bytes']} bytes")
+        for error in summary['errors']:
+            details = ', '.join(f"{key}={value}" for key, value in error.items() if key not in ('record', 'check'))
+            click.echo(f"    record {error['record']}: {error['check']}" + (f" ({details})" if details else ""))
+    
+    if not result['crc_checked']:
+        click.echo("Schema has no crc32c field - CRCs not checked", err=True)
+    rate = result['bytes_per_second'] / (1024 * 1024)
+    click.echo(f"Verified {result['records']:,} records ({result['bytes']:,} bytes) in {len(result['files'])} file(s) "
+               f"in {result['elapsed_seconds']:.2f}s ({result['records_per_second']:,.0f} records/s, {rate:.1f} MB/s)")
+    
+    if report:
+        with open(report, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        click.echo(f"Report written to {report}")
+    
+    if not result['ok']:
+        click.echo(f"{result['error_count']:,} errors found", err=True)
+        sys.exit(1)
+
+@cli.group()
+def bench():
+    """Run pipeline benchmarks and compare runs for regressions"""
+
+
+@bench.command('run')
+@click.argument('patterns', nargs=-1)
+@click.option('--schema', '-s', type=click.Path(exists=True),
+              help='Binary schema to benchmark (default: built-in schema)')
+@click.option('--types', '-t', type=click.Path(exists=True),
+              help='Custom types file')
+@click.option('--records', '-n', default=10_000, type=int, help='Records per round')
+@click.option('--rounds', default=DEFAULT_ROUNDS, type=int, show_default=True, help='Timed rounds per benchmark')
+@click.option('--warmup', default=1, type=int, help='Untimed rounds before timing')
+@click.option('--history', default=DEFAULT_HISTORY, type=click.Path(), show_default=True,
+              help='History file results are saved to')
+@click.option('--label', help='Label stored with the run')
+@click.option('--output', '-o', type=click.Path(), help='Also write the report to this JSON file')
+@click.option('--save/--no-save', default=True, help='Save the run to the history')
+def bench_run(patterns, schema, types, records, rounds, warmup, history, label, output, save):
+    """Run benchmarks matching PATTERNS (names or groups, default: all)"""
+    
+    try:
+        suite = BenchmarkSuite(schema, types, records=records, rounds=rounds, warmup=warmup, logger=logger)
+        report = suite.run(list(patterns) or None)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    
+    for result in report['results']:
+        click.echo(f"{result['name']:<28} median {result['median_ns'] / 1e6:10.3f} ms "
+                   f"({result['items_per_second']:,.0f} items/s)")
+    for name, reason in report['skipped'].items():
+        click.echo(f"{name:<28} skipped: {reason}")
+    
+    if output:
+        write_report(report, output)
+        click.echo(f"Report written to {output}")
+    if save:
+        run_id = BenchmarkHistory(history).save(report, label)
+        click.echo(f"Saved as run {run_id} in {history}")
+
+
+@bench.command('list')
+@click.option('--history', default=DEFAULT_HISTORY, type=click.Path(), show_default=True,
+              help='History file')
+def bench_list(history):
+    """List stored benchmark runs"""
+    
+    try:
+        runs = BenchmarkHistory(history).runs()
+    except (ValueError, OSError) as e:
+        raise click.ClickException(str(e))
+    if not runs:
+        click.echo(f"No runs in {history}")
+        return
+    
+    for run in runs:
+        revision = (run['environment'].get('git_revision') or '-')[:10]
+        label = f"  {run['label']}" if run.get('label') else ""
+        click.echo(f"{run['run_id']:>4}  {run['created']}  {revision:<10}  "
+                   f"{len(run['results'])} benchmarks{label}")
+
+
+@bench.command('compare')
+@click.argument('baseline', default='previous')
+@click.argument('candidate', default='latest')
+@click.option('--history', default=DEFAULT_HISTORY, type=click.Path(), show_default=True,
+              help='History file runs are looked up in')
+@click.option('--method', type=click.Choice(METHODS), default='mannwhitney', show_default=True,
+              help='Significance test')
+@click.option('--alpha', default=0.05, type=float, show_default=True,
+              help='Significance level (for the whole comparison unless --correction none)')
+@click.option('--threshold', default=0.05, type=float, show_default=True,
+              help='Smallest relative change of the median flagged (0.05 = 5%)')
+@click.option('--correction', type=click.Choice(CORRECTIONS), default='holm', show_default=True,
+              help='Multiple-comparison correction across benchmarks')
+@click.option('--fail-on-regression', is_flag=True, help='Exit with status 1 if any benchmark regressed')
+@click.option('--output', '-o', type=click.Path(), help='Write the comparison to this JSON file')
+def bench_compare(baseline, candidate, history, method, alpha, threshold, correction, fail_on_regression,
+                  output):
+    """Compare two runs (run ids, 'latest'/'previous' or report files)"""
+    
+    store = BenchmarkHistory(history)
+    try:
+        base_run = load_run(baseline, store)
+        cand_run = load_run(candidate, store)
+        comparisons = compare_runs(base_run, cand_run, method=method, alpha=alpha, threshold=threshold,
+                                   correction=correction)
+    except (ValueError, OSError) as e:
+        raise click.ClickException(str(e))
+    
+    for difference in setting_differences(base_run, cand_run):
+        click.echo(f"Warning: runs differ in {difference}", err=True)
+    
+    for comparison in comparisons:
+        if comparison.p_adjusted is not None:
+            stat = f"p={comparison.p_adjusted:.4f}"
+        else:
+            stat = f"CI [{comparison.ci_low:+.1%}, {comparison.ci_high:+.1%}]"
+        click.echo(f"{comparison.name:<28} {comparison.baseline_median_ns / 1e6:10.3f} -> "
+                   f"{comparison.candidate_median_ns / 1e6:10.3f} ms  {comparison.change:+7.1%}  "
+                   f"{stat:<24} {comparison.verdict}")
+    
+    regressions = [comparison for comparison in comparisons if comparison.is_regression]
+    improvements = sum(1 for comparison in comparisons if comparison.verdict == "improvement")
+    inconclusive = sum(1 for comparison in comparisons if comparison.is_inconclusive)
+    summary = f"{len(comparisons)} benchmarks compared: {len(regressions)} regressions, {improvements} improvements"
+    if inconclusive:
+        summary += f", {inconclusive} inconclusive (too few rounds)"
+    click.echo(summary)
+    
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({
+                "baseline": baseline,
+                "candidate": candidate,
+                "method": method,
+                "alpha": alpha,
+                "threshold": threshold,
+                "correction": correction,
+                "comparisons": [comparison.to_dict() for comparison in comparisons]
+            }, f, indent=2)
+        click.echo(f"Comparison written to {output}")
+    
+    if regressions and fail_on_regression:
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     cli()
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+column_samplers.py
+Per-field column samplers for batch generation
+
+Every schema field gets its own vectorized draw with the field's dtype and
+range, following the per-record rules of RecordDataPopulator: declared
+distributions first, then the named fields of the telemetry schema
+(scope-dependent block/thread IDs, value_bits by value_type, ...), then
+generic draws by field type.
+"""
+
+import string
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+from .distributions import value_kind
+from .value_pools import EnumTable, get_device_pool
+
+# Column draw: (row count, columns drawn so far) -> column
+ColumnDraw = Callable[[int, Dict[str, Any]], 'np.ndarray']
+
+_INT64_MAX = (1 << 63) - 1
+
+_ID_CHARS = np.frombuffer((string.ascii_letters + string.digits).encode('ascii'), dtype=np.uint8)
+
+# Common units: 0=none, 1=celsius, 2=watts, 3=percent, 4=MHz, etc.
+_COMMON_UNITS = np.array([0, 1, 2, 3, 4, 5, 10, 11, 12], dtype=np.int64)
+
+# block_id / thread_id outside their scope
+NOT_APPLICABLE = 0xFFFF
+
+# Fields computed from other columns, drawn after all others
+_DEPENDENT_FIELDS = ("block_id", "thread_id", "value_bits")
+
+# Filled in by sample() rather than drawn
+_SEQUENCE_FIELDS = ("seq_no", "timestamp_ns")
+
+
+class ColumnSamplerTable:
+    """
+    Column draw per schema field
+
+    sample() returns one numpy column per field, in schema order: int64 for
+    integer fields (uint64 when the field's range exceeds int64), float64
+    for floats, str arrays for bytes and codes for enums.
+    """
+
+    def __init__(
+        self,
+        schema_processor,
+        accelerator=None,
+        samplers: Optional[Mapping[str, Any]] = None,
+        device_pool=None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            schema_processor: Schema processor instance
+            accelerator: GPUAcceleratedGenerator for plain numeric columns
+                (default: host NumPy draws)
+            samplers: Field name -> FieldSampler of declared distributions
+            device_pool: Device fleet for device_id_ascii (default: shared pool)
+            seed: Seed of the host generator
+
+        Raises:
+            ValueError: If a schema field has no name or bit width
+        """
+        self.rng = np.random.default_rng(seed)
+        self.accelerator = accelerator
+        self.samplers = dict(samplers or {})
+        self.device_pool = device_pool
+
+        self.field_names = []
+        self._draws: Dict[str, ColumnDraw] = {}
+        self._dependent: Dict[str, ColumnDraw] = {}
+        try:
+            for field in schema_processor.fields:
+                name = field["name"]
+                self.field_names.append(name)
+                if name in _SEQUENCE_FIELDS and name not in self.samplers:
+                    continue
+                draws = self._dependent if name in _DEPENDENT_FIELDS else self._draws
+                draws[name] = self._compile(field)
+        except (AttributeError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid schema field structure: {e}")
+
+        # seq_no and timestamp_ns are always part of a batch
+        self._column_names = self.field_names + [name for name in _SEQUENCE_FIELDS
+                                                 if name not in self.field_names]
+
+    def sample(self, count: int, seq_start: int = 1, timestamp_start: int = 0) -> Dict[str, Any]:
+        """
+        Draw `count` rows
+
+        Args:
+            count: Number of rows
+            seq_start: seq_no of the first row
+            timestamp_start: timestamp_ns of the first row
+
+        Returns:
+            Field name -> column, in schema order (seq_no and timestamp_ns
+            last if the schema has no such fields)
+        """
+        columns = {
+            "seq_no": np.arange(seq_start, seq_start + count, dtype=np.int64),
+            "timestamp_ns": np.arange(timestamp_start, timestamp_start + count, dtype=np.int64)
+        }
+        for name, draw in self._draws.items():
+            columns[name] = draw(count, columns)
+        for name, draw in self._dependent.items():
+            columns[name] = draw(count, columns)
+        return {name: columns[name] for name in self._column_names}
+
+    def _compile(self, field: Mapping[str, Any]) -> ColumnDraw:
+        """Column draw of one field"""
+        name = field["name"]
+        bits = field["bits"]
+        kind = value_kind(field)
+        rng = self.rng
+
+        if name in self.samplers:
+            sampler = self.samplers[name]
+            return lambda count, columns: sampler.sample(count)
+
+        if name == "schema_version":
+            return lambda count, columns: np.ones(count, dtype=np.int64)
+
+        if name == "crc32c":
+            # Calculated during packing
+            return lambda count, columns: np.zeros(count, dtype=np.int64)
+
+        if name == "device_id_ascii" and kind == "bytes":
+            pool = self.device_pool or get_device_pool()
+            return lambda count, columns: pool.draw_batch(count, rng)
+
+        if name == "gpu_index":
+            # GPU index 0-7 typically, up to 255 at most
+            return self._integers(0, min(7, (1 << bits) - 1))
+
+        if name == "block_id":
+            # 0xFFFF if not relevant, otherwise 0-2047
+            return self._scoped(min(2047, (1 << bits) - 2), lambda scope: scope >= 1)
+
+        if name == "thread_id":
+            # 0xFFFF if not relevant, otherwise 0-1023
+            return self._scoped(min(1023, (1 << bits) - 2), lambda scope: scope == 2)
+
+        if name == "metric_id":
+            # Higher weight for common metrics (1-100)
+            return lambda count, columns: np.where(
+                rng.random(count) < 0.7,
+                rng.integers(1, 100, count, endpoint=True),
+                rng.integers(101, 1000, count, endpoint=True)
+            )
+
+        if name == "unit_code":
+            return lambda count, columns: np.where(
+                rng.random(count) < 0.8,
+                rng.choice(_COMMON_UNITS, count),
+                rng.integers(0, 255, count, endpoint=True)
+            )
+
+        if name == "scale_1eN":
+            # Most values close to 0
+            return lambda count, columns: np.where(
+                rng.random(count) < 0.6,
+                rng.integers(-3, 3, count, endpoint=True),
+                rng.integers(-9, 9, count, endpoint=True)
+            )
+
+        if name == "value_bits":
+            return self._value_bits
+
+        if kind == "enum":
+            table = EnumTable.for_field(field)
+            if table is None:
+                return lambda count, columns: np.zeros(count, dtype=np.int64)
+            return lambda count, columns: table.draw_batch(count, rng)
+
+        if kind == "bytes":
+            length = bits // 8
+            return lambda count, columns: _random_ascii(rng, count, length)
+
+        if kind == "float":
+            return self._floats(-1000.0, 1000.0)
+
+        if kind == "signed":
+            low = -(1 << (bits - 1))
+            return self._integers(low, -low - 1)
+
+        return self._integers(0, (1 << bits) - 1)
+
+    def _integers(self, low: int, high: int) -> ColumnDraw:
+        """Uniform integers in [low, high]"""
+        accelerator = self.accelerator
+        if accelerator is not None:
+            return lambda count, columns: np.asarray(accelerator.generate_column_int(count, low, high))
+        dtype = np.uint64 if high > _INT64_MAX else np.int64
+        rng = self.rng
+        return lambda count, columns: rng.integers(low, high, count, dtype=dtype, endpoint=True)
+
+    def _floats(self, low: float, high: float) -> ColumnDraw:
+        """Uniform floats in [low, high)"""
+        accelerator = self.accelerator
+        if accelerator is not None:
+            return lambda count, columns: np.asarray(accelerator.generate_column_float(count, low, high))
+        rng = self.rng
+        return lambda count, columns: rng.uniform(low, high, count)
+
+    def _scoped(self, high: int, in_scope: Callable) -> ColumnDraw:
+        """IDs in [0, high] where the row's scope applies, else NOT_APPLICABLE"""
+        rng = self.rng
+
+        def draw(count, columns):
+            # enum: 0=DEVICE, 1=BLOCK, 2=THREAD
+            scope = np.asarray(columns.get("scope", np.zeros(count, dtype=np.int64)))
+            return np.where(in_scope(scope), rng.integers(0, high, count, endpoint=True), NOT_APPLICABLE)
+        return draw
+
+    def _value_bits(self, count: int, columns: Dict[str, Any]) -> 'np.ndarray':
+        """value_bits per row's value_type (0=FLOAT32, 1=UINT64, 2=INT64, 3=BOOL)"""
+        rng = self.rng
+        value_type = np.asarray(columns.get("value_type", np.zeros(count, dtype=np.int64)))
+        floats = rng.uniform(-1000, 1000, count).astype(np.float32).view(np.uint32)
+        unsigned = rng.integers(0, (1 << 48) - 1, count, endpoint=True)
+        # Two's complement for negative values
+        signed = rng.integers(-(1 << 47), (1 << 47) - 1, count, endpoint=True).astype(np.uint64)
+        flags = rng.random(count) > 0.5
+        return np.select(
+            [value_type == 0, value_type == 1, value_type == 2, value_type == 3],
+            [floats.astype(np.uint64), unsigned.astype(np.uint64), signed, flags.astype(np.uint64)],
+            np.uint64(0)
+        )
+
+
+def _random_ascii(rng, count: int, length: int) -> 'np.ndarray':
+    """str column of random letters and digits"""
+    if length == 0:
+        return np.full(count, "", dtype="U1")
+    codes = _ID_CHARS[rng.integers(0, len(_ID_CHARS), (count, length))]
+    return codes.view(f"S{length}").ravel().astype(f"U{length}")
@@ -0,0 +1,550 @@
+"""
+converter.py
+Reads every format the generator produces and re-encodes it into any other,
+splitting large inputs into chunks that are converted in a process pool
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .types_and_enums import RecordType, TelemetryRecord
+from .rolling_writer import RollingFileWriter
+from .formats.leb128_stream import DEFAULT_MAX_RECORD_SIZE, LEB128StreamDecoder, max_leb128_record_size
+from .schema_model import load_schema
+
+FORMATS = ('binary', 'leb128', 'ndjson', 'json', 'influx')
+
+# Extensions written by RollingFileWriter
+FORMAT_EXTENSIONS = {
+    '.bin': 'binary',
+    '.leb128': 'leb128',
+    '.ndjson': 'ndjson',
+    '.json': 'json',
+    '.txt': 'influx'
+}
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Records per batch when the parent has to decode (leb128, json)
+RECORD_BATCH_SIZE = 20000
+
+
+def detect_format(path: str) -> Tuple[str, bool]:
+    """
+    Detect format and compression from a file name
+
+    Args:
+        path: Input file path
+
+    Returns:
+        Tuple of (format, is_gzip_compressed)
+
+    Raises:
+        ValueError: If the extension is not one the generator writes
+    """
+    name = os.path.basename(path).lower()
+    compressed = name.endswith('.gz')
+    if compressed:
+        name = name[:-3]
+
+    ext = os.path.splitext(name)[1]
+    if ext not in FORMAT_EXTENSIONS:
+        raise ValueError(
+            f"Cannot detect format of '{path}' - expected one of "
+            f"{', '.join(sorted(FORMAT_EXTENSIONS))} (optionally .gz)"
+        )
+    return FORMAT_EXTENSIONS[ext], compressed
+
+
+# -------------------------
+# Record parsing
+# -------------------------
+
+def normalize_record(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a JSON/NDJSON record to {type, timestamp, seq_id, data}
+
+    Accepts both the RollingFileWriter layout (seq_id) and the
+    OutputFormatter layout (sequence_id, schema).
+    """
+    seq_id = obj.get('seq_id', obj.get('sequence_id', 0))
+    return {
+        'type': obj.get('type', RecordType.UPDATE.value),
+        'timestamp': obj.get('timestamp', 0),
+        'seq_id': seq_id,
+        'data': obj.get('data', {})
+    }
+
+
+def _parse_influx_scalar(raw: str) -> Any:
+    """Parse an unquoted InfluxDB field value"""
+    if raw.endswith('i'):
+        return int(raw[:-1])
+    if raw == 'true':
+        return True
+    if raw == 'false':
+        return False
+    return float(raw)
+
+
+def parse_influx_line(line: str) -> Dict[str, Any]:
+    """
+    Parse one InfluxDB line protocol record written by the generator
+
+    Args:
+        line: Line of the form 'measurement,tags fields timestamp'
+
+    Returns:
+        Normalized record dict
+
+    Raises:
+        ValueError: If the line is malformed
+    """
+    line = line.rstrip('\n')
+    try:
+        head_end = line.index(' ')
+        head = line[:head_end].split(',')
+        tags = dict(part.split('=', 1) for part in head[1:])
+
+        rest = line[head_end + 1:]
+        n = len(rest)
+        pos = 0
+        fields = {}
+        timestamp = 0
+
+        while pos < n:
+            eq = rest.index('=', pos)
+            key = rest[pos:eq]
+            pos = eq + 1
+
+            if rest[pos] == '"':
+                # Quoted string, the formatter escapes embedded quotes
+                chars = []
+                pos += 1
+                while rest[pos] != '"':
+                    if rest[pos] == '\\' and pos + 1 < n and rest[pos + 1] == '"':
+                        chars.append('"')
+                        pos += 2
+                    else:
+                        chars.append(rest[pos])
+                        pos += 1
+                fields[key] = ''.join(chars)
+                pos += 1
+            else:
+                end = pos
+                while end < n and rest[end] not in ', ':
+                    end += 1
+                fields[key] = _parse_influx_scalar(rest[pos:end])
+                pos = end
+
+            if pos < n and rest[pos] == ',':
+                pos += 1
+            elif pos < n and rest[pos] == ' ':
+                timestamp = int(rest[pos + 1:])
+                break
+    except (ValueError, IndexError) as e:
+        raise ValueError(f"Malformed InfluxDB line: {line[:80]!r}: {e}")
+
+    return {
+        'type': tags.get('type', RecordType.UPDATE.value),
+        'timestamp': timestamp,
+        'seq_id': int(tags.get('seq_id', 0)),
+        'data': fields
+    }
+
+
+def _binary_record_to_dict(values: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Wrap decoded binary fields; binary records carry no header of their own"""
+    timestamp = values.get('timestamp_ns')
+    seq_id = values.get('seq_no')
+    return {
+        'type': RecordType.UPDATE.value,
+        'timestamp': timestamp if isinstance(timestamp, int) else 0,
+        'seq_id': seq_id if isinstance(seq_id, int) else index,
+        'data': values
+    }
+
+
+def to_telemetry_record(record: Dict[str, Any]) -> TelemetryRecord:
+    """Convert a normalized record dict to a TelemetryRecord"""
+    return TelemetryRecord(
+        record_type=RecordType(record['type']),
+        timestamp=int(record['timestamp']),
+        sequence_id=int(record['seq_id']),
+        data=record['data']
+    )
+
+
+# -------------------------
+# Chunked conversion tasks
+# -------------------------
+
+@dataclass
+class ConversionChunk:
+    """A unit of work: a byte range of a file, raw bytes, or decoded records"""
+    index: int
+    path: Optional[str] = None
+    start: int = 0
+    end: int = 0
+    data: Optional[bytes] = None
+    records: Optional[List[Dict[str, Any]]] = None
+
+
+@dataclass(frozen=True)
+class ConversionConfig:
+    """Settings every worker needs to decode and re-encode a chunk"""
+    input_format: str
+    output_format: str
+    schema_file: Optional[str] = None
+    measurement: str = "telemetry"
+
+
+class _SchemaCodec:
+    """Adapter exposing the generator serialization hooks RollingFileWriter looks for"""
+
+    def __init__(self, schema_file: Optional[str], measurement: str):
+        self.measurement = measurement
+        self.packer = None
+        self.formatter = None
+
+        if schema_file:
+            from .binary_schema import BinarySchemaProcessor
+            from .binary_packer import BinaryRecordPacker
+            from .formatters import OutputFormatter
+
+            processor = BinarySchemaProcessor.from_file(schema_file)
+            self.packer = BinaryRecordPacker(processor)
+            self.formatter = OutputFormatter(processor.schema_name)
+
+    def pack_record_enhanced(self, record: TelemetryRecord) -> bytes:
+        return self.packer.pack_record(record.data)
+
+    def format_influx_line(self, record: TelemetryRecord) -> str:
+        return self.formatter.format_influx_line(record, self.measurement)
+
+
+class _ChunkConverter:
+    """Per-process decoder/encoder state, built once per worker"""
+
+    def __init__(self, config: ConversionConfig):
+        self.config = config
+        self.reader = None
+        self.codec = _SchemaCodec(config.schema_file, config.measurement)
+
+        if config.input_format == 'binary':
+            from .binary_reader import BinaryRecordReader
+            self.reader = BinaryRecordReader(config.schema_file)
+
+        # Serializer only - files are opened lazily on first write, which never happens here
+        self.serializer = RollingFileWriter(
+            base_path='convert',
+            max_size_bytes=1,
+            format=config.output_format,
+            logger=logging.getLogger(__name__ + '.worker')
+        )
+        self.generator = self.codec if self.codec.packer else None
+
+    def iter_records(self, chunk: ConversionChunk) -> Iterator[Dict[str, Any]]:
+        """Decode the records of one chunk"""
+        if chunk.records is not None:
+            yield from chunk.records
+            return
+
+        data = chunk.data
+        if data is None:
+            with open(chunk.path, 'rb') as f:
+                f.seek(chunk.start)
+                data = f.read(chunk.end - chunk.start)
+
+        fmt = self.config.input_format
+        if fmt == 'binary':
+            record_size = self.reader.record_size
+            stride = record_size + 1
+            base_index = chunk.start // stride
+            for i, offset in enumerate(range(0, len(data) - record_size + 1, stride)):
+                values = self.reader._parse_record(data[offset:offset + record_size])
+                yield _binary_record_to_dict(values, base_index + i)
+
+        elif fmt == 'ndjson':
+            for line in data.decode('utf-8').splitlines():
+                if line.strip():
+                    yield normalize_record(json.loads(line))
+
+        elif fmt == 'influx':
+            for line in data.decode('utf-8').splitlines():
+                if line.strip():
+                    yield parse_influx_line(line)
+
+        else:
+            raise ValueError(f"Format '{fmt}' must be decoded before chunking")
+
+    def convert(self, chunk: ConversionChunk) -> Tuple[int, List[Union[str, bytes]], int]:
+        """Convert one chunk, returning (chunk index, serialized records, failed records)"""
+        output = []
+        failed = 0
+        for record in self.iter_records(chunk):
+            try:
+                output.append(self.serializer.serialize_record(to_telemetry_record(record), self.generator))
+            except (ValueError, TypeError, KeyError, RuntimeError):
+                failed += 1
+        return chunk.index, output, failed
+
+
+_WORKER_CONVERTERS: Dict[ConversionConfig, _ChunkConverter] = {}
+
+
+def _convert_chunk(config: ConversionConfig, chunk: ConversionChunk):
+    """Process pool entry point"""
+    converter = _WORKER_CONVERTERS.get(config)
+    if converter is None:
+        converter = _WORKER_CONVERTERS[config] = _ChunkConverter(config)
+    return converter.convert(chunk)
+
+
+def _resolve_format(path: str, input_format: Optional[str] = None) -> Tuple[str, bool]:
+    """Format (explicit, else from the extension) and gzip flag of an input file"""
+    if input_format is None:
+        return detect_format(path)
+    return input_format, path.lower().endswith('.gz')
+
+
+def _iter_chunks(path: str, fmt: str, compressed: bool, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 schema_file: Optional[str] = None) -> Iterator[ConversionChunk]:
+    """Split one input file into conversion chunks of about chunk_size input bytes"""
+    index = 0
+
+    if fmt in ('leb128', 'json'):
+        # No cheap record boundaries: decode here, convert in workers
+        if fmt == 'leb128':
+            max_record_size = DEFAULT_MAX_RECORD_SIZE
+            if schema_file:
+                max_record_size = max_leb128_record_size(load_schema(schema_file))
+            records = iter(LEB128StreamDecoder(path, chunk_size=chunk_size, max_record_size=max_record_size))
+        else:
+            opener = gzip.open if compressed else open
+            with opener(path, 'rt', encoding='utf-8') as f:
+                records = iter([normalize_record(obj) for obj in json.load(f)])
+
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= RECORD_BATCH_SIZE:
+                yield ConversionChunk(index=index, records=batch)
+                index += 1
+                batch = []
+        if batch:
+            yield ConversionChunk(index=index, records=batch)
+        return
+
+    if fmt == 'binary':
+        stride = load_schema(schema_file).record_size + 1  # +1 for newline separator
+        chunk_bytes = max(stride, chunk_size // stride * stride)
+    else:
+        stride = None
+        chunk_bytes = chunk_size
+
+    if compressed:
+        # Stream-decompress and cut at record boundaries
+        carry = b''
+        offset = 0
+        with gzip.open(path, 'rb') as f:
+            while True:
+                block = f.read(chunk_bytes)
+                data = carry + block
+                if not block:
+                    if data:
+                        yield ConversionChunk(index=index, start=offset, data=data)
+                    return
+
+                if stride:
+                    cut = len(data) // stride * stride
+                else:
+                    cut = data.rfind(b'\n') + 1
+                if cut <= 0:
+                    carry = data
+                    continue
+
+                yield ConversionChunk(index=index, start=offset, data=data[:cut])
+                index += 1
+                offset += cut
+                carry = data[cut:]
+
+    # Uncompressed: hand out byte ranges, workers read them directly
+    size = os.path.getsize(path)
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            elif not stride:
+                f.seek(end)
+                end += len(f.readline())
+
+            yield ConversionChunk(index=index, path=path, start=start, end=end)
+            index += 1
+            start = end
+
+
+class TelemetryConverter:
+    """Converts generated telemetry files between output formats"""
+
+    def __init__(
+        self,
+        output_format: str,
+        out_dir: str = 'converted/',
+        prefix: str = 'converted',
+        schema_file: Optional[str] = None,
+        compress: bool = False,
+        max_size_bytes: int = 512 * 1024 * 1024,
+        workers: int = 4,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        measurement: str = "telemetry",
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the converter
+
+        Args:
+            output_format: Target format ('binary', 'leb128', 'ndjson', 'json', 'influx')
+            out_dir: Output directory
+            prefix: Output filename prefix
+            schema_file: Binary schema, required when reading or writing binary
+            compress: Gzip the output files
+            max_size_bytes: Rotate output files at this size
+            workers: Worker processes (1 converts in-process)
+            chunk_size: Approximate input bytes per work unit
+            measurement: InfluxDB measurement name for influx output
+            logger: Optional logger instance
+        """
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {FORMATS}")
+        if output_format == 'binary' and not schema_file:
+            raise ValueError("Binary output requires a schema file")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+        self.output_format = output_format
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.schema_file = schema_file
+        self.compress = compress
+        self.max_size_bytes = max_size_bytes
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.measurement = measurement
+        self.logger = logger or logging.getLogger(__name__)
+
+    def convert(self, input_paths: List[str], input_format: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Convert input files into rotated output files
+
+        Args:
+            input_paths: Files to convert, in order
+            input_format: Input format (default: detect from each extension)
+
+        Returns:
+            Conversion statistics
+        """
+        start_time = time.time()
+        records_converted = 0
+        records_failed = 0
+        bytes_read = 0
+
+        writer = RollingFileWriter(
+            base_path=os.path.join(self.out_dir, self.prefix),
+            max_size_bytes=self.max_size_bytes,
+            format=self.output_format,
+            compress=self.compress,
+            logger=self.logger
+        )
+
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+        try:
+            for path in input_paths:
+                fmt, compressed = _resolve_format(path, input_format)
+                if fmt not in FORMATS:
+                    raise ValueError(f"Unknown input format '{fmt}'")
+                if fmt == 'binary' and not self.schema_file:
+                    raise ValueError(f"Binary input '{path}' requires a schema file")
+
+                config = ConversionConfig(
+                    input_format=fmt,
+                    output_format=self.output_format,
+                    schema_file=self.schema_file,
+                    measurement=self.measurement
+                )
+                bytes_read += os.path.getsize(path)
+                self.logger.info(f"Converting {path} ({fmt}{', gzip' if compressed else ''}) -> {self.output_format}")
+
+                for _, serialized, failed in self._run(executor, config, _iter_chunks(path, fmt, compressed, self.chunk_size, self.schema_file)):
+                    for item in serialized:
+                        writer.write_serialized(item)
+                    records_converted += len(serialized)
+                    records_failed += failed
+        finally:
+            if executor:
+                executor.shutdown()
+            writer.close()
+
+        elapsed = time.time() - start_time
+        if records_failed:
+            self.logger.warning(f"{records_failed:,} records could not be converted")
+
+        return {
+            'records_converted': records_converted,
+            'records_failed': records_failed,
+            'input_files': len(input_paths),
+            'input_bytes': bytes_read,
+            'output_files': writer.file_count,
+            'output_bytes': writer.total_bytes_written,
+            'elapsed_seconds': elapsed,
+            'records_per_second': records_converted / elapsed if elapsed > 0 else 0
+        }
+
+    def _run(self, executor, config: ConversionConfig, chunks: Iterator[ConversionChunk]):
+        """Convert chunks in order, keeping a bounded number in flight"""
+        if executor is None:
+            for chunk in chunks:
+                yield _convert_chunk(config, chunk)
+            return
+
+        max_in_flight = self.workers * 2
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_convert_chunk, config, chunk))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def read_records(path: str, input_format: Optional[str] = None,
+                 schema_file: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate normalized records of any generated file
+
+    Args:
+        path: Input file (optionally .gz)
+        input_format: Input format (default: detect from extension)
+        schema_file: Binary schema, required for binary input
+
+    Yields:
+        Dicts with type, timestamp, seq_id and data
+    """
+    fmt, compressed = _resolve_format(path, input_format)
+
+    chunk_converter = _ChunkConverter(ConversionConfig(input_format=fmt, output_format='ndjson',
+                                                       schema_file=schema_file))
+    for chunk in _iter_chunks(path, fmt, compressed, schema_file=schema_file):
+        yield from chunk_converter.iter_records(chunk)
@@ -11,6 +11,9 @@ from typing import Dict, Any, Union, List, Optional, Tuple
 
 from .types_and_enums import RecordType
 from .fault_injector import FaultInjector
+from .value_pools import DeviceIdPool, EnumTable, get_device_pool
+from .distributions import compile_samplers
+from .timeseries import TimeSeriesEngine
 
 class FieldDataGenerator:
     """Data generator for various field types"""
@@ -18,13 +21,12 @@ class FieldDataGenerator:
     @staticmethod
     def generate_device_id() -> str:
         """
-        Generate 8-character ASCII device ID
+        Draw an 8-character ASCII device ID from the shared device pool
         
         Returns:
             String containing uppercase letters and digits
         """
-        chars = string.ascii_uppercase + string.digits
-        return ''.join(random.choices(chars, k=8))
+        return get_device_pool().draw()
     
     @staticmethod
     def generate_enum_value(field: Dict[str, Any]) -> Union[int, str]:
@@ -37,13 +39,10 @@ class FieldDataGenerator:
         Returns:
             Integer index of selected enum value
         """
-        enum_map = field.get("enum", {})
-        if enum_map:
-            # In new format, keys are numbers as strings and values are strings
-            keys = list(enum_map.keys())
-            if keys:
-                key = random.choice(keys)
-                return int(key)  # Return the index as number
+        # In new format, keys are numbers as strings and values are strings
+        table = EnumTable.for_field(field)
+        if table:
+            return table.draw()  # Return the index as number
         return 0
     
     @staticmethod
@@ -176,6 +175,15 @@ class FaultAwareRecordDataPopulator:
         self.field_generator = FieldDataGenerator()
         self.fault_injector = fault_injector
         
+        # Device fleet, when the schema has a "device_pool" block
+        self.device_pool = DeviceIdPool.from_schema(schema_processor)
+        
+        # Samplers of fields with a "distribution" block
+        self.samplers = compile_samplers(schema_processor)
+        
+        # Stateful fleet series, when the schema has a "series" block
+        self.series_engine = TimeSeriesEngine.from_schema(schema_processor)
+        
         # Performance caches
         self._field_types_cache = {}
         self._enum_fields_cache = {}
@@ -202,18 +210,21 @@ class FaultAwareRecordDataPopulator:
         
         # Inject faults if required
         if inject_faults and self.fault_injector:
-            # Create temporary record for fault injection
-            from .types_and_enums import TelemetryRecord, RecordType
-            temp_record = TelemetryRecord(
-                record_type=RecordType.UPDATE,
-                timestamp=timestamp,
-                sequence_id=seq_id,
-                data=data
-            )
-            
-            # Apply fault injection
-            faulty_record, fault_details = self.fault_injector.inject_faults(temp_record)
-            data = faulty_record.data
+            if isinstance(self.fault_injector, FaultInjector):
+                # data is freshly generated and owned here - inject in place, no record or copy needed
+                fault_details = self.fault_injector.inject_faults_in_place(data, seq_id, timestamp)
+            else:
+                # Other injectors only implement the record-based API
+                from .types_and_enums import TelemetryRecord, RecordType
+                temp_record = TelemetryRecord(
+                    record_type=RecordType.UPDATE,
+                    timestamp=timestamp,
+                    sequence_id=seq_id,
+                    data=data
+                )
+                
+                faulty_record, fault_details = self.fault_injector.inject_faults(temp_record)
+                data = faulty_record.data
         
         return data, fault_details
     
@@ -229,16 +240,26 @@ class FaultAwareRecordDataPopulator:
             Dictionary containing field data
         """
         data = {}
+        series_values = self.series_engine.next_values() if self.series_engine else {}
         
         for field in self.schema_processor.fields:
             field_name = field["name"]
             
             # Handle specific fields from the new schema
-            if field_name == "schema_version":
+            if field_name in series_values:
+                data[field_name] = series_values[field_name]
+                
+            elif field_name in self.samplers:
+                data[field_name] = self.samplers[field_name].next_value()
+                
+            elif field_name == "schema_version":
                 data[field_name] = 1  # Version 1
                 
             elif field_name == "device_id_ascii":
-                data[field_name] = self.field_generator.generate_device_id()
+                if self.device_pool:
+                    data[field_name] = self.device_pool.draw()
+                else:
+                    data[field_name] = self.field_generator.generate_device_id()
                 
             elif field_name == "gpu_index":
                 # GPU index 0-7 typically, up to 255 at most
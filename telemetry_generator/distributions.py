@@ -0,0 +1,348 @@
+"""
+distributions.py
+Per-field value distributions declared in the schema and compiled to
+vectorized numpy samplers
+
+A field opts in with a "distribution" block:
+
+    "metric_id": {"type": "uint16", "bits": 16, "pos": "...",
+                  "distribution": {"type": "zipf", "a": 1.2, "min": 1, "max": 1000}}
+
+Supported types:
+    uniform      {"min", "max"}                  inclusive for integer fields
+    normal       {"mean", "std", "min"?, "max"?}  rounded for integer fields
+    zipf         {"a", "min"?, "max"?}            value min + k with weight 1 / (k + 1) ** a
+    categorical  {"values", "weights"?}           enum fields accept labels or codes
+    constant     {"value"}
+    sequence     {"start"?, "step"?}              wraps around the field range
+"""
+
+import math
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+DISTRIBUTION_TYPES = ("uniform", "normal", "zipf", "categorical", "constant", "sequence")
+
+# Distributions usable for bytes (string) fields
+_BYTES_TYPES = ("categorical", "constant")
+
+# Bounded Zipf draws use a cumulative table up to this many values
+_MAX_ZIPF_TABLE = 1 << 20
+
+_INT64_MAX = (1 << 63) - 1
+
+_UINT64_MASK = (1 << 64) - 1
+
+# Largest float64 below 2**63 (float(_INT64_MAX) rounds up and overflows int64)
+_FLOAT_INT64_MAX = 9223372036854774784.0
+
+# Values sampled at once for per-record access
+DEFAULT_BUFFER_SIZE = 256
+
+
+def value_kind(field_info: Mapping[str, Any]) -> str:
+    """
+    Value kind of a raw schema field
+
+    Returns:
+        One of 'enum', 'bytes', 'float', 'signed' or 'unsigned'
+    """
+    field_type = field_info.get("original_type", field_info.get("type", "uint8"))
+    if field_type == "enum":
+        return "enum"
+    if "bytes" in field_type:
+        return "bytes"
+    if "float" in field_type:
+        return "float"
+    if field_type.startswith("int"):
+        return "signed"
+    return "unsigned"
+
+
+def field_range(field_info: Mapping[str, Any]) -> Tuple[float, float]:
+    """Representable value range of a numeric field"""
+    kind = value_kind(field_info)
+    bits = field_info.get("bits", 8)
+    if kind == "float":
+        return -math.inf, math.inf
+    if kind == "signed":
+        return -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+    return 0, (1 << bits) - 1
+
+
+def _enum_labels(field_info: Mapping[str, Any]) -> Dict[str, int]:
+    """Enum label -> code of a raw or processed field"""
+    enum_map = field_info.get("enum")
+    if enum_map:
+        labels = {}
+        for key, label in enum_map.items():
+            labels.setdefault(label, int(key))
+        return labels
+    labels = {}
+    for code, label in enumerate(field_info.get("values", [])):
+        labels.setdefault(label, code)
+    return labels
+
+
+def validate_distribution(field_name: str, spec: Any, field_info: Mapping[str, Any]):
+    """
+    Check a field's distribution block
+
+    Raises:
+        ValueError: If the block is invalid
+    """
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"Field '{field_name}': distribution must be an object")
+    dist_type = spec.get("type")
+    if dist_type not in DISTRIBUTION_TYPES:
+        raise ValueError(f"Field '{field_name}': unknown distribution type {dist_type!r} "
+                         f"(expected one of {', '.join(DISTRIBUTION_TYPES)})")
+
+    kind = value_kind(field_info)
+    if kind == "bytes" and dist_type not in _BYTES_TYPES:
+        raise ValueError(f"Field '{field_name}': bytes fields support only categorical or constant distributions")
+
+    def require(*keys):
+        missing = [key for key in keys if key not in spec]
+        if missing:
+            raise ValueError(f"Field '{field_name}': {dist_type} distribution needs {', '.join(missing)}")
+
+    def check_range(name, *values):
+        """Integer fields only: values the packer could not store"""
+        if kind not in ("signed", "unsigned"):
+            return
+        low, high = field_range(field_info)
+        outside = [value for value in values if not low <= value <= high]
+        if outside:
+            raise ValueError(f"Field '{field_name}': {dist_type} {name} {', '.join(map(str, outside))} "
+                             f"outside the field range [{low}, {high}]")
+
+    if dist_type == "uniform":
+        require("min", "max")
+        if spec["min"] > spec["max"]:
+            raise ValueError(f"Field '{field_name}': uniform min is greater than max")
+        check_range("bounds", spec["min"], spec["max"])
+    elif dist_type == "normal":
+        require("mean", "std")
+        if spec["std"] < 0:
+            raise ValueError(f"Field '{field_name}': normal std must be non-negative")
+    elif dist_type == "zipf":
+        require("a")
+        if spec["a"] <= 0:
+            raise ValueError(f"Field '{field_name}': zipf exponent a must be positive")
+        bounds = [spec[key] for key in ("min", "max") if key in spec]
+        if len(bounds) == 2 and bounds[0] > bounds[1]:
+            raise ValueError(f"Field '{field_name}': zipf min is greater than max")
+        check_range("bounds", *bounds)
+    elif dist_type == "categorical":
+        require("values")
+        values = spec["values"]
+        if not values:
+            raise ValueError(f"Field '{field_name}': categorical distribution needs at least one value")
+        weights = spec.get("weights")
+        if weights is not None:
+            if len(weights) != len(values):
+                raise ValueError(f"Field '{field_name}': categorical weights and values differ in length")
+            if any(weight < 0 for weight in weights) or sum(weights) <= 0:
+                raise ValueError(f"Field '{field_name}': categorical weights must be non-negative with a positive sum")
+        if kind == "enum":
+            labels = _enum_labels(field_info)
+            unknown = [value for value in values if value not in labels and value not in labels.values()]
+            if unknown:
+                raise ValueError(f"Field '{field_name}': unknown enum values {unknown}")
+        check_range("values", *values)
+    elif dist_type == "constant":
+        require("value")
+        if kind == "enum":
+            labels = _enum_labels(field_info)
+            if spec["value"] not in labels and spec["value"] not in labels.values():
+                raise ValueError(f"Field '{field_name}': unknown enum value {spec['value']!r}")
+        check_range("value", spec["value"])
+    elif dist_type == "sequence":
+        if spec.get("step", 1) == 0:
+            raise ValueError(f"Field '{field_name}': sequence step must not be 0")
+
+
+class FieldSampler:
+    """
+    Vectorized sampler of one field's distribution
+
+    sample() returns a numpy column for batch generation; next_value()
+    serves single values from a buffered batch for per-record generation.
+    Integer values are clipped to the field's range.
+    """
+
+    def __init__(self, field_info: Mapping[str, Any], spec: Mapping[str, Any],
+                 seed: Optional[int] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            field_info: Processed schema field (name, type, bits, enum)
+            spec: The field's distribution block
+            seed: Seed when the block has none
+            buffer_size: Values sampled at once by next_value()
+
+        Raises:
+            ValueError: If the block is invalid
+        """
+        self.name = field_info.get("name", "")
+        validate_distribution(self.name, spec, field_info)
+
+        self.spec = dict(spec)
+        self.dist_type = spec["type"]
+        self.kind = value_kind(field_info)
+        self.low, self.high = field_range(field_info)
+        self.buffer_size = buffer_size
+        self._rng = np.random.default_rng(spec.get("seed", seed))
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffer_pos = 0
+
+        self._labels = _enum_labels(field_info) if self.kind == "enum" else {}
+        self._integer = self.kind in ("enum", "signed", "unsigned")
+        self._dtype = np.uint64 if self._integer and self.high > _INT64_MAX else np.int64
+        self._next_sequence = spec.get("start", 0)
+
+        compile_method = getattr(self, f"_compile_{self.dist_type}")
+        self._draw = compile_method()
+
+    def _finish(self, values):
+        """Clip and cast continuous draws to the field's value type"""
+        if not self._integer:
+            return values.astype(np.float64)
+        values = np.clip(np.rint(values), max(self.low, -_FLOAT_INT64_MAX), min(self.high, _FLOAT_INT64_MAX))
+        return values.astype(np.int64)
+
+    def _compile_uniform(self):
+        low, high = self.spec["min"], self.spec["max"]
+        if self._integer:
+            low, high = max(int(low), self.low), min(int(high), self.high)
+            dtype = self._dtype
+            return lambda count, rng: rng.integers(low, high, count, dtype=dtype, endpoint=True)
+        return lambda count, rng: rng.uniform(low, high, count)
+
+    def _compile_normal(self):
+        mean, std = self.spec["mean"], self.spec["std"]
+        low, high = self.spec.get("min", -math.inf), self.spec.get("max", math.inf)
+        return lambda count, rng: self._finish(np.clip(rng.normal(mean, std, count), low, high))
+
+    def _compile_zipf(self):
+        a = float(self.spec["a"])
+        low = int(self.spec.get("min", max(self.low, 1) if self._integer else 1))
+        high = int(self.spec.get("max", min(self.high, low + _MAX_ZIPF_TABLE - 1)))
+        size = high - low + 1
+        if size > _MAX_ZIPF_TABLE:
+            raise ValueError(f"Field '{self.name}': zipf range is limited to {_MAX_ZIPF_TABLE} values")
+
+        cumulative = np.cumsum(1.0 / np.arange(1, size + 1, dtype=np.float64) ** a)
+        total = cumulative[-1]
+
+        def draw(count, rng):
+            ranks = np.searchsorted(cumulative, rng.random(count) * total, side='right')
+            return self._finish(low + np.minimum(ranks, size - 1))
+        return draw
+
+    def _compile_categorical(self):
+        table = self._categorical_table(list(self.spec["values"]))
+        weights = self.spec.get("weights")
+        cumulative = None
+        if weights is not None:
+            cumulative = np.cumsum(np.asarray(weights, dtype=np.float64))
+            cumulative /= cumulative[-1]
+
+        def draw(count, rng):
+            if cumulative is None:
+                indices = rng.integers(0, len(table), count)
+            else:
+                indices = np.minimum(np.searchsorted(cumulative, rng.random(count), side='right'), len(table) - 1)
+            return table[indices]
+        return draw
+
+    def _categorical_table(self, values):
+        if self.kind == "bytes":
+            return np.array(values, dtype=object)
+        if self.kind == "enum":
+            labels = self._labels
+            values = [labels.get(value, value) for value in values]
+            return np.array(values, dtype=np.int64)
+        if self.kind == "float":
+            return np.array(values, dtype=np.float64)
+        return np.array(values, dtype=self._dtype)
+
+    def _compile_constant(self):
+        value = self.spec["value"]
+        if self.kind == "enum":
+            value = self._labels.get(value, value)
+        if self.kind == "bytes":
+            return lambda count, rng: np.full(count, value, dtype=object)
+        dtype = np.float64 if self.kind == "float" else self._dtype
+        return lambda count, rng: np.full(count, value, dtype=dtype)
+
+    def _compile_sequence(self):
+        step = self.spec.get("step", 1)
+        low, high = self.low, self.high
+        if self.kind == "float":
+            def draw(count, rng):
+                start = self._next_sequence
+                self._next_sequence = start + step * count
+                return start + step * np.arange(count, dtype=np.float64)
+            return draw
+
+        # Integer ranges span 2**bits values: offsets from low wrap in uint64 and are masked to the range
+        mask = np.uint64(high - low)
+        step_offset = np.uint64(step & _UINT64_MASK)
+        full_signed = low < 0 and high == _INT64_MAX
+
+        def draw(count, rng):
+            start = self._next_sequence
+            self._next_sequence = start + step * count
+            offsets = np.uint64((start - low) & _UINT64_MASK) + step_offset * np.arange(count, dtype=np.uint64)
+            offsets &= mask
+            if full_signed:
+                return (offsets ^ np.uint64(1 << 63)).view(np.int64)
+            if self._dtype == np.uint64:
+                return offsets
+            return offsets.astype(np.int64) + low
+        return draw
+
+    def sample(self, count: int, rng=None):
+        """Column of `count` values"""
+        with self._lock:
+            return self._draw(count, rng or self._rng)
+
+    def next_value(self) -> Any:
+        """Next single value (Python scalar)"""
+        with self._lock:
+            if self._buffer_pos >= len(self._buffer):
+                self._buffer = self._draw(self.buffer_size, self._rng).tolist()
+                self._buffer_pos = 0
+            value = self._buffer[self._buffer_pos]
+            self._buffer_pos += 1
+            return value
+
+
+def compile_samplers(schema_processor, seed: Optional[int] = None) -> Dict[str, FieldSampler]:
+    """
+    Samplers of the schema fields with a "distribution" block
+
+    Returns:
+        Field name -> FieldSampler (empty without numpy or distributions)
+    """
+    if not HAS_NUMPY:
+        return {}
+    fields = getattr(schema_processor, 'fields', None)
+    if not isinstance(fields, list):
+        return {}
+
+    samplers = {}
+    for i, field in enumerate(fields):
+        info = field.get("original_info") or {}
+        spec = info.get("distribution") if isinstance(info, Mapping) else None
+        if spec:
+            samplers[field["name"]] = FieldSampler(field, spec, seed=None if seed is None else seed + i)
+    return samplers
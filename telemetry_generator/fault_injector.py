@@ -3,15 +3,23 @@ fault_injector.py
 Controlled fault injection mechanism to simulate real-world conditions
 """
 
+import copy
+import fnmatch
 import random
 import struct
 import json
 import logging
+import threading
+import time
 from enum import Enum
-from typing import Dict, Any, List, Optional, Tuple, Union, Set
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union, Set, FrozenSet
 from dataclasses import dataclass, field
 
-from .types_and_enums import RecordType, TelemetryRecord
+import numpy as np
+
+from .types_and_enums import RecordType, TelemetryBatch, TelemetryRecord
+from .fault_scenarios import FaultTimeline, ScenarioType
 
 class FaultType(Enum):
     """Types of faults that can be injected"""
@@ -36,44 +44,370 @@ class FaultConfig:
     exclude_fields: List[str] = field(default_factory=list)  # Fields to exclude from faults
     parameters: Dict[str, Any] = field(default_factory=dict)  # Additional parameters
     
+    # Schema field names and the indices of the eligible ones, set by compile()
+    schema_fields: Tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    schema_field_set: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    eligible_fields: Optional[Tuple[int, ...]] = field(default=None, init=False, repr=False, compare=False)
+    
     def should_inject(self) -> bool:
         """Determine if fault should be injected now"""
         return random.random() < self.probability
+    
+    @property
+    def pattern_key(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """(field_patterns, exclude_fields) as a hashable key"""
+        return tuple(self.field_patterns), tuple(self.exclude_fields)
+    
+    def compile(self, field_names: Tuple[str, ...]):
+        """Resolve the eligible fields against a schema's field names"""
+        self.schema_fields = field_names
+        self.schema_field_set = frozenset(field_names)
+        self.eligible_fields = resolve_field_patterns(field_names, *self.pattern_key)
 
-class FaultStatistics:
-    """Fault statistics tracking"""
+
+@lru_cache(maxsize=1024)
+def resolve_field_patterns(
+    field_names: Tuple[str, ...],
+    field_patterns: Tuple[str, ...],
+    exclude_fields: Tuple[str, ...] = ()
+) -> Tuple[int, ...]:
+    """
+    Indices of the fields a fault config may target
+    
+    A field is eligible if it matches any of field_patterns (every field when
+    there are none) and none of exclude_fields, using fnmatch glob semantics.
+    Resolved once per (field set, patterns) and shared by all configs and
+    injectors with the same patterns.
+    
+    Returns:
+        Indices into field_names, in field order
+    """
+    def matches(name, patterns):
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+    
+    return tuple(
+        i for i, name in enumerate(field_names)
+        if (not field_patterns or matches(name, field_patterns)) and not matches(name, exclude_fields)
+    )
+
+# Stable codes used by FaultStatistics shards and the array-based FaultLog
+FAULT_TYPES: Tuple[FaultType, ...] = tuple(FaultType)
+SEVERITIES: Tuple[str, ...] = ("low", "medium", "high", "critical")
+
+_FAULT_TYPE_INDEX = {fault_type: i for i, fault_type in enumerate(FAULT_TYPES)}
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def _severity_code(severity: str) -> int:
+    """Index into SEVERITIES (unknown severities count as medium)"""
+    return SEVERITIES.index(severity) if severity in SEVERITIES else SEVERITIES.index("medium")
+
+
+class _StatisticsShard:
+    """Counters written by a single thread"""
+    __slots__ = ("total_records", "faulty_records", "field_counts", "severity_counts")
     
     def __init__(self):
         self.total_records = 0
         self.faulty_records = 0
-        self.fault_counts: Dict[FaultType, int] = {}
-        self.field_faults: Dict[str, int] = {}
-        self.severity_counts: Dict[str, int] = {}
-    
-    def record_fault(self, fault_type: FaultType, field_name: str, severity: str):
-        """Record a fault occurrence"""
-        self.faulty_records += 1
-        self.fault_counts[fault_type] = self.fault_counts.get(fault_type, 0) + 1
-        self.field_faults[field_name] = self.field_faults.get(field_name, 0) + 1
-        self.severity_counts[severity] = self.severity_counts.get(severity, 0) + 1
+        self.field_counts: List[List[int]] = []  # [field index][fault type index]
+        self.severity_counts = [0] * len(SEVERITIES)
+
+
+@dataclass(frozen=True)
+class FaultStatisticsSnapshot:
+    """Point-in-time merge of all statistics shards"""
+    total_records: int
+    faulty_records: int
+    total_faults: int
+    fault_counts: Dict[FaultType, int]
+    field_faults: Dict[str, int]
+    severity_counts: Dict[str, int]
+    timestamp: float  # time.monotonic() when taken
+    # Per-field counts indexed like FAULT_TYPES, so snapshots can be merged exactly
+    field_type_counts: Dict[str, Tuple[int, ...]] = field(default_factory=dict, repr=False)
     
-    def record_normal(self):
-        """Record a normal record"""
-        self.total_records += 1
+    @property
+    def fault_rate_percent(self) -> float:
+        return (self.faulty_records / self.total_records * 100) if self.total_records > 0 else 0
     
-    def get_summary(self) -> Dict[str, Any]:
-        """Get statistics summary"""
-        fault_rate = (self.faulty_records / self.total_records * 100) if self.total_records > 0 else 0
-        
+    def to_summary(self) -> Dict[str, Any]:
+        """Summary in the FaultStatistics.get_summary format"""
         return {
             "total_records": self.total_records,
             "faulty_records": self.faulty_records,
-            "fault_rate_percent": round(fault_rate, 2),
+            "fault_rate_percent": round(self.fault_rate_percent, 2),
             "fault_types": dict(self.fault_counts),
             "affected_fields": dict(self.field_faults),
             "severity_distribution": dict(self.severity_counts)
         }
 
+
+class FaultStatistics:
+    """
+    Fault statistics tracking
+    
+    Each thread counts into its own shard (lists indexed by field and fault
+    type), so updates take no lock; shards are only merged by snapshot().
+    Statistics from worker processes are folded in with merge().
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_StatisticsShard] = []
+        self._field_index: Dict[str, int] = {}
+        self._field_names: List[str] = []
+        self._lock = threading.Lock()  # Shard and field registration only
+    
+    def _shard(self) -> _StatisticsShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _StatisticsShard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+    
+    def _field_row(self, shard: _StatisticsShard, field_name: str) -> List[int]:
+        index = self._field_index.get(field_name)
+        if index is None:
+            with self._lock:
+                index = self._field_index.get(field_name)
+                if index is None:
+                    index = len(self._field_names)
+                    self._field_names.append(field_name)
+                    self._field_index[field_name] = index
+        
+        rows = shard.field_counts
+        while len(rows) <= index:
+            rows.append([0] * len(FAULT_TYPES))
+        return rows[index]
+    
+    def record_fault(self, fault_type: FaultType, field_name: str, severity: str, count: int = 1):
+        """Record count occurrences of a fault in a field"""
+        shard = self._shard()
+        self._field_row(shard, field_name)[_FAULT_TYPE_INDEX[fault_type]] += count
+        shard.severity_counts[_severity_code(severity)] += count
+    
+    def record_records(self, count: int = 1, faulty: int = 0):
+        """Record count processed records, of which faulty received at least one fault"""
+        shard = self._shard()
+        shard.total_records += count
+        shard.faulty_records += faulty
+    
+    def record_normal(self):
+        """Record a normal record"""
+        self._shard().total_records += 1
+    
+    @property
+    def total_records(self) -> int:
+        return sum(shard.total_records for shard in list(self._shards))
+    
+    @property
+    def faulty_records(self) -> int:
+        return sum(shard.faulty_records for shard in list(self._shards))
+    
+    def snapshot(self) -> FaultStatisticsSnapshot:
+        """
+        Merge all shards into an immutable snapshot
+        
+        Shards are read while writers keep going, so counts may trail
+        in-flight updates slightly. Cost depends only on the number of
+        threads and fields, not on records processed.
+        """
+        with self._lock:
+            shards = list(self._shards)
+            field_names = list(self._field_names)
+        
+        total_records = faulty_records = 0
+        matrix = [[0] * len(FAULT_TYPES) for _ in field_names]
+        severity_totals = [0] * len(SEVERITIES)
+        
+        for shard in shards:
+            total_records += shard.total_records
+            faulty_records += shard.faulty_records
+            for totals, row in zip(matrix, list(shard.field_counts)):
+                for type_index, count in enumerate(row):
+                    totals[type_index] += count
+            for severity_index, count in enumerate(shard.severity_counts):
+                severity_totals[severity_index] += count
+        
+        type_totals = [sum(column) for column in zip(*matrix)] or [0] * len(FAULT_TYPES)
+        return FaultStatisticsSnapshot(
+            total_records=total_records,
+            faulty_records=faulty_records,
+            total_faults=sum(type_totals),
+            fault_counts={FAULT_TYPES[i]: count for i, count in enumerate(type_totals) if count},
+            field_faults={name: sum(row) for name, row in zip(field_names, matrix) if any(row)},
+            severity_counts={SEVERITIES[i]: count for i, count in enumerate(severity_totals) if count},
+            timestamp=time.monotonic(),
+            field_type_counts={name: tuple(row) for name, row in zip(field_names, matrix) if any(row)}
+        )
+    
+    def merge(self, other: Union['FaultStatistics', FaultStatisticsSnapshot]):
+        """Add another statistics object or snapshot (e.g. from a worker process) as a new shard"""
+        if isinstance(other, FaultStatistics):
+            other = other.snapshot()
+        
+        shard = _StatisticsShard()
+        shard.total_records = other.total_records
+        shard.faulty_records = other.faulty_records
+        for severity, count in other.severity_counts.items():
+            shard.severity_counts[_severity_code(severity)] += count
+        for field_name, counts in other.field_type_counts.items():
+            row = self._field_row(shard, field_name)
+            for type_index, count in enumerate(counts):
+                row[type_index] += count
+        
+        with self._lock:
+            self._shards.append(shard)
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Get statistics summary"""
+        return self.snapshot().to_summary()
+    
+    def __getstate__(self):
+        # Thread-local shards don't pickle; ship one merged snapshot
+        return {"snapshot": self.snapshot()}
+    
+    def __setstate__(self, state):
+        self.__init__()
+        self.merge(state["snapshot"])
+
+
+# Fault types applied column-wise by inject_faults_batch; the rest go through
+# the scalar injectors on the selected cells only
+VECTORIZED_FAULT_TYPES = frozenset({
+    FaultType.OUT_OF_RANGE,
+    FaultType.NULL_VALUES,
+    FaultType.TIMESTAMP_DRIFT,
+    FaultType.SEQUENCE_BREAK
+})
+
+class FaultLog:
+    """
+    Compact, array-based log of the faults applied to a columnar batch
+    
+    One entry per faulty cell: row index, fault type code (index into
+    FAULT_TYPES), field code (index into field_names), severity code (index
+    into SEVERITIES) and the original and injected values.
+    """
+    
+    def __init__(self, field_names: Tuple[str, ...], rows=(), fault_codes=(), field_codes=(),
+                 severity_codes=(), original_values=(), new_values=()):
+        self.field_names = tuple(field_names)
+        self.rows = rows
+        self.fault_codes = fault_codes
+        self.field_codes = field_codes
+        self.severity_codes = severity_codes
+        self.original_values = original_values
+        self.new_values = new_values
+    
+    @classmethod
+    def from_chunks(cls, field_names: Tuple[str, ...], chunks: List[Tuple]) -> 'FaultLog':
+        """
+        Build a log from (rows, fault_code, field_code, severity_code, originals, new_values)
+        chunks, one per (fault config, field)
+        """
+        if not chunks:
+            return cls(field_names)
+        
+        sizes = [len(chunk[0]) for chunk in chunks]
+        return cls(
+            field_names,
+            rows=np.concatenate([np.asarray(chunk[0], dtype=np.int64) for chunk in chunks]),
+            fault_codes=np.repeat(np.array([chunk[1] for chunk in chunks], dtype=np.uint8), sizes),
+            field_codes=np.repeat(np.array([chunk[2] for chunk in chunks], dtype=np.uint16), sizes),
+            severity_codes=np.repeat(np.array([chunk[3] for chunk in chunks], dtype=np.uint8), sizes),
+            original_values=_concat_values([chunk[4] for chunk in chunks]),
+            new_values=_concat_values([chunk[5] for chunk in chunks])
+        )
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    @property
+    def faulty_rows(self):
+        """Sorted unique indices of rows with at least one fault"""
+        return np.unique(np.asarray(self.rows, dtype=np.int64))
+    
+    def counts_by_type(self) -> Dict[str, int]:
+        """Number of faulty cells per fault type value"""
+        counts = {}
+        for code in self.fault_codes:
+            name = FAULT_TYPES[int(code)].value
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+    
+    def to_details(self, sequence_ids=None) -> List[Dict[str, Any]]:
+        """
+        Expand into the per-fault detail dicts produced by inject_faults
+        
+        Args:
+            sequence_ids: Optional per-row sequence numbers, included as "seq_no"
+        """
+        details = []
+        for i in range(len(self.rows)):
+            row = int(self.rows[i])
+            detail = {
+                "fault_type": FAULT_TYPES[int(self.fault_codes[i])].value,
+                "field_name": self.field_names[int(self.field_codes[i])],
+                "original_value": _to_python(self.original_values[i]),
+                "new_value": _to_python(self.new_values[i]),
+                "severity": SEVERITIES[int(self.severity_codes[i])],
+                "row": row
+            }
+            if sequence_ids is not None:
+                detail["seq_no"] = _to_python(sequence_ids[row])
+            details.append(detail)
+        return details
+
+
+def _concat_values(parts):
+    """Concatenate value arrays, falling back to object dtype for mixed kinds"""
+    try:
+        return np.concatenate(parts)
+    except (TypeError, ValueError):
+        return np.concatenate([np.asarray(part, dtype=object) for part in parts])
+
+
+def _to_python(value):
+    """numpy scalar -> Python scalar"""
+    return value.item() if hasattr(value, "item") else value
+
+
+
+def _assign_rows(column, rows, values):
+    """
+    Write values into column[rows], widening the column dtype when they
+    don't fit (e.g. out-of-range values in a narrow integer column)
+    
+    Returns:
+        The column (a new array if it had to be widened)
+    """
+    if column.dtype != object and not _values_fit(values, column.dtype):
+        if values.dtype == object:
+            column = column.astype(object)
+        else:
+            column = column.astype(np.result_type(column.dtype, values.dtype))
+    column[rows] = values
+    return column
+
+
+def _values_fit(values, dtype) -> bool:
+    if values.dtype == object:
+        return False
+    if dtype.kind == 'f':
+        return values.dtype.kind in 'iuf'
+    if dtype.kind in 'iu' and values.dtype.kind in 'iu':
+        if not len(values):
+            return True
+        info = np.iinfo(dtype)
+        return int(values.min()) >= info.min and int(values.max()) <= info.max
+    return False
+
+
 class FaultInjector:
     """Main class for fault injection"""
     
@@ -82,14 +416,19 @@ class FaultInjector:
         schema_processor,
         fault_configs: List[FaultConfig] = None,
         global_fault_rate: float = 0.05,  # 5% faults by default
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        timeline: Optional[FaultTimeline] = None
     ):
         self.schema_processor = schema_processor
         self.global_fault_rate = global_fault_rate
         self.logger = logger or logging.getLogger(__name__)
         
+        # Time-correlated scenarios (storms, failing devices, skew, resets)
+        self.timeline = timeline
+        
         # Fault configuration setup
         self.fault_configs = fault_configs or self._create_default_configs()
+        self._compile_field_patterns()
         
         # Statistics tracking
         self.statistics = FaultStatistics()
@@ -98,6 +437,9 @@ class FaultInjector:
         self._field_cache = {}
         self._enum_cache = {}
         
+        # Random generator for batch injection
+        self._rng = np.random.default_rng()
+        
         self.logger.info(f"FaultInjector initialized with {len(self.fault_configs)} fault types, "
                         f"global rate: {global_fault_rate:.1%}")
     
@@ -215,41 +557,471 @@ class FaultInjector:
         """
         Inject faults into a record
         
+        The input record is left untouched: when a fault fires, the result is a
+        shallow copy of the record with its own data dict (copy-on-write).
+        
         Returns:
             Tuple of (modified_record, fault_details)
         """
-        self.statistics.total_records += 1
+        if self._scenarios_active(record.data, record.timestamp):
+            faulty_record = copy.copy(record)
+            faulty_record.data = dict(record.data)
+            fault_details = self.inject_faults_in_place(faulty_record.data, record.sequence_id, record.timestamp)
+            return (faulty_record, fault_details) if fault_details else (record, [])
         
         if not self.should_inject_fault():
             self.statistics.record_normal()
             return record, []
         
-        # Create a copy of the record
-        import copy
+        configs = [config for config in self.fault_configs if config.should_inject()]
+        if not configs:
+            self.statistics.record_normal()
+            return record, []
+        
+        # Field values are immutable scalars, so a shallow copy of the data dict is enough
+        faulty_record = copy.copy(record)
+        faulty_record.data = dict(record.data)
+        
+        fault_details = self._apply_faults(faulty_record.data, configs, record.sequence_id)
+        self.statistics.record_records(1, faulty=1 if fault_details else 0)
+        return faulty_record, fault_details
+    
+    def inject_faults_in_place(
+        self,
+        data: Dict[str, Any],
+        sequence_id: Optional[int] = None,
+        timestamp: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Inject faults directly into a record's data dict
+        
+        For callers that own the dict (e.g. freshly generated data). Original
+        values are kept in each fault detail's "original_value".
+        
+        Args:
+            data: Record data, modified in place
+            sequence_id: Optional sequence number, added to each fault detail as "seq_no"
+            timestamp: Record time for the scenario timeline, if data has no "timestamp_ns"
+            
+        Returns:
+            List of fault details that were applied
+        """
+        fault_details = []
+        if self._scenarios_active(data, timestamp):
+            fault_details = self._inject_record_scenarios(data, sequence_id, timestamp)
+        
+        if self.should_inject_fault():
+            configs = [config for config in self.fault_configs if config.should_inject()]
+            if configs:
+                fault_details.extend(self._apply_faults(data, configs, sequence_id))
+        
+        self.statistics.record_records(1, faulty=1 if fault_details else 0)
+        return fault_details
+    
+    def _scenarios_active(self, data: Dict[str, Any], timestamp: Optional[int]) -> bool:
+        """Whether any timeline scenario covers a record"""
+        if self.timeline is None:
+            return False
         try:
-            faulty_record = copy.deepcopy(record)
+            return bool(self.timeline.active_at(int(data.get("timestamp_ns", timestamp))))
+        except (TypeError, ValueError, OverflowError):
+            return False
+    
+    def _inject_record_scenarios(
+        self,
+        data: Dict[str, Any],
+        sequence_id: Optional[int],
+        timestamp: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Apply active scenarios to one record as a one-row batch"""
+        columns = {}
+        for name, value in data.items():
+            column = np.asarray([value])
+            columns[name] = column if column.dtype.kind in 'iuf' else column.astype(object)
+        borrowed_timestamp = "timestamp_ns" not in columns
+        if borrowed_timestamp:
+            columns["timestamp_ns"] = np.asarray([timestamp], dtype=np.int64)
+        
+        field_names = tuple(columns)
+        chunks = self._scenario_chunks(columns, field_names, self._rng)
+        if not chunks:
+            return []
+        
+        for name in field_names:
+            if name == "timestamp_ns" and borrowed_timestamp:
+                continue
+            value = columns[name][0]
+            if value is None:
+                data.pop(name, None)
+            else:
+                data[name] = _to_python(value)
+        
+        fault_details = FaultLog.from_chunks(field_names, chunks).to_details()
+        for detail in fault_details:
+            del detail["row"]
+            if sequence_id is not None:
+                detail["seq_no"] = sequence_id
+        return fault_details
+    
+    def inject_faults_batch(self, columns: Union[Dict[str, Any], TelemetryBatch], rng=None) -> FaultLog:
+        """
+        Inject faults into a columnar batch
+        
+        Record and per-config Bernoulli draws are made for the whole batch at
+        once and target cells are picked with array ops. Out-of-range, null,
+        timestamp-drift and sequence-break faults are applied column-wise to
+        numeric columns; other fault types go through the scalar injectors on
+        the selected cells only.
+        
+        Args:
+            columns: Field name -> column (NumPy array or list), all of equal
+                length, or a TelemetryBatch (its columns are used). Modified
+                in place: columns are stored back as arrays, widened when
+                injected values don't fit their dtype, and cells removed by
+                missing-field faults become None.
+            rng: Optional numpy.random.Generator
+            
+        Returns:
+            FaultLog of the applied faults
+        """
+        if isinstance(columns, TelemetryBatch):
+            columns = columns.columns
+        
+        rng = rng or self._rng
+        field_names = tuple(columns)
+        if not field_names:
+            return FaultLog(field_names)
+        
+        for name in field_names:
+            column = np.asarray(columns[name])
+            if column.dtype.kind not in 'iuf':
+                # Strings, bytes, mixed values
+                column = column.astype(object)
+            columns[name] = column
+        
+        num_rows = len(columns[field_names[0]])
+        if not num_rows:
+            self.statistics.record_records(num_rows)
+            return FaultLog(field_names)
+        
+        # Scenarios first: they select rows by the original timestamps
+        chunks = self._scenario_chunks(columns, field_names, rng) if self.timeline is not None else []
+        
+        if self.fault_configs:
+            # One draw per record, then one per (config, record)
+            faulty = rng.random(num_rows) < self.global_fault_rate
+            probabilities = np.array([config.probability for config in self.fault_configs], dtype=np.float64)
+            fires = (rng.random((len(self.fault_configs), num_rows)) < probabilities[:, None]) & faulty
+            
+            for config, mask in zip(self.fault_configs, fires):
+                rows = np.flatnonzero(mask)
+                if len(rows):
+                    chunks.extend(self._config_chunks(columns, field_names, config, rows, rng))
+        
+        fault_log = FaultLog.from_chunks(field_names, chunks)
+        self.statistics.record_records(num_rows, faulty=len(fault_log.faulty_rows))
+        if len(fault_log):
+            self.logger.debug(f"Applied {len(fault_log)} faults to batch of {num_rows} records")
+        
+        return fault_log
+    
+    def _fault_chunk(self, field_names, field_name: str, fault_type: 'FaultType', severity: str,
+                     rows, originals, new_values) -> Tuple:
+        """Record statistics for one applied column fault and build its FaultLog chunk"""
+        self.statistics.record_fault(fault_type, field_name, severity, len(rows))
+        return (
+            rows,
+            FAULT_TYPES.index(fault_type),
+            field_names.index(field_name),
+            _severity_code(severity),
+            originals,
+            new_values
+        )
+    
+    def _config_chunks(self, columns: Dict[str, Any], field_names, config: FaultConfig, rows, rng,
+                       severity: Optional[str] = None, exclude: Tuple[str, ...] = ()) -> List[Tuple]:
+        """Apply one fault config to the given rows of a batch"""
+        chunks = []
+        try:
+            for field_name, field_rows in self._select_batch_targets(field_names, config, rows, rng):
+                if field_name in exclude:
+                    continue
+                originals, new_values = self._inject_column_fault(columns, field_name, field_rows, config, rng)
+                chunks.append(self._fault_chunk(field_names, field_name, config.fault_type,
+                                                severity or config.severity, field_rows, originals, new_values))
         except Exception as e:
-            self.logger.error(f"Failed to create deep copy of record: {e}")
-            return record, []
+            self.logger.warning(f"Failed to apply fault {config.fault_type} to batch: {e}")
+        return chunks
+    
+    def _scenario_chunks(self, columns: Dict[str, Any], field_names, rng) -> List[Tuple]:
+        """
+        Apply the timeline scenarios active in a batch
+        
+        Rows are matched to scenarios by a lookup of their timestamps in the
+        precomputed timeline, before any fault touches the timestamp column.
+        """
+        if "timestamp_ns" not in columns:
+            return []
+        timestamps = np.array(columns["timestamp_ns"], dtype=np.int64)
+        
+        chunks = []
+        for scenario_index, rows in self.timeline.active_rows(timestamps).items():
+            scenario = self.timeline.scenarios[scenario_index]
+            try:
+                if scenario.scenario_type in (ScenarioType.FAULT_STORM, ScenarioType.DEVICE_FAILURE):
+                    chunks.extend(self._storm_chunks(columns, field_names, scenario, rows, rng))
+                elif scenario.scenario_type == ScenarioType.CLOCK_SKEW:
+                    chunks.extend(self._clock_skew_chunks(columns, field_names, scenario_index, rows, timestamps))
+                elif scenario.scenario_type == ScenarioType.SEQUENCE_RESET:
+                    chunks.extend(self._sequence_reset_chunks(columns, field_names, scenario_index, rows))
+            except Exception as e:
+                self.logger.warning(f"Failed to apply scenario '{scenario.name or scenario.scenario_type.value}': {e}")
+        return chunks
+    
+    def _scenario_configs(self, scenario) -> List[FaultConfig]:
+        """Fault configs used by a storm or device failure"""
+        if not scenario.fault_types:
+            return self.fault_configs
+        configured = {config.fault_type.value: config for config in self.fault_configs}
+        return [configured.get(fault_type) or FaultConfig(FaultType(fault_type), 1.0, scenario.severity)
+                for fault_type in scenario.fault_types]
+    
+    def _storm_chunks(self, columns: Dict[str, Any], field_names, scenario, rows, rng) -> List[Tuple]:
+        exclude = ()
+        if scenario.scenario_type == ScenarioType.DEVICE_FAILURE:
+            device = columns.get(scenario.target_field)
+            if device is None:
+                return []
+            rows = rows[np.asarray(device[rows] == scenario.target_value, dtype=bool)]
+            # Keep the failing device identifiable
+            exclude = (scenario.target_field,)
+        
+        rows = rows[rng.random(len(rows)) < scenario.fault_rate]
+        configs = self._scenario_configs(scenario)
+        if not len(rows) or not configs:
+            return []
+        
+        chunks = []
+        assignment = rng.integers(0, len(configs), len(rows))
+        for i, config in enumerate(configs):
+            config_rows = rows[assignment == i]
+            if len(config_rows):
+                chunks.extend(self._config_chunks(columns, field_names, config, config_rows, rng,
+                                                  severity=scenario.severity, exclude=exclude))
+        return chunks
+    
+    def _clock_skew_chunks(self, columns: Dict[str, Any], field_names, scenario_index: int,
+                           rows, timestamps) -> List[Tuple]:
+        scenario = self.timeline.scenarios[scenario_index]
+        column = columns.get(scenario.skew_field)
+        if column is None or column.dtype.kind not in 'iu':
+            return []
+        
+        # Skew grows linearly from 0 to max_skew_seconds over the window
+        progress = self.timeline.progress(scenario_index, timestamps[rows])
+        skew = (progress * scenario.max_skew_seconds * NS_PER_SECOND).astype(np.int64)
+        originals = column[rows]
+        new_values = np.maximum(originals.astype(np.int64) + skew, 0)
+        columns[scenario.skew_field] = _assign_rows(column, rows, new_values)
+        return [self._fault_chunk(field_names, scenario.skew_field, FaultType.TIMESTAMP_DRIFT,
+                                  scenario.severity, rows, originals, new_values)]
+    
+    def _sequence_reset_chunks(self, columns: Dict[str, Any], field_names, scenario_index: int,
+                               rows) -> List[Tuple]:
+        scenario = self.timeline.scenarios[scenario_index]
+        column = columns.get(scenario.sequence_field)
+        if column is None or column.dtype.kind not in 'iu':
+            return []
+        
+        # Sequence restarts at reset_to from the first record in the window
+        originals = column[rows]
+        base = self.timeline.state.setdefault(scenario_index, int(originals.min()))
+        new_values = np.maximum(originals.astype(np.int64) - base + scenario.reset_to, 0)
+        columns[scenario.sequence_field] = _assign_rows(column, rows, new_values)
+        return [self._fault_chunk(field_names, scenario.sequence_field, FaultType.SEQUENCE_BREAK,
+                                  scenario.severity, rows, originals, new_values)]
+    
+    def _select_batch_targets(self, field_names, config: FaultConfig, rows, rng) -> List[Tuple[str, Any]]:
+        """Pick target fields for each selected row; returns (field_name, rows) pairs"""
+        eligible = resolve_field_patterns(field_names, *config.pattern_key)
+        if not eligible:
+            return []
+        
+        if not config.field_patterns:
+            # One random field per row
+            picks = rng.integers(0, len(eligible), len(rows))[:, None]
+        else:
+            max_fields = config.parameters.get("max_fields", 2)
+            if len(eligible) <= max_fields:
+                return [(field_names[index], rows) for index in eligible]
+            # max_fields distinct fields per row: the first columns of a random permutation
+            picks = np.argsort(rng.random((len(rows), len(eligible))), axis=1)[:, :max_fields]
+        
+        targets = []
+        for j, index in enumerate(eligible):
+            field_rows = rows[(picks == j).any(axis=1)]
+            if len(field_rows):
+                targets.append((field_names[index], field_rows))
+        return targets
+    
+    def _inject_column_fault(self, columns: Dict[str, Any], field_name: str, rows, config: FaultConfig, rng):
+        """
+        Apply one fault config to column[rows]
         
+        Returns:
+            Tuple of (original_values, logged_new_values)
+        """
+        column = columns[field_name]
+        originals = column[rows]
+        
+        if config.fault_type in VECTORIZED_FAULT_TYPES and column.dtype != object:
+            new_values = self._batch_fault_values(field_name, originals, config, rng)
+            logged_values = new_values
+        else:
+            new_values = np.empty(len(rows), dtype=object)
+            for i, value in enumerate(originals):
+                cell = {field_name: _to_python(value)}
+                self._inject_field_fault(cell, field_name, config)
+                new_values[i] = cell.get(field_name)  # None when deleted
+            
+            if config.fault_type == FaultType.MISSING_FIELD:
+                logged_values = np.full(len(rows), "<DELETED>", dtype=object)
+            else:
+                logged_values = new_values
+        
+        columns[field_name] = _assign_rows(column, rows, new_values)
+        return originals, logged_values
+    
+    def _batch_fault_values(self, field_name: str, values, config: FaultConfig, rng):
+        """Column-wise counterparts of the scalar injectors"""
+        if config.fault_type == FaultType.OUT_OF_RANGE:
+            return self._batch_out_of_range(field_name, values, config, rng)
+        if config.fault_type == FaultType.NULL_VALUES:
+            return self._batch_null_values(values, config, rng)
+        if config.fault_type == FaultType.TIMESTAMP_DRIFT:
+            return self._batch_timestamp_drift(values, config, rng)
+        if config.fault_type == FaultType.SEQUENCE_BREAK:
+            return self._batch_sequence_break(values, config, rng)
+        return values.copy()
+    
+    def _batch_out_of_range(self, field_name: str, values, config: FaultConfig, rng):
+        """Vectorized _inject_out_of_range"""
+        params = config.parameters
+        count = len(values)
+        field_info = self._get_field_info(field_name)
+        bits = field_info.get("bits") if field_info else None
+        
+        # Multiply by range, chance for negative value
+        low, high = params.get("multiplier_range", (2, 5))
+        scaled = values.astype(np.float64) * rng.uniform(low, high, count)
+        neg_chance = float(params.get("negative_chance", 0) or 0)
+        scaled = np.where(rng.random(count) < neg_chance, -np.abs(scaled), scaled)
+        
+        # Ensure value is actually out of range
+        bump = np.zeros(count, dtype=bool)
+        if bits:
+            max_val = (1 << bits) - 1
+            bump = scaled <= float(max_val)
+            offsets = rng.integers(1, 1001, count)
+        
+        if values.dtype.kind == 'f':
+            result = scaled
+            if bits:
+                result[bump] = float(max_val) + offsets[bump]
+        elif bits and bits >= 63:
+            # Out-of-range values don't fit in 64 bits
+            result = np.array([max_val + int(offset) if b else int(value)
+                               for value, b, offset in zip(scaled, bump, offsets)], dtype=object)
+        else:
+            result = np.clip(scaled, -2.0 ** 63, 2.0 ** 63 - 2048).astype(np.int64)
+            if bits:
+                result[bump] = max_val + offsets[bump]
+        
+        # Predefined extreme values
+        extreme_values = params.get("extreme_values", [])
+        if extreme_values:
+            use_extreme = rng.random(count) < 0.3
+            choices = np.array(extreme_values, dtype=result.dtype)[rng.integers(0, len(extreme_values), count)]
+            result[use_extreme] = choices[use_extreme]
+        
+        return result
+    
+    def _batch_null_values(self, values, config: FaultConfig, rng):
+        """Vectorized _inject_null_value (numeric columns: null, empty and zero all become 0)"""
+        params = config.parameters
+        chance = (params.get("null_chance", 0.4) + params.get("empty_string_chance", 0.3)
+                  + params.get("zero_chance", 0.2))
+        result = values.copy()
+        result[rng.random(len(values)) < chance] = 0
+        return result
+    
+    def _batch_timestamp_drift(self, values, config: FaultConfig, rng):
+        """Vectorized _inject_timestamp_drift"""
+        if values.dtype.kind not in 'iu':
+            return values.copy()
+        
+        params = config.parameters
+        count = len(values)
+        result = values.astype(np.int64)
+        
+        # Normal drift, future, far past
+        normal = rng.random(count) < 0.8
+        future = ~normal & (rng.random(count) < params.get("future_chance", 0.1))
+        past = ~(normal | future)
+        
+        low, high = params.get("drift_seconds", (-3600, 3600))
+        result[normal] += rng.integers(low, high + 1, int(normal.sum())) * NS_PER_SECOND
+        result[future] += rng.integers(86400, 365 * 86400 + 1, int(future.sum())) * NS_PER_SECOND
+        past_drift = rng.integers(365 * 86400, 10 * 365 * 86400 + 1, int(past.sum())) * NS_PER_SECOND
+        result[past] = np.maximum(0, result[past] - past_drift)
+        return result
+    
+    def _batch_sequence_break(self, values, config: FaultConfig, rng):
+        """Vectorized _inject_sequence_break"""
+        if values.dtype.kind not in 'iu':
+            return values.copy()
+        
+        params = config.parameters
+        count = len(values)
+        result = values.astype(np.int64)
+        
+        # Jump forward, jump backward, otherwise keep the value (duplicate)
+        forward = rng.random(count) < 0.5
+        backward = ~forward & (rng.random(count) < 0.3)
+        
+        low, high = params.get("jump_forward", (100, 1000))
+        result[forward] += rng.integers(low, high + 1, int(forward.sum()))
+        low, high = params.get("jump_backward", (1, 50))
+        result[backward] = np.maximum(0, result[backward] - rng.integers(low, high + 1, int(backward.sum())))
+        return result
+    
+    def _apply_faults(
+        self,
+        data: Dict[str, Any],
+        configs: List[FaultConfig],
+        sequence_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Apply the selected fault configs to data in place"""
         fault_details = []
         
-        # Select faults to inject
-        for config in self.fault_configs:
-            if config.should_inject():
-                try:
-                    fault_applied = self._apply_fault(faulty_record, config)
-                    if fault_applied:
-                        fault_details.extend(fault_applied)
-                except Exception as e:
-                    self.logger.warning(f"Failed to apply fault {config.fault_type}: {e}")
+        for config in configs:
+            try:
+                fault_applied = self._apply_fault(data, config)
+                if fault_applied:
+                    fault_details.extend(fault_applied)
+            except Exception as e:
+                self.logger.warning(f"Failed to apply fault {config.fault_type}: {e}")
+        
+        if sequence_id is not None:
+            for detail in fault_details:
+                detail["seq_no"] = sequence_id
         
         if fault_details:
-            self.logger.debug(f"Applied {len(fault_details)} faults to record {record.sequence_id}")
+            self.logger.debug(f"Applied {len(fault_details)} faults to record {sequence_id}")
         
-        return faulty_record, fault_details
+        return fault_details
     
-    def _apply_fault(self, record: TelemetryRecord, config: FaultConfig) -> List[Dict[str, Any]]:
+    def _apply_fault(self, data: Dict[str, Any], config: FaultConfig) -> List[Dict[str, Any]]:
         """
         Apply a specific fault
         
@@ -260,7 +1032,7 @@ class FaultInjector:
         
         # Select target fields
         try:
-            target_fields = self._select_target_fields(record, config)
+            target_fields = self._select_target_fields(data, config)
         except Exception as e:
             self.logger.warning(f"Failed to select target fields for {config.fault_type}: {e}")
             return fault_details
@@ -271,7 +1043,7 @@ class FaultInjector:
         # Apply fault to each selected field
         for field_name in target_fields:
             try:
-                fault_detail = self._inject_field_fault(record, field_name, config)
+                fault_detail = self._inject_field_fault(data, field_name, config)
                 if fault_detail:
                     fault_details.append(fault_detail)
                     self.statistics.record_fault(config.fault_type, field_name, config.severity)
@@ -280,65 +1052,49 @@ class FaultInjector:
         
         return fault_details
     
-    def _select_target_fields(self, record: TelemetryRecord, config: FaultConfig) -> List[str]:
-        """Select target fields for fault injection"""
+    def _compile_field_patterns(self):
+        """Resolve each config's eligible fields against the schema field set up front"""
         try:
-            available_fields = set(record.data.keys())
-        except AttributeError as e:
-            self.logger.error(f"Record has no data attribute: {e}")
+            field_names = tuple(field["name"] for field in self.schema_processor.fields)
+        except (AttributeError, KeyError, TypeError):
+            return
+        for config in self.fault_configs:
+            config.compile(field_names)
+    
+    def _select_target_fields(self, data: Dict[str, Any], config: FaultConfig) -> List[str]:
+        """Select target fields for fault injection"""
+        if config.eligible_fields is not None and data.keys() == config.schema_field_set:
+            field_names, eligible = config.schema_fields, config.eligible_fields
+        else:
+            # Record fields differ from the schema's
+            field_names = tuple(data)
+            eligible = resolve_field_patterns(field_names, *config.pattern_key)
+        if not eligible:
             return []
         
-        # Filter by exclude_fields
-        if config.exclude_fields:
-            for exclude_pattern in config.exclude_fields:
-                if exclude_pattern in available_fields:
-                    available_fields.discard(exclude_pattern)
-        
-        # Select by field_patterns
-        target_fields = set()
-        
-        if config.field_patterns:
-            for pattern in config.field_patterns:
-                try:
-                    if pattern == "*":
-                        target_fields.update(available_fields)
-                    elif "*" in pattern:
-                        # Pattern matching
-                        prefix = pattern.replace("*", "")
-                        for field in available_fields:
-                            if field.startswith(prefix) or field.endswith(prefix.replace("*", "")):
-                                target_fields.add(field)
-                    elif pattern in available_fields:
-                        target_fields.add(pattern)
-                except Exception as e:
-                    self.logger.warning(f"Error processing pattern {pattern}: {e}")
-        else:
+        if not config.field_patterns:
             # If no patterns, select random field
-            if available_fields:
-                target_fields.add(random.choice(list(available_fields)))
+            return [field_names[random.choice(eligible)]]
         
         # Limit number of fields
         max_fields = config.parameters.get("max_fields", 2)
-        if len(target_fields) > max_fields:
-            try:
-                target_fields = set(random.sample(list(target_fields), max_fields))
-            except ValueError as e:
-                self.logger.warning(f"Error sampling target fields: {e}")
+        if len(eligible) > max_fields:
+            eligible = random.sample(eligible, max_fields)
         
-        return list(target_fields & available_fields)
+        return [field_names[i] for i in eligible]
     
     def _inject_field_fault(
         self, 
-        record: TelemetryRecord, 
+        data: Dict[str, Any], 
         field_name: str, 
         config: FaultConfig
     ) -> Optional[Dict[str, Any]]:
-        """Inject fault into a specific field"""
+        """Inject fault into a specific field of data (in place)"""
         
-        if field_name not in record.data:
+        if field_name not in data:
             return None
         
-        original_value = record.data[field_name]
+        original_value = data[field_name]
         fault_detail = {
             "fault_type": config.fault_type.value,
             "field_name": field_name,
@@ -358,7 +1114,7 @@ class FaultInjector:
             elif config.fault_type == FaultType.MISSING_FIELD:
                 # Delete the field
                 try:
-                    del record.data[field_name]
+                    del data[field_name]
                     fault_detail["new_value"] = "<DELETED>"
                     return fault_detail
                 except KeyError as e:
@@ -388,7 +1144,7 @@ class FaultInjector:
             if new_value is None:
                 new_value = 0
             
-            record.data[field_name] = new_value
+            data[field_name] = new_value
             fault_detail["new_value"] = new_value
             
             return fault_detail
@@ -651,6 +1407,11 @@ class FaultInjector:
                     continue
             
             self.fault_configs = fault_configs
+            self._compile_field_patterns()
+            
+            if config_data.get("scenarios"):
+                self.timeline = FaultTimeline.from_dict(config_data)
+                self.logger.info(f"Loaded {len(self.timeline.scenarios)} fault scenarios")
             self.logger.info(f"Loaded fault configuration from {config_file}")
             
         except FileNotFoundError:
@@ -681,6 +1442,9 @@ class FaultInjector:
                     "parameters": config.parameters
                 })
             
+            if self.timeline is not None:
+                config_data.update(self.timeline.to_dict())
+            
             with open(config_file, 'w', encoding='utf-8') as f:
                 json.dump(config_data, f, indent=2, ensure_ascii=False)
             
@@ -0,0 +1,159 @@
+"""
+fault_log.py
+Streaming fault ground-truth log, rotated alongside the data files
+"""
+
+import gzip
+import json
+import logging
+import os
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+# Suffix of fault log files; the data file's extension is replaced by it
+FAULT_LOG_SUFFIX = '.faults.ndjson'
+
+
+def json_value(value: Any) -> Any:
+    """JSON-safe form of an original/injected field value"""
+    if hasattr(value, 'item'):  # numpy scalar
+        return value.item()
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode('latin-1')
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def to_jsonable(obj: Any) -> Any:
+    """Recursively convert enum dict keys and odd values for json.dump"""
+    if isinstance(obj, dict):
+        return {(key.value if isinstance(key, Enum) else str(key)): to_jsonable(value)
+                for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(value) for value in obj]
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    return json_value(obj)
+
+
+class FaultLogWriter:
+    """
+    Writes one NDJSON line per injected fault:
+    {"seq_no", "field", "fault_type", "original_value", "new_value", "severity"}
+
+    Attached to a RollingFileWriter, a new log file is opened next to each
+    data file as it is created (<data file stem>.faults.ndjson), so the faults
+    of the records in a data file are in its sidecar. Nothing is buffered
+    beyond the file object, so memory stays flat for any run length.
+    """
+
+    def __init__(self, path: Optional[str] = None, compress: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: Single log file to write (when not attached to a data writer)
+            compress: gzip the log files
+            logger: Optional logger instance
+        """
+        self.compress = compress
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.current_file: Optional[TextIO] = None
+        self.current_file_path: Optional[str] = None
+        self.files: List[str] = []
+        self.faults_written = 0
+        self.faults_in_current_file = 0
+
+        if path:
+            self._open(path)
+
+    def attach(self, data_writer) -> 'FaultLogWriter':
+        """Rotate together with a RollingFileWriter"""
+        data_writer.add_rotation_listener(self.rotate)
+        if data_writer.current_file_path:
+            self.rotate(data_writer.current_file_path)
+        return self
+
+    @staticmethod
+    def sidecar_path(data_file_path: str, compress: bool = False) -> str:
+        """Fault log path for a data file"""
+        stem = data_file_path
+        if stem.endswith('.gz'):
+            stem = stem[:-3]
+        stem = os.path.splitext(stem)[0]
+        return stem + FAULT_LOG_SUFFIX + ('.gz' if compress else '')
+
+    def rotate(self, data_file_path: str, *_):
+        """Start the fault log of a newly opened data file"""
+        self._open(self.sidecar_path(data_file_path, self.compress))
+
+    def _open(self, path: str):
+        self.close()
+        if self.compress:
+            self.current_file = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            self.current_file = open(path, 'w', encoding='utf-8')
+        self.current_file_path = path
+        self.faults_in_current_file = 0
+        self.files.append(path)
+
+    def write(self, fault_details: Iterable[Dict[str, Any]], seq_no: Optional[int] = None) -> int:
+        """
+        Write the fault details of one record (as returned by FaultInjector)
+
+        Args:
+            fault_details: Fault detail dicts
+            seq_no: Record sequence number, if the details don't carry one
+
+        Returns:
+            Number of faults written
+        """
+        if self.current_file is None:
+            raise ValueError("FaultLogWriter has no open file")
+
+        lines = []
+        for detail in fault_details:
+            lines.append(json.dumps({
+                "seq_no": detail.get("seq_no", seq_no),
+                "field": detail.get("field_name"),
+                "fault_type": detail.get("fault_type"),
+                "original_value": detail.get("original_value"),
+                "new_value": detail.get("new_value"),
+                "severity": detail.get("severity")
+            }, separators=(',', ':'), ensure_ascii=False, default=json_value))
+
+        if lines:
+            self.current_file.write('\n'.join(lines) + '\n')
+            self.faults_written += len(lines)
+            self.faults_in_current_file += len(lines)
+        return len(lines)
+
+    def write_fault_log(self, fault_log, sequence_ids=None) -> int:
+        """Write a FaultLog from batch injection"""
+        return self.write(fault_log.to_details(sequence_ids))
+
+    def flush(self):
+        if self.current_file:
+            self.current_file.flush()
+
+    def close(self):
+        if not self.current_file:
+            return
+        self.current_file.close()
+        self.logger.debug(f"Closed fault log: {self.current_file_path} ({self.faults_in_current_file:,} faults)")
+        self.current_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def read_fault_log(path: str) -> List[Dict[str, Any]]:
+    """Read a fault log file (plain or gzip)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,189 @@
+"""
+fault_scenarios.py
+Time-correlated fault scenarios (fault storms, failing devices, clock skew
+ramps, sequence resets) scheduled on a precomputed timeline
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+NS_PER_SECOND = 1_000_000_000
+
+# End of open-ended scenarios
+_END_OF_TIME = np.iinfo(np.int64).max
+
+
+class ScenarioType(Enum):
+    """Kinds of correlated fault scenarios"""
+    FAULT_STORM = "fault_storm"             # Elevated fault rate for all records
+    DEVICE_FAILURE = "device_failure"       # One device (field value) goes bad
+    CLOCK_SKEW = "clock_skew"               # Timestamp skew ramping up over the window
+    SEQUENCE_RESET = "sequence_reset"       # Sequence numbers restart
+
+
+@dataclass
+class FaultScenario:
+    """One scheduled scenario; times are seconds from the timeline start"""
+    scenario_type: ScenarioType
+    start_seconds: float
+    duration_seconds: Optional[float] = None  # None: until the end of the run
+    name: str = ""
+    severity: str = "high"
+    fault_rate: float = 1.0                 # Storm/device: share of affected records that get faults
+    fault_types: List[str] = field(default_factory=list)  # Storm/device: FaultType values (default: all configured)
+    target_field: str = "device_id_ascii"   # Device failure: field identifying the device
+    target_value: Any = None                # Device failure: failing device
+    skew_field: str = "timestamp_ns"        # Clock skew: field to skew
+    max_skew_seconds: float = 0.0           # Clock skew: skew reached at the end of the window
+    sequence_field: str = "seq_no"          # Sequence reset: field to reset
+    reset_to: int = 0                       # Sequence reset: first value after the reset
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FaultScenario':
+        """
+        Raises:
+            ValueError: If the scenario is invalid
+        """
+        data = dict(data)
+        try:
+            data["scenario_type"] = ScenarioType(data.pop("type", data.get("scenario_type")))
+        except ValueError:
+            raise ValueError(f"Unknown scenario type: {data.get('type', data.get('scenario_type'))}")
+        scenario = cls(**data)
+        scenario.validate()
+        return scenario
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"type": self.scenario_type.value}
+        for name in self.__dataclass_fields__:
+            if name != "scenario_type":
+                data[name] = getattr(self, name)
+        return data
+
+    def validate(self):
+        if self.start_seconds < 0:
+            raise ValueError(f"Scenario '{self.name}' starts before the timeline ({self.start_seconds}s)")
+        if self.duration_seconds is not None and self.duration_seconds <= 0:
+            raise ValueError(f"Scenario '{self.name}' needs a positive duration")
+        if not 0.0 <= self.fault_rate <= 1.0:
+            raise ValueError(f"Scenario '{self.name}' fault_rate must be between 0.0 and 1.0")
+        if self.scenario_type == ScenarioType.DEVICE_FAILURE and self.target_value is None:
+            raise ValueError(f"Device failure scenario '{self.name}' needs a target_value")
+        if self.scenario_type == ScenarioType.CLOCK_SKEW and self.duration_seconds is None:
+            raise ValueError(f"Clock skew scenario '{self.name}' needs a duration")
+
+
+class FaultTimeline:
+    """
+    Scenario schedule compiled to sorted segment boundaries
+
+    Every start/end time splits the run into segments with a fixed set of
+    active scenarios, so finding the scenarios of a batch is a single
+    searchsorted over its timestamps.
+    """
+
+    def __init__(self, scenarios: List[FaultScenario], start_ns: Optional[int] = None):
+        """
+        Args:
+            scenarios: Scheduled scenarios
+            start_ns: Timeline start (default: first timestamp seen)
+        """
+        self.scenarios = list(scenarios)
+        self.start_ns = None
+        self.boundaries = np.empty(0, dtype=np.int64)
+        self.segments: List[Tuple[int, ...]] = []
+        self.windows = np.empty((0, 2), dtype=np.int64)
+
+        # Per-scenario runtime state (e.g. sequence base of a reset)
+        self.state: Dict[int, Any] = {}
+
+        if start_ns is not None:
+            self.anchor(start_ns)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FaultTimeline':
+        return cls([FaultScenario.from_dict(s) for s in data.get("scenarios", [])],
+                   data.get("timeline_start_ns"))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'FaultTimeline':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timeline_start_ns": self.start_ns,
+            "scenarios": [scenario.to_dict() for scenario in self.scenarios]
+        }
+
+    def anchor(self, start_ns: int):
+        """Fix the timeline start and compile the segments"""
+        self.start_ns = int(start_ns)
+        self.state.clear()
+
+        windows = []
+        for scenario in self.scenarios:
+            begin = self.start_ns + int(scenario.start_seconds * NS_PER_SECOND)
+            if scenario.duration_seconds is None or math.isinf(scenario.duration_seconds):
+                end = _END_OF_TIME
+            else:
+                end = begin + int(scenario.duration_seconds * NS_PER_SECOND)
+            windows.append((begin, end))
+        self.windows = np.array(windows, dtype=np.int64).reshape(-1, 2)
+
+        points = sorted({point for window in windows for point in window})
+        self.boundaries = np.array(points, dtype=np.int64)
+        self.segments = [
+            tuple(i for i, (begin, end) in enumerate(windows) if begin <= point < end)
+            for point in points
+        ]
+
+    def _ensure_anchored(self, first_timestamp: int):
+        if self.start_ns is None:
+            self.anchor(first_timestamp)
+
+    def active_at(self, timestamp_ns: int) -> Tuple[int, ...]:
+        """Indices of the scenarios active at a timestamp"""
+        if not self.scenarios:
+            return ()
+        self._ensure_anchored(timestamp_ns)
+        segment = int(np.searchsorted(self.boundaries, timestamp_ns, side='right')) - 1
+        return self.segments[segment] if segment >= 0 else ()
+
+    def active_rows(self, timestamps_ns) -> Dict[int, np.ndarray]:
+        """
+        Rows of a batch affected by each scenario
+
+        Args:
+            timestamps_ns: Record timestamps
+
+        Returns:
+            Scenario index -> sorted row indices (only active scenarios)
+        """
+        timestamps = np.asarray(timestamps_ns, dtype=np.int64)
+        if not self.scenarios or not len(timestamps):
+            return {}
+        self._ensure_anchored(int(timestamps.min()))
+
+        segment_of_row = np.searchsorted(self.boundaries, timestamps, side='right') - 1
+        rows_by_scenario: Dict[int, List[np.ndarray]] = {}
+        for segment in np.unique(segment_of_row[segment_of_row >= 0]).tolist():
+            active = self.segments[segment]
+            if not active:
+                continue
+            rows = np.flatnonzero(segment_of_row == segment)
+            for scenario_index in active:
+                rows_by_scenario.setdefault(scenario_index, []).append(rows)
+
+        return {index: np.sort(np.concatenate(parts)) for index, parts in rows_by_scenario.items()}
+
+    def progress(self, scenario_index: int, timestamps_ns) -> np.ndarray:
+        """Fraction (0-1) of a scenario's window elapsed at each timestamp"""
+        begin, end = self.windows[scenario_index]
+        elapsed = np.asarray(timestamps_ns, dtype=np.int64) - begin
+        return np.clip(elapsed / float(end - begin), 0.0, 1.0)
@@ -3,7 +3,17 @@ LEB128 Encoding/Decoding
 Variable-length encoding for efficient integer storage
 """
 
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Sequence, Union
+
+# Check numpy availability
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Longest valid encoding of a 64-bit value (ceil(64 / 7))
+MAX_LEB128_BYTES = 10
 
 def encode_leb128(value: int) -> bytes:
     """
@@ -129,8 +139,8 @@ def decode_signed_leb128(data: bytes, offset: int = 0) -> Tuple[int, int]:
         
         if byte & 0x80 == 0:
             # Last byte - check sign
-            if shift < 64 and (byte & 0x40):
-                # Sign extend
+            if byte & 0x40:
+                # Sign extend (Python ints are unbounded, so this holds for 10-byte values too)
                 result |= -(1 << shift)
             break
         
@@ -189,9 +199,14 @@ class LEB128Encoder:
 
 
 class LEB128Decoder:
-    """Helper class for decoding multiple values"""
+    """
+    Helper class for decoding multiple values
+    
+    Accepts bytes, bytearray, memoryview or mmap; slices of a memoryview are
+    returned without copying. For record files use LEB128StreamDecoder.
+    """
     
-    def __init__(self, data: bytes):
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
         self._data = data
         self._offset = 0
     
@@ -212,7 +227,7 @@ class LEB128Decoder:
         length = self.read_unsigned()
         if self._offset + length > len(self._data):
             raise ValueError("String length exceeds available data")
-        value = self._data[self._offset:self._offset + length].decode('utf-8')
+        value = str(self._data[self._offset:self._offset + length], 'utf-8')
         self._offset += length
         return value
     
@@ -230,7 +245,7 @@ class LEB128Decoder:
         import struct
         if self._offset + 8 > len(self._data):
             raise ValueError("Not enough data for float")
-        value = struct.unpack('<d', self._data[self._offset:self._offset + 8])[0]
+        value = struct.unpack_from('<d', self._data, self._offset)[0]
         self._offset += 8
         return value
     
@@ -242,6 +257,10 @@ class LEB128Decoder:
         self._offset += 1
         return value
     
+    def tell(self) -> int:
+        """Get current read offset"""
+        return self._offset
+    
     def remaining(self) -> int:
         """Get number of remaining bytes"""
         return len(self._data) - self._offset
@@ -325,30 +344,218 @@ def compare_encoding_sizes(values: List[int], signed: bool = False) -> dict:
 
 
 # Optimized batch encoding/decoding
-def encode_batch_leb128(values: List[int], signed: bool = False) -> bytes:
+if HAS_NUMPY:
+    # Unsigned value v needs 1 + (number of thresholds <= v) bytes
+    _UNSIGNED_THRESHOLDS = np.array([1 << (7 * k) for k in range(1, MAX_LEB128_BYTES)], dtype=np.uint64)
+    # Signed value v needs 1 + (number of thresholds <= (v ^ (v >> 63))) bytes
+    _SIGNED_THRESHOLDS = np.array([1 << (7 * k - 1) for k in range(1, MAX_LEB128_BYTES)], dtype=np.uint64)
+
+
+def _to_int64_array(values: Sequence[int], signed: bool) -> Optional["np.ndarray"]:
     """
-    Encode a batch of integers efficiently
+    Convert values to an int64/uint64 array, or None if they don't fit in 64 bits
+    
+    Raises:
+        ValueError: If a negative value is passed for unsigned encoding
+    """
+    try:
+        arr = np.asarray(values)
+    except (OverflowError, ValueError):
+        return None
+    
+    if arr.ndim != 1:
+        arr = arr.reshape(-1)
+    if arr.size == 0:
+        return arr.astype(np.int64 if signed else np.uint64)
+    if arr.dtype.kind not in "iub":
+        # Python ints beyond 64 bits end up as dtype=object
+        return None
+    
+    if signed:
+        if arr.dtype == np.uint64 and int(arr.max()) > np.iinfo(np.int64).max:
+            return None
+        return arr.astype(np.int64, copy=False)
+    
+    if arr.dtype.kind == "i" and int(arr.min()) < 0:
+        raise ValueError(f"Cannot encode negative value {int(arr.min())} as unsigned LEB128")
+    return arr.astype(np.uint64, copy=False)
+
+
+def _encode_leb128_python(values: Sequence[int], signed: bool) -> bytes:
+    """Pure Python fallback for encode_leb128_array"""
+    encode = encode_signed_leb128 if signed else encode_leb128
+    return b"".join(encode(int(value)) for value in values)
+
+
+def encode_leb128_array(values: Sequence[int], signed: bool = False) -> bytes:
+    """
+    Encode a sequence of integers back to back, vectorized with NumPy
+    
+    Byte lengths are computed for all values at once, then each 7-bit group
+    is scattered into a preallocated output buffer. Values that don't fit in
+    64 bits (or a missing NumPy) fall back to the scalar encoder.
     
     Args:
-        values: List of integers
+        values: Integers (list or NumPy array)
         signed: Whether to use signed encoding
         
     Returns:
-        Encoded bytes with count prefix
+        Concatenated LEB128 encodings, identical to joining the scalar output
+        
+    Raises:
+        ValueError: If a negative value is passed for unsigned encoding
     """
-    encoder = LEB128Encoder()
+    if not HAS_NUMPY:
+        return _encode_leb128_python(values, signed)
     
-    # Write count first
-    encoder.write_unsigned(len(values))
+    arr = _to_int64_array(values, signed)
+    if arr is None:
+        return _encode_leb128_python(values, signed)
+    if arr.size == 0:
+        return b""
     
-    # Write all values
-    for value in values:
+    if signed:
+        # Number of significant bits excluding the sign is the bit length of v ^ (v >> 63)
+        magnitude = (arr ^ (arr >> 63)).view(np.uint64)
+        lengths = 1 + np.searchsorted(_SIGNED_THRESHOLDS, magnitude, side="right")
+    else:
+        lengths = 1 + np.searchsorted(_UNSIGNED_THRESHOLDS, arr, side="right")
+    
+    ends = np.cumsum(lengths)
+    offsets = ends - lengths
+    out = np.empty(int(ends[-1]), dtype=np.uint8)
+    
+    for k in range(int(lengths.max())):
+        active = lengths > k
+        if active.all():
+            group_values = arr
+            group_lengths = lengths
+            positions = offsets + k
+        else:
+            group_values = arr[active]
+            group_lengths = lengths[active]
+            positions = offsets[active] + k
+        
+        group = ((group_values >> (7 * k)) & 0x7F).astype(np.uint8)
+        # Continuation bit on every byte except the last one of each value
+        group |= (group_lengths > k + 1).astype(np.uint8) << 7
+        out[positions] = group
+    
+    return out.tobytes()
+
+
+def _decode_leb128_python(
+    data: bytes, count: Optional[int], offset: int, signed: bool
+) -> Tuple[List[int], int]:
+    """Pure Python fallback for decode_leb128_array"""
+    decode = decode_signed_leb128 if signed else decode_leb128
+    values = []
+    position = offset
+    
+    while (count is None and position < len(data)) or (count is not None and len(values) < count):
+        if position >= len(data):
+            raise ValueError(f"Truncated LEB128 data: expected {count} values, got {len(values)}")
+        value, consumed = decode(data, position)
+        if data[position + consumed - 1] & 0x80:
+            raise ValueError("Truncated LEB128 data: last value has no terminator byte")
+        values.append(value)
+        position += consumed
+    
+    return values, position - offset
+
+
+def decode_leb128_array(
+    data: Union[bytes, bytearray, memoryview],
+    count: Optional[int] = None,
+    offset: int = 0,
+    signed: bool = False
+) -> Tuple[Union["np.ndarray", List[int]], int]:
+    """
+    Decode back-to-back LEB128 integers, vectorized with NumPy
+    
+    Terminator bytes (high bit clear) are located with array ops, and the
+    7-bit groups of all values are accumulated in at most ten passes.
+    
+    Args:
+        data: Encoded bytes
+        count: Number of values to decode (default: everything after offset)
+        offset: Starting offset in data
+        signed: Whether values are signed
+        
+    Returns:
+        Tuple of (values, bytes consumed). Values are an int64/uint64 array,
+        or a list when NumPy is unavailable or a value exceeds 64 bits.
+        
+    Raises:
+        ValueError: On truncated data or values longer than ten bytes
+    """
+    if not HAS_NUMPY:
+        return _decode_leb128_python(data, count, offset, signed)
+    
+    buf = np.frombuffer(data, dtype=np.uint8, offset=offset)
+    terminators = np.flatnonzero(buf < 0x80)
+    
+    if count is None:
+        if buf.size and buf[-1] & 0x80:
+            raise ValueError("Truncated LEB128 data: last value has no terminator byte")
+        count = terminators.size
+    elif terminators.size < count:
+        raise ValueError(f"Truncated LEB128 data: expected {count} values, got {terminators.size}")
+    
+    dtype = np.int64 if signed else np.uint64
+    if count == 0:
+        return np.empty(0, dtype=dtype), 0
+    
+    ends = terminators[:count]
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    
+    max_length = int(lengths.max())
+    if max_length > MAX_LEB128_BYTES:
+        raise ValueError("LEB128 value too large (>64 bits)")
+    if max_length == MAX_LEB128_BYTES:
+        # A tenth byte may carry bits beyond 64 that only Python ints can hold
+        last_bytes = buf[ends[lengths == MAX_LEB128_BYTES]]
         if signed:
-            encoder.write_signed(value)
+            overflow = (last_bytes != 0x00) & (last_bytes != 0x7F)
         else:
-            encoder.write_unsigned(value)
+            overflow = last_bytes > 0x01
+        if overflow.any():
+            return _decode_leb128_python(data, count, offset, signed)
+    
+    values = np.zeros(count, dtype=np.uint64)
+    for k in range(max_length):
+        active = lengths > k
+        group = (buf[starts[active] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+        if active.all():
+            values |= group
+        else:
+            values[active] |= group
+    
+    if signed:
+        sign_bits = np.uint64(7) * lengths.astype(np.uint64)
+        negative = ((buf[ends] & 0x40) != 0) & (sign_bits < 64)
+        if negative.any():
+            values[negative] |= ~np.uint64(0) << sign_bits[negative]
+        values = values.view(np.int64)
     
-    return encoder.get_bytes()
+    return values, int(ends[-1]) + 1
+
+
+def encode_batch_leb128(values: List[int], signed: bool = False) -> bytes:
+    """
+    Encode a batch of integers efficiently
+    
+    Args:
+        values: List of integers
+        signed: Whether to use signed encoding
+        
+    Returns:
+        Encoded bytes with count prefix
+    """
+    return encode_leb128(len(values)) + encode_leb128_array(values, signed=signed)
 
 
 def decode_batch_leb128(data: bytes, signed: bool = False) -> List[int]:
@@ -362,18 +569,7 @@ def decode_batch_leb128(data: bytes, signed: bool = False) -> List[int]:
     Returns:
         List of decoded integers
     """
-    decoder = LEB128Decoder(data)
-    
-    # Read count
-    count = decoder.read_unsigned()
-    
-    # Read all values
-    values = []
-    for _ in range(count):
-        if signed:
-            values.append(decoder.read_signed())
-        else:
-            values.append(decoder.read_unsigned())
+    count, consumed = decode_leb128(data)
+    values, _ = decode_leb128_array(data, count=count, offset=consumed, signed=signed)
     
-    return values
-        
\ No newline at end of file
+    return values if isinstance(values, list) else values.tolist()
@@ -0,0 +1,408 @@
+"""
+Streaming LEB128 record decoding
+Reads records written by RollingFileWriter in 'leb128' format in chunks,
+so rotated files never have to be loaded into memory at once
+"""
+
+import gzip
+import mmap
+import os
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple, Union
+
+# Record layout written by RollingFileWriter._serialize_leb128:
+#   record_type (1 byte) | timestamp (uLEB128) | seq_id (uLEB128) | field count (uLEB128)
+#   field count x [key length (uLEB128) | key (utf-8) | value tag (1 byte) | value]
+#   separator (0xFF)
+RECORD_SEPARATOR = 0xFF
+
+# Value tags
+VALUE_BOOL = 0
+VALUE_SIGNED = 1
+VALUE_UNSIGNED = 2
+VALUE_FLOAT = 3
+VALUE_STRING = 4
+
+RECORD_TYPES = {0: "update", 1: "event"}
+
+# Longest LEB128 encoding of a 64-bit value
+MAX_VARINT_BYTES = 10
+
+# Largest record accepted when no schema bound is given
+DEFAULT_MAX_RECORD_SIZE = 1 << 20
+
+# Room per value for values replaced by injected faults (type mismatches, corrupted strings)
+FAULT_VALUE_SLACK = 64
+
+_DOUBLE = struct.Struct('<d')
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class IncompleteRecordError(ValueError):
+    """Raised when the buffer ends before the current record is complete"""
+
+    def __init__(self, message: str, required_end: Optional[int] = None):
+        super().__init__(message)
+        self.required_end = required_end  # Buffer end the record needs at least, when known
+
+
+def _read_unsigned(buf: Buffer, pos: int, end: int) -> Tuple[int, int]:
+    """Decode an unsigned LEB128 value at pos, returning (value, next position)"""
+    result = 0
+    shift = 0
+
+    while pos < end:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+
+        if byte < 0x80:
+            return result, pos
+
+        shift += 7
+        if shift > 63:
+            raise ValueError("LEB128 value too large (>64 bits)")
+
+    raise IncompleteRecordError("Buffer ends inside a LEB128 value")
+
+
+def _read_signed(buf: Buffer, pos: int, end: int) -> Tuple[int, int]:
+    """Decode a signed LEB128 value at pos, returning (value, next position)"""
+    result = 0
+    shift = 0
+
+    while pos < end:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            if byte & 0x40:
+                result |= -(1 << shift)
+            return result, pos
+
+        if shift > 63:
+            raise ValueError("Signed LEB128 value too large (>64 bits)")
+
+    raise IncompleteRecordError("Buffer ends inside a signed LEB128 value")
+
+
+def _read_string(buf: Buffer, pos: int, end: int) -> Tuple[str, int]:
+    """Decode a length-prefixed UTF-8 string at pos"""
+    length, pos = _read_unsigned(buf, pos, end)
+    if pos + length > end:
+        raise IncompleteRecordError("Buffer ends inside a string", pos + length)
+
+    # str() decodes straight from the buffer, memoryview slices don't copy
+    return str(buf[pos:pos + length], 'utf-8'), pos + length
+
+
+def decode_leb128_record(buf: Buffer, offset: int = 0, end: int = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Decode one LEB128 record
+
+    Args:
+        buf: bytes, bytearray, memoryview or mmap holding the record
+        offset: Offset of the record's first byte
+        end: End of valid data in buf (default: len(buf))
+
+    Returns:
+        Tuple of (record dict with type/timestamp/seq_id/data, offset after the separator)
+
+    Raises:
+        IncompleteRecordError: If buf ends before the record does
+        ValueError: If the record is malformed
+    """
+    if end is None:
+        end = len(buf)
+    if offset >= end:
+        raise IncompleteRecordError("No data available for record")
+
+    record_type = RECORD_TYPES.get(buf[offset])
+    if record_type is None:
+        raise ValueError(f"Invalid record type byte 0x{buf[offset]:02x} at offset {offset}")
+
+    pos = offset + 1
+    timestamp, pos = _read_unsigned(buf, pos, end)
+    seq_id, pos = _read_unsigned(buf, pos, end)
+    field_count, pos = _read_unsigned(buf, pos, end)
+
+    data = {}
+    for _ in range(field_count):
+        key, pos = _read_string(buf, pos, end)
+
+        if pos >= end:
+            raise IncompleteRecordError("Buffer ends before value tag")
+        tag = buf[pos]
+        pos += 1
+
+        if tag == VALUE_UNSIGNED:
+            value, pos = _read_unsigned(buf, pos, end)
+        elif tag == VALUE_SIGNED:
+            value, pos = _read_signed(buf, pos, end)
+        elif tag == VALUE_FLOAT:
+            if pos + 8 > end:
+                raise IncompleteRecordError("Buffer ends inside a float")
+            value = _DOUBLE.unpack_from(buf, pos)[0]
+            pos += 8
+        elif tag == VALUE_STRING:
+            value, pos = _read_string(buf, pos, end)
+        elif tag == VALUE_BOOL:
+            if pos >= end:
+                raise IncompleteRecordError("Buffer ends inside a bool")
+            value = buf[pos] != 0
+            pos += 1
+        else:
+            raise ValueError(f"Invalid value tag {tag} for field '{key}' at offset {pos - 1}")
+
+        data[key] = value
+
+    if pos >= end:
+        raise IncompleteRecordError("Buffer ends before record separator")
+    if buf[pos] != RECORD_SEPARATOR:
+        raise ValueError(f"Missing record separator at offset {pos}")
+
+    return {
+        'type': record_type,
+        'timestamp': timestamp,
+        'seq_id': seq_id,
+        'data': data
+    }, pos + 1
+
+
+def max_leb128_record_size(schema: Any) -> int:
+    """
+    Largest LEB128 record written for a schema's records
+
+    Args:
+        schema: TelemetrySchema (fields with name, original_type, bits, enum)
+
+    Returns:
+        Size in bytes, including FAULT_VALUE_SLACK per field
+    """
+    size = 1 + 3 * MAX_VARINT_BYTES + 1  # Type, timestamp, seq_id, field count, separator
+    for spec in schema.fields:
+        if spec.original_type == 'bytes':
+            value = MAX_VARINT_BYTES + 4 * (spec.bits // 8)  # UTF-8 string of bits / 8 characters
+        elif spec.original_type == 'enum':
+            value = MAX_VARINT_BYTES + max((len(str(name).encode('utf-8')) for _, name in spec.enum), default=0)
+        else:
+            value = MAX_VARINT_BYTES  # Varint, or an 8-byte float
+        size += MAX_VARINT_BYTES + len(spec.name.encode('utf-8')) + 1 + value + FAULT_VALUE_SLACK
+    return size
+
+
+def _find_separator(buf: memoryview, start: int, end: int) -> int:
+    """Find the next separator byte in buf[start:end], or -1 (error path only)"""
+    step = 4096
+    while start < end:
+        stop = min(end, start + step)
+        index = bytes(buf[start:stop]).find(RECORD_SEPARATOR)
+        if index >= 0:
+            return start + index
+        start = stop
+    return -1
+
+
+class LEB128StreamDecoder:
+    """
+    Buffered streaming decoder for LEB128 record files
+
+    Records are parsed structurally (the 0xFF separator is verified, not
+    searched for, since 0xFF also occurs inside floats and varints). Values
+    that straddle chunk boundaries are completed from the next chunk, up to
+    max_record_size: a longer record (e.g. a corrupt length prefix) is a
+    framing error, so buffered data stays bounded.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, BinaryIO, Buffer],
+        chunk_size: int = 1 << 20,
+        use_mmap: bool = True,
+        skip_errors: bool = False,
+        max_record_size: int = DEFAULT_MAX_RECORD_SIZE
+    ):
+        """
+        Initialize the decoder
+
+        Args:
+            source: Path (.leb128 or .leb128.gz), binary file object, or an
+                in-memory buffer (bytes, bytearray, memoryview, mmap)
+            chunk_size: Bytes read per chunk from file objects
+            use_mmap: Map uncompressed files instead of reading them in chunks
+            skip_errors: Skip malformed records by resyncing on the next
+                separator instead of raising
+            max_record_size: Largest valid record in bytes (see
+                max_leb128_record_size for a schema's bound)
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if max_record_size <= 0:
+            raise ValueError(f"max_record_size must be positive, got {max_record_size}")
+
+        self.source = source
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+        self.skip_errors = skip_errors
+        self.max_record_size = max_record_size
+
+        # Statistics
+        self.records_read = 0
+        self.bytes_consumed = 0
+        self.errors = 0
+        self.skipped_bytes = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_records()
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield decoded records one by one"""
+        source = self.source
+
+        if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            with memoryview(source) as view:
+                yield from self._iter_buffer(view)
+
+        elif isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            if path.endswith('.gz'):
+                with gzip.open(path, 'rb') as f:
+                    yield from self._iter_stream(f)
+            elif self.use_mmap and os.path.getsize(path) > 0:
+                with open(path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view:
+                    yield from self._iter_buffer(view)
+            else:
+                with open(path, 'rb') as f:
+                    yield from self._iter_stream(f)
+
+        else:
+            yield from self._iter_stream(source)
+
+    def _oversized(self, error: IncompleteRecordError, pos: int, end: int) -> Optional[ValueError]:
+        """Framing error for an incomplete record already longer than max_record_size, else None"""
+        if max(end, error.required_end or 0) - pos <= self.max_record_size:
+            return None
+        return ValueError(f"Record exceeds max_record_size ({self.max_record_size:,} bytes)")
+
+    def _handle_error(self, buf: memoryview, pos: int, end: int, error: ValueError) -> Tuple[int, bool]:
+        """
+        Count a malformed record and skip past the next separator
+
+        Returns:
+            (next position, whether a separator was found); without one,
+            everything up to end is skipped and resyncing continues in the
+            next chunk (see _skip)
+        """
+        self.errors += 1
+        if not self.skip_errors:
+            raise ValueError(f"Malformed LEB128 record at offset {self.bytes_consumed}: {error}") from error
+        return self._skip(buf, pos, pos + 1, end)
+
+    def _skip(self, buf: memoryview, pos: int, search_from: int, end: int) -> Tuple[int, bool]:
+        """Skip from pos through the next separator at or after search_from (or to end)"""
+        separator = _find_separator(buf, search_from, end)
+        next_pos = end if separator < 0 else separator + 1
+        self.skipped_bytes += next_pos - pos
+        self.bytes_consumed += next_pos - pos
+        return next_pos, separator >= 0
+
+    def _handle_truncated(self, remaining: int):
+        """Deal with an incomplete record at the end of input"""
+        self.errors += 1
+        if not self.skip_errors:
+            raise ValueError(
+                f"Truncated LEB128 record at offset {self.bytes_consumed}: {remaining} trailing bytes"
+            )
+        self.skipped_bytes += remaining
+        self.bytes_consumed += remaining
+
+    def _iter_buffer(self, buf: memoryview) -> Iterator[Dict[str, Any]]:
+        """Decode records from a complete in-memory buffer without copying it"""
+        pos = 0
+        end = len(buf)
+
+        while pos < end:
+            try:
+                record, next_pos = decode_leb128_record(buf, pos, end)
+            except IncompleteRecordError as e:
+                error = self._oversized(e, pos, end)
+                if error is None:
+                    self._handle_truncated(end - pos)
+                    return
+                pos, _ = self._handle_error(buf, pos, end, error)
+                continue
+            except ValueError as e:
+                pos, _ = self._handle_error(buf, pos, end, e)
+                continue
+
+            self.records_read += 1
+            self.bytes_consumed += next_pos - pos
+            pos = next_pos
+            yield record
+
+    def _iter_stream(self, f: BinaryIO) -> Iterator[Dict[str, Any]]:
+        """Decode records from a file object, chunk_size bytes at a time"""
+        pending = bytearray()
+        pos = 0
+        eof = False
+        resyncing = False  # Skipping a malformed record up to the next separator
+
+        while True:
+            with memoryview(pending) as buf:
+                end = len(buf)
+                while pos < end:
+                    if resyncing:
+                        pos, found = self._skip(buf, pos, pos, end)
+                        resyncing = not found
+                        continue
+                    try:
+                        record, next_pos = decode_leb128_record(buf, pos, end)
+                    except IncompleteRecordError as e:
+                        error = self._oversized(e, pos, end)
+                        if error is None:
+                            break
+                        pos, found = self._handle_error(buf, pos, end, error)
+                        resyncing = not found
+                        continue
+                    except ValueError as e:
+                        pos, found = self._handle_error(buf, pos, end, e)
+                        resyncing = not found
+                        continue
+
+                    self.records_read += 1
+                    self.bytes_consumed += next_pos - pos
+                    pos = next_pos
+                    yield record
+
+            if eof:
+                if pos < len(pending):
+                    self._handle_truncated(len(pending) - pos)
+                return
+
+            # Drop consumed bytes, keep the partial record and append the next chunk
+            del pending[:pos]
+            pos = 0
+            chunk = f.read(self.chunk_size)
+            if chunk:
+                pending += chunk
+            else:
+                eof = True
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get decoding statistics"""
+        return {
+            'records_read': self.records_read,
+            'bytes_consumed': self.bytes_consumed,
+            'errors': self.errors,
+            'skipped_bytes': self.skipped_bytes
+        }
+
+
+def iter_leb128_records(source: Union[str, os.PathLike, BinaryIO, Buffer], **kwargs) -> Iterator[Dict[str, Any]]:
+    """Convenience wrapper: iterate records of a LEB128 file or buffer"""
+    return LEB128StreamDecoder(source, **kwargs).iter_records()
@@ -4,7 +4,7 @@ Output formatters for different formats (JSON, InfluxDB, NDJSON)
 """
 import json
 from typing import Dict, Any
-from .types_and_enums import TelemetryRecord
+from .types_and_enums import TelemetryBatch, TelemetryRecord
 
 class OutputFormatter:
     """Output formatter for various formats"""
@@ -44,6 +44,31 @@ class OutputFormatter:
         except Exception as e:
             raise RuntimeError(f"Unexpected error formatting NDJSON: {e}")
    
+    def format_ndjson_batch(self, batch: TelemetryBatch) -> str:
+        """
+        Format a TelemetryBatch as NDJSON
+        
+        Same lines as format_ndjson on each record of the batch; each
+        column is converted to Python values once.
+        """
+        try:
+            dumps = json.JSONEncoder(separators=(',', ':')).encode
+            lines = [
+                dumps({
+                    'schema': self.schema_name,
+                    'type': record.record_type.value,
+                    'timestamp': record.timestamp,
+                    'seq_id': record.sequence_id,
+                    'data': record.data
+                })
+                for record in batch.records()
+            ]
+            return '\n'.join(lines) + '\n' if lines else ''
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Failed to serialize batch to NDJSON: {e}")
+        except Exception as e:
+            raise RuntimeError(f"Unexpected error formatting NDJSON: {e}")
+   
     def format_influx_line(self, record: TelemetryRecord, measurement: str = "telemetry") -> str:
         """Convert record to InfluxDB Line Protocol format"""
         try:
@@ -103,6 +128,10 @@ class OutputFormatter:
                 raise
             raise RuntimeError(f"Unexpected error formatting InfluxDB line: {e}")
    
+    def format_influx_batch(self, batch: TelemetryBatch, measurement: str = "telemetry") -> str:
+        """Format a TelemetryBatch as InfluxDB Line Protocol (one line per record)"""
+        return ''.join(self.format_influx_line(record, measurement) for record in batch.records())
+   
     def prepare_json_array_data(self, record: TelemetryRecord) -> Dict[str, Any]:
         """Prepare data for JSON array"""
         try:
@@ -4,7 +4,7 @@ GPU-accelerated data generation class with fallback to numpy and pure Python
 """
 
 import random
-from typing import List
+from typing import List, Union
 
 # Check library availability
 try:
@@ -19,12 +19,17 @@ try:
 except ImportError:
     HAS_NUMPY = False
 
+UINT64_MAX = (1 << 64) - 1
+INT64_MAX = (1 << 63) - 1
+
 class GPUAcceleratedGenerator:
     """Class for GPU-accelerated data generation"""
     
     def __init__(self, use_gpu: bool = True):
         self.use_gpu = False
-        self.xp = None
+        self.xp = np if HAS_NUMPY else None
+        # NumPy generator: full-width uint64 draws, unlike np.random.randint
+        self._rng = np.random.default_rng() if HAS_NUMPY else None
         
         if use_gpu:
             try:
@@ -38,15 +43,17 @@ class GPUAcceleratedGenerator:
                 
             except (ImportError, Exception) as e:
                 self.use_gpu = False
-                try:
-                    import numpy as np
-                    self.xp = np
-                except ImportError:
-                    self.xp = None
+                self.xp = np if HAS_NUMPY else None
     
     def generate_batch_int(self, batch_size: int, num_fields: int, 
-                          max_bits: int = 32) -> List[List[int]]:
-        """Generate batch of integer values"""
+                          max_bits: int = 32) -> Union['np.ndarray', List[List[int]]]:
+        """
+        Generate batch of integer values
+        
+        Returns:
+            (batch_size, num_fields) host numpy array; nested lists only on
+            the pure Python fallback
+        """
         if not self.xp:
             # Fallback to pure Python
             try:
@@ -63,18 +70,22 @@ class GPUAcceleratedGenerator:
         try:
             max_val = (1 << max_bits) - 1
             
+            if not self.use_gpu:
+                return self._rng.integers(0, max_val, (batch_size, num_fields),
+                                          dtype=np.uint64, endpoint=True)
+            
             batch = self.xp.random.randint(0, max_val, (batch_size, num_fields))
             
             if self.use_gpu:
                 try:
-                    return batch.get().tolist()
+                    return batch.get()  # Device to host copy, stays an array
                 except Exception as e:
                     # Fallback if GPU memory transfer fails
                     self.use_gpu = False
                     self.xp = np if HAS_NUMPY else None
                     return self.generate_batch_int(batch_size, num_fields, max_bits)
             else:
-                return batch.tolist()
+                return batch
                 
         except Exception as e:
             # Complete fallback to Python
@@ -91,8 +102,14 @@ class GPUAcceleratedGenerator:
                         for _ in range(num_fields)] 
                        for _ in range(batch_size)]
 
-    def generate_batch_float(self, batch_size: int, num_fields: int) -> List[List[float]]:
-        """Generate batch of float values"""
+    def generate_batch_float(self, batch_size: int, num_fields: int) -> Union['np.ndarray', List[List[float]]]:
+        """
+        Generate batch of float values
+        
+        Returns:
+            (batch_size, num_fields) host numpy array; nested lists only on
+            the pure Python fallback
+        """
         if not self.xp:
             # Fallback to pure Python
             try:
@@ -104,18 +121,21 @@ class GPUAcceleratedGenerator:
                        for _ in range(batch_size)]
         
         try:
+            if not self.use_gpu:
+                return self._rng.random((batch_size, num_fields))
+            
             batch = self.xp.random.random((batch_size, num_fields))
             
             if self.use_gpu:
                 try:
-                    return batch.get().tolist()
+                    return batch.get()  # Device to host copy, stays an array
                 except Exception as e:
                     # Fallback if GPU memory transfer fails
                     self.use_gpu = False
                     self.xp = np if HAS_NUMPY else None
                     return self.generate_batch_float(batch_size, num_fields)
             else:
-                return batch.tolist()
+                return batch
                 
         except Exception as e:
             # Complete fallback to Python
@@ -127,4 +147,65 @@ class GPUAcceleratedGenerator:
             except Exception:
                 # Ultimate safe fallback
                 return [[0.5 for _ in range(num_fields)] 
-                       for _ in range(batch_size)]
\ No newline at end of file
+                       for _ in range(batch_size)]
+
+    def generate_column_int(self, count: int, low: int, high: int) -> Union['np.ndarray', List[int]]:
+        """
+        Generate one integer column, uniform over [low, high]
+        
+        Returns:
+            Host numpy array, uint64 when high exceeds int64 and int64
+            otherwise; a list only on the pure Python fallback
+        """
+        if not self.xp:
+            return [random.randint(low, high) for _ in range(count)]
+        
+        try:
+            wide = high > INT64_MAX
+            if not self.use_gpu:
+                return self._rng.integers(low, high, count, dtype=np.uint64 if wide else np.int64,
+                                          endpoint=True)
+            
+            if not wide:
+                return self.xp.random.randint(low, high + 1, count, dtype=self.xp.int64).get()
+            
+            # CuPy draws are bounded by int64: combine two 32-bit halves
+            halves = self.xp.random.randint(0, 1 << 32, (count, 2), dtype=self.xp.int64).astype(self.xp.uint64)
+            column = (halves[:, 0] << self.xp.uint64(32)) | halves[:, 1]
+            span = high - low + 1
+            if span <= UINT64_MAX:
+                column = self.xp.uint64(low) + column % self.xp.uint64(span)
+            return column.get()
+            
+        except Exception:
+            # Retry on the host
+            if self.use_gpu:
+                self.use_gpu = False
+                self.xp = np if HAS_NUMPY else None
+                return self.generate_column_int(count, low, high)
+            self.xp = None
+            return [random.randint(low, high) for _ in range(count)]
+
+    def generate_column_float(self, count: int, low: float, high: float) -> Union['np.ndarray', List[float]]:
+        """
+        Generate one float column, uniform over [low, high)
+        
+        Returns:
+            Host float64 numpy array; a list only on the pure Python fallback
+        """
+        if not self.xp:
+            return [random.uniform(low, high) for _ in range(count)]
+        
+        try:
+            if not self.use_gpu:
+                return self._rng.uniform(low, high, count)
+            return self.xp.random.uniform(low, high, count).get()
+            
+        except Exception:
+            # Retry on the host
+            if self.use_gpu:
+                self.use_gpu = False
+                self.xp = np if HAS_NUMPY else None
+                return self.generate_column_float(count, low, high)
+            self.xp = None
+            return [random.uniform(low, high) for _ in range(count)]
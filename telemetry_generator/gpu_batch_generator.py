@@ -4,22 +4,51 @@ GPU-accelerated batch generation for telemetry records
 """
 
 import time
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from .types_and_enums import RecordType, TelemetryRecord
+from .types_and_enums import HAS_NUMPY, RecordType, TelemetryBatch, TelemetryRecord
 from .data_generators import FieldDataGenerator
+from .value_pools import DeviceIdPool
+from .distributions import compile_samplers
+
+if HAS_NUMPY:
+    from .timeseries import TimeSeriesEngine
+    from .column_samplers import ColumnSamplerTable
 
 class GPUBatchGenerator:
     """Class for generating batches with GPU acceleration"""
     
-    def __init__(self, schema_processor, gpu_generator):
+    def __init__(self, schema_processor, gpu_generator, fault_injector=None):
         self.schema_processor = schema_processor
         self.gpu_generator = gpu_generator
+        self.fault_injector = fault_injector
+        self.last_fault_log = None  # FaultLog of the last accelerated batch
+        self.series_engine = TimeSeriesEngine.from_schema(schema_processor) if HAS_NUMPY else None
+        self.device_pool = DeviceIdPool.from_schema(schema_processor)
+        self.samplers = compile_samplers(schema_processor)
+        self._fallback_populator = None
+        self._column_table = None
+        self._column_table_fields = None
         try:
             self.field_generator = FieldDataGenerator()
         except Exception as e:
             raise RuntimeError(f"Failed to initialize field generator: {e}")
     
+    @property
+    def column_table(self) -> 'ColumnSamplerTable':
+        """Per-field column samplers for the processor's current fields"""
+        fields = self.schema_processor.fields
+        if self._column_table is None or fields is not self._column_table_fields:
+            accelerator = self.gpu_generator if getattr(self.gpu_generator, 'use_gpu', False) else None
+            self._column_table = ColumnSamplerTable(
+                self.schema_processor,
+                accelerator=accelerator,
+                samplers=self.samplers,
+                device_pool=self.device_pool
+            )
+            self._column_table_fields = fields
+        return self._column_table
+    
     def generate_batch_gpu_accelerated(
         self, 
         batch_size: int,
@@ -28,100 +57,11 @@ class GPUBatchGenerator:
     ) -> List[TelemetryRecord]:
         """Generate batch of records with GPU acceleration"""
         try:
-            if not self.gpu_generator:
+            if not self.gpu_generator or not HAS_NUMPY:
                 # Fallback to regular generation
                 return self._generate_batch_fallback(batch_size, record_type, next_seq_id)
             
-            records = []
-            timestamp_base = time.time_ns()
-            
-            # Calculate number of fields of each type
-            int_fields = []
-            float_fields = []
-            
-            try:
-                for field in self.schema_processor.fields:
-                    field_type = field.get("type", "")
-                    if "int" in field_type or "uint" in field_type:
-                        int_fields.append(field)
-                    elif "float" in field_type:
-                        float_fields.append(field)
-            except (AttributeError, KeyError) as e:
-                raise ValueError(f"Invalid schema field structure: {e}")
-            
-            # Generate batches with GPU
-            int_batch = []
-            float_batch = []
-            
-            try:
-                if int_fields:
-                    max_bits = max(field.get("bits", 32) for field in int_fields)
-                    int_batch = self.gpu_generator.generate_batch_int(
-                        batch_size, len(int_fields), max_bits
-                    )
-                
-                if float_fields:
-                    float_batch = self.gpu_generator.generate_batch_float(
-                        batch_size, len(float_fields)
-                    )
-            except Exception as e:
-                raise RuntimeError(f"GPU batch generation failed: {e}")
-            
-            # Assemble records
-            for i in range(batch_size):
-                try:
-                    data = {}
-                    
-                    # Integer and float field indices
-                    int_idx = 0
-                    float_idx = 0
-                    
-                    for field in self.schema_processor.fields:
-                        try:
-                            field_name = field.get("name", f"field_{int_idx + float_idx}")
-                            field_type = field.get("type", "")
-                            
-                            if "int" in field_type or "uint" in field_type:
-                                if int_batch and int_idx < len(int_fields):
-                                    raw_value = int_batch[i][int_idx]
-                                    field_bits = field.get("bits", 32)
-                                    data[field_name] = raw_value & ((1 << field_bits) - 1)
-                                    int_idx += 1
-                                else:
-                                    data[field_name] = self.field_generator.generate_generic_field_value(field)
-                            
-                            elif "float" in field_type:
-                                if float_batch and float_idx < len(float_fields):
-                                    data[field_name] = float_batch[i][float_idx] * 1000 - 500  # scale
-                                    float_idx += 1
-                                else:
-                                    data[field_name] = self.field_generator.generate_generic_field_value(field)
-                            
-                            else:
-                                # Other fields (string, enum, etc.)
-                                data[field_name] = self.field_generator.generate_generic_field_value(field)
-                                
-                        except Exception as e:
-                            # Continue with fallback value for this field
-                            data[field_name] = 0
-                            continue
-                    
-                    # Override with specific values
-                    seq_id = next_seq_id + i
-                    data["seq_no"] = seq_id
-                    data["timestamp_ns"] = timestamp_base + i
-                    
-                    record = TelemetryRecord(
-                        record_type=record_type,
-                        timestamp=timestamp_base + i,
-                        sequence_id=seq_id,
-                        data=data
-                    )
-                    records.append(record)
-                    
-                except Exception as e:
-                    # Log error but continue with next record
-                    continue
+            records = list(self.generate_telemetry_batch(batch_size, record_type, next_seq_id).records())
             
             if not records:
                 raise RuntimeError("Failed to generate any records in batch")
@@ -133,6 +73,72 @@ class GPUBatchGenerator:
                 raise
             raise RuntimeError(f"Unexpected error in GPU batch generation: {e}")
     
+    def generate_telemetry_batch(
+        self,
+        batch_size: int,
+        record_type: RecordType = RecordType.UPDATE,
+        next_seq_id: int = 1
+    ) -> TelemetryBatch:
+        """
+        Generate a batch without building records
+        
+        Record timestamps are consecutive nanoseconds from now; the
+        timestamp_ns column holds the same values unless faults changed them.
+        
+        Args:
+            batch_size: Number of records
+            record_type: Type of every record
+            next_seq_id: sequence_id of the first record
+            
+        Returns:
+            TelemetryBatch over generate_columns()
+        """
+        timestamp_base = time.time_ns()
+        columns = self.generate_columns(batch_size, next_seq_id, timestamp_base)
+        return TelemetryBatch(columns, record_type, next_seq_id,
+                              timestamps=range(timestamp_base, timestamp_base + batch_size))
+    
+    def generate_columns(
+        self,
+        batch_size: int,
+        next_seq_id: int = 1,
+        timestamp_base: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a batch as columns, without building records
+        
+        Every column is an array drawn with its field's dtype and range (see
+        ColumnSamplerTable), ready for BinaryRecordPacker.pack_columns or the
+        columnar formatters.
+        Faults are injected column-wise (see last_fault_log).
+        
+        Args:
+            batch_size: Number of rows
+            next_seq_id: seq_no of the first row
+            timestamp_base: timestamp_ns of the first row (default: now)
+            
+        Returns:
+            Field name -> column
+        """
+        if not HAS_NUMPY:
+            raise ValueError("Columnar generation requires numpy")
+        if timestamp_base is None:
+            timestamp_base = time.time_ns()
+        
+        # One draw per field with its own dtype and range (distributions included)
+        columns = self.column_table.sample(batch_size, next_seq_id, timestamp_base)
+        
+        # Fleet identity and values from the stateful series
+        if self.series_engine:
+            columns.update(self.series_engine.next_batch(batch_size))
+        
+        # Inject faults column-wise for the whole batch
+        self.last_fault_log = None
+        if self.fault_injector:
+            self.last_fault_log = self.fault_injector.inject_faults_batch(columns)
+        
+        return columns
+    
     def _generate_batch_fallback(
         self, 
         batch_size: int, 
@@ -143,7 +149,13 @@ class GPUBatchGenerator:
         try:
             from .data_generators import RecordDataPopulator
             
-            populator = RecordDataPopulator(self.schema_processor)
+            # Kept across batches so the series state carries over
+            if self._fallback_populator is None:
+                self._fallback_populator = RecordDataPopulator(self.schema_processor)
+                self._fallback_populator.series_engine = self.series_engine
+                self._fallback_populator.device_pool = self.device_pool
+                self._fallback_populator.samplers = self.samplers
+            populator = self._fallback_populator
             records = []
             
             for i in range(batch_size):
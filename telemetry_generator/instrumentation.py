@@ -0,0 +1,355 @@
+"""
+instrumentation.py
+Per-stage counters and latency histograms for the generation pipeline
+
+Each thread records into its own shard (plain lists indexed by stage), so
+the hot path takes no lock; shards are only merged by snapshot(). Latencies
+go into log-linear (HDR-style) histograms with a fixed relative error, so
+percentiles stay cheap to record and merge however long a run lasts.
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+STAGES = (
+    'generation',
+    'fault_injection',
+    'serialization',
+    'compression',
+    'write',
+    'rotation',
+    'rate_limit_sleep'
+)
+
+_STAGE_INDEX = {stage: index for index, stage in enumerate(STAGES)}
+
+# 2**SUB_BUCKET_BITS linear sub-buckets per power of two: values are
+# recorded with a relative error below 2**-(SUB_BUCKET_BITS - 1) (~1.6%)
+SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF = _SUB_BUCKETS >> 1
+_BUCKET_COUNT = (66 - SUB_BUCKET_BITS) * _HALF  # Covers values below 2**64
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+# Sampling rate for per-record methods timed through Instrumentation.wrap
+PER_RECORD_SAMPLE_EVERY = 64
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return shift * _HALF + (value >> shift)
+
+
+def _bucket_high(index: int) -> int:
+    """Largest value recorded into a bucket"""
+    if index < _SUB_BUCKETS:
+        return index
+    shift = index // _HALF - 1
+    return ((index - shift * _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of non-negative integer values (nanoseconds)"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, value: int):
+        """Record one value; negative values are clamped to 0"""
+        if value < 0:
+            value = 0
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's values to this one"""
+        if not other.count:
+            return
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentile(self, percent: float) -> int:
+        """
+        Value at a percentile (0-100)
+
+        Returns the largest value of the bucket holding that rank, capped
+        at the recorded maximum (0 for an empty histogram).
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_high(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary statistics (values in nanoseconds)"""
+        summary = {"count": self.count, "min": self.min or 0, "mean": round(self.mean, 1)}
+        for percent in PERCENTILES:
+            summary[f"p{percent:g}".replace('.', '_')] = self.percentile(percent)
+        summary["max"] = self.max
+        return summary
+
+
+class _StageShard:
+    """One thread's counters, indexed like STAGES"""
+
+    __slots__ = ('calls', 'items', 'nanos', 'nbytes', 'histograms', 'recorded_ns')
+
+    def __init__(self):
+        self.calls = [0] * len(STAGES)
+        self.items = [0] * len(STAGES)
+        self.nanos = [0] * len(STAGES)
+        self.nbytes = [0] * len(STAGES)
+        self.histograms = [LatencyHistogram() for _ in STAGES]
+        self.recorded_ns = 0  # All stages, for excluding nested stages
+
+
+class StageTimer:
+    """
+    Times one call of a stage (see Instrumentation.stage)
+
+    Time recorded by nested stages on the same thread is subtracted, so
+    each stage reports exclusive time. items and nbytes may be set inside
+    the with block once they are known.
+    """
+
+    __slots__ = ('instrumentation', 'stage', 'items', 'nbytes', 'weight', '_shard', '_nested', '_start')
+
+    def __init__(self, instrumentation: 'Instrumentation', stage: str, items: int = 1, nbytes: int = 0,
+                 weight: int = 1):
+        self.instrumentation = instrumentation
+        self.stage = stage
+        self.items = items
+        self.nbytes = nbytes
+        self.weight = weight
+
+    def __enter__(self) -> 'StageTimer':
+        self._shard = self.instrumentation._shard()
+        self._nested = self._shard.recorded_ns
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        elapsed = time.perf_counter_ns() - self._start - (self._shard.recorded_ns - self._nested)
+        if elapsed < 0:  # Sampled nested stages are estimates
+            elapsed = 0
+        self.instrumentation.record(self.stage, elapsed, self.items, self.nbytes, self.weight)
+        return False
+
+
+class _NullTimer:
+    """Stand-in for StageTimer when instrumentation is off"""
+
+    __slots__ = ('items', 'nbytes')
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def null_stage(stage: str, items: int = 1, nbytes: int = 0) -> _NullTimer:
+    """Instrumentation.stage replacement that records nothing"""
+    return _NULL_TIMER
+
+
+class Instrumentation:
+    """
+    Pipeline stage timings
+
+    Stages are timed per batch or per buffered I/O call rather than per
+    record, which keeps the overhead far below the timed work; per-record
+    calls inside other components are sampled (see wrap).
+
+    Example:
+        with instrumentation.stage('generation', items=batch_size):
+            records = generate(batch_size)
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_StageShard] = []
+        self._lock = threading.Lock()  # Shard registration only
+        self.start_time = time.perf_counter()
+
+    def _shard(self) -> _StageShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _StageShard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def record(self, stage: str, elapsed_ns: int, items: int = 1, nbytes: int = 0, weight: int = 1):
+        """
+        Record one timed call of a stage
+
+        Args:
+            stage: One of STAGES
+            elapsed_ns: Time spent in the call
+            items: Records handled by the call
+            nbytes: Bytes handled by the call
+            weight: Calls the measurement stands for (1 in weight calls sampled)
+        """
+        shard = self._shard()
+        index = _STAGE_INDEX[stage]
+        total_ns = elapsed_ns * weight
+        shard.calls[index] += weight
+        shard.items[index] += items * weight
+        shard.nanos[index] += total_ns
+        shard.nbytes[index] += nbytes * weight
+        shard.recorded_ns += total_ns
+        shard.histograms[index].record(elapsed_ns)
+
+    def stage(self, stage: str, items: int = 1, nbytes: int = 0) -> StageTimer:
+        """Context manager timing one call of a stage"""
+        return StageTimer(self, stage, items, nbytes)
+
+    def wrap(self, owner: Any, method_name: str, stage: str, sample_every: int = 1) -> bool:
+        """
+        Time calls of a method on one object as a stage
+
+        The bound method is replaced by a timing wrapper on the instance
+        only. For per-record methods, sample_every > 1 times one call in
+        sample_every and weights it accordingly; the sampling counter is
+        shared by all threads without a lock, so the rate is approximate.
+
+        Returns:
+            Whether the object has the method
+        """
+        method = getattr(owner, method_name, None)
+        if not callable(method):
+            return False
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be at least 1, got {sample_every}")
+        calls = 0
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls % sample_every:
+                return method(*args, **kwargs)
+            with StageTimer(self, stage, weight=sample_every):
+                return method(*args, **kwargs)
+
+        setattr(owner, method_name, timed)
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Merge all shards into a JSON-ready report
+
+        Shards are read while writers keep going, so counts may trail
+        in-flight updates slightly.
+
+        Returns:
+            Dictionary with elapsed_seconds, per-stage statistics (exclusive
+            time) and the busiest stage as 'limiting_stage'
+        """
+        with self._lock:
+            shards = list(self._shards)
+        elapsed = time.perf_counter() - self.start_time
+
+        stages = {}
+        for index, stage in enumerate(STAGES):
+            calls = sum(shard.calls[index] for shard in shards)
+            if not calls:
+                continue
+            items = sum(shard.items[index] for shard in shards)
+            nanos = sum(shard.nanos[index] for shard in shards)
+            histogram = LatencyHistogram()
+            for shard in shards:
+                histogram.merge(shard.histograms[index])
+            stages[stage] = {
+                "calls": calls,
+                "items": items,
+                "bytes": sum(shard.nbytes[index] for shard in shards),
+                "total_seconds": nanos / 1e9,
+                "share_percent": round(100 * nanos / 1e9 / elapsed, 2) if elapsed > 0 else 0.0,
+                "ns_per_item": round(nanos / items, 1) if items else None,
+                "latency_ns": histogram.to_dict()
+            }
+
+        limiting = max(stages, key=lambda stage: stages[stage]["total_seconds"]) if stages else None
+        return {
+            "elapsed_seconds": elapsed,
+            "threads": len(shards),
+            "stages": stages,
+            "limiting_stage": limiting
+        }
+
+    def stats_line(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """One-line summary: share of wall time and p99 latency per stage"""
+        snapshot = snapshot or self.snapshot()
+        parts = []
+        for stage, stats in snapshot["stages"].items():
+            parts.append(f"{stage} {stats['share_percent']:.1f}% p99 {format_ns(stats['latency_ns']['p99'])}")
+        return " | ".join(parts) or "no stages recorded"
+
+
+class TimedWriteFile:
+    """
+    File proxy recording each write() as the 'write' stage
+
+    Placed under a buffering or compressing layer (e.g. as a GzipFile's
+    fileobj), so only the comparatively rare flushes to the OS are timed.
+    Other attributes are passed through to the wrapped file.
+    """
+
+    def __init__(self, file: Any, instrumentation: Instrumentation):
+        self._file = file
+        self._instrumentation = instrumentation
+
+    def write(self, data) -> int:
+        if not data:
+            return self._file.write(data)
+        with StageTimer(self._instrumentation, 'write') as timer:
+            written = self._file.write(data)
+            timer.nbytes = len(data)
+        return written
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+
+def format_ns(value: float) -> str:
+    """Human-readable duration from nanoseconds"""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= scale:
+            return f"{value / scale:.1f}{unit}"
+    return f"{value:.0f}ns"
@@ -0,0 +1,268 @@
+"""
+metrics_exporter.py
+Prometheus /metrics endpoint for long-running generation
+
+A stdlib http.server runs in a daemon thread and renders the metrics of a
+collect() callback in the Prometheus text exposition format on each scrape.
+GenerationMetrics collects the live state of a generate run.
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+METRIC_TYPES = ('counter', 'gauge')
+
+
+@dataclass
+class Metric:
+    """One metric family: samples are (labels, value) pairs"""
+    name: str
+    type: str
+    help: str
+    samples: List[Tuple[Dict[str, str], float]] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.type not in METRIC_TYPES:
+            raise ValueError(f"Unknown metric type '{self.type}', expected one of {METRIC_TYPES}")
+
+    def add(self, value: float, **labels: str) -> 'Metric':
+        self.samples.append((labels, value))
+        return self
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def render_metrics(metrics: List[Metric]) -> str:
+    """Metrics in the Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for labels, value in metric.samples:
+            label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            name = f"{metric.name}{{{label_text}}}" if label_text else metric.name
+            lines.append(f"{name} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """
+    Serves GET /metrics from a background thread
+
+    Example:
+        exporter = MetricsExporter(metrics.collect, port=9100)
+        exporter.start()
+        ...
+        exporter.stop()
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[], List[Metric]],
+        port: int = 0,
+        host: str = '127.0.0.1',
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the exporter
+
+        Args:
+            collect: Returns the metrics to render, called once per scrape
+            port: TCP port to listen on (0 picks a free port)
+            host: Interface to bind (default: local only)
+            logger: Optional logger instance
+        """
+        if not 0 <= port <= 65535:
+            raise ValueError(f"port must be between 0 and 65535, got {port}")
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self.logger = logger or logging.getLogger(__name__)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler(self):
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404, "Only /metrics is served")
+                    return
+                try:
+                    body = render_metrics(exporter.collect()).encode('utf-8')
+                except Exception as e:
+                    exporter.logger.error(f"Metrics collection failed: {e}")
+                    self.send_error(500, "Metrics collection failed")
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                exporter.logger.debug(f"Metrics request: {format % args}")
+
+        return MetricsHandler
+
+    def start(self) -> int:
+        """
+        Start serving in a daemon thread
+
+        Returns:
+            The bound port
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        if self._server:
+            return self.port
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='telegen-metrics', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Serving metrics on {self.url}")
+        return self.port
+
+    def stop(self):
+        """Stop serving and release the port"""
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class GenerationMetrics:
+    """
+    Live state of a generate run, collected for /metrics
+
+    The generation loop sets records_generated, faulty_records and
+    batch_in_flight; everything else is read from the components on each
+    scrape. batch_in_flight is the records generated but not yet written,
+    the only queue in the single-threaded loop.
+    """
+
+    def __init__(
+        self,
+        target_rate: float,
+        writer: Any = None,
+        rate_limiter: Any = None,
+        fault_statistics: Any = None,
+        fault_log_writer: Any = None,
+        instrumentation: Any = None
+    ):
+        """
+        Args:
+            target_rate: Configured records/sec
+            writer: RollingFileWriter of the run
+            rate_limiter: RateLimiter of the run
+            fault_statistics: FaultStatistics of the fault injector, if any
+            fault_log_writer: FaultLogWriter, if fault logs are written
+            instrumentation: Instrumentation, if stages are timed
+        """
+        self.target_rate = target_rate
+        self.writer = writer
+        self.rate_limiter = rate_limiter
+        self.fault_statistics = fault_statistics
+        self.fault_log_writer = fault_log_writer
+        self.instrumentation = instrumentation
+        self.start_time = time.time()
+
+        self.records_generated = 0
+        self.faulty_records = 0
+        self.batch_in_flight = 0
+
+    def collect(self) -> List[Metric]:
+        """Current metric values"""
+        metrics = [
+            Metric('telegen_start_time_seconds', 'gauge', "Unix time the run started").add(self.start_time),
+            Metric('telegen_records_generated_total', 'counter', "Records generated").add(self.records_generated),
+            Metric('telegen_faulty_records_total', 'counter',
+                   "Generated records with at least one injected fault").add(self.faulty_records),
+            Metric('telegen_target_rate_records_per_second', 'gauge', "Configured generation rate").add(self.target_rate),
+            Metric('telegen_queue_depth', 'gauge',
+                   "Records waiting in a pipeline queue").add(self.batch_in_flight, queue='batch'),
+        ]
+
+        if self.rate_limiter:
+            stats = self.rate_limiter.get_stats()
+            metrics += [
+                Metric('telegen_actual_rate_records_per_second', 'gauge',
+                       "Average achieved rate since the rate limiter started").add(stats.actual_rate),
+                Metric('telegen_rate_limiter_records_total', 'counter',
+                       "Records paced by the rate limiter").add(stats.total_records),
+                Metric('telegen_rate_limiter_sleep_seconds_total', 'counter',
+                       "Time the rate limiter slept").add(stats.sleep_time_total),
+                Metric('telegen_rate_limiter_overshoots_total', 'counter',
+                       "Sleeps that overran their target by more than 10%").add(stats.overshoots),
+                Metric('telegen_rate_limiter_undershoots_total', 'counter',
+                       "Batches more than one batch interval behind schedule").add(stats.undershoots),
+            ]
+
+        if self.writer:
+            metrics += [
+                Metric('telegen_records_written_total', 'counter',
+                       "Records written to data files").add(self.writer.total_records_written),
+                Metric('telegen_bytes_written_total', 'counter',
+                       "Bytes written to data files, before compression").add(self.writer.total_bytes_written),
+                Metric('telegen_files_rotated_total', 'counter', "Data files opened").add(self.writer.file_count),
+            ]
+
+        if self.fault_statistics:
+            snapshot = self.fault_statistics.snapshot()
+            faults = Metric('telegen_faults_injected_total', 'counter', "Injected faults by type")
+            for fault_type, count in snapshot.fault_counts.items():
+                faults.add(count, fault_type=getattr(fault_type, 'value', fault_type))
+            metrics.append(faults)
+
+        if self.fault_log_writer:
+            metrics.append(Metric('telegen_fault_log_entries_total', 'counter',
+                                  "Faults written to fault log files").add(self.fault_log_writer.faults_written))
+
+        if self.instrumentation:
+            stages = self.instrumentation.snapshot()['stages']
+            seconds = Metric('telegen_stage_seconds_total', 'counter', "Exclusive time spent per pipeline stage")
+            items = Metric('telegen_stage_items_total', 'counter', "Records handled per pipeline stage")
+            for stage, stats in stages.items():
+                seconds.add(stats['total_seconds'], stage=stage)
+                items.add(stats['items'], stage=stage)
+            metrics += [seconds, items]
+
+        return metrics
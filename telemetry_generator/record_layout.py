@@ -0,0 +1,451 @@
+"""
+Compiled record layout shared by the binary packer and reader
+"""
+
+import math
+import operator
+import struct
+from typing import Dict, Any, Mapping, Optional, Tuple, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .binary_schema import BinarySchemaProcessor
+from .value_pools import encode_ascii
+
+# struct codes for byte-aligned fields, by (kind, width in bytes)
+_STRUCT_CODES = {
+    ("unsigned", 1): "B", ("unsigned", 2): "H", ("unsigned", 4): "I", ("unsigned", 8): "Q",
+    ("signed", 1): "b", ("signed", 2): "h", ("signed", 4): "i", ("signed", 8): "q",
+    ("other", 1): "B", ("other", 2): "H", ("other", 4): "I", ("other", 8): "Q",
+}
+
+_FLOAT_CODES = {("np.float32", 32): "f", ("np.float64", 64): "d"}
+
+FLOAT_TYPES = ("np.float32", "np.float64")
+
+
+def field_kind(field_type: str) -> str:
+    """
+    Classify a mapped field type the way BinaryRecordPacker._pack_field does
+
+    Returns:
+        One of 'bytes', 'float', 'unsigned', 'signed' or 'other'
+    """
+    if field_type == "np.bytes_":
+        return "bytes"
+    if field_type in FLOAT_TYPES:
+        return "float"
+    lowered = field_type.lower()
+    if "uint" in lowered:
+        return "unsigned"
+    if "int" in lowered:
+        return "signed"
+    return "other"
+
+
+class RecordLayout:
+    """
+    Decode/encode plan compiled once from a schema
+
+    Byte-aligned fields whose width matches a C type are packed and unpacked
+    with a single struct.Struct covering the whole record; remaining bit
+    fields are read and written as shift/mask operations on the record as
+    one integer. Bit numbering follows BinaryRecordPacker._write_bits: for
+    little-endian records bit N is bit N of the little-endian integer, for
+    big-endian records bits are numbered MSB first.
+    """
+
+    def __init__(self, processor: BinarySchemaProcessor):
+        """
+        Compile the layout
+
+        Args:
+            processor: Schema processor (or anything with fields, endianness and total_bits)
+        """
+        self.endianness = processor.endianness
+        self.byteorder = 'little' if self.endianness == 'little' else 'big'
+        self.record_size = math.ceil(processor.total_bits / 8)
+
+        fields = sorted(processor.fields, key=lambda f: f["start_bit"])
+        self.field_names: Tuple[str, ...] = tuple(f["name"] for f in fields)
+
+        # Plan covers the record, or the fields if they run past total_bits
+        end_byte = max([(f["end_bit"] // 8) + 1 for f in fields] + [self.record_size])
+        self.size = end_byte
+
+        struct_format = ['<' if self.byteorder == 'little' else '>']
+        struct_names = []
+        struct_enums = []
+        struct_bytes = []
+        bit_fields = []
+        enum_labels = []
+        column_fields = []
+        offset = 0
+
+        for field in fields:
+            name = field["name"]
+            start_bit = field["start_bit"]
+            bits = field["bits"]
+            kind = field_kind(field["type"])
+            enum = field.get("enum") or {}
+
+            reverse = None
+            if enum:
+                reverse = {}
+                for key, value in enum.items():
+                    reverse.setdefault(value, int(key))
+                enum_labels.append((name, {int(key): value for key, value in enum.items()}))
+
+            code = None
+            if kind == "bytes":
+                # Written whole bytes from start_bit // 8, like _pack_field
+                if start_bit // 8 < offset:
+                    raise ValueError(f"Field '{name}' overlaps the previous byte-aligned field")
+                code = f"{bits // 8}s"
+            elif start_bit % 8 == 0 and bits % 8 == 0 and start_bit // 8 >= offset:
+                if kind == "float":
+                    code = _FLOAT_CODES.get((field["type"], bits))
+                else:
+                    code = _STRUCT_CODES.get((kind, bits // 8))
+
+            if code is not None:
+                start_byte = start_bit // 8
+                if start_byte > offset:
+                    struct_format.append(f"{start_byte - offset}x")
+                struct_format.append(code)
+                offset = start_byte + bits // 8
+
+                index = len(struct_names)
+                struct_names.append(name)
+                column_fields.append((name, kind, start_byte, code, reverse))
+                if kind == "bytes":
+                    struct_bytes.append(index)
+                elif reverse is not None:
+                    struct_enums.append((index, reverse))
+            else:
+                if self.byteorder == 'little':
+                    shift = start_bit
+                else:
+                    shift = end_byte * 8 - 1 - field["end_bit"]
+                bit_fields.append((name, shift, (1 << bits) - 1, bits, kind, reverse))
+
+        if end_byte > offset:
+            struct_format.append(f"{end_byte - offset}x")
+
+        self.struct = struct.Struct(''.join(struct_format))
+        self._struct_names = tuple(struct_names)
+        self._struct_enums = tuple(struct_enums)
+        self._struct_bytes = tuple(struct_bytes)
+        self._bytes_names = tuple(struct_names[i] for i in struct_bytes)
+        self._bit_fields = tuple(bit_fields)
+        self._enum_labels = tuple(enum_labels)
+        self._column_fields = tuple(column_fields)
+        self._columns_dtype = None
+
+        # Enum label -> code, by field name
+        self.enum_codes: Dict[str, Dict[str, int]] = {
+            name: {label: code for code, label in reversed(list(labels.items()))}
+            for name, labels in enum_labels
+        }
+
+    @property
+    def aligned_fields(self) -> Tuple[str, ...]:
+        """Names of the fields handled by the struct fast path"""
+        return self._struct_names
+
+    @property
+    def bit_fields(self) -> Tuple[str, ...]:
+        """Names of the fields handled with shift/mask"""
+        return tuple(f[0] for f in self._bit_fields)
+
+    def pack(self, data: Dict[str, Any]) -> bytearray:
+        """
+        Pack a record without coercing values
+
+        Enum labels and str/bytes values are converted exactly as
+        BinaryRecordPacker._pack_field does; anything else that is not
+        already a valid value for its field raises instead.
+
+        Raises:
+            struct.error, TypeError, ValueError, OverflowError: If a value needs
+                coercion (out of range, float in an int field, ...)
+        """
+        get = data.get
+        values = [get(name, 0) for name in self._struct_names]
+
+        for index, reverse in self._struct_enums:
+            value = values[index]
+            if isinstance(value, str):
+                values[index] = reverse.get(value, 0)
+
+        for index in self._struct_bytes:
+            value = values[index]
+            if isinstance(value, str):
+                values[index] = encode_ascii(value)
+            elif isinstance(value, bytearray):
+                values[index] = bytes(value)
+            elif not isinstance(value, bytes):
+                values[index] = str(value).encode('ascii')
+
+        packed = self.struct.pack(*values)
+
+        if self._bit_fields:
+            bits_value = 0
+            for name, shift, mask, _, kind, reverse in self._bit_fields:
+                value = get(name, 0)
+                if reverse is not None and isinstance(value, str):
+                    value = reverse.get(value, 0)
+                if kind == "float":
+                    raise TypeError(f"Field '{name}': float bit fields need packer coercion")
+                value = operator.index(value)
+                if kind == "unsigned":
+                    value = abs(value)
+                bits_value |= (value & mask) << shift
+
+            packed = (int.from_bytes(packed, self.byteorder) | bits_value).to_bytes(self.size, self.byteorder)
+
+        return bytearray(packed[:self.record_size])
+
+    def unpack(self, record: Union[bytes, bytearray, memoryview]) -> Dict[str, Any]:
+        """
+        Decode a record into a dict in field order
+
+        Signed integers are sign-extended, floats decoded, bytes fields
+        returned as ASCII (hex if not ASCII) and enums as their labels.
+        """
+        if len(record) < self.size:
+            record = bytes(record).ljust(self.size, b'\x00')
+
+        values = self.struct.unpack_from(record)
+
+        if self._bit_fields:
+            result = dict.fromkeys(self.field_names)
+            result.update(zip(self._struct_names, values))
+
+            record_value = int.from_bytes(record[:self.size], self.byteorder)
+            for name, shift, mask, bits, kind, _ in self._bit_fields:
+                value = (record_value >> shift) & mask
+                if kind == "signed" and value >> (bits - 1):
+                    value -= 1 << bits
+                result[name] = value
+        else:
+            result = dict(zip(self._struct_names, values))
+
+        for name in self._bytes_names:
+            raw = result[name]
+            try:
+                result[name] = raw.rstrip(b'\x00').decode('ascii')
+            except UnicodeDecodeError:
+                result[name] = raw.hex()
+
+        for name, labels in self._enum_labels:
+            value = result[name]
+            label = labels.get(value)
+            result[name] = label if label is not None else f"unknown_{value}"
+
+        return result
+
+    def _record_dtype(self):
+        """Structured dtype of the byte-aligned fields, itemsize = one record"""
+        if self._columns_dtype is None:
+            order = '<' if self.byteorder == 'little' else '>'
+            names, formats, offsets = [], [], []
+            for name, kind, start_byte, code, _ in self._column_fields:
+                if kind == "bytes":
+                    dtype = f"S{code[:-1]}"
+                elif kind == "float":
+                    dtype = order + ("f4" if code == "f" else "f8")
+                else:
+                    # Integers are stored masked to the field width, as unsigned
+                    dtype = order + f"u{struct.calcsize(code)}"
+                names.append(name)
+                formats.append(dtype)
+                offsets.append(start_byte)
+            self._columns_dtype = np.dtype({"names": names, "formats": formats,
+                                            "offsets": offsets, "itemsize": self.size})
+        return self._columns_dtype
+
+    def pack_columns(self, columns: Mapping[str, Any], num_rows: Optional[int] = None, trim: bool = True):
+        """
+        Pack a columnar batch into a (num_rows, record_size) uint8 array
+
+        Values are coerced the way BinaryRecordPacker._pack_field does:
+        integers masked to the field width (absolute value for unsigned
+        fields), enum labels mapped to codes, strings ASCII-encoded and
+        truncated. Missing columns and None cells pack as 0.
+
+        With trim=False the records keep the full plan width (size), as
+        write_column needs.
+
+        Raises:
+            TypeError, ValueError, OverflowError: If a column can't be packed
+                vectorized (non-numeric values, float bit fields, ...)
+        """
+        if not HAS_NUMPY:
+            raise TypeError("Columnar packing requires numpy")
+        if num_rows is None:
+            num_rows = len(next(iter(columns.values()))) if columns else 0
+
+        records = np.zeros((num_rows, self.size), dtype=np.uint8)
+        for name in self.field_names:
+            column = columns.get(name)
+            if column is not None:
+                self.write_column(records, name, column)
+        return records[:, :self.record_size] if trim else records
+
+    def write_column(self, records, name: str, column):
+        """
+        Write one field's column into zero-filled packed records
+
+        Args:
+            records: (num_rows, size) uint8 array from pack_columns(trim=False)
+            name: Field name
+            column: Field values
+        """
+        for field_name, kind, _, code, reverse in self._column_fields:
+            if field_name != name:
+                continue
+            structured = records.view(self._record_dtype())[:, 0]
+            if kind == "bytes":
+                structured[name] = _bytes_column(column, int(code[:-1]))
+            elif kind == "float":
+                structured[name] = _float_column(column)
+            else:
+                mask = (1 << (8 * struct.calcsize(code))) - 1
+                structured[name] = _integer_column(column, kind, mask, reverse)
+            return
+
+        for field_name, shift, mask, bits, kind, reverse in self._bit_fields:
+            if field_name != name:
+                continue
+            if kind == "float":
+                raise TypeError(f"Field '{name}': float bit fields need packer coercion")
+            values = _integer_column(column, kind, mask, reverse)
+
+            # OR the value into each record byte it overlaps
+            for byte in range(shift // 8, (shift + bits - 1) // 8 + 1):
+                offset = shift - 8 * byte
+                if offset >= 0:
+                    part = values << np.uint64(offset)
+                else:
+                    part = values >> np.uint64(-offset)
+                index = byte if self.byteorder == 'little' else self.size - 1 - byte
+                records[:, index] |= (part & np.uint64(0xFF)).astype(np.uint8)
+            return
+
+    def read_column(self, records, name: str) -> 'np.ndarray':
+        """
+        Stored bits of one integer field, from packed records
+
+        Args:
+            records: (num_rows, width) uint8 array; may be a strided view
+                (e.g. records of a file with separators) and narrower than
+                size, missing bytes read as 0
+            name: Field name
+
+        Returns:
+            uint64 column of the field's raw (unsigned) values
+        """
+        records = np.asarray(records)
+        width = records.shape[1]
+
+        for field_name, kind, start_byte, code, _ in self._column_fields:
+            if field_name != name:
+                continue
+            if kind in ("bytes", "float"):
+                raise TypeError(f"Field '{name}' is not an integer field")
+            num_bytes = struct.calcsize(code)
+            if start_byte + num_bytes <= width:
+                # Gather the field's bytes once and reinterpret them
+                order = '<' if self.byteorder == 'little' else '>'
+                chunk = np.ascontiguousarray(records[:, start_byte:start_byte + num_bytes])
+                return chunk.view(f"{order}u{num_bytes}")[:, 0].astype(np.uint64)
+            values = np.zeros(len(records), dtype=np.uint64)
+            for i in range(min(num_bytes, width - start_byte)):
+                position = i if self.byteorder == 'little' else num_bytes - 1 - i
+                values |= records[:, start_byte + i].astype(np.uint64) << np.uint64(8 * position)
+            return values
+
+        for field_name, shift, mask, bits, kind, _ in self._bit_fields:
+            if field_name != name:
+                continue
+            if kind == "float":
+                raise TypeError(f"Field '{name}' is not an integer field")
+            values = np.zeros(len(records), dtype=np.uint64)
+            # Inverse of write_column: collect each overlapped record byte
+            for byte in range(shift // 8, (shift + bits - 1) // 8 + 1):
+                index = byte if self.byteorder == 'little' else self.size - 1 - byte
+                if index >= width:
+                    continue
+                part = records[:, index].astype(np.uint64)
+                offset = shift - 8 * byte
+                if offset >= 0:
+                    values |= part >> np.uint64(offset)
+                else:
+                    values |= part << np.uint64(-offset)
+            return values & np.uint64(mask)
+
+        raise KeyError(f"Unknown field '{name}'")
+
+
+def _object_values(column):
+    """List of a column's values with None (missing cells) as 0"""
+    return [0 if value is None else value for value in column]
+
+
+def _integer_column(column, kind: str, mask: int, reverse) -> 'np.ndarray':
+    """uint64 column of integer field values, masked like _pack_field"""
+    column = np.asarray(column)
+    if column.dtype.kind in 'OUS':
+        values = _object_values(column.tolist())
+        if reverse is not None:
+            values = [reverse.get(value, 0) if isinstance(value, str) else value for value in values]
+        column = np.asarray(values)
+        if column.dtype.kind not in 'iufb':
+            raise TypeError(f"Non-numeric values in an integer column ({column.dtype})")
+    if column.dtype.kind == 'f':
+        if not np.isfinite(column).all():
+            raise ValueError("Non-finite values in an integer column")
+        column = np.trunc(column).astype(np.int64)
+    elif column.dtype.kind == 'b':
+        column = column.astype(np.int64)
+    if kind == "unsigned" and column.dtype.kind == 'i':
+        column = np.abs(column)
+    return column.astype(np.uint64) & np.uint64(mask)
+
+
+def _float_column(column) -> 'np.ndarray':
+    column = np.asarray(column)
+    if column.dtype.kind in 'OUS':
+        column = np.asarray(_object_values(column.tolist()), dtype=np.float64)
+    return column
+
+
+def _bytes_column(column, width: int) -> 'np.ndarray':
+    """Fixed-width bytes column (ASCII, truncated and zero padded)"""
+    column = np.asarray(column)
+    if column.dtype.kind == 'S':
+        return column.astype(f"S{width}")
+    if column.dtype.kind == 'U':
+        return np.char.encode(column, 'ascii').astype(f"S{width}")
+    if column.dtype.kind == 'O' and not (column == None).any():  # noqa: E711 (elementwise)
+        try:
+            # Strings (e.g. pooled device IDs) encode as ASCII inside numpy
+            return column.astype(f"S{width}")
+        except (UnicodeError, TypeError, ValueError):
+            pass
+    values = []
+    for value in column.tolist():
+        if value is None:
+            values.append(b"")
+        elif isinstance(value, str):
+            values.append(encode_ascii(value))
+        elif isinstance(value, (bytes, bytearray)):
+            values.append(bytes(value))
+        else:
+            values.append(str(value).encode('ascii'))
+    return np.array(values, dtype=f"S{width}")
@@ -10,10 +10,18 @@ import time
 import struct
 import logging
 from pathlib import Path
-from typing import Optional, Any, BinaryIO, TextIO, Union
+from typing import Optional, Any, BinaryIO, Callable, TextIO, Union
 from datetime import datetime
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 from .formats.leb128 import encode_leb128, encode_signed_leb128
+from .types_and_enums import TelemetryBatch
+from .instrumentation import Instrumentation, TimedWriteFile
 
 class RollingFileWriter:
     """
@@ -27,7 +35,8 @@ class RollingFileWriter:
         format: str = 'ndjson',
         compress: bool = False,
         timestamp_format: str = '%Y%m%d_%H%M%S',
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        instrumentation: Optional[Instrumentation] = None
     ):
         """
         Initialize RollingFileWriter
@@ -39,6 +48,8 @@ class RollingFileWriter:
             compress: Whether to compress files with gzip
             timestamp_format: Format for timestamps in filenames
             logger: Optional logger instance
+            instrumentation: Optional stage timings (rotation, and with
+                compression the writes of compressed data)
         """
         self.base_path = base_path
         self.max_size_bytes = max_size_bytes
@@ -46,6 +57,7 @@ class RollingFileWriter:
         self.compress = compress
         self.timestamp_format = timestamp_format
         self.logger = logger or logging.getLogger(__name__)
+        self.instrumentation = instrumentation
         
         # State
         self.current_file: Optional[Union[BinaryIO, TextIO]] = None
@@ -67,6 +79,9 @@ class RollingFileWriter:
         # JSON array handling (for regular JSON format)
         self.json_first_record = True
         
+        # Callbacks run after each rotation with (new_file_path, file_count)
+        self._rotation_listeners = []
+        
         self.logger.info(
             f"Initialized RollingFileWriter: format={format}, "
             f"max_size={max_size_bytes:,} bytes, compress={compress}"
@@ -100,6 +115,14 @@ class RollingFileWriter:
 
     def _open_new_file(self):
         """Open a new file for writing"""
+        if self.instrumentation:
+            with self.instrumentation.stage('rotation'):
+                self._rotate()
+        else:
+            self._rotate()
+
+    def _rotate(self):
+        """Close the current file and open the next one"""
         # Close current file if open
         if self.current_file:
             self._close_current_file()
@@ -125,9 +148,28 @@ class RollingFileWriter:
             else:
                 self.current_file = open(self.current_file_path, 'w', encoding='utf-8')
         
+        if self.compress and self.instrumentation:
+            # Time compressed output reaching the file apart from compression itself
+            gzip_file = self.current_file if self.is_binary else self.current_file.buffer
+            gzip_file.fileobj = TimedWriteFile(gzip_file.fileobj, self.instrumentation)
+        
         # Write header for JSON array format
         if self.format == 'json':
             self._write_raw('[\n')
+        
+        for listener in self._rotation_listeners:
+            listener(self.current_file_path, self.file_count)
+
+    def add_rotation_listener(self, callback: Callable[[str, int], None]):
+        """
+        Register a callback run whenever a new file is opened
+        
+        Lets companion files (e.g. fault logs) rotate together with the data.
+        
+        Args:
+            callback: Called with (new_file_path, file_count)
+        """
+        self._rotation_listeners.append(callback)
 
     def _close_current_file(self):
         """Close the current file"""
@@ -185,7 +227,18 @@ class RollingFileWriter:
         """
         # Serialize record based on format
         serialized = self._serialize_record(record, generator)
+        self.write_serialized(serialized)
+
+    def write_serialized(self, serialized: Union[str, bytes]):
+        """
+        Write an already serialized record (as returned by serialize_record)
         
+        Lets callers serialize records elsewhere (e.g. in worker processes)
+        while rotation, compression and JSON array framing stay here.
+        
+        Args:
+            serialized: Serialized record in this writer's format
+        """
         # Check if we need to rotate BEFORE writing
         estimated_size = len(serialized) if isinstance(serialized, bytes) else len(serialized.encode('utf-8'))
         
@@ -208,6 +261,75 @@ class RollingFileWriter:
         self.records_in_current_file += 1
         self.total_records_written += 1
 
+    def write_batch(self, batch: TelemetryBatch, generator: Any = None):
+        """
+        Write a TelemetryBatch
+        
+        Binary batches are packed column-wise when the generator exposes a
+        BinaryRecordPacker as `packer`; otherwise each record is serialized
+        as in write_record.
+        
+        Args:
+            batch: Records to write
+            generator: Optional generator instance for format-specific serialization
+        """
+        packer = getattr(generator, 'packer', None)
+        if self.format == 'binary' and hasattr(packer, 'pack_batch'):
+            packed = packer.pack_batch(batch)
+            if HAS_NUMPY:
+                self.write_packed(packed)
+            else:
+                for record in packed:
+                    self.write_serialized(record + b'\n')
+            return
+        
+        for record in batch.records():
+            self.write_serialized(self._serialize_record(record, generator))
+
+    def write_packed(self, records: Any):
+        """
+        Write a block of packed binary records (BinaryRecordPacker.pack_columns)
+        
+        Each row is framed as in binary serialization (record + newline);
+        rows are written in chunks that respect the rotation size.
+        
+        Args:
+            records: (num_rows, record_size) uint8 array
+        """
+        if self.format != 'binary':
+            raise ValueError(f"Packed records need the binary format, not '{self.format}'")
+        num_rows = len(records)
+        if num_rows == 0:
+            return
+        
+        # Append the newline framing to every row in one copy
+        framed = np.empty((num_rows, records.shape[1] + 1), dtype=np.uint8)
+        framed[:, :-1] = records
+        framed[:, -1] = ord('\n')
+        row_size = framed.shape[1]
+        
+        start = 0
+        while start < num_rows:
+            if self._should_rotate(row_size):
+                self._open_new_file()
+            # Rows fitting in the current file (at least one, as in write_serialized)
+            room = (self.max_size_bytes - self.current_size - 1) // row_size
+            end = min(num_rows, start + max(1, room))
+            self._write_raw(framed[start:end].tobytes())
+            
+            self.records_in_current_file += end - start
+            self.total_records_written += end - start
+            start = end
+
+    def serialize_record(self, record: Any, generator: Any = None) -> Union[str, bytes]:
+        """
+        Serialize a record in this writer's format without writing it
+        
+        Args:
+            record: TelemetryRecord object to serialize
+            generator: Optional generator instance for format-specific serialization
+        """
+        return self._serialize_record(record, generator)
     
     def _serialize_record(self, record: Any, generator: Any = None) -> Union[str, bytes]:
         """Serialize record based on format"""
@@ -0,0 +1,323 @@
+"""
+Immutable binary schema model
+Parsed once per schema content and shared by the processor, packer, reader,
+generators, fault injector and CLI
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from .distributions import validate_distribution
+
+logger = logging.getLogger(__name__)
+
+# Top-level schema keys that are not field definitions
+RESERVED_KEYS = ("schema_name", "endianness", "total_bits", "validation", "series", "device_pool")
+
+DEFAULT_TYPE_MAPPING = {
+    "uint8": "np.uint8",
+    "int8": "np.int8",
+    "uint16": "np.uint16",
+    "uint32": "np.uint32",
+    "uint64": "np.uint64",
+    "int64": "np.int64",
+    "float32": "np.float32",
+    "bytes": "np.bytes_",
+    "enum": "np.uint8"  # Default for enums
+}
+
+
+def load_type_mapping(types_file: Optional[str]) -> Dict[str, str]:
+    """
+    Load type mapping from external file
+
+    Args:
+        types_file: Path to JSON file containing type mappings
+
+    Returns:
+        Dictionary mapping original types to target types (defaults if the
+        file is missing or invalid)
+    """
+    if types_file and os.path.exists(types_file):
+        try:
+            with open(types_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load types file: {e}")
+
+    return dict(DEFAULT_TYPE_MAPPING)
+
+
+def map_type(original_type: str, type_mapping: Mapping[str, str]) -> str:
+    """Map a schema type to its Python/NumPy type string"""
+    if original_type == "enum":
+        return "np.uint8"  # enums are stored as uint8
+    return type_mapping.get(original_type, "np.uint8")
+
+
+def enum_from_info(field_info: Mapping[str, Any]) -> Dict[str, Any]:
+    """Build the {"0": value, ...} enum mapping of an enum field"""
+    if field_info.get("type") != "enum":
+        return {}
+    return {str(i): value for i, value in enumerate(field_info.get("values", []))}
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """One field of a binary schema"""
+    name: str
+    type: str
+    original_type: str
+    bits: int
+    start_bit: int
+    end_bit: int
+    desc: str = ""
+    enum: Tuple[Tuple[str, Any], ...] = ()
+    info: Mapping[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def enum_map(self) -> Dict[str, Any]:
+        """Enum as {"0": value, ...} (empty for non-enum fields)"""
+        return dict(self.enum)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field in the dict form used by BinarySchemaProcessor.fields"""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "original_type": self.original_type,
+            "bits": self.bits,
+            "start_bit": self.start_bit,
+            "end_bit": self.end_bit,
+            "desc": self.desc,
+            "enum": dict(self.enum),
+            "original_info": copy.deepcopy(dict(self.info))
+        }
+
+
+@dataclass(frozen=True)
+class TelemetrySchema:
+    """
+    Parsed, validated binary schema
+
+    Equality and hashing use the content hash of the schema and type
+    mapping, so equal content always yields interchangeable objects.
+    """
+    schema_name: str
+    endianness: str
+    total_bits: int
+    fields: Tuple[FieldSpec, ...]
+    content_hash: str
+    type_mapping: Mapping[str, str] = field(default_factory=dict, compare=False, repr=False)
+    validation: Mapping[str, Any] = field(default_factory=dict, compare=False, repr=False)
+    series: Mapping[str, Any] = field(default_factory=dict, compare=False, repr=False)
+    device_pool: Mapping[str, Any] = field(default_factory=dict, compare=False, repr=False)
+    source: Mapping[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, '_by_name', {f.name: f for f in self.fields})
+
+    @property
+    def record_size(self) -> int:
+        """Record size in bytes"""
+        return (self.total_bits + 7) // 8
+
+    @property
+    def field_names(self) -> Tuple[str, ...]:
+        return tuple(f.name for f in self.fields)
+
+    def get_field(self, name: str) -> Optional[FieldSpec]:
+        """Look up a field by name"""
+        return self._by_name.get(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copy of the schema as originally loaded"""
+        return copy.deepcopy(dict(self.source))
+
+    def __reduce__(self):
+        # Mapping proxies don't pickle; rebuild from source (through the cache) in worker processes
+        return (_rebuild_schema, (self.to_dict(), dict(self.type_mapping), self.content_hash))
+
+    @classmethod
+    def from_dict(cls, schema: Dict[str, Any], type_mapping: Optional[Mapping[str, str]] = None,
+                  content_hash: Optional[str] = None) -> 'TelemetrySchema':
+        """
+        Parse and validate a schema dict
+
+        Args:
+            schema: Schema dictionary containing field definitions
+            type_mapping: Type mapping (default: DEFAULT_TYPE_MAPPING)
+            content_hash: Precomputed content hash
+
+        Raises:
+            ValueError: If the schema is invalid
+        """
+        if not isinstance(schema, dict):
+            raise ValueError("Schema must be a JSON object")
+        type_mapping = dict(DEFAULT_TYPE_MAPPING if type_mapping is None else type_mapping)
+
+        fields = []
+        for field_name, field_info in schema.items():
+            if field_name in RESERVED_KEYS:
+                continue
+            if not isinstance(field_info, dict):
+                raise ValueError(f"Field '{field_name}' must be an object, got {type(field_info).__name__}")
+
+            # Parse bit position
+            pos_str = field_info.get("pos", "0-7")
+            start_bit, end_bit = map(int, pos_str.split("-"))
+
+            if "distribution" in field_info:
+                validate_distribution(field_name, field_info["distribution"], field_info)
+
+            original_type = field_info.get("type", "uint8")
+            fields.append(FieldSpec(
+                name=field_name,
+                type=map_type(original_type, type_mapping),
+                original_type=original_type,
+                bits=field_info.get("bits", 8),
+                start_bit=start_bit,
+                end_bit=end_bit,
+                desc=field_info.get("desc", ""),
+                enum=tuple(enum_from_info(field_info).items()),
+                info=MappingProxyType(copy.deepcopy(field_info))
+            ))
+
+        # Sort by bit position
+        fields.sort(key=lambda f: f.start_bit)
+
+        total_bits = schema.get("total_bits", 0)
+        _validate_fields(fields, total_bits)
+
+        return cls(
+            schema_name=schema.get("schema_name", "unknown"),
+            endianness=schema.get("endianness", "little"),
+            total_bits=total_bits,
+            fields=tuple(fields),
+            content_hash=content_hash or _content_hash(schema, type_mapping),
+            type_mapping=MappingProxyType(type_mapping),
+            validation=MappingProxyType(copy.deepcopy(schema.get("validation", {}))),
+            series=MappingProxyType(copy.deepcopy(schema.get("series", {}))),
+            device_pool=MappingProxyType(copy.deepcopy(schema.get("device_pool", {}))),
+            source=MappingProxyType(copy.deepcopy(schema))
+        )
+
+
+def _validate_fields(fields, total_bits: int):
+    """
+    Validate field layout
+
+    Raises:
+        ValueError: If schema validation fails
+    """
+    if not fields:
+        raise ValueError("Schema contains no valid fields")
+
+    # Check for bit overlaps
+    for current, next_field in zip(fields, fields[1:]):
+        if current.end_bit >= next_field.start_bit:
+            raise ValueError(
+                f"Bit overlap between {current.name} ({current.start_bit}-{current.end_bit}) "
+                f"and {next_field.name} ({next_field.start_bit}-{next_field.end_bit})"
+            )
+
+    # Check total bits
+    actual_bits = fields[-1].end_bit + 1
+    if total_bits > 0 and actual_bits > total_bits:
+        raise ValueError(
+            f"Schema fields extend beyond total_bits ({total_bits}): actual bits used = {actual_bits}"
+        )
+
+
+def _content_hash(schema: Dict[str, Any], type_mapping: Mapping[str, str]) -> str:
+    canonical = json.dumps([schema, type_mapping], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _file_digest(path: Optional[str]) -> str:
+    if not path or not os.path.exists(path):
+        return ""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+_SCHEMA_CACHE: Dict[Tuple[str, str], TelemetrySchema] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def load_schema(schema_file: str, types_file: Optional[str] = None) -> TelemetrySchema:
+    """
+    Load a schema file, parsing each distinct content only once per process
+
+    Args:
+        schema_file: Path to the JSON schema
+        types_file: Optional path to a JSON type mapping
+
+    Returns:
+        Cached TelemetrySchema
+
+    Raises:
+        ValueError: If the schema is invalid JSON or fails validation
+    """
+    with open(schema_file, 'rb') as f:
+        content = f.read()
+
+    key = ("file:" + hashlib.sha256(content).hexdigest(), _file_digest(types_file))
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is not None:
+        return schema
+
+    try:
+        schema_dict = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in schema file {schema_file}: {e}")
+
+    schema = schema_from_dict(schema_dict, types_file)
+    with _CACHE_LOCK:
+        return _SCHEMA_CACHE.setdefault(key, schema)
+
+
+def schema_from_dict(schema: Dict[str, Any], types_file: Optional[str] = None) -> TelemetrySchema:
+    """
+    Build (or fetch from cache) the model of a schema dict
+
+    Args:
+        schema: Schema dictionary
+        types_file: Optional path to a JSON type mapping
+    """
+    type_mapping = load_type_mapping(types_file)
+    return _rebuild_schema(schema, type_mapping, _content_hash(schema, type_mapping))
+
+
+def _rebuild_schema(schema: Dict[str, Any], type_mapping: Dict[str, str], content_hash: str) -> TelemetrySchema:
+    key = (content_hash, "")
+    cached = _SCHEMA_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    model = TelemetrySchema.from_dict(schema, type_mapping, content_hash)
+    with _CACHE_LOCK:
+        return _SCHEMA_CACHE.setdefault(key, model)
+
+
+def get_schema(schema: Union[TelemetrySchema, Dict[str, Any], str, os.PathLike],
+               types_file: Optional[str] = None) -> TelemetrySchema:
+    """Return the cached model for a model, schema dict or schema file path"""
+    if isinstance(schema, TelemetrySchema):
+        return schema
+    if isinstance(schema, dict):
+        return schema_from_dict(schema, types_file)
+    return load_schema(os.fspath(schema), types_file)
+
+
+def clear_schema_cache():
+    """Drop all cached schema models"""
+    with _CACHE_LOCK:
+        _SCHEMA_CACHE.clear()
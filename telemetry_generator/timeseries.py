@@ -0,0 +1,335 @@
+"""
+timeseries.py
+Stateful per-device time-series engine: a fixed fleet of devices x GPUs x
+metrics, each series carrying its own value process advanced in vectorized
+steps
+"""
+
+import math
+import string
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+# Schema fields filled by the engine (when present in the schema)
+DEVICE_FIELD = "device_id_ascii"
+GPU_FIELD = "gpu_index"
+METRIC_FIELD = "metric_id"
+VALUE_TYPE_FIELD = "value_type"
+VALUE_BITS_FIELD = "value_bits"
+
+# value_type enum: 0=FLOAT32
+FLOAT32_VALUE_TYPE = 0
+
+_ID_CHARS = np.array(list(string.ascii_uppercase + string.digits))
+
+
+class ProcessModel(Enum):
+    """Value process of a series"""
+    RANDOM_WALK = "random_walk"     # v += drift + N(0, sigma)
+    AR1 = "ar1"                     # v = level + phi * (v - level) + N(0, sigma)
+    SEASONAL = "seasonal"           # v = level + amplitude * sin(2*pi*step/period + phase) + N(0, sigma)
+
+
+_MODEL_CODES = {model: i for i, model in enumerate(ProcessModel)}
+
+
+@dataclass
+class MetricSeries:
+    """Process parameters of one metric_id, shared by every device and GPU"""
+    metric_id: int
+    model: ProcessModel = ProcessModel.AR1
+    mean: float = 50.0
+    sigma: float = 1.0
+    phi: float = 0.9                # AR(1) coefficient
+    drift: float = 0.0              # Random walk drift per step
+    amplitude: float = 10.0         # Seasonal amplitude
+    period: float = 60.0            # Seasonal period, in steps
+    spread: float = 0.1             # Relative spread of per-series levels around mean
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricSeries':
+        """
+        Raises:
+            ValueError: If the metric spec is invalid
+        """
+        data = dict(data)
+        try:
+            data["model"] = ProcessModel(data.get("model", ProcessModel.AR1.value))
+        except ValueError:
+            raise ValueError(f"Unknown series model: {data.get('model')}")
+        try:
+            metric = cls(**data)
+        except TypeError as e:
+            raise ValueError(f"Invalid series metric spec: {e}")
+        metric.validate()
+        return metric
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        data["model"] = self.model.value
+        return data
+
+    def validate(self):
+        if self.sigma < 0:
+            raise ValueError(f"Metric {self.metric_id}: sigma must be non-negative")
+        if self.model == ProcessModel.AR1 and not -1.0 < self.phi < 1.0:
+            raise ValueError(f"Metric {self.metric_id}: AR(1) phi must be in (-1, 1)")
+        if self.model == ProcessModel.SEASONAL and self.period <= 0:
+            raise ValueError(f"Metric {self.metric_id}: seasonal period must be positive")
+        if self.min is not None and self.max is not None and self.min > self.max:
+            raise ValueError(f"Metric {self.metric_id}: min is greater than max")
+
+
+class TimeSeriesEngine:
+    """
+    Fixed fleet of series (device x GPU x metric) with per-series state
+
+    Rows are emitted round-robin over the fleet; one full pass is one time
+    step of every series. Each batch advances the states of its series in
+    a few vectorized numpy operations, so values are correlated in time per
+    series and the series cardinality is fixed, as in a production fleet.
+
+    Configured from the schema's top-level "series" block:
+
+        "series": {
+            "devices": 100,
+            "gpus_per_device": 8,
+            "seed": 7,
+            "metrics": [
+                {"metric_id": 1, "model": "ar1", "mean": 65, "phi": 0.95, "sigma": 0.5},
+                {"metric_id": 2, "model": "seasonal", "mean": 250, "amplitude": 80, "period": 600},
+                {"metric_id": 3, "model": "random_walk", "mean": 1500, "sigma": 10, "min": 300, "max": 2100}
+            ]
+        }
+
+    "devices" may also be a list of device IDs and "metrics" a count of
+    default AR(1) metrics. Values go to value_type/value_bits as FLOAT32
+    bits, and to "value_field" if set.
+    """
+
+    def __init__(
+        self,
+        metrics: Sequence[MetricSeries],
+        devices: Union[int, Sequence[str]] = 16,
+        gpus_per_device: int = 8,
+        seed: Optional[int] = None,
+        field_types: Optional[Mapping[str, str]] = None,
+        value_field: Optional[str] = None,
+        device_id_length: int = 8,
+        buffer_size: int = 1024
+    ):
+        """
+        Args:
+            metrics: Metric process specs
+            devices: Number of devices, or explicit device IDs
+            gpus_per_device: GPUs per device
+            seed: Random seed (fleet layout and values are reproducible)
+            field_types: Schema field name -> type; only these fields are
+                emitted (default: the identity and value_bits fields)
+            value_field: Extra field receiving the raw value
+            device_id_length: Length of generated device IDs
+            buffer_size: Rows generated at once for per-record access
+        """
+        if not metrics:
+            raise ValueError("Time-series engine needs at least one metric")
+        if gpus_per_device < 1:
+            raise ValueError("gpus_per_device must be at least 1")
+
+        self.metrics = list(metrics)
+        self.gpus_per_device = gpus_per_device
+        self.value_field = value_field
+        self.buffer_size = buffer_size
+        self._rng = np.random.default_rng(seed)
+
+        if isinstance(devices, int):
+            self.device_ids = self._make_device_ids(devices, device_id_length)
+        else:
+            self.device_ids = np.array(list(devices), dtype=object)
+        if not len(self.device_ids):
+            raise ValueError("Time-series engine needs at least one device")
+
+        if field_types is None:
+            field_types = {DEVICE_FIELD: "bytes", GPU_FIELD: "uint8", METRIC_FIELD: "uint16",
+                           VALUE_TYPE_FIELD: "enum", VALUE_BITS_FIELD: "uint64"}
+        self.field_types = dict(field_types)
+
+        self._build_series()
+
+        self._lock = threading.RLock()
+        self._cursor = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_pos = 0
+
+    @classmethod
+    def from_dict(cls, block: Mapping[str, Any], field_types: Optional[Mapping[str, str]] = None,
+                  **kwargs) -> 'TimeSeriesEngine':
+        """
+        Build from a "series" block
+
+        Raises:
+            ValueError: If the block is invalid
+        """
+        metrics = block.get("metrics", 4)
+        if isinstance(metrics, int):
+            metrics = [MetricSeries(metric_id=i + 1) for i in range(metrics)]
+        else:
+            metrics = [MetricSeries.from_dict(metric) for metric in metrics]
+
+        return cls(
+            metrics,
+            devices=block.get("devices", 16),
+            gpus_per_device=block.get("gpus_per_device", 8),
+            seed=block.get("seed"),
+            field_types=field_types,
+            value_field=block.get("value_field"),
+            **kwargs
+        )
+
+    @classmethod
+    def from_schema(cls, schema_processor) -> Optional['TimeSeriesEngine']:
+        """Engine for a schema with a "series" block, else None"""
+        block = getattr(schema_processor, 'series', None)
+        if not block or not isinstance(block, Mapping):
+            return None
+
+        fields = {field["name"]: field for field in schema_processor.fields}
+        field_types = {name: field.get("original_type", field["type"]) for name, field in fields.items()}
+
+        gpus = block.get("gpus_per_device", 8)
+        if GPU_FIELD in fields:
+            gpus = min(gpus, 1 << fields[GPU_FIELD]["bits"])
+        device_id_length = fields[DEVICE_FIELD]["bits"] // 8 if DEVICE_FIELD in fields else 8
+
+        return cls.from_dict(dict(block, gpus_per_device=gpus), field_types,
+                             device_id_length=device_id_length)
+
+    @property
+    def num_series(self) -> int:
+        return len(self._value)
+
+    def _make_device_ids(self, count: int, length: int) -> np.ndarray:
+        """Distinct random ASCII device IDs"""
+        if count > len(_ID_CHARS) ** length:
+            raise ValueError(f"Cannot make {count} distinct {length}-character device IDs")
+        ids = set()
+        while len(ids) < count:
+            chars = self._rng.choice(_ID_CHARS, size=(count - len(ids), length))
+            ids.update(''.join(row) for row in chars)
+        return np.array(sorted(ids)[:count], dtype=object)
+
+    def _build_series(self):
+        """Per-series parameter and state arrays, device-major order"""
+        devices, gpus, metrics = len(self.device_ids), self.gpus_per_device, len(self.metrics)
+        per_device = gpus * metrics
+
+        self._series_device = np.repeat(np.arange(devices), per_device)
+        self._series_gpu = np.tile(np.repeat(np.arange(gpus), metrics), devices)
+        series_metric = np.tile(np.arange(metrics), devices * gpus)
+        self._series_metric_id = np.array([m.metric_id for m in self.metrics], dtype=np.int64)[series_metric]
+
+        def per_series(name, default=0.0):
+            values = [getattr(m, name) for m in self.metrics]
+            values = [default if value is None else value for value in values]
+            return np.array(values, dtype=np.float64)[series_metric]
+
+        count = len(series_metric)
+        self._model = np.array([_MODEL_CODES[m.model] for m in self.metrics])[series_metric]
+        self._sigma = per_series("sigma")
+        self._phi = per_series("phi")
+        self._drift = per_series("drift")
+        self._amplitude = per_series("amplitude")
+        self._period = per_series("period")
+        self._low = per_series("min", -math.inf)
+        self._high = per_series("max", math.inf)
+
+        # Every series has its own level and phase
+        mean = per_series("mean")
+        self._level = mean + np.abs(mean) * per_series("spread") * self._rng.standard_normal(count)
+        self._phase = self._rng.uniform(0.0, 2 * math.pi, count)
+
+        self._value = np.clip(self._level, self._low, self._high)
+        self._steps = np.zeros(count, dtype=np.int64)
+
+    def _advance(self, series):
+        """Advance the given (distinct) series one step; returns their new values"""
+        value = self._value[series]
+        level = self._level[series]
+        noise = self._rng.standard_normal(len(series)) * self._sigma[series]
+        model = self._model[series]
+
+        walk = value + self._drift[series] + noise
+        ar1 = level + self._phi[series] * (value - level) + noise
+        angle = 2 * math.pi * self._steps[series] / self._period[series] + self._phase[series]
+        seasonal = level + self._amplitude[series] * np.sin(angle) + noise
+
+        new_value = np.select(
+            [model == _MODEL_CODES[ProcessModel.RANDOM_WALK], model == _MODEL_CODES[ProcessModel.AR1]],
+            [walk, ar1],
+            seasonal
+        )
+        new_value = np.clip(new_value, self._low[series], self._high[series])
+
+        self._value[series] = new_value
+        self._steps[series] += 1
+        return new_value
+
+    def next_batch(self, batch_size: int) -> Dict[str, np.ndarray]:
+        """
+        Next rows of the fleet as schema columns
+
+        Returns:
+            Field name -> column, for the engine's fields present in the schema
+        """
+        num_series = self.num_series
+        with self._lock:
+            series = (self._cursor + np.arange(batch_size)) % num_series
+            values = np.empty(batch_size, dtype=np.float64)
+            # A run of num_series consecutive rows touches each series once
+            for start in range(0, batch_size, num_series):
+                chunk = series[start:start + num_series]
+                values[start:start + num_series] = self._advance(chunk)
+            self._cursor = (self._cursor + batch_size) % num_series
+
+        return self._encode(series, values)
+
+    def _encode(self, series, values) -> Dict[str, np.ndarray]:
+        columns = {}
+        if DEVICE_FIELD in self.field_types:
+            columns[DEVICE_FIELD] = self.device_ids[self._series_device[series]]
+        if GPU_FIELD in self.field_types:
+            columns[GPU_FIELD] = self._series_gpu[series]
+        if METRIC_FIELD in self.field_types:
+            columns[METRIC_FIELD] = self._series_metric_id[series]
+        if VALUE_BITS_FIELD in self.field_types:
+            if VALUE_TYPE_FIELD in self.field_types:
+                columns[VALUE_TYPE_FIELD] = np.full(len(series), FLOAT32_VALUE_TYPE, dtype=np.int64)
+            columns[VALUE_BITS_FIELD] = values.astype(np.float32).view(np.uint32).astype(np.int64)
+        if self.value_field in self.field_types:
+            if "float" in self.field_types[self.value_field]:
+                columns[self.value_field] = values
+            else:
+                columns[self.value_field] = np.rint(values).astype(np.int64)
+        return columns
+
+    def next_values(self) -> Dict[str, Any]:
+        """Field values of the next single row (served from a buffered batch)"""
+        with self._lock:
+            if self._buffer_pos >= len(self._buffer):
+                columns = self.next_batch(self.buffer_size)
+                names = list(columns)
+                self._buffer = [dict(zip(names, row))
+                                for row in zip(*(columns[name].tolist() for name in names))]
+                self._buffer_pos = 0
+            values = self._buffer[self._buffer_pos]
+            self._buffer_pos += 1
+            return values
+
+    def current_values(self) -> np.ndarray:
+        """Current value of every series"""
+        return self._value.copy()
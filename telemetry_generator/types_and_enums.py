@@ -4,9 +4,15 @@ types_and_enums.py
 Basic definitions, enums and data types for the telemetry system
 """
 
+from array import array
 from enum import Enum
-from dataclasses import dataclass
-from typing import Dict, Any, Union
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 # Type aliases
 Number = Union[int, float]
@@ -16,22 +22,52 @@ class RecordType(Enum):
     UPDATE = "update"
     EVENT = "event"
 
+# Row record types of a TelemetryBatch are stored as indexes into this tuple
+RECORD_TYPES = tuple(RecordType)
+
 class OutputFormat(Enum):
     """Supported output formats"""
     BINARY = "binary"
     INFLUX_LINE = "influx_line"
     JSON = "json"
 
-@dataclass
 class TelemetryRecord:
-    """Data structure for telemetry record"""
-    record_type: RecordType
-    timestamp: int
-    sequence_id: int
-    data: Dict[str, Any]
-    
-    def __post_init__(self):
-        """Validate record data after initialization"""
+    """
+    Data structure for telemetry record
+    
+    Slotted and unchecked on construction; call validate() on records
+    built from outside input.
+    """
+    __slots__ = ("record_type", "timestamp", "sequence_id", "data")
+    
+    def __init__(self, record_type: RecordType, timestamp: int, sequence_id: int, data: Dict[str, Any]):
+        self.record_type = record_type
+        self.timestamp = timestamp
+        self.sequence_id = sequence_id
+        self.data = data
+    
+    def __repr__(self) -> str:
+        return (f"TelemetryRecord(record_type={self.record_type!r}, timestamp={self.timestamp!r}, "
+                f"sequence_id={self.sequence_id!r}, data={self.data!r})")
+    
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.record_type, self.timestamp, self.sequence_id, self.data) == \
+            (other.record_type, other.timestamp, other.sequence_id, other.data)
+    
+    __hash__ = None
+    
+    def validate(self) -> 'TelemetryRecord':
+        """
+        Check field types and values
+        
+        Returns:
+            The record itself
+            
+        Raises:
+            ValueError: If a field is invalid
+        """
         try:
             # Validate record_type
             if not isinstance(self.record_type, RecordType):
@@ -56,7 +92,8 @@ class TelemetryRecord:
                 raise ValueError("data dictionary cannot be empty")
                 
         except Exception as e:
-            raise ValueError(f"Invalid TelemetryRecord initialization: {e}")
+            raise ValueError(f"Invalid TelemetryRecord: {e}")
+        return self
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert record to dictionary representation"""
@@ -83,8 +120,216 @@ class TelemetryRecord:
                 timestamp=data.get("timestamp", 0),
                 sequence_id=data.get("sequence_id", 0),
                 data=data.get("data", {})
-            )
+            ).validate()
         except KeyError as e:
             raise ValueError(f"Missing required field in data: {e}")
         except Exception as e:
-            raise RuntimeError(f"Failed to create record from dict: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to create record from dict: {e}")
+
+
+def _typed_column(values: Any) -> Any:
+    """
+    Column as a typed array: NumPy when available, else array.array
+    
+    Arrays and ranges are kept as they are; columns mixing value types or
+    with missing (None) cells become object arrays (lists without NumPy).
+    """
+    if isinstance(values, range) or hasattr(values, "dtype") or isinstance(values, array):
+        return values
+    values = list(values)
+    kinds = {type(value) for value in values}
+    
+    if HAS_NUMPY:
+        if kinds == {int}:
+            for dtype in (np.int64, np.uint64):
+                try:
+                    return np.array(values, dtype=dtype)
+                except OverflowError:
+                    pass
+        elif kinds == {float}:
+            return np.array(values, dtype=np.float64)
+        elif kinds == {bool}:
+            return np.array(values, dtype=np.bool_)
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    
+    if kinds == {int}:
+        for typecode in ('q', 'Q'):
+            try:
+                return array(typecode, values)
+            except OverflowError:
+                pass
+    elif kinds == {float}:
+        return array('d', values)
+    return values
+
+
+def _scalar(value: Any) -> Any:
+    """Python value of a column cell (NumPy scalars unwrapped)"""
+    return value.item() if hasattr(value, "item") else value
+
+
+class TelemetryRecordView:
+    """
+    Lazy row of a TelemetryBatch, readable like a TelemetryRecord
+    
+    Cells are read from the batch's columns on access; `data` is only
+    built when first used.
+    """
+    __slots__ = ("batch", "index", "_data")
+    
+    def __init__(self, batch: 'TelemetryBatch', index: int):
+        self.batch = batch
+        self.index = index
+        self._data = None
+    
+    @property
+    def record_type(self) -> RecordType:
+        return self.batch.record_type_at(self.index)
+    
+    @property
+    def timestamp(self) -> int:
+        return _scalar(self.batch.timestamps[self.index])
+    
+    @property
+    def sequence_id(self) -> int:
+        return self.batch.first_sequence_id + self.index
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        """One field's value, without building `data`"""
+        column = self.batch.columns.get(name)
+        value = None if column is None else _scalar(column[self.index])
+        return default if value is None else value
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            index = self.index
+            cells = ((name, column[index]) for name, column in self.batch.columns.items())
+            self._data = {name: _scalar(value) for name, value in cells if value is not None}
+        return self._data
+    
+    def to_record(self) -> TelemetryRecord:
+        return TelemetryRecord(self.record_type, self.timestamp, self.sequence_id, dict(self.data))
+    
+    def __repr__(self) -> str:
+        return f"TelemetryRecordView(sequence_id={self.sequence_id})"
+
+
+class TelemetryBatch:
+    """
+    Struct-of-arrays batch of telemetry records
+    
+    Row i is the record with sequence_id first_sequence_id + i. Each field
+    is stored as one typed column (NumPy array, or array.array without
+    NumPy); a None cell is a field missing from that record. Indexing and
+    iteration give lazy TelemetryRecordViews; records() materializes rows.
+    """
+    __slots__ = ("columns", "record_types", "first_sequence_id", "timestamps")
+    
+    def __init__(
+        self,
+        columns: Mapping[str, Any],
+        record_types: Union[RecordType, Sequence[RecordType]],
+        first_sequence_id: int,
+        timestamps: Optional[Sequence[int]] = None
+    ):
+        """
+        Args:
+            columns: Field name -> column, one entry per record
+            record_types: One RecordType for all rows, or one per row
+            first_sequence_id: sequence_id of the first row
+            timestamps: Record timestamps (default: the timestamp_ns column)
+            
+        Raises:
+            ValueError: If columns differ in length or timestamps are missing
+        """
+        self.columns = {name: _typed_column(column) for name, column in columns.items()}
+        if not isinstance(record_types, RecordType):
+            # Row types as codes into RECORD_TYPES
+            codes = [RECORD_TYPES.index(record_type) for record_type in record_types]
+            record_types = np.array(codes, dtype=np.uint8) if HAS_NUMPY else array('B', codes)
+        self.record_types = record_types
+        self.first_sequence_id = first_sequence_id
+        if timestamps is None:
+            timestamps = self.columns.get("timestamp_ns")
+            if timestamps is None:
+                raise ValueError("TelemetryBatch needs timestamps or a timestamp_ns column")
+            # Record timestamps stay put when faults rewrite the column
+            timestamps = timestamps.copy() if hasattr(timestamps, "copy") else list(timestamps)
+        self.timestamps = _typed_column(timestamps)
+        
+        lengths = {len(column) for column in self.columns.values()}
+        lengths.add(len(self.timestamps))
+        if not isinstance(record_types, RecordType):
+            lengths.add(len(record_types))
+        if len(lengths) > 1:
+            raise ValueError(f"TelemetryBatch columns differ in length: {sorted(lengths)}")
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def __getitem__(self, index: int) -> TelemetryRecordView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TelemetryBatch index out of range")
+        return TelemetryRecordView(self, index)
+    
+    def __iter__(self) -> Iterator[TelemetryRecordView]:
+        return (TelemetryRecordView(self, index) for index in range(len(self)))
+    
+    @property
+    def sequence_ids(self) -> range:
+        return range(self.first_sequence_id, self.first_sequence_id + len(self))
+    
+    def record_type_at(self, index: int) -> RecordType:
+        if isinstance(self.record_types, RecordType):
+            return self.record_types
+        return RECORD_TYPES[self.record_types[index]]
+    
+    def record_type_list(self) -> List[RecordType]:
+        """RecordType of every row"""
+        if isinstance(self.record_types, RecordType):
+            return [self.record_types] * len(self)
+        return [RECORD_TYPES[code] for code in self.record_types.tolist()]
+    
+    def column_lists(self) -> Dict[str, List[Any]]:
+        """Columns as Python lists (one conversion per column)"""
+        return {name: column.tolist() if hasattr(column, "tolist") else list(column)
+                for name, column in self.columns.items()}
+    
+    def records(self) -> Iterator[TelemetryRecord]:
+        """Row-wise TelemetryRecords, converting each column once"""
+        columns = self.column_lists()
+        names = list(columns)
+        timestamps = self.timestamps.tolist() if hasattr(self.timestamps, "tolist") else self.timestamps
+        for record_type, timestamp, sequence_id, values in zip(
+            self.record_type_list(), timestamps, self.sequence_ids, zip(*columns.values())
+        ):
+            data = {name: value for name, value in zip(names, values) if value is not None}
+            yield TelemetryRecord(record_type, timestamp, sequence_id, data)
+    
+    @classmethod
+    def from_records(cls, records: Sequence[TelemetryRecord]) -> 'TelemetryBatch':
+        """
+        Batch of consecutive records
+        
+        Raises:
+            ValueError: If the records are empty or not consecutive
+        """
+        if not records:
+            raise ValueError("Cannot build a TelemetryBatch from no records")
+        first = records[0].sequence_id
+        if any(record.sequence_id != first + i for i, record in enumerate(records)):
+            raise ValueError("TelemetryBatch records must have consecutive sequence IDs")
+        
+        names = {}
+        for record in records:
+            names.update(dict.fromkeys(record.data))
+        columns = {name: [record.data.get(name) for record in records] for name in names}
+        record_types = [record.record_type for record in records]
+        if len(set(record_types)) == 1:
+            record_types = record_types[0]
+        return cls(columns, record_types, first, timestamps=[record.timestamp for record in records])
@@ -101,10 +101,10 @@ class BenchmarkRunner:
             
             # Regular test
             try:
-                start = time.time()
+                start = time.perf_counter()
                 for _ in range(test_records):
                     self.generator.generate_enhanced_record()
-                regular_time = time.time() - start
+                regular_time = time.perf_counter() - start
                 
                 if regular_time > 0:
                     results["regular_records_per_sec"] = test_records / regular_time
@@ -123,13 +123,13 @@ class BenchmarkRunner:
                         self.generator.gpu_generator
                     )
                     
-                    start = time.time()
+                    start = time.perf_counter()
                     batches = test_records // batch_size
                     next_seq = 1
                     for _ in range(batches):
                         batch_gen.generate_batch_gpu_accelerated(batch_size, next_seq_id=next_seq)
                         next_seq += batch_size
-                    gpu_time = time.time() - start
+                    gpu_time = time.perf_counter() - start
                     
                     if gpu_time > 0:
                         results["gpu_records_per_sec"] = (batches * batch_size) / gpu_time
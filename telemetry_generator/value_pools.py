@@ -0,0 +1,183 @@
+"""
+value_pools.py
+Pre-generated value pools: device IDs (optionally Zipf-popular) and enum
+code tables, drawn by integer index and pre-encoded for the packer
+"""
+
+import bisect
+import itertools
+import random
+import string
+import sys
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+DEVICE_ID_CHARS = string.ascii_uppercase + string.digits
+
+# Large enough that unrelated draws rarely collide, small enough to build quickly
+DEFAULT_DEVICE_POOL_SIZE = 16384
+
+# Interned str -> ASCII bytes of pooled values, shared with the packer
+_ENCODED: Dict[str, bytes] = {}
+
+
+def encode_ascii(value: str) -> bytes:
+    """ASCII bytes of a string, reusing the pre-encoded bytes of pooled values"""
+    encoded = _ENCODED.get(value)
+    if encoded is None:
+        encoded = value.encode('ascii')
+    return encoded
+
+
+class DeviceIdPool:
+    """
+    Fixed fleet of device IDs, encoded once
+
+    Draws pick an index, uniformly or with Zipf popularity (rank r drawn
+    with weight 1 / r ** zipf_exponent), so no string is built per record.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_DEVICE_POOL_SIZE,
+        length: int = 8,
+        zipf_exponent: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            size: Number of distinct device IDs
+            length: Characters per ID
+            zipf_exponent: Popularity skew (0: uniform)
+            seed: Seed for the pool contents (draws use the random module)
+        """
+        if size < 1:
+            raise ValueError("Device pool size must be at least 1")
+        if size > len(DEVICE_ID_CHARS) ** length:
+            raise ValueError(f"Cannot make {size} distinct {length}-character device IDs")
+        if zipf_exponent < 0:
+            raise ValueError("zipf_exponent must be non-negative")
+
+        rng = random.Random(seed)
+        ids = set()
+        while len(ids) < size:
+            ids.add(''.join(rng.choices(DEVICE_ID_CHARS, k=length)))
+        ids = sorted(ids)
+        # Popularity rank independent of the ID's spelling
+        rng.shuffle(ids)
+
+        self.size = size
+        self.length = length
+        self.zipf_exponent = zipf_exponent
+        self.ids: Tuple[str, ...] = tuple(sys.intern(device_id) for device_id in ids)
+        self.encoded: Tuple[bytes, ...] = tuple(device_id.encode('ascii') for device_id in self.ids)
+        _ENCODED.update(zip(self.ids, self.encoded))
+
+        self._cumulative = None
+        if zipf_exponent > 0:
+            self._cumulative = list(itertools.accumulate(
+                1.0 / (rank ** zipf_exponent) for rank in range(1, size + 1)
+            ))
+        self._id_array = np.array(self.ids, dtype=object) if HAS_NUMPY else None
+
+    @classmethod
+    def from_dict(cls, config: Mapping[str, Any], length: int = 8) -> 'DeviceIdPool':
+        """Pool from a schema "device_pool" block ({"size", "zipf", "seed"})"""
+        return cls(
+            size=config.get("size", DEFAULT_DEVICE_POOL_SIZE),
+            length=config.get("length", length),
+            zipf_exponent=config.get("zipf", 0.0),
+            seed=config.get("seed")
+        )
+
+    @classmethod
+    def from_schema(cls, schema_processor) -> Optional['DeviceIdPool']:
+        """Pool for a schema with a "device_pool" block, else None"""
+        config = getattr(schema_processor, 'device_pool', None)
+        if not config or not isinstance(config, Mapping):
+            return None
+        field = getattr(schema_processor, 'fields_by_name', {}).get("device_id_ascii")
+        return cls.from_dict(config, length=field["bits"] // 8 if field else 8)
+
+    def draw_index(self) -> int:
+        if self._cumulative is None:
+            return int(random.random() * self.size)
+        return bisect.bisect_right(self._cumulative, random.random() * self._cumulative[-1])
+
+    def draw(self) -> str:
+        """One device ID (the pool's interned string)"""
+        return self.ids[self.draw_index()]
+
+    def draw_indices(self, count: int, rng=None):
+        """Vectorized index draws"""
+        rng = rng or np.random.default_rng()
+        if self._cumulative is None:
+            return rng.integers(0, self.size, count)
+        cumulative = np.asarray(self._cumulative)
+        return np.searchsorted(cumulative, rng.random(count) * cumulative[-1], side='right')
+
+    def draw_batch(self, count: int, rng=None):
+        """Object array of `count` device IDs"""
+        return self._id_array[self.draw_indices(count, rng)]
+
+
+class EnumTable:
+    """Enum codes and labels of a field, built once per enum mapping"""
+
+    # id(enum map) -> (enum map, table); the map is held so its id stays unique
+    _cache: Dict[int, Tuple[Mapping[str, str], 'EnumTable']] = {}
+    _cache_lock = threading.Lock()
+    _MAX_CACHED = 1024
+
+    def __init__(self, enum_map: Mapping[str, str]):
+        self.codes: Tuple[int, ...] = tuple(int(key) for key in enum_map)
+        self.labels: Tuple[str, ...] = tuple(enum_map.values())
+        self.code_of: Dict[str, int] = {}
+        for code, label in zip(self.codes, self.labels):
+            self.code_of.setdefault(label, code)
+        self._code_array = np.array(self.codes, dtype=np.int64) if HAS_NUMPY else None
+
+    @classmethod
+    def for_field(cls, field: Mapping[str, Any]) -> Optional['EnumTable']:
+        """Cached table of a field's "enum" mapping (None if it has none)"""
+        enum_map = field.get("enum")
+        if not enum_map:
+            return None
+        entry = cls._cache.get(id(enum_map))
+        if entry is not None and entry[0] is enum_map and len(entry[1].codes) == len(enum_map):
+            return entry[1]
+
+        table = cls(enum_map)
+        with cls._cache_lock:
+            if len(cls._cache) >= cls._MAX_CACHED:
+                cls._cache.clear()
+            cls._cache[id(enum_map)] = (enum_map, table)
+        return table
+
+    def draw(self) -> int:
+        return random.choice(self.codes)
+
+    def draw_batch(self, count: int, rng=None):
+        """Vectorized code draws"""
+        rng = rng or np.random.default_rng()
+        return self._code_array[rng.integers(0, len(self.codes), count)]
+
+
+_default_device_pool: Optional[DeviceIdPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_device_pool() -> DeviceIdPool:
+    """Shared default device pool, built on first use"""
+    global _default_device_pool
+    if _default_device_pool is None:
+        with _default_pool_lock:
+            if _default_device_pool is None:
+                _default_device_pool = DeviceIdPool()
+    return _default_device_pool
@@ -0,0 +1,414 @@
+"""
+verifier.py
+Integrity checks for packed binary telemetry files
+
+Files are split into blocks of whole records that worker processes check
+directly from a memory map: record framing, the crc32c field against the
+record contents, and seq_no / timestamp_ns ordering. Ordering across block
+boundaries is checked when the blocks are merged back in file order.
+"""
+
+import gzip
+import logging
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .binary_schema import BinarySchemaProcessor
+from .checksums import CrcField
+from .record_layout import RecordLayout
+from .schema_model import load_schema
+
+DEFAULT_BLOCK_SIZE = 64 * 1024 * 1024
+
+# Error kinds, in report order
+CHECKS = ('framing', 'crc', 'seq_no', 'timestamp')
+
+
+@dataclass
+class VerifyBlock:
+    """A unit of work: whole records of a file, as a byte range or raw bytes"""
+    index: int
+    path: str
+    first_record: int
+    start: int = 0
+    end: int = 0
+    data: Optional[bytes] = None
+
+
+@dataclass(frozen=True)
+class VerifyConfig:
+    """Settings every worker needs to check a block"""
+    schema_file: str
+    types_file: Optional[str] = None
+    max_errors: int = 10
+
+
+@dataclass
+class BlockResult:
+    """Checks of one block; errors hold at most max_errors examples"""
+    index: int
+    path: str
+    first_record: int
+    records: int = 0
+    trailing_bytes: int = 0
+    counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(CHECKS, 0))
+    seq_gaps: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    first_seq: Optional[int] = None
+    last_seq: Optional[int] = None
+    first_timestamp: Optional[int] = None
+    last_timestamp: Optional[int] = None
+
+
+class _BlockChecker:
+    """Per-process schema state, built once per worker"""
+
+    def __init__(self, config: VerifyConfig):
+        self.config = config
+        self.processor = BinarySchemaProcessor(load_schema(config.schema_file, config.types_file))
+        self.layout = RecordLayout(self.processor)
+        self.record_size = self.layout.record_size
+        self.stride = self.record_size + 1  # +1 for newline separator
+        self.crc = CrcField.from_processor(self.processor)
+
+        seq_field = self.processor.fields_by_name.get("seq_no")
+        self.seq_mask = (1 << seq_field["bits"]) - 1 if seq_field else None
+        self.has_timestamp = "timestamp_ns" in self.processor.fields_by_name
+
+    def check(self, block: VerifyBlock) -> BlockResult:
+        """Check every record of one block"""
+        result = BlockResult(block.index, block.path, block.first_record)
+        if block.data is not None:
+            self._check_buffer(block.data, result)
+            return result
+        if block.end <= block.start:
+            return result
+
+        with open(block.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)[block.start:block.end]
+                try:
+                    self._check_buffer(view, result)
+                finally:
+                    view.release()
+        return result
+
+    def _check_buffer(self, data, result: BlockResult):
+        num_records = len(data) // self.stride
+        result.records = num_records
+        # Only the last block of a file can end in a partial record
+        result.trailing_bytes = len(data) - num_records * self.stride
+        if num_records == 0:
+            return
+        if HAS_NUMPY:
+            self._check_columns(data, num_records, result)
+        else:
+            self._check_rows(data, num_records, result)
+
+    def _check_columns(self, data, num_records: int, result: BlockResult):
+        """Vectorized checks over a strided view of the block's records"""
+        framed = np.frombuffer(data, dtype=np.uint8, count=num_records * self.stride)
+        framed = framed.reshape(num_records, self.stride)
+        rows = framed[:, :self.record_size]
+
+        self._report(result, 'framing', np.flatnonzero(framed[:, -1] != ord('\n')))
+
+        if self.crc:
+            stored = self.layout.read_column(rows, self.crc.name)
+            computed = self.crc.compute_batch(rows)
+            bad = np.flatnonzero(stored != computed)
+            self._report(result, 'crc', bad, stored=stored[bad], computed=computed[bad])
+
+        if self.seq_mask is not None:
+            seq = self.layout.read_column(rows, "seq_no")
+            # Forward distance modulo the field width, so wrap-around is in order
+            step = (seq[1:] - seq[:-1]) & np.uint64(self.seq_mask)
+            bad = np.flatnonzero((step == 0) | (step > np.uint64(self.seq_mask >> 1))) + 1
+            self._report(result, 'seq_no', bad, previous=seq[bad - 1], value=seq[bad])
+            result.seq_gaps = int(np.count_nonzero((step > 1) & (step <= np.uint64(self.seq_mask >> 1))))
+            result.first_seq, result.last_seq = int(seq[0]), int(seq[-1])
+
+        if self.has_timestamp:
+            timestamps = self.layout.read_column(rows, "timestamp_ns")
+            bad = np.flatnonzero(timestamps[1:] < timestamps[:-1]) + 1
+            self._report(result, 'timestamp', bad, previous=timestamps[bad - 1], value=timestamps[bad])
+            result.first_timestamp, result.last_timestamp = int(timestamps[0]), int(timestamps[-1])
+
+    def _check_rows(self, data, num_records: int, result: BlockResult):
+        """Record-by-record checks, without NumPy"""
+        data = memoryview(data)
+        bad = {check: [] for check in CHECKS}
+        details = {check: [] for check in CHECKS}
+        previous_seq = previous_timestamp = None
+
+        for i in range(num_records):
+            offset = i * self.stride
+            record = data[offset:offset + self.record_size]
+            if data[offset + self.record_size] != ord('\n'):
+                bad['framing'].append(i)
+                details['framing'].append({})
+            values = self.layout.unpack(record)
+
+            if self.crc:
+                stored = values[self.crc.name] & ((1 << self.crc.field["bits"]) - 1)
+                computed = self.crc.compute(record)
+                if stored != computed:
+                    bad['crc'].append(i)
+                    details['crc'].append({"stored": stored, "computed": computed})
+
+            if self.seq_mask is not None:
+                seq = values["seq_no"]
+                if previous_seq is None:
+                    result.first_seq = seq
+                else:
+                    step = (seq - previous_seq) & self.seq_mask
+                    if step == 0 or step > self.seq_mask >> 1:
+                        bad['seq_no'].append(i)
+                        details['seq_no'].append({"previous": previous_seq, "value": seq})
+                    elif step > 1:
+                        result.seq_gaps += 1
+                previous_seq = result.last_seq = seq
+
+            if self.has_timestamp:
+                timestamp = values["timestamp_ns"]
+                if previous_timestamp is None:
+                    result.first_timestamp = timestamp
+                elif timestamp < previous_timestamp:
+                    bad['timestamp'].append(i)
+                    details['timestamp'].append({"previous": previous_timestamp, "value": timestamp})
+                previous_timestamp = result.last_timestamp = timestamp
+
+        for check in CHECKS:
+            result.counts[check] += len(bad[check])
+            room = self.config.max_errors - len(result.errors)
+            for i, extra in zip(bad[check][:max(room, 0)], details[check]):
+                result.errors.append(dict({"record": result.first_record + i, "check": check}, **extra))
+
+    def _report(self, result: BlockResult, check: str, indices, **columns):
+        """Count failures of one check and keep the first examples"""
+        result.counts[check] += len(indices)
+        room = self.config.max_errors - len(result.errors)
+        for j in range(min(room, len(indices))):
+            error = {"record": result.first_record + int(indices[j]), "check": check}
+            error.update((name, int(column[j])) for name, column in columns.items())
+            result.errors.append(error)
+
+
+_WORKER_CHECKERS: Dict[VerifyConfig, _BlockChecker] = {}
+
+
+def _check_block(config: VerifyConfig, block: VerifyBlock) -> BlockResult:
+    """Process pool entry point"""
+    checker = _WORKER_CHECKERS.get(config)
+    if checker is None:
+        checker = _WORKER_CHECKERS[config] = _BlockChecker(config)
+    return checker.check(block)
+
+
+class BinaryFileVerifier:
+    """Certifies packed binary files: framing, CRC32C and record ordering"""
+
+    def __init__(
+        self,
+        schema_file: str,
+        types_file: Optional[str] = None,
+        workers: int = 4,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_errors: int = 10,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the verifier
+
+        Args:
+            schema_file: Binary schema the files were packed with
+            types_file: Optional types mapping file
+            workers: Worker processes (1 checks in-process)
+            block_size: Approximate bytes per work unit
+            max_errors: Error examples kept per file (all errors are counted)
+            logger: Optional logger instance
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if block_size <= 0:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+        if max_errors < 0:
+            raise ValueError(f"max_errors must be non-negative, got {max_errors}")
+
+        self.config = VerifyConfig(schema_file, types_file, max_errors)
+        self.workers = workers
+        self.block_size = block_size
+        self.logger = logger or logging.getLogger(__name__)
+
+        # Checks the parent needs for block boundaries and the report
+        self.checker = _BlockChecker(self.config)
+        self.record_size = self.checker.record_size
+        if self.checker.crc is None:
+            self.logger.warning(f"Schema '{self.checker.processor.schema_name}' has no crc32c field - "
+                                f"CRC checks disabled")
+
+    def _iter_blocks(self, path: str, first_index: int) -> Iterator[VerifyBlock]:
+        """Split one file into blocks of whole records"""
+        stride = self.checker.stride
+        block_bytes = max(stride, self.block_size // stride * stride)
+        index = first_index
+
+        if path.endswith('.gz'):
+            # Stream-decompress and cut at record boundaries
+            carry = b''
+            first_record = 0
+            with gzip.open(path, 'rb') as f:
+                while True:
+                    block = f.read(block_bytes)
+                    data = carry + block
+                    cut = len(data) // stride * stride if block else len(data)
+                    if cut:
+                        yield VerifyBlock(index, path, first_record, data=data[:cut])
+                        index += 1
+                        first_record += cut // stride
+                    if not block:
+                        return
+                    carry = data[cut:]
+
+        size = os.path.getsize(path)
+        for start in range(0, size, block_bytes):
+            yield VerifyBlock(index, path, start // stride, start=start, end=min(start + block_bytes, size))
+            index += 1
+
+    def verify(self, paths: List[str]) -> Dict[str, Any]:
+        """
+        Check files and summarize the errors per file
+
+        Args:
+            paths: Binary files (optionally .gz)
+
+        Returns:
+            Report with per-file summaries ('files') and totals
+        """
+        start_time = time.time()
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        files = []
+        total_bytes = 0
+
+        try:
+            blocks = self._all_blocks(paths)
+            summary = None
+            previous = None
+            for result in self._run(executor, blocks):
+                if summary is None or summary['file'] != result.path:
+                    summary = self._file_summary(result.path)
+                    files.append(summary)
+                    total_bytes += summary['bytes']
+                    previous = None
+                self._merge(summary, result, previous)
+                if result.records:
+                    previous = result
+        finally:
+            if executor:
+                executor.shutdown()
+
+        for summary in files:
+            summary['ok'] = not summary['error_count'] and not summary['trailing_bytes']
+            summary['errors'].sort(key=lambda error: error['record'])
+
+        elapsed = time.time() - start_time
+        total_records = sum(summary['records'] for summary in files)
+        return {
+            'files': files,
+            'ok': all(summary['ok'] for summary in files),
+            'records': total_records,
+            'bytes': total_bytes,
+            'error_count': sum(summary['error_count'] for summary in files),
+            'crc_checked': self.checker.crc is not None,
+            'elapsed_seconds': elapsed,
+            'records_per_second': total_records / elapsed if elapsed > 0 else 0,
+            'bytes_per_second': total_bytes / elapsed if elapsed > 0 else 0
+        }
+
+    def _all_blocks(self, paths: List[str]) -> Iterator[VerifyBlock]:
+        index = 0
+        for path in paths:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"File not found: {path}")
+            self.logger.info(f"Verifying {path}")
+            empty = True
+            for block in self._iter_blocks(path, index):
+                empty = False
+                index += 1
+                yield block
+            if empty:
+                # Still report the file
+                yield VerifyBlock(index, path, 0)
+                index += 1
+
+    def _file_summary(self, path: str) -> Dict[str, Any]:
+        return {
+            'file': path,
+            'bytes': os.path.getsize(path),
+            'records': 0,
+            'trailing_bytes': 0,
+            'error_count': 0,
+            **{f'{check}_errors': 0 for check in CHECKS},
+            'seq_gaps': 0,
+            'errors': []
+        }
+
+    def _merge(self, summary: Dict[str, Any], result: BlockResult, previous: Optional[BlockResult]):
+        """Add one block's results to its file summary, checking the block boundary"""
+        max_errors = self.config.max_errors
+        summary['records'] += result.records
+        summary['trailing_bytes'] += result.trailing_bytes
+        summary['seq_gaps'] += result.seq_gaps
+
+        for check in CHECKS:
+            summary[f'{check}_errors'] += result.counts[check]
+            summary['error_count'] += result.counts[check]
+        summary['errors'].extend(result.errors[:max(max_errors - len(summary['errors']), 0)])
+
+        if previous is None or not result.records:
+            return
+
+        boundary = []
+        mask = self.checker.seq_mask
+        if mask is not None:
+            step = (result.first_seq - previous.last_seq) & mask
+            if step == 0 or step > mask >> 1:
+                boundary.append(('seq_no', previous.last_seq, result.first_seq))
+            elif step > 1:
+                summary['seq_gaps'] += 1
+        if self.checker.has_timestamp and result.first_timestamp < previous.last_timestamp:
+            boundary.append(('timestamp', previous.last_timestamp, result.first_timestamp))
+
+        for check, before, value in boundary:
+            summary[f'{check}_errors'] += 1
+            summary['error_count'] += 1
+            if len(summary['errors']) < max_errors:
+                summary['errors'].append({"record": result.first_record, "check": check,
+                                          "previous": before, "value": value})
+
+    def _run(self, executor, blocks: Iterator[VerifyBlock]) -> Iterator[BlockResult]:
+        """Check blocks in order, keeping a bounded number in flight"""
+        if executor is None:
+            for block in blocks:
+                yield _check_block(self.config, block)
+            return
+
+        max_in_flight = self.workers * 2
+        pending = deque()
+        for block in blocks:
+            pending.append(executor.submit(_check_block, self.config, block))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,187 @@
+# tests/test_bench_history.py
+"""
+Tests for benchmark run history and regression comparison
+"""
+
+import json
+import random
+
+import pytest
+from click.testing import CliRunner
+
+from telemetry_generator.cli import cli
+from telemetry_generator.benchmarks import BENCHMARKS, DEFAULT_ROUNDS
+from telemetry_generator.bench_history import (
+    BenchmarkHistory,
+    bootstrap_change_ci,
+    compare_runs,
+    holm_adjust,
+    mann_whitney_u,
+    min_p_value,
+    min_rounds
+)
+
+
+def make_report(times, schema_hash="abc"):
+    return {
+        "created": "2026-01-01T00:00:00",
+        "environment": {"python": "3.12", "git_revision": None},
+        "settings": {"schema_hash": schema_hash, "records": 100},
+        "results": [{"name": name, "times_ns": values} for name, values in times.items()],
+        "skipped": {}
+    }
+
+
+def noisy(median, rounds=10, seed=0):
+    rng = random.Random(seed)
+    return [int(median * rng.uniform(0.98, 1.02)) for _ in range(rounds)]
+
+
+class TestStatistics:
+    """Test significance tests"""
+
+    def test_mann_whitney_exact(self):
+        u, p = mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+
+        assert u == 0
+        assert p == pytest.approx(2 / 252)
+        assert mann_whitney_u([1, 3, 5, 7, 9], [2, 4, 6, 8, 10])[1] == pytest.approx(0.6905, abs=1e-4)
+
+    def test_mann_whitney_ties(self):
+        u, p = mann_whitney_u([1, 2, 2, 3, 5], [2, 4, 4, 6, 7])
+
+        assert u == 5
+        assert p == pytest.approx(0.1376, abs=1e-4)
+        assert mann_whitney_u([3, 3, 3], [3, 3, 3])[1] == 1.0
+
+    def test_holm_adjust(self):
+        assert holm_adjust([0.01, 0.04, 0.03, 0.005]) == pytest.approx([0.03, 0.06, 0.06, 0.02])
+        assert holm_adjust([0.5, 0.9]) == [1.0, 1.0]
+        assert holm_adjust([]) == []
+
+    def test_bootstrap_interval(self):
+        low, high = bootstrap_change_ci(noisy(100_000), noisy(120_000, seed=1))
+
+        assert 0.1 < low < 0.2 < high < 0.3
+
+
+class TestCompareRuns:
+    """Test regression verdicts"""
+
+    @pytest.mark.parametrize("method", ["mannwhitney", "bootstrap"])
+    def test_verdicts(self, method):
+        baseline = make_report({"slow": noisy(1e6), "fast": noisy(1e6), "same": noisy(1e6), "gone": [1]})
+        candidate = make_report({"slow": noisy(1.2e6, seed=1), "fast": noisy(0.7e6, seed=2),
+                                 "same": noisy(1e6, seed=3), "new": [1]})
+
+        comparisons = {c.name: c for c in compare_runs(baseline, candidate, method=method)}
+
+        assert set(comparisons) == {"slow", "fast", "same"}
+        assert comparisons["slow"].is_regression
+        assert comparisons["slow"].change == pytest.approx(0.2, abs=0.03)
+        assert comparisons["fast"].verdict == "improvement"
+        assert comparisons["same"].verdict == "unchanged"
+
+    def test_multiple_comparison_correction(self):
+        base = [100, 102, 104, 106, 108, 110, 112, 114, 116, 118]
+        times = {f"flat{i}": noisy(1e6, seed=i) for i in range(9)}
+        baseline = make_report(dict(times, borderline=base))
+        candidate = make_report(dict(times, borderline=[value + 7 for value in base]))
+
+        uncorrected = compare_runs(baseline, candidate, correction="none")[-1]
+        corrected = compare_runs(baseline, candidate)[-1]
+
+        assert uncorrected.p_value == corrected.p_value == pytest.approx(0.0288, abs=1e-4)
+        assert uncorrected.verdict == "regression"
+        assert corrected.p_adjusted == pytest.approx(10 * corrected.p_value)
+        assert corrected.verdict == "unchanged"
+
+        narrow = compare_runs(baseline, candidate, method="bootstrap", correction="none")[-1]
+        wide = compare_runs(baseline, candidate, method="bootstrap")[-1]
+        assert wide.ci_low < narrow.ci_low < narrow.ci_high < wide.ci_high
+
+    @pytest.mark.parametrize("rounds, verdict", [(DEFAULT_ROUNDS, "regression"), (5, "inconclusive")])
+    def test_full_suite_detection(self, rounds, verdict, caplog):
+        names = sorted(BENCHMARKS)
+        baseline = make_report({name: noisy(1e6, rounds, seed=i) for i, name in enumerate(names)})
+        candidate = make_report({name: noisy(2e6 if name == names[0] else 1e6, rounds, seed=100 + i)
+                                 for i, name in enumerate(names)})
+
+        comparisons = compare_runs(baseline, candidate)
+
+        assert comparisons[0].verdict == verdict
+        if verdict == "inconclusive":
+            assert "too few rounds" in caplog.text
+        else:
+            assert {c.verdict for c in comparisons[1:]} == {"unchanged"}
+
+    def test_min_rounds(self):
+        assert min_p_value(5, 5) == pytest.approx(2 / 252)
+        assert min_rounds(0.05) == 4
+        assert min_rounds(0.05, family=len(BENCHMARKS)) <= DEFAULT_ROUNDS
+
+    def test_threshold(self):
+        baseline = make_report({"x": noisy(1e6)})
+        candidate = make_report({"x": noisy(1.2e6, seed=1)})
+
+        assert compare_runs(baseline, candidate, threshold=0.5)[0].verdict == "unchanged"
+        with pytest.raises(ValueError, match="method"):
+            compare_runs(baseline, candidate, method="t-test")
+        with pytest.raises(ValueError, match="correction"):
+            compare_runs(baseline, candidate, correction="fdr")
+
+
+class TestBenchmarkHistory:
+    """Test run storage"""
+
+    def test_save_and_get(self, tmp_path):
+        history = BenchmarkHistory(str(tmp_path / "bench" / "history.ndjson"))
+
+        assert history.runs() == []
+        assert history.save(make_report({"x": [1]}), label="before") == 1
+        assert history.save(make_report({"x": [2]})) == 2
+
+        assert history.get("previous")["label"] == "before"
+        assert history.get("latest")["results"][0]["times_ns"] == [2]
+        assert history.get("1")["run_id"] == 1
+        with pytest.raises(ValueError, match="No run"):
+            history.get(3)
+        with pytest.raises(ValueError, match="Invalid run reference"):
+            history.get("newest")
+
+
+class TestBenchCommands:
+    """Test bench CLI group"""
+
+    def test_run_list_compare(self, tmp_path):
+        history = str(tmp_path / "history.ndjson")
+        runner = CliRunner()
+        args = ['bench', 'run', 'pack.*', '--records', '20', '--rounds', '3', '--warmup', '0',
+                '--history', history]
+
+        for label in ("base", "candidate"):
+            result = runner.invoke(cli, args + ['--label', label])
+            assert result.exit_code == 0, result.output
+            assert "pack.record" in result.output
+
+        result = runner.invoke(cli, ['bench', 'list', '--history', history])
+        assert result.exit_code == 0, result.output
+        assert "base" in result.output and "candidate" in result.output
+
+        output = tmp_path / "comparison.json"
+        result = runner.invoke(cli, ['bench', 'compare', '--history', history, '--output', str(output)])
+        assert result.exit_code == 0, result.output
+        assert "2 benchmarks compared" in result.output
+        assert [c["name"] for c in json.loads(output.read_text())["comparisons"]] == ["pack.record", "pack.columns"]
+
+    def test_compare_fails_on_regression(self, tmp_path):
+        baseline, candidate = tmp_path / "base.json", tmp_path / "cand.json"
+        baseline.write_text(json.dumps(make_report({"x": noisy(1e6)})))
+        candidate.write_text(json.dumps(make_report({"x": noisy(1.5e6, seed=1)}, schema_hash="def")))
+
+        result = CliRunner().invoke(cli, ['bench', 'compare', str(baseline), str(candidate),
+                                          '--fail-on-regression'])
+
+        assert result.exit_code == 1
+        assert "regression" in result.output
+        assert "schema_hash: abc -> def" in result.output
@@ -0,0 +1,92 @@
+# tests/test_benchmarks.py
+"""
+Tests for the pipeline benchmark suite
+"""
+
+import json
+
+import pytest
+
+from telemetry_generator.benchmarks import (
+    BENCHMARKS,
+    DEFAULT_SCHEMA,
+    BenchmarkResult,
+    BenchmarkSuite,
+    measure,
+    write_report
+)
+
+
+class TestMeasure:
+    """Test round timing"""
+
+    def test_warmup_not_recorded(self):
+        calls = []
+
+        times = measure(lambda: calls.append(1), rounds=3, warmup=2)
+
+        assert len(calls) == 5
+        assert len(times) == 3
+        assert all(isinstance(t, int) and t >= 0 for t in times)
+
+    def test_result_statistics(self):
+        result = BenchmarkResult("x", "group", items=1000, rounds=4, warmup=0,
+                                 times_ns=[4_000_000, 1_000_000, 2_000_000, 3_000_000])
+
+        summary = result.to_dict()
+
+        assert summary["min_ns"] == 1_000_000 and summary["max_ns"] == 4_000_000
+        assert summary["median_ns"] == 2_500_000
+        assert summary["items_per_second"] == pytest.approx(400_000)
+
+
+class TestBenchmarkSuite:
+    """Test benchmark selection and suite reports"""
+
+    def test_every_stage_registered(self):
+        groups = {bench.group for bench in BENCHMARKS.values()}
+
+        assert groups == {"schema", "generation", "faults", "packing", "crc", "formatting",
+                          "leb128", "writing", "reading", "rate_control"}
+        assert {"write.binary", "write.binary_gzip", "leb128.encode", "leb128.decode"} <= set(BENCHMARKS)
+
+    def test_select(self):
+        assert [b.name for b in BenchmarkSuite.select(["crc"])] == ["crc.record", "crc.batch"]
+        assert [b.name for b in BenchmarkSuite.select(["pack.*", "pack.record"])] == ["pack.record", "pack.columns"]
+        with pytest.raises(ValueError, match="No benchmark matches"):
+            BenchmarkSuite.select(["nothing"])
+
+    def test_run_report(self, tmp_path):
+        suite = BenchmarkSuite(records=20, rounds=2, warmup=1)
+
+        report = suite.run(["packing", "crc", "formatting", "leb128", "writing", "reading", "rate_control"])
+
+        names = [result["name"] for result in report["results"]]
+        assert "pack.record" in names and "write.binary_gzip" in names
+        assert report["skipped"] == {}
+        assert report["settings"]["schema_hash"]
+        assert {key: value for key, value in report["settings"].items() if key != "schema_hash"} == {
+            "schema_file": None, "records": 20, "rounds": 2, "warmup": 1}
+        assert all(len(result["times_ns"]) == 2 for result in report["results"])
+        limiter = next(result for result in report["results"] if result["name"] == "rate_limiter.accuracy")
+        assert set(limiter["extra"]) == {"target_rate", "achieved_rate", "error_percent"}
+
+        path = tmp_path / "results.json"
+        write_report(report, str(path))
+        assert json.loads(path.read_text())["results"][0]["name"] == names[0]
+
+    def test_schema_file(self, tmp_path):
+        schema = {key: value for key, value in DEFAULT_SCHEMA.items() if key != "validation"}
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps(schema))
+
+        report = BenchmarkSuite(str(schema_path), records=10, rounds=1, warmup=0).run(["schema.load", "crc.record"])
+
+        assert [result["name"] for result in report["results"]] == ["schema.load"]
+        assert "crc32c" in report["skipped"]["crc.record"]
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError, match="rounds"):
+            BenchmarkSuite(rounds=0)
+        with pytest.raises(ValueError, match="records"):
+            BenchmarkSuite(records=0)
@@ -0,0 +1,157 @@
+# tests/test_binary_faults.py
+"""
+Tests for post-pack binary fault injection
+"""
+
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from telemetry_generator.cli import cli
+from telemetry_generator.binary_faults import (
+    BinaryFaultConfig,
+    BinaryFaultInjector,
+    load_ground_truth
+)
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.checksums import crc32c
+
+
+SCHEMA = {
+    "schema_name": "binary_fault_test",
+    "endianness": "little",
+    "total_bits": 96,
+    "validation": {"crc32c": {"field": "crc32c", "range_bits": "0-95"}},
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+    "value": {"type": "uint32", "bits": 32, "pos": "32-63"},
+    "crc32c": {"type": "uint32", "bits": 32, "pos": "64-95"}
+}
+
+
+@pytest.fixture
+def processor():
+    return BinarySchemaProcessor(SCHEMA)
+
+
+@pytest.fixture
+def records(processor):
+    packer = BinaryRecordPacker(processor)
+    return [packer.pack_record({"seq_no": i, "value": i * 7}) for i in range(1000)]
+
+
+def crc_ok(record):
+    body = record[:8] + b"\x00" * 4
+    return crc32c(body) == int.from_bytes(record[8:12], "little")
+
+
+class TestBinaryFaultInjector:
+    """Test batch binary faults and their ground truth"""
+
+    def test_no_faults_is_identity(self, processor, records):
+        injector = BinaryFaultInjector(processor, seed=1)
+
+        output, truth = injector.inject_batch(records)
+
+        assert output == records
+        assert truth == []
+
+    def test_bit_flips_recorded(self, processor, records):
+        injector = BinaryFaultInjector(processor, BinaryFaultConfig(bit_flip_rate=0.1, max_bit_flips=3), seed=2)
+
+        output, truth = injector.inject_batch(records)
+
+        assert len(output) == len(records)
+        assert truth
+        for entry in truth:
+            index = entry["index"]
+            assert entry["output_positions"] == [index]
+            assert entry["seq_no"] == index
+            diff = int.from_bytes(output[index], "little") ^ int.from_bytes(records[index], "little")
+            assert diff == sum(1 << bit for bit in entry["flipped_bits"])
+        faulty = {entry["index"] for entry in truth}
+        assert all(output[i] == records[i] for i in range(len(records)) if i not in faulty)
+
+    def test_crc_corruption(self, processor, records):
+        injector = BinaryFaultInjector(processor, BinaryFaultConfig(crc_corruption_rate=0.2), seed=3)
+
+        output, truth = injector.inject_batch(records)
+
+        corrupted = {entry["index"] for entry in truth}
+        assert corrupted
+        assert all(crc_ok(record) for record in records)
+        assert {i for i, record in enumerate(output) if not crc_ok(record)} == corrupted
+
+    def test_stream_faults(self, processor, records):
+        config = BinaryFaultConfig(truncation_rate=0.05, drop_rate=0.05, duplicate_rate=0.05,
+                                   reorder_rate=0.05, reorder_window=3)
+        injector = BinaryFaultInjector(processor, config, seed=4)
+
+        output, truth = injector.inject_batch(records, first_index=100)
+
+        by_index = {entry["index"] - 100: entry for entry in truth}
+        stats = injector.get_stats()
+        assert len(output) == len(records) - stats["drop"] + stats["duplicate"]
+        for i, entry in by_index.items():
+            if "drop" in entry["faults"]:
+                assert entry["output_positions"] == []
+            if "duplicate" in entry["faults"]:
+                assert len(entry["output_positions"]) == 2
+            for position in entry["output_positions"]:
+                expected = records[i][:entry.get("truncated_length", len(records[i]))]
+                assert output[position] == expected
+
+    def test_stream_matches_records(self, processor, records):
+        config = BinaryFaultConfig(truncation_rate=0.05, duplicate_rate=0.05, drop_rate=0.05, reorder_rate=0.05)
+        batch = np.frombuffer(b"".join(records), dtype=np.uint8).reshape(len(records), 12)
+
+        output, truth = BinaryFaultInjector(processor, config, seed=6).inject_array(batch)
+        stream, count, stream_truth = BinaryFaultInjector(processor, config, seed=6).inject_stream(batch)
+
+        assert stream == b"".join(record + b"\n" for record in output)
+        assert count == len(output)
+        assert stream_truth == truth
+
+    def test_process_file(self, processor, records, tmp_path):
+        source = tmp_path / "clean.bin"
+        source.write_bytes(b"".join(record + b"\n" for record in records))
+        target = tmp_path / "faulty.bin"
+        config = BinaryFaultConfig(truncation_rate=0.02, duplicate_rate=0.02, bit_flip_rate=0.02)
+
+        stats = BinaryFaultInjector(processor, config, seed=5).process_file(str(source), str(target), batch_size=128)
+
+        data = target.read_bytes()
+        truth = load_ground_truth(stats["index_file"])
+        assert stats["records_in"] == len(records)
+        assert len(truth) == stats["faulty_records"]
+        for entry in truth:
+            for position, offset in zip(entry["output_positions"], entry["output_offsets"]):
+                length = entry.get("truncated_length", 12)
+                assert data[offset + length:offset + length + 1] == b"\n"
+
+    def test_invalid_rate(self, processor):
+        with pytest.raises(ValueError, match="drop_rate"):
+            BinaryFaultInjector(processor, BinaryFaultConfig(drop_rate=1.5))
+
+
+class TestInjectBinaryFaultsCommand:
+    """Test the inject-binary-faults command"""
+
+    def test_command(self, records, tmp_path):
+        schema = tmp_path / "schema.json"
+        schema.write_text(json.dumps(SCHEMA))
+        source = tmp_path / "clean.bin"
+        source.write_bytes(b"".join(record + b"\n" for record in records))
+        target = tmp_path / "faulty.bin"
+
+        result = CliRunner().invoke(cli, [
+            'inject-binary-faults', str(source), str(target), '--schema', str(schema),
+            '--crc-rate', '0.1', '--drop-rate', '0.1', '--seed', '7'
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert "Processed 1,000 records" in result.output
+        truth = load_ground_truth(str(target) + ".faults.ndjson")
+        assert truth and all(set(entry["faults"]) <= {"crc_corruption", "drop"} for entry in truth)
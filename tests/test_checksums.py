@@ -0,0 +1,154 @@
+# tests/test_checksums.py
+"""
+Tests for CRC-32C checksums and record CRC verification
+"""
+
+import json
+import random
+
+import pytest
+
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.binary_reader import BinaryRecordReader
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.checksums import CrcField, _extend_python, crc32c, crc32c_batch, crc32c_masked
+
+
+SCHEMA = {
+    "schema_name": "crc_test",
+    "endianness": "little",
+    "total_bits": 168,
+    "validation": {"crc32c": {"field": "crc32c", "range_bits": "0-167"}},
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+    "value": {"type": "uint64", "bits": 64, "pos": "32-95"},
+    "crc32c": {"type": "uint32", "bits": 32, "pos": "96-127"},
+    "device_id_ascii": {"type": "bytes", "bits": 40, "pos": "128-167"}
+}
+
+# CRC in a bit field that doesn't start on a byte boundary
+BIT_FIELD_SCHEMA = dict(
+    SCHEMA,
+    validation={"crc32c": {"field": "crc", "range_bits": "0-167"}},
+    flags={"type": "uint8", "bits": 4, "pos": "96-99"},
+    crc={"type": "uint32", "bits": 28, "pos": "100-127"}
+)
+del BIT_FIELD_SCHEMA["crc32c"]
+
+
+def reference_crc(data):
+    """Bitwise CRC-32C"""
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ (0x82F63B78 if crc & 1 else 0)
+    return crc ^ 0xFFFFFFFF
+
+
+def make_records(schema, count=200):
+    packer = BinaryRecordPacker(BinarySchemaProcessor(schema))
+    rng = random.Random(5)
+    return packer, [
+        packer.pack_record({"seq_no": i, "value": rng.getrandbits(64), "flags": i % 16,
+                            "device_id_ascii": "D%04d" % i})
+        for i in range(count)
+    ]
+
+
+class TestCrc32c:
+    """Test the checksum functions"""
+
+    def test_check_value(self):
+        assert crc32c(b"123456789") == 0xE3069283
+        assert _extend_python(0, b"123456789") == 0xE3069283
+        assert crc32c(b"6789", crc32c(b"12345")) == 0xE3069283
+
+    def test_slicing_by_8_matches_bitwise(self):
+        rng = random.Random(1)
+        for length in (0, 1, 7, 8, 9, 63, 64, 100):
+            data = bytes(rng.getrandbits(8) for _ in range(length))
+            assert _extend_python(0, data) == crc32c(data) == reference_crc(data)
+
+    def test_masked_reads_zeros(self):
+        data = bytes(range(40))
+
+        expected = reference_crc(data[3:10] + bytes(4) + data[14:30])
+
+        assert crc32c_masked(data, 3, 30, (10, 14)) == expected
+        assert crc32c_masked(data, 12, 30, (10, 14)) == reference_crc(bytes(2) + data[14:30])
+        assert crc32c_masked(data, 0, None, (50, 54)) == reference_crc(data)
+
+    def test_batch_matches_scalar_on_strided_rows(self):
+        np = pytest.importorskip("numpy")
+        buffer = np.random.default_rng(2).integers(0, 256, (500, 46), dtype=np.uint8)
+        records = buffer[:, :45]
+
+        crcs = crc32c_batch(records, 3, 41, (8, 13))
+
+        assert crcs.dtype == np.uint32
+        assert crcs.tolist() == [crc32c_masked(row.tobytes(), 3, 41, (8, 13)) for row in records]
+
+
+class TestRecordCrc:
+    """Test CRCs of packed records"""
+
+    @pytest.mark.parametrize("schema", [SCHEMA, BIT_FIELD_SCHEMA])
+    def test_packed_crc(self, schema):
+        packer, records = make_records(schema)
+        crc = CrcField.from_processor(packer.processor)
+
+        stored = [packer.layout.unpack(record)[crc.name] for record in records]
+
+        assert stored == [crc.compute(record) for record in records]
+        assert stored[0] == reference_crc(records[0][:12] + bytes(4) + records[0][16:]) & crc.value_mask
+
+    def test_columns_match_records(self):
+        np = pytest.importorskip("numpy")
+        packer, records = make_records(SCHEMA)
+
+        packed = packer.pack_columns({
+            "seq_no": np.arange(200),
+            "value": np.array([packer.layout.unpack(r)["value"] for r in records], dtype=np.uint64),
+            "device_id_ascii": ["D%04d" % i for i in range(200)]
+        })
+
+        assert [bytes(row) for row in packed] == records
+
+    def test_no_crc_field(self):
+        schema = {key: value for key, value in SCHEMA.items() if key != "validation"}
+        assert CrcField.from_processor(BinarySchemaProcessor(schema)) is None
+
+
+class TestVerifyCrc:
+    """Test BinaryRecordReader.verify_crc"""
+
+    @pytest.mark.parametrize("endianness", ["little", "big"])
+    @pytest.mark.parametrize("schema", [SCHEMA, BIT_FIELD_SCHEMA])
+    def test_reports_corrupted_records(self, tmp_path, monkeypatch, schema, endianness):
+        schema = dict(schema, endianness=endianness)
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps(schema))
+        packer, records = make_records(schema)
+        records[7] = records[7][:2] + bytes([records[7][2] ^ 0x10]) + records[7][3:]
+        records[150] = records[150][:-1] + b"X"
+        data_path = tmp_path / "data.bin"
+        data_path.write_bytes(b"".join(record + b"\n" for record in records))
+        reader = BinaryRecordReader(str(schema_path))
+
+        failures = reader.verify_crc(str(data_path))
+
+        assert [failure["record"] for failure in failures] == [7, 150]
+        crc = CrcField.from_processor(reader.processor)
+        assert failures[0]["computed"] == crc.compute(records[7])
+        assert failures[0]["stored"] == reader.layout.unpack(records[7])[crc.name]
+
+        import telemetry_generator.binary_reader as binary_reader
+        monkeypatch.setattr(binary_reader, "HAS_NUMPY", False)
+        assert reader.verify_crc(str(data_path)) == failures
+
+    def test_requires_crc_field(self, tmp_path):
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps({key: value for key, value in SCHEMA.items() if key != "validation"}))
+
+        with pytest.raises(ValueError, match="no crc32c field"):
+            BinaryRecordReader(str(schema_path)).verify_crc(str(tmp_path / "data.bin"))
@@ -0,0 +1,119 @@
+# tests/test_column_samplers.py
+"""
+Tests for per-field column samplers of the accelerated batch path
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.column_samplers import NOT_APPLICABLE, ColumnSamplerTable
+from telemetry_generator.gpu_accelerator import GPUAcceleratedGenerator
+from telemetry_generator.gpu_batch_generator import GPUBatchGenerator
+from telemetry_generator.types_and_enums import RecordType
+
+
+SCHEMA = {
+    "schema_name": "column_test",
+    "endianness": "little",
+    "total_bits": 384,
+    "device_id_ascii": {"type": "bytes", "bits": 64, "pos": "0-63"},
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "64-95"},
+    "timestamp_ns": {"type": "uint64", "bits": 64, "pos": "96-159"},
+    "scope": {"type": "enum", "bits": 2, "pos": "160-161", "values": ["DEVICE", "BLOCK", "THREAD"]},
+    "delta": {"type": "int8", "bits": 6, "pos": "162-167"},
+    "block_id": {"type": "uint16", "bits": 16, "pos": "168-183"},
+    "thread_id": {"type": "uint16", "bits": 16, "pos": "184-199"},
+    "value_type": {"type": "enum", "bits": 8, "pos": "200-207", "values": ["FLOAT32", "UINT64", "INT64", "BOOL"]},
+    "value_bits": {"type": "uint64", "bits": 64, "pos": "208-271"},
+    "raw": {"type": "uint64", "bits": 64, "pos": "272-335"},
+    "label": {"type": "bytes", "bits": 16, "pos": "336-351"},
+    "load": {"type": "float32", "bits": 32, "pos": "352-383"}
+}
+
+
+@pytest.fixture
+def processor():
+    return BinarySchemaProcessor(SCHEMA)
+
+
+class TestColumnSamplerTable:
+    """Test per-field column draws"""
+
+    def test_dtypes_and_ranges(self, processor):
+        columns = ColumnSamplerTable(processor, seed=1).sample(5000, seq_start=10, timestamp_start=99)
+
+        assert list(columns) == list(processor.fields_by_name)
+        assert columns["seq_no"].tolist()[:3] == [10, 11, 12]
+        assert columns["timestamp_ns"][0] == 99
+        assert columns["raw"].dtype == np.uint64
+        assert columns["raw"].max() > np.uint64(1 << 63)
+        assert columns["delta"].dtype == np.int64
+        assert columns["delta"].min() == -32 and columns["delta"].max() == 31
+        assert set(columns["scope"].tolist()) == {0, 1, 2}
+        assert columns["load"].dtype == np.float64
+        labels = columns["label"].tolist()
+        assert all(len(label) == 2 and label.isalnum() for label in labels)
+
+    def test_scope_dependent_ids(self, processor):
+        columns = ColumnSamplerTable(processor, seed=2).sample(5000)
+        scope, block, thread = columns["scope"], columns["block_id"], columns["thread_id"]
+
+        assert (block[scope == 0] == NOT_APPLICABLE).all()
+        assert (block[scope >= 1] <= 2047).all()
+        assert (thread[scope < 2] == NOT_APPLICABLE).all()
+        assert (thread[scope == 2] <= 1023).all()
+
+    def test_value_bits_follow_value_type(self, processor):
+        columns = ColumnSamplerTable(processor, seed=3).sample(5000)
+        value_type, value_bits = columns["value_type"], columns["value_bits"]
+
+        floats = value_bits[value_type == 0].astype(np.uint32).view(np.float32)
+        assert (np.abs(floats) <= 1000).all()
+        assert (value_bits[value_type == 1] < (1 << 48)).all()
+        assert set(value_bits[value_type == 3].tolist()) <= {0, 1}
+
+    def test_seeded(self, processor):
+        first = ColumnSamplerTable(processor, seed=4).sample(100)
+        second = ColumnSamplerTable(processor, seed=4).sample(100)
+
+        assert all((first[name] == second[name]).all() for name in first)
+
+    def test_accelerator_columns(self, processor):
+        accelerator = GPUAcceleratedGenerator(use_gpu=False)
+
+        columns = ColumnSamplerTable(processor, accelerator=accelerator).sample(2000)
+
+        assert columns["raw"].dtype == np.uint64
+        assert columns["delta"].min() >= -32 and columns["delta"].max() <= 31
+
+    def test_declared_distribution_wins(self):
+        schema = dict(SCHEMA, raw=dict(SCHEMA["raw"], distribution={"type": "constant", "value": 7}))
+        processor = BinarySchemaProcessor(schema)
+        generator = GPUBatchGenerator(processor, GPUAcceleratedGenerator(use_gpu=False))
+
+        assert (generator.generate_columns(50)["raw"] == 7).all()
+
+
+class TestAcceleratedBatch:
+    """Test the accelerated batch path end to end"""
+
+    def test_columns_pack_like_records(self, processor):
+        generator = GPUBatchGenerator(processor, GPUAcceleratedGenerator(use_gpu=False))
+        packer = BinaryRecordPacker(processor)
+
+        columns = generator.generate_columns(200, next_seq_id=5, timestamp_base=1000)
+        rows = [dict(zip(columns, values)) for values in zip(*(c.tolist() for c in columns.values()))]
+
+        assert [bytes(row) for row in packer.pack_columns(columns)] == [packer.pack_record(r) for r in rows]
+
+    def test_records(self, processor):
+        generator = GPUBatchGenerator(processor, GPUAcceleratedGenerator(use_gpu=False))
+
+        records = generator.generate_batch_gpu_accelerated(20, RecordType.UPDATE, 7)
+
+        assert [r.sequence_id for r in records] == list(range(7, 27))
+        assert all(r.data["seq_no"] == r.sequence_id for r in records)
+        assert all(isinstance(r.data["device_id_ascii"], str) for r in records)
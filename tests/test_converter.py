@@ -0,0 +1,236 @@
+# tests/test_converter.py
+"""
+Tests for format conversion
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from telemetry_generator.cli import cli
+from telemetry_generator.converter import (
+    TelemetryConverter,
+    detect_format,
+    parse_influx_line,
+    read_records
+)
+from telemetry_generator.rolling_writer import RollingFileWriter
+from telemetry_generator import TelemetryRecord, RecordType
+
+
+SCHEMA = {
+    "schema_name": "converter_test",
+    "endianness": "little",
+    "total_bits": 64,
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+    "temperature": {"type": "uint16", "bits": 16, "pos": "32-47"},
+    "code": {"type": "uint8", "bits": 8, "pos": "48-55"},
+    "flags": {"type": "uint8", "bits": 8, "pos": "56-63"}
+}
+
+EXTENSIONS = {'binary': 'bin', 'leb128': 'leb128', 'ndjson': 'ndjson', 'json': 'json', 'influx': 'txt'}
+
+
+def make_records(count):
+    return [
+        TelemetryRecord(
+            record_type=RecordType.UPDATE,
+            timestamp=1_700_000_000_000_000_000 + i,
+            sequence_id=i,
+            data={"seq_no": i, "temperature": 200 + i % 50, "code": i % 256, "flags": 10 ** (i % 3)}
+        )
+        for i in range(count)
+    ]
+
+
+def expected_dicts(records):
+    return [
+        {'type': r.record_type.value, 'timestamp': r.timestamp, 'seq_id': r.sequence_id, 'data': r.data}
+        for r in records
+    ]
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    return str(path)
+
+
+@pytest.fixture
+def records():
+    return make_records(300)
+
+
+def write_file(directory, records, fmt, schema_file=None, compress=False):
+    """Write records the way the generator does and return the file path"""
+    generator = None
+    if fmt in ('binary', 'influx') and schema_file:
+        from telemetry_generator.converter import _SchemaCodec
+        generator = _SchemaCodec(schema_file, "telemetry")
+
+    writer = RollingFileWriter(
+        base_path=str(directory / f"source_{fmt}"),
+        max_size_bytes=1 << 30,
+        format=fmt,
+        compress=compress
+    )
+    for record in records:
+        writer.write_record(record, generator)
+    writer.close()
+    return writer.current_file_path
+
+
+def output_records(out_dir, fmt, schema_file=None):
+    files = sorted(out_dir.glob(f"*.{EXTENSIONS[fmt]}*"))
+    result = []
+    for path in files:
+        result.extend(read_records(str(path), schema_file=schema_file))
+    return result
+
+
+class TestDetectFormat:
+    """Test format detection from file names"""
+
+    @pytest.mark.parametrize("name,expected", [
+        ("telemetry_0001.bin", ("binary", False)),
+        ("telemetry_0001.leb128.gz", ("leb128", True)),
+        ("telemetry_0001.ndjson", ("ndjson", False)),
+        ("telemetry_0001.json.gz", ("json", True)),
+        ("telemetry_0001.txt", ("influx", False)),
+    ])
+    def test_known_extensions(self, name, expected):
+        assert detect_format(name) == expected
+
+    def test_unknown_extension(self):
+        with pytest.raises(ValueError, match="Cannot detect format"):
+            detect_format("data.csv")
+
+
+class TestParseInfluxLine:
+    """Test InfluxDB line protocol parsing"""
+
+    def test_typed_fields(self):
+        line = 'telemetry,schema=s,type=event,seq_id=7 a=5i,b=1.5,c=true,d="x, \\"y\\" z" 123\n'
+
+        assert parse_influx_line(line) == {
+            'type': 'event',
+            'timestamp': 123,
+            'seq_id': 7,
+            'data': {'a': 5, 'b': 1.5, 'c': True, 'd': 'x, "y" z'}
+        }
+
+    def test_malformed_line(self):
+        with pytest.raises(ValueError, match="Malformed"):
+            parse_influx_line('telemetry a=notanumber 1')
+
+
+class TestTelemetryConverter:
+    """Test conversion between formats"""
+
+    @pytest.mark.parametrize("source_format", ['leb128', 'ndjson', 'json', 'influx'])
+    @pytest.mark.parametrize("target_format", ['leb128', 'ndjson', 'influx'])
+    def test_round_trip(self, tmp_path, records, schema_file, source_format, target_format):
+        source = write_file(tmp_path, records, source_format, schema_file)
+        out_dir = tmp_path / "out"
+
+        stats = TelemetryConverter(
+            target_format, out_dir=str(out_dir), schema_file=schema_file,
+            workers=1, chunk_size=512
+        ).convert([source])
+
+        assert stats['records_converted'] == len(records)
+        assert stats['records_failed'] == 0
+        assert output_records(out_dir, target_format) == expected_dicts(records)
+
+    def test_binary_round_trip(self, tmp_path, records, schema_file):
+        source = write_file(tmp_path, records, 'binary', schema_file)
+        ndjson_dir = tmp_path / "ndjson"
+        binary_dir = tmp_path / "binary"
+
+        TelemetryConverter('ndjson', out_dir=str(ndjson_dir), schema_file=schema_file,
+                           workers=1, chunk_size=100).convert([source])
+        converted = output_records(ndjson_dir, 'ndjson')
+        assert [r['data'] for r in converted] == [r.data for r in records]
+
+        TelemetryConverter('binary', out_dir=str(binary_dir), schema_file=schema_file,
+                           workers=1).convert(sorted(str(p) for p in ndjson_dir.glob("*.ndjson")))
+        output = next(binary_dir.glob("*.bin"))
+        with open(source, 'rb') as f:
+            assert output.read_bytes() == f.read()
+
+    def test_gzip_input_and_output(self, tmp_path, records, schema_file):
+        source = write_file(tmp_path, records, 'ndjson', compress=True)
+        out_dir = tmp_path / "out"
+
+        TelemetryConverter('ndjson', out_dir=str(out_dir), compress=True,
+                           workers=1, chunk_size=333).convert([source])
+
+        output = next(out_dir.glob("*.ndjson.gz"))
+        with gzip.open(output, 'rt') as f:
+            assert [json.loads(line) for line in f] == expected_dicts(records)
+
+    def test_parallel_preserves_order(self, tmp_path, records):
+        source = write_file(tmp_path, records, 'ndjson')
+        out_dir = tmp_path / "out"
+
+        stats = TelemetryConverter('leb128', out_dir=str(out_dir), workers=2,
+                                   chunk_size=1024).convert([source])
+
+        assert stats['records_converted'] == len(records)
+        assert output_records(out_dir, 'leb128') == expected_dicts(records)
+
+    def test_output_rotation(self, tmp_path, records):
+        source = write_file(tmp_path, records, 'leb128')
+        out_dir = tmp_path / "out"
+
+        stats = TelemetryConverter('ndjson', out_dir=str(out_dir), max_size_bytes=4096,
+                                   workers=1).convert([source])
+
+        assert stats['output_files'] > 1
+        assert output_records(out_dir, 'ndjson') == expected_dicts(records)
+
+    def test_binary_requires_schema(self, tmp_path):
+        with pytest.raises(ValueError, match="schema"):
+            TelemetryConverter('binary', out_dir=str(tmp_path))
+
+
+class TestConvertCommand:
+    """Test convert CLI command"""
+
+    def test_convert(self, tmp_path, records):
+        source = write_file(tmp_path, records, 'leb128')
+        out_dir = tmp_path / "out"
+
+        result = CliRunner().invoke(cli, [
+            'convert', source, '--to', 'ndjson', '--out-dir', str(out_dir), '--workers', '1'
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert f"Converted {len(records)} records" in result.output
+        assert output_records(out_dir, 'ndjson') == expected_dicts(records)
+
+    def test_explicit_input_format(self, tmp_path, records):
+        source = tmp_path / "capture.log.gz"
+        os.rename(write_file(tmp_path, records, 'ndjson', compress=True), source)
+        out_dir = tmp_path / "out"
+
+        result = CliRunner().invoke(cli, [
+            'convert', str(source), '--from', 'ndjson', '--to', 'leb128', '--out-dir', str(out_dir),
+            '--workers', '1'
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert output_records(out_dir, 'leb128') == expected_dicts(records)
+        assert list(read_records(str(source), input_format='ndjson')) == expected_dicts(records)
+
+    def test_convert_binary_without_schema(self, tmp_path, records):
+        source = write_file(tmp_path, records, 'ndjson')
+
+        result = CliRunner().invoke(cli, ['convert', source, '--to', 'binary', '--out-dir', str(tmp_path)])
+
+        assert result.exit_code != 0
+        assert "schema" in result.output
@@ -0,0 +1,145 @@
+# tests/test_distributions.py
+"""
+Tests for schema field distributions
+"""
+
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.data_generators import RecordDataPopulator
+from telemetry_generator.distributions import FieldSampler, compile_samplers
+
+
+SCHEMA = {
+    "schema_name": "distribution_test",
+    "endianness": "little",
+    "total_bits": 192,
+    "metric_id": {"type": "uint16", "bits": 16, "pos": "0-15",
+                  "distribution": {"type": "zipf", "a": 1.3, "min": 1, "max": 500, "seed": 1}},
+    "temperature": {"type": "int16", "bits": 16, "pos": "16-31",
+                    "distribution": {"type": "normal", "mean": 60, "std": 5, "seed": 2}},
+    "state": {"type": "enum", "bits": 8, "pos": "32-39", "values": ["ok", "warn", "fail"],
+              "distribution": {"type": "categorical", "values": ["ok", "warn", "fail"],
+                               "weights": [90, 9, 1], "seed": 3}},
+    "load": {"type": "float32", "bits": 32, "pos": "40-71",
+             "distribution": {"type": "uniform", "min": 0.0, "max": 1.0, "seed": 4}},
+    "counter": {"type": "uint8", "bits": 8, "pos": "72-79",
+                "distribution": {"type": "sequence", "start": 250, "step": 3}},
+    "site": {"type": "bytes", "bits": 32, "pos": "80-111",
+             "distribution": {"type": "constant", "value": "LAB1"}},
+    "raw": {"type": "uint64", "bits": 64, "pos": "112-175"}
+}
+
+
+def field(name, **info):
+    return dict(name=name, **info)
+
+
+class TestFieldSampler:
+    """Test distribution samplers"""
+
+    def test_uniform_integer_inclusive(self):
+        sampler = FieldSampler(field("x", type="uint8", bits=8), {"type": "uniform", "min": 3, "max": 5, "seed": 0})
+
+        values = sampler.sample(2000)
+
+        assert values.dtype == np.int64
+        assert set(values.tolist()) == {3, 4, 5}
+
+    def test_uniform_full_uint64(self):
+        sampler = FieldSampler(field("x", type="uint64", bits=64),
+                               {"type": "uniform", "min": 0, "max": (1 << 64) - 1, "seed": 0})
+
+        values = sampler.sample(1000)
+
+        assert values.dtype == np.uint64
+        assert values.max() > np.uint64(1 << 63)
+
+    def test_normal_rounded_and_clipped(self):
+        sampler = FieldSampler(field("x", type="uint8", bits=8), {"type": "normal", "mean": 250, "std": 20, "seed": 0})
+
+        values = sampler.sample(5000)
+
+        assert values.max() == 255 and values.min() >= 0
+        assert abs(values.mean() - 240) < 10
+
+    def test_zipf_popularity(self):
+        sampler = FieldSampler(field("x", type="uint16", bits=16), {"type": "zipf", "a": 1.5, "min": 10, "max": 100, "seed": 0})
+
+        counts = Counter(sampler.sample(20000).tolist())
+
+        assert min(counts) >= 10 and max(counts) <= 100
+        assert counts[10] > counts[11] > counts[20]
+
+    def test_sequence_wraps(self):
+        sampler = FieldSampler(field("x", type="uint8", bits=8), {"type": "sequence", "start": 254})
+
+        assert sampler.sample(3).tolist() == [254, 255, 0]
+        assert sampler.sample(2).tolist() == [1, 2]
+
+    @pytest.mark.parametrize("field_type, start, step, expected", [
+        ("uint64", 2 ** 64 - 2, 1, [2 ** 64 - 2, 2 ** 64 - 1, 0]),
+        ("int64", 2 ** 63 - 1, 1, [2 ** 63 - 1, -2 ** 63, -2 ** 63 + 1]),
+        ("int8", -127, -1, [-127, -128, 127]),
+    ])
+    def test_sequence_wraps_full_range(self, field_type, start, step, expected):
+        bits = int(field_type.lstrip("uint"))
+        sampler = FieldSampler(field("x", type=field_type, bits=bits), {"type": "sequence", "start": start, "step": step})
+
+        assert sampler.sample(3).tolist() == expected
+
+    @pytest.mark.parametrize("spec", [
+        {"type": "poisson"},
+        {"type": "uniform", "min": 1},
+        {"type": "uniform", "min": 5, "max": 1},
+        {"type": "normal", "mean": 0, "std": -1},
+        {"type": "categorical", "values": [1, 2], "weights": [1]},
+        {"type": "sequence", "step": 0},
+        {"type": "uniform", "min": 300, "max": 400},
+        {"type": "zipf", "a": 1.2, "max": 1000},
+        {"type": "categorical", "values": [1, 300]},
+        {"type": "constant", "value": -5},
+        "uniform"
+    ])
+    def test_invalid_specs(self, spec):
+        with pytest.raises(ValueError):
+            FieldSampler(field("x", type="uint8", bits=8), spec)
+
+    def test_invalid_spec_rejected_at_schema_load(self):
+        schema = dict(SCHEMA, state=dict(SCHEMA["state"], distribution={"type": "categorical", "values": ["gone"]}))
+        with pytest.raises(ValueError, match="unknown enum values"):
+            BinarySchemaProcessor(schema)
+        schema = dict(SCHEMA, site=dict(SCHEMA["site"], distribution={"type": "normal", "mean": 0, "std": 1}))
+        with pytest.raises(ValueError, match="bytes fields"):
+            BinarySchemaProcessor(schema)
+        schema = dict(SCHEMA, counter=dict(SCHEMA["counter"], distribution={"type": "constant", "value": 300}))
+        with pytest.raises(ValueError, match=r"'counter': constant value 300 outside the field range \[0, 255\]"):
+            BinarySchemaProcessor(schema)
+
+
+class TestSchemaDistributions:
+    """Test distributions compiled from the schema"""
+
+    def test_compile_samplers(self):
+        samplers = compile_samplers(BinarySchemaProcessor(SCHEMA))
+
+        assert set(samplers) == {"metric_id", "temperature", "state", "load", "counter", "site"}
+        states = Counter(samplers["state"].sample(10000).tolist())
+        assert states[0] > states[1] > states[2] > 0
+        assert (samplers["site"].sample(3) == "LAB1").all()
+        loads = samplers["load"].sample(100)
+        assert loads.dtype == np.float64 and ((loads >= 0) & (loads <= 1)).all()
+
+    def test_populator_uses_samplers(self):
+        populator = RecordDataPopulator(BinarySchemaProcessor(SCHEMA))
+
+        rows = [populator.populate_record_data(seq, seq) for seq in range(5)]
+
+        assert [row["counter"] for row in rows] == [250, 253, 0, 3, 6]
+        assert all(row["site"] == "LAB1" for row in rows)
+        assert all(isinstance(row["temperature"], int) for row in rows)
+        assert all(1 <= row["metric_id"] <= 500 for row in rows)
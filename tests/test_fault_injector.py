@@ -0,0 +1,281 @@
+# tests/test_fault_injector.py
+"""
+Tests for fault injection
+"""
+
+import pickle
+import random
+import threading
+
+import pytest
+
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.data_generators import FaultAwareRecordDataPopulator
+from telemetry_generator.fault_injector import (
+    FaultConfig,
+    FaultInjector,
+    FaultStatistics,
+    FaultType,
+    resolve_field_patterns
+)
+from telemetry_generator import TelemetryBatch, TelemetryRecord, RecordType
+
+
+SCHEMA = {
+    "schema_name": "fault_test",
+    "endianness": "little",
+    "total_bits": 128,
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+    "temperature": {"type": "uint16", "bits": 16, "pos": "32-47"},
+    "device_id_ascii": {"type": "bytes", "bits": 64, "pos": "48-111"},
+    "status": {"type": "enum", "bits": 8, "pos": "112-119", "values": ["ok", "warn", "fail"]}
+}
+
+
+@pytest.fixture
+def processor():
+    return BinarySchemaProcessor(SCHEMA)
+
+
+@pytest.fixture
+def injector(processor):
+    configs = [
+        FaultConfig(FaultType.OUT_OF_RANGE, probability=1.0, field_patterns=["temperature"]),
+        FaultConfig(FaultType.MISSING_FIELD, probability=1.0, field_patterns=["status"]),
+        FaultConfig(FaultType.STRING_CORRUPTION, probability=1.0, field_patterns=["device_id_ascii"]),
+    ]
+    return FaultInjector(processor, configs, global_fault_rate=1.0)
+
+
+def make_data(seq):
+    return {"seq_no": seq, "temperature": 300, "device_id_ascii": "DEV00001", "status": "ok"}
+
+
+class TestCopyOnWriteInjection:
+    """Test fault injection without deep copies"""
+
+    def test_inject_faults_leaves_input_untouched(self, injector):
+        random.seed(1)
+        data = make_data(7)
+        record = TelemetryRecord(RecordType.UPDATE, 1, 7, data)
+
+        faulty, details = injector.inject_faults(record)
+
+        assert details
+        assert record.data == make_data(7)
+        assert faulty is not record
+        assert faulty.data is not record.data
+        assert faulty.sequence_id == 7
+        assert "status" not in faulty.data
+
+    def test_original_values_in_details(self, injector):
+        random.seed(2)
+        data = make_data(3)
+
+        details = injector.inject_faults_in_place(data, 3)
+
+        by_field = {d["field_name"]: d for d in details}
+        assert by_field["status"]["original_value"] == "ok"
+        assert by_field["status"]["new_value"] == "<DELETED>"
+        assert by_field["temperature"]["original_value"] == 300
+        assert data["temperature"] == by_field["temperature"]["new_value"]
+        assert "status" not in data
+
+    def test_no_fault_returns_same_record(self, processor):
+        injector = FaultInjector(processor, [], global_fault_rate=0.0)
+        record = TelemetryRecord(RecordType.UPDATE, 1, 1, make_data(1))
+
+        faulty, details = injector.inject_faults(record)
+
+        assert faulty is record
+        assert details == []
+
+    def test_populator_injects_in_place(self, processor, injector, monkeypatch):
+        def fail(record):
+            raise AssertionError("record-based injection should not be used")
+        monkeypatch.setattr(injector, "inject_faults", fail)
+
+        populator = FaultAwareRecordDataPopulator(processor, injector)
+        data, details = populator.populate_record_data(5, 123)
+
+        assert details
+        assert "status" not in data
+        assert injector.statistics.total_records == 1
+
+
+def make_columns(rows):
+    np = pytest.importorskip("numpy")
+    return {
+        "seq_no": np.arange(rows, dtype=np.int64),
+        "timestamp_ns": np.arange(rows, dtype=np.uint64) + np.uint64(1_700_000_000_000_000_000),
+        "temperature": np.full(rows, 300, dtype=np.uint16),
+        "device_id_ascii": ["DEV00001"] * rows,
+        "status": ["ok"] * rows
+    }
+
+
+class TestBatchInjection:
+    """Test vectorized fault injection over columnar batches"""
+
+    def test_log_matches_columns(self, injector):
+        np = pytest.importorskip("numpy")
+        columns = make_columns(500)
+        injector.global_fault_rate = 0.2
+
+        log = injector.inject_faults_batch(columns, rng=np.random.default_rng(5))
+
+        assert 0 < len(log.faulty_rows) < 500
+        assert log.counts_by_type()["missing_field"] == len(log.faulty_rows)
+        for detail in log.to_details(sequence_ids=columns["seq_no"]):
+            assert detail["seq_no"] == detail["row"]
+            value = columns[detail["field_name"]][detail["row"]]
+            if detail["fault_type"] == "missing_field":
+                assert value is None
+            else:
+                assert value == detail["new_value"]
+
+        # Untouched rows keep their values
+        clean = np.setdiff1d(np.arange(500), log.faulty_rows)
+        assert (columns["temperature"][clean] == 300).all()
+        assert injector.statistics.total_records == 500
+
+    def test_out_of_range_widens_column(self, processor):
+        np = pytest.importorskip("numpy")
+        config = FaultConfig(FaultType.OUT_OF_RANGE, probability=1.0, field_patterns=["temperature"])
+        injector = FaultInjector(processor, [config], global_fault_rate=1.0)
+        columns = make_columns(100)
+
+        log = injector.inject_faults_batch(columns, rng=np.random.default_rng(1))
+
+        assert len(log) == 100
+        assert columns["temperature"].dtype == np.int64
+        assert (columns["temperature"] > 0xFFFF).all()
+
+    @pytest.mark.parametrize("fault_type,field_name", [
+        (FaultType.TIMESTAMP_DRIFT, "timestamp_ns"),
+        (FaultType.SEQUENCE_BREAK, "seq_no"),
+        (FaultType.NULL_VALUES, "temperature")
+    ])
+    def test_vectorized_faults_stay_numeric(self, processor, fault_type, field_name):
+        np = pytest.importorskip("numpy")
+        config = FaultConfig(fault_type, probability=1.0, field_patterns=[field_name])
+        injector = FaultInjector(processor, [config], global_fault_rate=1.0)
+        columns = make_columns(200)
+
+        log = injector.inject_faults_batch(columns, rng=np.random.default_rng(3))
+
+        assert len(log) == 200
+        assert columns[field_name].dtype.kind in "iu"
+        assert (columns[field_name] >= 0).all()
+
+    def test_telemetry_batch(self, injector):
+        np = pytest.importorskip("numpy")
+        batch = TelemetryBatch(make_columns(50), RecordType.UPDATE, 0)
+        timestamps = batch.timestamps.copy()
+
+        log = injector.inject_faults_batch(batch, rng=np.random.default_rng(2))
+
+        assert len(log.faulty_rows) == 50
+        assert all("status" not in view.data for view in batch)
+        assert batch[0].get("temperature") > 0xFFFF
+        assert (batch.timestamps == timestamps).all()
+
+    def test_no_faults(self, processor):
+        np = pytest.importorskip("numpy")
+        injector = FaultInjector(processor, [], global_fault_rate=0.0)
+        columns = make_columns(10)
+
+        log = injector.inject_faults_batch(columns, rng=np.random.default_rng(0))
+
+        assert len(log) == 0
+        assert log.to_details() == []
+
+
+class TestFieldPatterns:
+    """Test precompiled field-pattern matching"""
+
+    FIELDS = ("metric_id", "id_metric", "value_a", "old_value_", "device_id_ascii", "scope")
+
+    def test_fnmatch_semantics(self):
+        assert resolve_field_patterns(self.FIELDS, ("value_*",)) == (2,)
+        assert resolve_field_patterns(self.FIELDS, ("*_id",)) == (0,)
+        assert resolve_field_patterns(self.FIELDS, ("*_id*", "scope")) == (0, 4, 5)
+
+    def test_excludes_and_no_patterns(self):
+        assert resolve_field_patterns(self.FIELDS, (), ("*_id*", "value_a")) == (1, 3, 5)
+        assert resolve_field_patterns(self.FIELDS, ("*",), ("device_id_ascii",)) == (0, 1, 2, 3, 5)
+
+    def test_resolved_once_per_pattern_set(self, processor):
+        configs = [
+            FaultConfig(FaultType.OUT_OF_RANGE, 1.0, field_patterns=["temp*"]),
+            FaultConfig(FaultType.NULL_VALUES, 1.0, field_patterns=["temp*"])
+        ]
+        injector = FaultInjector(processor, configs, global_fault_rate=1.0)
+        assert configs[0].eligible_fields == configs[1].eligible_fields == (1,)
+        info = resolve_field_patterns.cache_info()
+
+        for _ in range(10):
+            injector.inject_faults_in_place(make_data(1), 1)
+
+        assert resolve_field_patterns.cache_info() == info
+
+        # Records whose fields differ from the schema's are resolved per field set
+        for _ in range(10):
+            injector.inject_faults_in_place(dict(make_data(1), extra=1), 1)
+
+        after = resolve_field_patterns.cache_info()
+        assert (after.misses - info.misses, after.hits - info.hits) == (1, 19)
+
+    def test_selection_limited_to_max_fields(self, processor):
+        config = FaultConfig(FaultType.NULL_VALUES, 1.0, field_patterns=["*"], parameters={"max_fields": 2})
+        injector = FaultInjector(processor, [config], global_fault_rate=1.0)
+
+        targets = injector._select_target_fields(make_data(1), config)
+
+        assert len(targets) == 2
+        assert set(targets) <= set(make_data(1))
+
+
+class TestFaultStatistics:
+    """Test sharded fault statistics"""
+
+    def test_records_counted_once(self, processor, injector):
+        clean = FaultInjector(processor, [], global_fault_rate=0.0)
+        for seq in range(10):
+            clean.inject_faults(TelemetryRecord(RecordType.UPDATE, 1, seq, make_data(seq)))
+            injector.inject_faults(TelemetryRecord(RecordType.UPDATE, 1, seq, make_data(seq)))
+
+        assert clean.get_statistics()["total_records"] == 10
+        snapshot = injector.statistics.snapshot()
+        assert snapshot.total_records == 10
+        assert snapshot.faulty_records == 10
+        assert snapshot.total_faults == 30
+        assert snapshot.fault_counts[FaultType.MISSING_FIELD] == 10
+        assert snapshot.field_faults == {"temperature": 10, "status": 10, "device_id_ascii": 10}
+
+    def test_threads_and_merge(self):
+        stats = FaultStatistics()
+
+        def work():
+            for _ in range(1000):
+                stats.record_fault(FaultType.NULL_VALUES, "value", "low")
+                stats.record_records(1, faulty=1)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = stats.snapshot()
+        assert snapshot.total_records == snapshot.faulty_records == 4000
+        assert snapshot.field_type_counts["value"][list(FaultType).index(FaultType.NULL_VALUES)] == 4000
+
+        worker = pickle.loads(pickle.dumps(stats))
+        worker.record_fault(FaultType.OUT_OF_RANGE, "other", "high", count=5)
+        stats.merge(worker)
+
+        summary = stats.get_summary()
+        assert summary["total_records"] == 8000
+        assert summary["affected_fields"] == {"value": 8000, "other": 5}
+        assert summary["severity_distribution"] == {"low": 8000, "high": 5}
@@ -0,0 +1,88 @@
+# tests/test_fault_log.py
+"""
+Tests for the streaming fault ground-truth log
+"""
+
+import json
+import os
+
+import pytest
+
+from telemetry_generator.fault_injector import FaultConfig, FaultInjector, FaultType
+from telemetry_generator.fault_log import FaultLogWriter, read_fault_log, to_jsonable
+from telemetry_generator.rolling_writer import RollingFileWriter
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator import TelemetryRecord, RecordType
+
+
+SCHEMA = {
+    "schema_name": "fault_log_test",
+    "total_bits": 48,
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+    "temperature": {"type": "uint16", "bits": 16, "pos": "32-47"}
+}
+
+
+@pytest.fixture
+def injector():
+    config = FaultConfig(FaultType.OUT_OF_RANGE, probability=1.0, field_patterns=["temperature"])
+    return FaultInjector(BinarySchemaProcessor(SCHEMA), [config], global_fault_rate=0.5)
+
+
+def make_record(seq):
+    return TelemetryRecord(RecordType.UPDATE, 1_700_000_000 + seq, seq, {"seq_no": seq, "temperature": 20})
+
+
+class TestFaultLogWriter:
+    """Test fault log lines and rotation"""
+
+    def test_lines(self, tmp_path, injector):
+        path = tmp_path / "faults.ndjson"
+        data = {"seq_no": 4, "temperature": 20}
+        details = []
+        while not details:
+            details = injector.inject_faults_in_place(data, 4)
+
+        with FaultLogWriter(str(path)) as log:
+            assert log.write(details) == 1
+            log.write([{"field_name": "device_id", "fault_type": "string_corruption",
+                        "original_value": b"AB\x00", "new_value": "A", "severity": "low"}], seq_no=5)
+
+        first, second = read_fault_log(str(path))
+        assert first == {"seq_no": 4, "field": "temperature", "fault_type": "out_of_range",
+                         "original_value": 20, "new_value": data["temperature"], "severity": "medium"}
+        assert second["seq_no"] == 5
+        assert second["original_value"] == "AB\x00"
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_rotates_with_data_files(self, tmp_path, injector, compress):
+        writer = RollingFileWriter(str(tmp_path / "telemetry"), max_size_bytes=2000, format='ndjson',
+                                   compress=compress)
+        log = FaultLogWriter(compress=compress).attach(writer)
+
+        expected = {}
+        for seq in range(100):
+            faulty, details = injector.inject_faults(make_record(seq))
+            writer.write_record(faulty)
+            log.write(details)
+            if details:
+                expected[seq] = writer.current_file_path
+        writer.close()
+        log.close()
+
+        assert writer.file_count > 1
+        assert len(log.files) == writer.file_count
+        assert log.faults_written == len(expected)
+        for path in log.files:
+            assert os.path.exists(path)
+            assert path.endswith(".faults.ndjson.gz" if compress else ".faults.ndjson")
+            for line in read_fault_log(path):
+                assert FaultLogWriter.sidecar_path(expected[line["seq_no"]], compress) == path
+
+    def test_report_is_json(self):
+        report = {"fault_types": {FaultType.OUT_OF_RANGE: 3}, "values": [b"\x01", 2]}
+
+        assert json.loads(json.dumps(to_jsonable(report))) == {
+            "fault_types": {"out_of_range": 3},
+            "values": ["\x01", 2]
+        }
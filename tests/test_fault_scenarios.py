@@ -0,0 +1,180 @@
+# tests/test_fault_scenarios.py
+"""
+Tests for time-correlated fault scenarios
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.fault_injector import FaultConfig, FaultInjector, FaultType
+from telemetry_generator.fault_scenarios import FaultScenario, FaultTimeline, ScenarioType
+from telemetry_generator import TelemetryRecord, RecordType
+
+
+SCHEMA = {
+    "schema_name": "scenario_test",
+    "endianness": "little",
+    "total_bits": 192,
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+    "timestamp_ns": {"type": "uint64", "bits": 64, "pos": "32-95"},
+    "temperature": {"type": "uint16", "bits": 16, "pos": "96-111"},
+    "device_id_ascii": {"type": "bytes", "bits": 64, "pos": "112-175"}
+}
+
+START = 1_700_000_000_000_000_000
+SECOND = 1_000_000_000
+
+
+@pytest.fixture
+def processor():
+    return BinarySchemaProcessor(SCHEMA)
+
+
+def make_columns(seconds, per_second=10, devices=("DEV00001", "DEV00002")):
+    """One batch covering `seconds` seconds from START"""
+    rows = seconds * per_second
+    return {
+        "seq_no": np.arange(rows, dtype=np.int64),
+        "timestamp_ns": np.uint64(START) + (np.arange(rows, dtype=np.uint64) * np.uint64(SECOND // per_second)),
+        "temperature": np.full(rows, 300, dtype=np.uint16),
+        "device_id_ascii": [devices[i % len(devices)] for i in range(rows)]
+    }
+
+
+def scenario_injector(processor, *scenarios, configs=None):
+    timeline = FaultTimeline(list(scenarios), start_ns=START)
+    configs = configs or [FaultConfig(FaultType.OUT_OF_RANGE, 1.0, field_patterns=["temperature"])]
+    return FaultInjector(processor, configs, global_fault_rate=0.0, timeline=timeline)
+
+
+def window_rows(columns, begin_s, end_s):
+    seconds = (columns["timestamp_ns"] - np.uint64(START)) // np.uint64(SECOND)
+    return np.flatnonzero((seconds >= begin_s) & (seconds < end_s))
+
+
+class TestFaultTimeline:
+    """Test the precomputed scenario schedule"""
+
+    def test_active_lookup(self):
+        timeline = FaultTimeline([
+            FaultScenario(ScenarioType.FAULT_STORM, 10, 5),
+            FaultScenario(ScenarioType.SEQUENCE_RESET, 12),
+        ], start_ns=START)
+
+        assert timeline.active_at(START) == ()
+        assert timeline.active_at(START + 11 * SECOND) == (0,)
+        assert timeline.active_at(START + 13 * SECOND) == (0, 1)
+        assert timeline.active_at(START + 10 ** 6 * SECOND) == (1,)
+
+    def test_active_rows_and_lazy_anchor(self):
+        timeline = FaultTimeline([FaultScenario(ScenarioType.FAULT_STORM, 2, 1)])
+        timestamps = START + np.arange(50, dtype=np.int64) * (SECOND // 10)
+
+        rows = timeline.active_rows(timestamps)
+
+        assert timeline.start_ns == START
+        assert rows[0].tolist() == list(range(20, 30))
+
+    def test_progress(self):
+        timeline = FaultTimeline([FaultScenario(ScenarioType.CLOCK_SKEW, 0, 10, max_skew_seconds=1)], START)
+
+        progress = timeline.progress(0, [START, START + 5 * SECOND, START + 20 * SECOND])
+
+        assert progress.tolist() == [0.0, 0.5, 1.0]
+
+    def test_invalid_scenarios(self):
+        with pytest.raises(ValueError):
+            FaultScenario.from_dict({"type": "meteor_strike", "start_seconds": 0})
+        with pytest.raises(ValueError):
+            FaultScenario.from_dict({"type": "device_failure", "start_seconds": 0})
+        with pytest.raises(ValueError):
+            FaultScenario.from_dict({"type": "clock_skew", "start_seconds": 0, "max_skew_seconds": 5})
+
+
+class TestScenarioInjection:
+    """Test scenarios applied by FaultInjector"""
+
+    def test_storm_only_inside_window(self, processor):
+        injector = scenario_injector(processor, FaultScenario(ScenarioType.FAULT_STORM, 3, 2))
+        columns = make_columns(10)
+
+        log = injector.inject_faults_batch(columns, rng=np.random.default_rng(1))
+
+        assert log.faulty_rows.tolist() == window_rows(columns, 3, 5).tolist()
+        assert log.counts_by_type() == {"out_of_range": 20}
+        assert all(detail["severity"] == "high" for detail in log.to_details())
+
+    def test_device_failure_targets_one_device(self, processor):
+        injector = scenario_injector(processor, FaultScenario(
+            ScenarioType.DEVICE_FAILURE, 0, 5, target_value="DEV00002",
+            fault_types=["out_of_range"]
+        ), configs=[FaultConfig(FaultType.OUT_OF_RANGE, 1.0, field_patterns=["*"])])
+        columns = make_columns(10)
+        expected = [row for row in window_rows(columns, 0, 5).tolist() if row % 2 == 1]
+
+        log = injector.inject_faults_batch(columns, rng=np.random.default_rng(2))
+
+        assert log.faulty_rows.tolist() == expected
+        # The failing device stays identifiable
+        assert columns["device_id_ascii"][expected[0]] == "DEV00002"
+
+    def test_clock_skew_ramps(self, processor):
+        injector = scenario_injector(processor, FaultScenario(
+            ScenarioType.CLOCK_SKEW, 2, 4, max_skew_seconds=8
+        ))
+        columns = make_columns(10)
+        original = columns["timestamp_ns"].astype(np.int64)
+        rows = window_rows(columns, 2, 6)
+
+        log = injector.inject_faults_batch(columns, rng=np.random.default_rng(3))
+
+        skew = columns["timestamp_ns"].astype(np.int64) - original
+        assert log.counts_by_type() == {"timestamp_drift": len(rows)}
+        assert (np.diff(skew[rows]) > 0).all()
+        assert skew[rows[0]] == 0
+        assert skew[rows[-1]] < 8 * SECOND
+        assert (skew[:rows[0]] == 0).all() and (skew[rows[-1] + 1:] == 0).all()
+
+    def test_sequence_reset_across_batches(self, processor):
+        injector = scenario_injector(processor, FaultScenario(ScenarioType.SEQUENCE_RESET, 5, reset_to=1))
+        columns = make_columns(10)
+        first = {name: values[:70] for name, values in columns.items()}
+        second = {name: values[70:] for name, values in columns.items()}
+
+        injector.inject_faults_batch(first, rng=np.random.default_rng(4))
+        injector.inject_faults_batch(second, rng=np.random.default_rng(4))
+
+        sequence = np.concatenate([first["seq_no"], second["seq_no"]])
+        assert sequence[:50].tolist() == list(range(50))
+        assert sequence[50:].tolist() == list(range(1, 51))
+
+    def test_per_record_path(self, processor):
+        injector = scenario_injector(processor, FaultScenario(ScenarioType.FAULT_STORM, 1, 1))
+        inside = {"seq_no": 7, "timestamp_ns": START + SECOND, "temperature": 300, "device_id_ascii": "DEV00001"}
+        outside = dict(inside, timestamp_ns=START + 5 * SECOND)
+
+        faulty, details = injector.inject_faults(TelemetryRecord(RecordType.UPDATE, START + SECOND, 7, inside))
+        clean, no_details = injector.inject_faults(TelemetryRecord(RecordType.UPDATE, START, 8, outside))
+
+        assert [d["fault_type"] for d in details] == ["out_of_range"]
+        assert details[0]["seq_no"] == 7
+        assert isinstance(faulty.data["temperature"], int) and faulty.data["temperature"] > 0xFFFF
+        assert inside["temperature"] == 300
+        assert no_details == [] and clean.data is outside
+        assert injector.statistics.total_records == 2
+        assert injector.statistics.faulty_records == 1
+
+    def test_config_file_round_trip(self, processor, tmp_path):
+        injector = scenario_injector(processor, FaultScenario(
+            ScenarioType.DEVICE_FAILURE, 30, 60, name="dev2 down", target_value="DEV00002"
+        ))
+        path = tmp_path / "faults.json"
+        injector.save_config_to_file(str(path))
+
+        loaded = FaultInjector(processor)
+        loaded.load_config_from_file(str(path))
+
+        assert loaded.timeline.start_ns == START
+        assert loaded.timeline.scenarios == injector.timeline.scenarios
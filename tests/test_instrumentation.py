@@ -0,0 +1,140 @@
+# tests/test_instrumentation.py
+"""
+Tests for pipeline stage instrumentation
+"""
+
+import io
+import random
+import threading
+import time
+
+import pytest
+
+from telemetry_generator.instrumentation import (
+    STAGES,
+    Instrumentation,
+    LatencyHistogram,
+    TimedWriteFile,
+    null_stage
+)
+
+
+class TestLatencyHistogram:
+    """Test log-linear latency histograms"""
+
+    def test_percentiles_within_relative_error(self):
+        rng = random.Random(7)
+        values = sorted(rng.randint(1, 10 ** 9) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 90, 99, 99.9):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert histogram.percentile(percent) == pytest.approx(exact, rel=0.02)
+        assert histogram.percentile(100) == histogram.max == values[-1]
+        assert histogram.to_dict()["min"] == values[0]
+
+    def test_small_values_exact(self):
+        histogram = LatencyHistogram()
+        for value in (0, 1, 2, 3, 100):
+            histogram.record(value)
+
+        assert [histogram.percentile(p) for p in (20, 40, 60, 80, 100)] == [0, 1, 2, 3, 100]
+        assert LatencyHistogram().percentile(99) == 0
+
+    def test_merge(self):
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 1000):
+            (first if value % 2 else second).record(value * 1000)
+            combined.record(value * 1000)
+
+        first.merge(second)
+
+        assert first.to_dict() == combined.to_dict()
+
+
+class TestInstrumentation:
+    """Test stage counters and timers"""
+
+    def test_nested_stages_are_exclusive(self):
+        instrumentation = Instrumentation()
+
+        with instrumentation.stage('write', items=10) as timer:
+            time.sleep(0.01)
+            with instrumentation.stage('rotation'):
+                time.sleep(0.02)
+            timer.nbytes = 512
+
+        stages = instrumentation.snapshot()['stages']
+        assert set(stages) == {'write', 'rotation'}
+        assert stages['write']['items'] == 10 and stages['write']['bytes'] == 512
+        assert 0.01 <= stages['write']['total_seconds'] < 0.02
+        assert stages['rotation']['total_seconds'] >= 0.02
+        assert instrumentation.snapshot()['limiting_stage'] == 'rotation'
+
+    def test_threads_record_into_shards(self):
+        instrumentation = Instrumentation()
+
+        def work():
+            for _ in range(1000):
+                instrumentation.record('generation', 100, items=5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = instrumentation.snapshot()
+        assert snapshot['threads'] == 4
+        assert snapshot['stages']['generation']['calls'] == 4000
+        assert snapshot['stages']['generation']['items'] == 20000
+        assert snapshot['stages']['generation']['latency_ns']['p99'] == 100
+
+    def test_wrap_samples_calls(self):
+        instrumentation = Instrumentation()
+
+        class Injector:
+            def inject(self, value):
+                return value + 1
+
+        injector = Injector()
+        assert instrumentation.wrap(injector, 'inject', 'fault_injection', sample_every=8)
+        assert not instrumentation.wrap(injector, 'missing', 'fault_injection')
+        assert not instrumentation.wrap(None, 'inject', 'fault_injection')
+
+        assert [injector.inject(i) for i in range(64)] == list(range(1, 65))
+        stats = instrumentation.snapshot()['stages']['fault_injection']
+        assert stats['calls'] == 64
+        assert stats['latency_ns']['count'] == 8
+        assert Injector().inject(1) == 2  # Other instances are untouched
+
+    def test_stats_line(self):
+        instrumentation = Instrumentation()
+        assert instrumentation.stats_line() == "no stages recorded"
+
+        instrumentation.record('serialization', 2_500_000)
+        instrumentation.record('rate_limit_sleep', 40_000)
+
+        line = instrumentation.stats_line()
+        assert line.startswith("serialization ") and "p99 2.5ms" in line
+        assert line.endswith("p99 40.0us")
+        assert "rate_limit_sleep" in STAGES
+
+    def test_null_stage(self):
+        with null_stage('generation', items=3) as timer:
+            timer.nbytes = 10
+
+    def test_timed_write_file(self):
+        instrumentation = Instrumentation()
+        buffer = io.BytesIO()
+        timed = TimedWriteFile(buffer, instrumentation)
+
+        timed.write(b"abc")
+        timed.write(b"")
+        timed.write(b"defg")
+
+        assert buffer.getvalue() == b"abcdefg" and timed.tell() == 7
+        stats = instrumentation.snapshot()['stages']['write']
+        assert stats['calls'] == 2 and stats['bytes'] == 7
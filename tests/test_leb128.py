@@ -3,7 +3,10 @@
 Tests for LEB128 encoding
 """
 
+import random
+
 import pytest
+from telemetry_generator.formats import leb128
 from telemetry_generator.formats.leb128 import (
     encode_leb128,
     decode_leb128,
@@ -12,7 +15,11 @@ from telemetry_generator.formats.leb128 import (
     LEB128Encoder,
     LEB128Decoder,
     estimate_leb128_size,
-    compare_encoding_sizes
+    compare_encoding_sizes,
+    encode_leb128_array,
+    decode_leb128_array,
+    encode_batch_leb128,
+    decode_batch_leb128
 )
 
 
@@ -86,3 +93,91 @@ class TestLEB128Encoding:
         assert float(stats['compression_vs_32'][:-1]) > 0  # Should have compression
 
 
+UNSIGNED_EDGE_VALUES = [0, 1, 127, 128, 16383, 16384, (1 << 35), (1 << 63) - 1, 1 << 63, (1 << 64) - 1]
+SIGNED_EDGE_VALUES = [0, 1, -1, 63, 64, -64, -65, 8191, -8192, (1 << 62), -(1 << 63), (1 << 63) - 1]
+
+
+@pytest.fixture
+def random_unsigned():
+    rng = random.Random(1234)
+    return UNSIGNED_EDGE_VALUES + [rng.getrandbits(rng.randint(1, 64)) for _ in range(2000)]
+
+
+@pytest.fixture
+def random_signed():
+    rng = random.Random(4321)
+    return SIGNED_EDGE_VALUES + [rng.randint(-(1 << 63), (1 << 63) - 1) >> rng.randint(0, 63)
+                                 for _ in range(2000)]
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def numpy_mode(request, monkeypatch):
+    """Run a test against both the vectorized path and the pure-Python fallback"""
+    if request.param and not leb128.HAS_NUMPY:
+        pytest.skip("numpy not available")
+    monkeypatch.setattr(leb128, "HAS_NUMPY", request.param)
+    return request.param
+
+
+class TestVectorizedLEB128:
+    """Vectorized batch encoding must match the scalar functions byte for byte"""
+    
+    def test_unsigned_encoding_matches_scalar(self, numpy_mode, random_unsigned):
+        expected = b"".join(encode_leb128(v) for v in random_unsigned)
+        assert encode_leb128_array(random_unsigned) == expected
+    
+    def test_signed_encoding_matches_scalar(self, numpy_mode, random_signed):
+        expected = b"".join(encode_signed_leb128(v) for v in random_signed)
+        assert encode_leb128_array(random_signed, signed=True) == expected
+    
+    def test_unsigned_decoding_matches_scalar(self, numpy_mode, random_unsigned):
+        data = b"".join(encode_leb128(v) for v in random_unsigned)
+        values, consumed = decode_leb128_array(data)
+        
+        assert list(values) == random_unsigned
+        assert consumed == len(data)
+    
+    def test_signed_decoding_matches_scalar(self, numpy_mode, random_signed):
+        data = b"".join(encode_signed_leb128(v) for v in random_signed)
+        values, consumed = decode_leb128_array(data, signed=True)
+        
+        assert list(values) == random_signed
+        assert consumed == len(data)
+    
+    def test_decode_with_count_and_offset(self, numpy_mode):
+        data = b"\xaa" + encode_leb128_array([300, 5, 70000]) + b"\xff\xff"
+        values, consumed = decode_leb128_array(data, count=3, offset=1)
+        
+        assert list(values) == [300, 5, 70000]
+        assert consumed == len(data) - 3
+    
+    @pytest.mark.parametrize("signed", [False, True])
+    def test_batch_roundtrip(self, numpy_mode, signed, random_unsigned, random_signed):
+        values = random_signed if signed else random_unsigned
+        encoded = encode_batch_leb128(values, signed=signed)
+        
+        assert decode_batch_leb128(encoded, signed=signed) == values
+        assert decode_batch_leb128(encode_batch_leb128([], signed=signed), signed=signed) == []
+    
+    def test_batch_format_unchanged(self, numpy_mode):
+        """Count prefix followed by values, as the scalar encoder produced"""
+        encoder = LEB128Encoder()
+        encoder.write_unsigned(3)
+        for value in (1, 200, 1 << 40):
+            encoder.write_unsigned(value)
+        
+        assert encode_batch_leb128([1, 200, 1 << 40]) == encoder.get_bytes()
+    
+    def test_values_beyond_64_bits_fall_back(self):
+        value = 1 << 70
+        assert encode_leb128_array([value, 1]) == encode_leb128(value) + encode_leb128(1)
+    
+    def test_negative_unsigned_rejected(self, numpy_mode):
+        with pytest.raises(ValueError, match="Cannot encode negative"):
+            encode_leb128_array([1, -1])
+    
+    def test_truncated_data_rejected(self, numpy_mode):
+        with pytest.raises(ValueError, match="Truncated"):
+            decode_leb128_array(b"\x80\x80")
+        with pytest.raises(ValueError, match="Truncated"):
+            decode_leb128_array(encode_leb128(5), count=2)
@@ -0,0 +1,210 @@
+# tests/test_leb128_stream.py
+"""
+Tests for streaming LEB128 record decoding
+"""
+
+import io
+import json
+import struct
+
+import pytest
+from click.testing import CliRunner
+
+from telemetry_generator.cli import cli
+from telemetry_generator.formats.leb128_stream import (
+    LEB128StreamDecoder,
+    IncompleteRecordError,
+    decode_leb128_record,
+    iter_leb128_records,
+    max_leb128_record_size
+)
+from telemetry_generator.rolling_writer import RollingFileWriter
+from telemetry_generator.schema_model import load_schema
+from telemetry_generator import TelemetryRecord, RecordType
+
+
+def make_records(count):
+    """Records whose values exercise every value tag, including 0xFF bytes inside floats"""
+    return [
+        TelemetryRecord(
+            record_type=RecordType.UPDATE if i % 3 else RecordType.EVENT,
+            timestamp=1_700_000_000_000_000_000 + i,
+            sequence_id=i,
+            data={
+                "seq_no": i,
+                "scale_1eN": -i,
+                "temperature": struct.unpack('<d', b'\xff' * 6 + b'\xef\x3f')[0] + i,
+                "device_id_ascii": f"DEV{i:05d}",
+                "online": bool(i % 2),
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def expected_dicts(records):
+    return [
+        {'type': r.record_type.value, 'timestamp': r.timestamp, 'seq_id': r.sequence_id, 'data': r.data}
+        for r in records
+    ]
+
+
+@pytest.fixture
+def records():
+    return make_records(200)
+
+
+@pytest.fixture
+def encoded(records, tmp_path):
+    """Raw LEB128 bytes as RollingFileWriter produces them"""
+    writer = RollingFileWriter(str(tmp_path / "enc"), max_size_bytes=1 << 30, format='leb128')
+    return b"".join(writer._serialize_leb128(r) for r in records)
+
+
+def write_file(tmp_path, records, compress=False):
+    writer = RollingFileWriter(
+        base_path=str(tmp_path / "telemetry"),
+        max_size_bytes=1 << 30,
+        format='leb128',
+        compress=compress
+    )
+    for record in records:
+        writer.write_record(record)
+    writer.close()
+    return writer.current_file_path
+
+
+class TestDecodeRecord:
+    """Test single record decoding"""
+
+    def test_single_record(self, records, encoded):
+        record, next_offset = decode_leb128_record(encoded)
+
+        assert record == expected_dicts(records)[0]
+        assert encoded[next_offset - 1] == 0xFF
+
+    def test_incomplete_record(self, encoded):
+        _, next_offset = decode_leb128_record(encoded)
+
+        for cut in range(next_offset):
+            with pytest.raises(IncompleteRecordError):
+                decode_leb128_record(encoded[:cut])
+
+    def test_invalid_record_type(self):
+        with pytest.raises(ValueError, match="Invalid record type"):
+            decode_leb128_record(b"\x07\x00\x00\x00\xff")
+
+
+class TestStreamDecoder:
+    """Test buffered streaming decoder"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+    def test_chunk_boundaries(self, records, encoded, chunk_size):
+        decoder = LEB128StreamDecoder(io.BytesIO(encoded), chunk_size=chunk_size)
+
+        assert list(decoder) == expected_dicts(records)
+        assert decoder.records_read == len(records)
+        assert decoder.bytes_consumed == len(encoded)
+
+    def test_memoryview_input(self, records, encoded):
+        view = memoryview(bytearray(encoded))
+        assert list(iter_leb128_records(view)) == expected_dicts(records)
+
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_file_input(self, tmp_path, records, use_mmap):
+        path = write_file(tmp_path, records)
+        assert list(iter_leb128_records(path, use_mmap=use_mmap)) == expected_dicts(records)
+
+    def test_gzip_file_input(self, tmp_path, records):
+        path = write_file(tmp_path, records, compress=True)
+        assert path.endswith(".leb128.gz")
+        assert list(iter_leb128_records(path, chunk_size=100)) == expected_dicts(records)
+
+    def test_empty_input(self, tmp_path):
+        path = tmp_path / "empty.leb128"
+        path.write_bytes(b"")
+        assert list(iter_leb128_records(str(path))) == []
+
+    def test_truncated_input_raises(self, encoded):
+        with pytest.raises(ValueError, match="Truncated"):
+            list(iter_leb128_records(io.BytesIO(encoded[:-3]), chunk_size=16))
+
+    def test_truncated_input_skipped(self, records, encoded):
+        decoder = LEB128StreamDecoder(encoded[:-3], skip_errors=True)
+
+        assert list(decoder) == expected_dicts(records)[:-1]
+        assert decoder.errors == 1
+
+    @pytest.mark.parametrize("chunk_size", [5, 1 << 20])
+    def test_corrupt_record_skipped(self, records, encoded, chunk_size):
+        _, second = decode_leb128_record(encoded)
+        corrupted = bytearray(encoded)
+        corrupted[second] = 0x42  # invalid record type byte
+
+        decoder = LEB128StreamDecoder(io.BytesIO(bytes(corrupted)), chunk_size=chunk_size, skip_errors=True)
+        decoded = list(decoder)
+
+        assert decoder.errors == 1
+        assert decoded[0] == expected_dicts(records)[0]
+        assert decoded[-1] == expected_dicts(records)[-1]
+
+    # Record header claiming a ~4GB key: type, timestamp, seq_id, 1 field, key length 2**32
+    HUGE_KEY = bytes([0, 0, 0, 1, 0x80, 0x80, 0x80, 0x80, 0x10])
+
+    @pytest.mark.parametrize("chunk_size", [5, 1 << 20, None])
+    def test_oversized_record_resyncs(self, records, encoded, chunk_size):
+        _, second = decode_leb128_record(encoded)
+        corrupted = encoded[:second] + self.HUGE_KEY + b"\xff" + encoded[second:]
+        source = corrupted if chunk_size is None else io.BytesIO(corrupted)
+
+        decoder = LEB128StreamDecoder(source, chunk_size=chunk_size or 1, skip_errors=True, max_record_size=1000)
+
+        assert list(decoder) == expected_dicts(records)
+        assert decoder.errors == 1
+        assert decoder.skipped_bytes == len(self.HUGE_KEY) + 1
+
+    def test_oversized_record_not_buffered(self, encoded):
+        source = io.BytesIO(self.HUGE_KEY + encoded * 10)
+
+        with pytest.raises(ValueError, match="max_record_size"):
+            list(LEB128StreamDecoder(source, chunk_size=64, max_record_size=1000))
+        assert source.tell() == 64
+
+    def test_schema_record_bound(self, tmp_path):
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps({
+            "schema_name": "bound_test",
+            "total_bits": 112,
+            "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+            "device_id_ascii": {"type": "bytes", "bits": 64, "pos": "32-95"},
+            "status": {"type": "enum", "bits": 8, "pos": "96-103", "values": ["ok", "degraded"]}
+        }))
+        record = TelemetryRecord(RecordType.UPDATE, 2 ** 64 - 1, 2 ** 64 - 1,
+                                 {"seq_no": 2 ** 32 - 1, "device_id_ascii": "DEV00001", "status": "degraded"})
+        writer = RollingFileWriter(str(tmp_path / "enc"), max_size_bytes=1 << 30, format='leb128')
+
+        bound = max_leb128_record_size(load_schema(str(schema_path)))
+
+        assert len(writer._serialize_leb128(record)) <= bound < 1000
+
+
+class TestReadLEB128Command:
+    """Test read-leb128 CLI command"""
+
+    def test_read_to_ndjson(self, tmp_path, records):
+        path = write_file(tmp_path, records)
+        output = tmp_path / "decoded.ndjson"
+
+        result = CliRunner().invoke(cli, ['read-leb128', path, '--output', str(output)])
+
+        assert result.exit_code == 0
+        lines = output.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == expected_dicts(records)
+
+    def test_limit(self, tmp_path, records):
+        path = write_file(tmp_path, records)
+
+        result = CliRunner().invoke(cli, ['read-leb128', path, '--limit', '5'])
+
+        assert result.exit_code == 0
+        assert 'Decoded 5 records' in result.output
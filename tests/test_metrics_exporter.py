@@ -0,0 +1,133 @@
+# tests/test_metrics_exporter.py
+"""
+Tests for the Prometheus metrics endpoint
+"""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from telemetry_generator.fault_injector import FaultStatistics, FaultType
+from telemetry_generator.instrumentation import Instrumentation
+from telemetry_generator.metrics_exporter import (
+    GenerationMetrics,
+    Metric,
+    MetricsExporter,
+    render_metrics
+)
+from telemetry_generator.rate_control import RateLimiter
+from telemetry_generator.rolling_writer import RollingFileWriter
+from telemetry_generator import TelemetryRecord, RecordType
+
+
+def scrape(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.status, response.headers['Content-Type'], response.read().decode('utf-8')
+
+
+def samples(text):
+    return dict(line.rsplit(' ', 1) for line in text.splitlines() if not line.startswith('#'))
+
+
+class TestRenderMetrics:
+    """Test the text exposition format"""
+
+    def test_render(self):
+        metrics = [
+            Metric('telegen_up', 'gauge', "Always 1").add(1),
+            Metric('telegen_things_total', 'counter', "Things\nby kind")
+            .add(2.5, kind='a"b').add(float('inf'), kind='c\\d')
+        ]
+
+        assert render_metrics(metrics) == (
+            '# HELP telegen_up Always 1\n'
+            '# TYPE telegen_up gauge\n'
+            'telegen_up 1\n'
+            '# HELP telegen_things_total Things\\nby kind\n'
+            '# TYPE telegen_things_total counter\n'
+            'telegen_things_total{kind="a\\"b"} 2.5\n'
+            'telegen_things_total{kind="c\\\\d"} +Inf\n'
+        )
+
+    def test_invalid_type(self):
+        with pytest.raises(ValueError, match="metric type"):
+            Metric('telegen_x', 'summary', "x")
+
+
+class TestMetricsExporter:
+    """Test serving /metrics"""
+
+    def test_serves_metrics(self):
+        calls = []
+
+        def collect():
+            calls.append(1)
+            return [Metric('telegen_scrapes', 'counter', "Scrapes").add(len(calls))]
+
+        with MetricsExporter(collect, port=0) as exporter:
+            assert exporter.port > 0
+            status, content_type, body = scrape(exporter.url)
+            assert status == 200 and content_type.startswith('text/plain; version=0.0.4')
+            assert samples(body) == {'telegen_scrapes': '1'}
+            assert samples(scrape(exporter.url)[2]) == {'telegen_scrapes': '2'}
+
+            with pytest.raises(urllib.error.HTTPError) as error:
+                scrape(exporter.url.replace('/metrics', '/other'))
+            assert error.value.code == 404
+            url = exporter.url
+
+        with pytest.raises(urllib.error.URLError):
+            scrape(url)
+
+    def test_collect_failure(self):
+        def collect():
+            raise RuntimeError("broken")
+
+        with MetricsExporter(collect) as exporter:
+            with pytest.raises(urllib.error.HTTPError) as error:
+                scrape(exporter.url)
+        assert error.value.code == 500
+
+    def test_invalid_port(self):
+        with pytest.raises(ValueError, match="port"):
+            MetricsExporter(list, port=70000)
+
+
+class TestGenerationMetrics:
+    """Test collected generation metrics"""
+
+    def test_collect(self, tmp_path):
+        writer = RollingFileWriter(str(tmp_path / "data"), max_size_bytes=1024 * 1024, format='ndjson')
+        rate_limiter = RateLimiter(1_000_000, batch_size=10)
+        rate_limiter.start()
+        statistics = FaultStatistics()
+        statistics.record_fault(FaultType.OUT_OF_RANGE, "value", "medium", count=3)
+        instrumentation = Instrumentation()
+        instrumentation.record('generation', 1_000_000, items=10)
+
+        metrics = GenerationMetrics(500, writer=writer, rate_limiter=rate_limiter,
+                                    fault_statistics=statistics, instrumentation=instrumentation)
+        for i in range(10):
+            writer.write_record(TelemetryRecord(RecordType.UPDATE, 1000 + i, i, {"value": i}))
+        rate_limiter.wait_if_needed(10)
+        metrics.records_generated = 10
+        metrics.faulty_records = 1
+        metrics.batch_in_flight = 4
+
+        values = samples(render_metrics(metrics.collect()))
+        writer.close()
+
+        assert values['telegen_records_generated_total'] == '10'
+        assert values['telegen_faulty_records_total'] == '1'
+        assert values['telegen_target_rate_records_per_second'] == '500'
+        assert values['telegen_queue_depth{queue="batch"}'] == '4'
+        assert values['telegen_rate_limiter_records_total'] == '10'
+        assert float(values['telegen_actual_rate_records_per_second']) > 0
+        assert values['telegen_rate_limiter_overshoots_total'] == '0'
+        assert values['telegen_records_written_total'] == '10'
+        assert int(values['telegen_bytes_written_total']) == writer.total_bytes_written
+        assert values['telegen_files_rotated_total'] == '1'
+        assert values['telegen_faults_injected_total{fault_type="out_of_range"}'] == '3'
+        assert values['telegen_stage_seconds_total{stage="generation"}'] == '0.001'
+        assert 'telegen_fault_log_entries_total' not in values
@@ -0,0 +1,216 @@
+# tests/test_record_layout.py
+"""
+Tests for the compiled record layout shared by packer and reader
+"""
+
+import json
+import math
+import random
+
+import pytest
+
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.binary_reader import BinaryRecordReader
+from telemetry_generator.record_layout import RecordLayout
+
+
+TYPES = {
+    "uint8": "np.uint8", "uint16": "np.uint16", "uint32": "np.uint32", "uint64": "np.uint64",
+    "int8": "np.int8", "int16": "np.int16", "int32": "np.int32", "int64": "np.int64",
+    "float32": "np.float32", "float64": "np.float64", "bytes": "np.bytes_", "enum": "np.uint8"
+}
+
+SCHEMA = {
+    "schema_name": "layout_test",
+    "total_bits": 256,
+    "version": {"type": "uint8", "bits": 8, "pos": "0-7"},
+    "flags": {"type": "uint8", "bits": 3, "pos": "8-10"},
+    "delta": {"type": "int8", "bits": 5, "pos": "11-15"},
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "16-47"},
+    "offset": {"type": "int16", "bits": 16, "pos": "48-63"},
+    "temperature": {"type": "float32", "bits": 32, "pos": "64-95"},
+    "device_id": {"type": "bytes", "bits": 64, "pos": "96-159"},
+    "state": {"type": "enum", "bits": 8, "pos": "160-167", "values": ["idle", "busy", "fault"]},
+    "wide": {"type": "uint32", "bits": 24, "pos": "168-191"},
+    "timestamp_ns": {"type": "uint64", "bits": 64, "pos": "192-255"}
+}
+
+
+@pytest.fixture
+def types_file(tmp_path):
+    path = tmp_path / "types.json"
+    path.write_text(json.dumps(TYPES))
+    return str(path)
+
+
+def make_processor(types_file, endianness):
+    return BinarySchemaProcessor(dict(SCHEMA, endianness=endianness), types_file)
+
+
+def random_record(rng):
+    return {
+        "version": rng.randrange(256),
+        "flags": rng.randrange(8),
+        "delta": rng.randrange(-16, 16),
+        "seq_no": rng.randrange(1 << 32),
+        "offset": rng.randrange(-(1 << 15), 1 << 15),
+        "temperature": rng.choice([0.5, -273.25, 1024.0]),
+        "device_id": f"DEV{rng.randrange(10 ** 5):05d}",
+        "state": rng.choice(["idle", "busy", "fault"]),
+        "wide": rng.randrange(1 << 24),
+        "timestamp_ns": rng.randrange(1 << 64)
+    }
+
+
+def pack_slow(packer, data):
+    """Reference encoding through _pack_field"""
+    buffer = bytearray(math.ceil(packer.processor.total_bits / 8))
+    for field in packer.processor.fields:
+        packer._pack_field(buffer, field, data.get(field["name"], 0))
+    return bytes(buffer)
+
+
+class TestRecordLayout:
+    """Test layout compilation and encode/decode"""
+
+    def test_compiled_plan(self, types_file):
+        layout = RecordLayout(make_processor(types_file, "little"))
+
+        assert layout.record_size == 32
+        assert layout.struct.size == 32
+        assert set(layout.bit_fields) == {"flags", "delta", "wide"}
+        assert "timestamp_ns" in layout.aligned_fields
+
+    @pytest.mark.parametrize("endianness", ["little", "big"])
+    def test_fast_path_matches_pack_field(self, types_file, endianness):
+        packer = BinaryRecordPacker(make_processor(types_file, endianness))
+        rng = random.Random(7)
+
+        for _ in range(200):
+            data = random_record(rng)
+            assert bytes(packer.layout.pack(data)) == pack_slow(packer, data)
+
+    @pytest.mark.parametrize("endianness", ["little", "big"])
+    def test_round_trip(self, types_file, endianness):
+        packer = BinaryRecordPacker(make_processor(types_file, endianness))
+        rng = random.Random(11)
+
+        for _ in range(200):
+            data = random_record(rng)
+            assert packer.layout.unpack(packer.pack_record(data)) == data
+
+    def test_coercion_falls_back_to_pack_field(self, types_file):
+        packer = BinaryRecordPacker(make_processor(types_file, "little"))
+        data = {"seq_no": 3.9, "version": 300, "flags": -3, "temperature": 2, "device_id": 42}
+
+        with pytest.raises(Exception):
+            packer.layout.pack(data)
+
+        decoded = packer.layout.unpack(packer.pack_record(data))
+        assert decoded["seq_no"] == 3
+        assert decoded["version"] == 300 & 0xFF
+        assert decoded["flags"] == 3
+        assert decoded["temperature"] == 2.0
+        assert decoded["device_id"] == "42"
+
+    def test_unknown_enum_value(self, types_file):
+        layout = RecordLayout(make_processor(types_file, "little"))
+        record = bytearray(layout.pack({}))
+        record[20] = 9
+
+        assert layout.unpack(record)["state"] == "unknown_9"
+
+    def test_layout_follows_field_changes(self, types_file):
+        processor = make_processor(types_file, "little")
+        packer = BinaryRecordPacker(processor)
+        first = packer.layout
+
+        processor.fields = [f for f in processor.fields if f["name"] != "wide"]
+
+        assert packer.layout is not first
+        assert "wide" not in packer.layout.field_names
+
+
+class TestReaderLayout:
+    """Test BinaryRecordReader decoding through the shared layout"""
+
+    def test_read_file(self, tmp_path, types_file):
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps(dict(SCHEMA, endianness="little")))
+        packer = BinaryRecordPacker(make_processor(types_file, "little"))
+        rng = random.Random(3)
+        records = [random_record(rng) for _ in range(50)]
+
+        data_path = tmp_path / "data.bin"
+        data_path.write_bytes(b"".join(packer.pack_record(r) + b"\n" for r in records))
+
+        reader = BinaryRecordReader(str(schema_path), types_file)
+        decoded = reader.read_all_records(str(data_path))
+        assert [r.pop("_record_number") for r in decoded] == list(range(len(records)))
+        assert decoded == records
+
+
+def to_columns(records):
+    np = pytest.importorskip("numpy")
+    columns = {name: [r[name] for r in records] for name in records[0]}
+    for name in ("version", "flags", "delta", "seq_no", "offset", "wide"):
+        columns[name] = np.array(columns[name], dtype=np.int64)
+    columns["timestamp_ns"] = np.array(columns["timestamp_ns"], dtype=np.uint64)
+    columns["temperature"] = np.array(columns["temperature"], dtype=np.float64)
+    columns["device_id"] = np.array(columns["device_id"], dtype=object)
+    return columns
+
+
+class TestColumnarPacking:
+    """Test packing whole columns against pack_record"""
+
+    @pytest.mark.parametrize("endianness", ["little", "big"])
+    def test_matches_pack_record(self, types_file, endianness):
+        packer = BinaryRecordPacker(make_processor(types_file, endianness))
+        rng = random.Random(5)
+        records = [random_record(rng) for _ in range(300)]
+
+        packed = packer.pack_columns(to_columns(records))
+
+        assert packed.shape == (300, 32)
+        assert [bytes(row) for row in packed] == [packer.pack_record(r) for r in records]
+
+    def test_crc_field(self, types_file):
+        schema = dict(SCHEMA, endianness="little",
+                      validation={"crc32c": {"field": "wide", "range_bits": "0-255"}})
+        packer = BinaryRecordPacker(BinarySchemaProcessor(schema, types_file))
+        rng = random.Random(9)
+        records = [random_record(rng) for _ in range(50)]
+
+        packed = packer.pack_columns(to_columns(records))
+
+        assert [bytes(row) for row in packed] == [packer.pack_record(r) for r in records]
+
+    def test_mixed_columns_fall_back_to_rows(self, types_file):
+        packer = BinaryRecordPacker(make_processor(types_file, "little"))
+        columns = {"seq_no": [1, 2.7, None], "device_id": ["A", 42, "C"]}
+
+        packed = packer.pack_columns(columns)
+
+        expected = [packer.pack_record({"seq_no": 1, "device_id": "A"}),
+                    packer.pack_record({"seq_no": 2.7, "device_id": 42}),
+                    packer.pack_record({"device_id": "C"})]
+        assert [bytes(row) for row in packed] == expected
+
+    def test_write_packed_rotates(self, tmp_path, types_file):
+        from telemetry_generator.rolling_writer import RollingFileWriter
+
+        packer = BinaryRecordPacker(make_processor(types_file, "little"))
+        rng = random.Random(2)
+        records = [random_record(rng) for _ in range(100)]
+        packed = packer.pack_columns(to_columns(records))
+
+        writer = RollingFileWriter(str(tmp_path / "out"), max_size_bytes=33 * 40, format="binary")
+        writer.write_packed(packed)
+        writer.close()
+
+        data = b"".join(p.read_bytes() for p in sorted(tmp_path.glob("out*.bin")))
+        assert data == b"".join(packer.pack_record(r) + b"\n" for r in records)
+        assert writer.total_records_written == 100
+        assert len(list(tmp_path.glob("out*.bin"))) == 3
@@ -154,3 +154,28 @@ class TestRollingFileWriter:
         writer.close()
 
 
+    
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_instrumentation(self, tmp_path, sample_record, binary):
+        """Test rotation and compressed write timings"""
+        import gzip
+        from telemetry_generator.instrumentation import Instrumentation
+        
+        instrumentation = Instrumentation()
+        writer = RollingFileWriter(
+            base_path=str(tmp_path / "test"),
+            max_size_bytes=2048,
+            format='binary' if binary else 'ndjson',
+            compress=True,
+            instrumentation=instrumentation
+        )
+        
+        for i in range(200):
+            writer.write_record(sample_record)
+        writer.close()
+        
+        stages = instrumentation.snapshot()['stages']
+        files = sorted(tmp_path.glob("*.gz"))
+        assert stages['rotation']['calls'] == writer.file_count == len(files) > 1
+        assert stages['write']['bytes'] > 0
+        assert sum(len(gzip.open(path).read()) for path in files) == writer.total_bytes_written
@@ -0,0 +1,123 @@
+# tests/test_schema_model.py
+"""
+Tests for the shared immutable schema model
+"""
+
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from telemetry_generator.schema_model import (
+    TelemetrySchema,
+    get_schema,
+    load_schema,
+    schema_from_dict
+)
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.binary_reader import BinaryRecordReader
+
+
+SCHEMA = {
+    "schema_name": "model_test",
+    "endianness": "little",
+    "total_bits": 64,
+    "validation": {"crc32c": {"field": "crc", "range_bits": "0-31"}},
+    "device_id": {"type": "bytes", "bits": 16, "pos": "0-15"},
+    "state": {"type": "enum", "bits": 8, "pos": "16-23", "values": ["off", "on"]},
+    "level": {"type": "int8", "bits": 8, "pos": "24-31"},
+    "crc": {"type": "uint32", "bits": 32, "pos": "32-63"}
+}
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    return str(path)
+
+
+class TestTelemetrySchema:
+    """Test schema model parsing and caching"""
+
+    def test_fields(self):
+        model = schema_from_dict(SCHEMA)
+
+        assert model.schema_name == "model_test"
+        assert model.record_size == 8
+        assert model.field_names == ("device_id", "state", "level", "crc")
+        assert model.get_field("device_id").type == "np.bytes_"
+        assert model.get_field("state").enum_map == {"0": "off", "1": "on"}
+
+    def test_immutable_and_hashable(self):
+        model = schema_from_dict(SCHEMA)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            model.total_bits = 8
+        with pytest.raises(TypeError):
+            model.validation["crc32c"] = {}
+        assert {model: 1}[schema_from_dict(json.loads(json.dumps(SCHEMA)))] == 1
+
+    def test_cached_by_content(self, schema_file, tmp_path):
+        copy_path = tmp_path / "copy.json"
+        copy_path.write_text(json.dumps(SCHEMA, indent=2))
+
+        assert load_schema(schema_file) is load_schema(schema_file)
+        assert load_schema(str(copy_path)) is load_schema(schema_file)
+        assert get_schema(dict(SCHEMA)) is load_schema(schema_file)
+
+    def test_types_file_changes_model(self, schema_file, tmp_path):
+        types_path = tmp_path / "types.json"
+        types_path.write_text(json.dumps({"bytes": "np.bytes_", "int8": "np.int16", "uint32": "np.uint32"}))
+
+        model = load_schema(schema_file, str(types_path))
+
+        assert model != load_schema(schema_file)
+        assert model.get_field("level").type == "np.int16"
+
+    def test_validation_errors(self):
+        with pytest.raises(ValueError, match="Bit overlap"):
+            TelemetrySchema.from_dict(dict(SCHEMA, level={"type": "int8", "bits": 8, "pos": "20-27"}))
+        with pytest.raises(ValueError, match="no valid fields"):
+            TelemetrySchema.from_dict({"schema_name": "empty"})
+
+    def test_pickle_round_trip(self):
+        model = schema_from_dict(SCHEMA)
+        assert pickle.loads(pickle.dumps(model)) is model
+
+
+class TestSharedModel:
+    """Test components built from the shared model"""
+
+    def test_processor_from_model(self):
+        model = schema_from_dict(SCHEMA)
+        processor = BinarySchemaProcessor(model)
+
+        assert processor.model is model
+        assert processor.schema == SCHEMA
+        assert processor.fields_by_name["state"]["enum"] == {"0": "off", "1": "on"}
+        assert processor.validation == SCHEMA["validation"]
+
+    def test_processor_fields_are_private_copies(self):
+        first = BinarySchemaProcessor(SCHEMA)
+        second = BinarySchemaProcessor(SCHEMA)
+
+        first.fields[0]["bits"] = 99
+
+        assert first.model is second.model
+        assert second.fields[0]["bits"] == 16
+
+    def test_reader_matches_packer(self, schema_file, tmp_path, capsys):
+        packer = BinaryRecordPacker(BinarySchemaProcessor.from_file(schema_file))
+        record = {"device_id": "AB", "state": "on", "level": -5}
+        data_path = tmp_path / "data.bin"
+        data_path.write_bytes(packer.pack_record(record) + b"\n")
+
+        reader = BinaryRecordReader(schema_file)
+        decoded = reader.read_all_records(str(data_path))[0]
+
+        assert reader.model is packer.processor.model
+        assert {k: decoded[k] for k in record} == record
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,180 @@
+# tests/test_telemetry_batch.py
+"""
+Tests for the slotted TelemetryRecord and the TelemetryBatch container
+"""
+
+import json
+
+import pytest
+
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.formatters import OutputFormatter
+from telemetry_generator.rolling_writer import RollingFileWriter
+from telemetry_generator.types_and_enums import RecordType, TelemetryBatch, TelemetryRecord
+
+
+SCHEMA = {
+    "schema_name": "batch_test",
+    "endianness": "little",
+    "total_bits": 160,
+    "seq_no": {"type": "uint32", "bits": 32, "pos": "0-31"},
+    "timestamp_ns": {"type": "uint64", "bits": 64, "pos": "32-95"},
+    "device_id_ascii": {"type": "bytes", "bits": 32, "pos": "96-127"},
+    "load": {"type": "float32", "bits": 32, "pos": "128-159"}
+}
+
+
+def make_batch(count=10, first=100):
+    columns = {
+        "seq_no": list(range(first, first + count)),
+        "timestamp_ns": [1000 + i for i in range(count)],
+        "device_id_ascii": ["D%03d" % i for i in range(count)],
+        "load": [i / 4 for i in range(count)]
+    }
+    return TelemetryBatch(columns, RecordType.UPDATE, first)
+
+
+class TestTelemetryRecord:
+    """Test the slotted record"""
+
+    def test_construction_is_unchecked(self):
+        record = TelemetryRecord(RecordType.UPDATE, -1, 0, {})
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(ValueError, match="timestamp must be non-negative"):
+            record.validate()
+
+    def test_validate_returns_record(self):
+        record = TelemetryRecord(RecordType.EVENT, 5, 6, {"a": 1})
+        assert record.validate() is record
+
+    def test_from_dict_validates(self):
+        record = TelemetryRecord(RecordType.EVENT, 5, 6, {"a": 1})
+        assert TelemetryRecord.from_dict(record.to_dict()) == record
+        with pytest.raises(RuntimeError):
+            TelemetryRecord.from_dict({"record_type": "update", "timestamp": 1, "sequence_id": 2, "data": {}})
+
+
+class TestTelemetryBatch:
+    """Test the columnar batch container"""
+
+    def test_records(self):
+        columns = make_batch().columns
+        columns["load"] = [None if i == 3 else i / 4 for i in range(10)]
+        batch = TelemetryBatch(columns, RecordType.UPDATE, 100)
+
+        records = list(batch.records())
+
+        assert len(batch) == 10
+        assert [r.sequence_id for r in records] == list(batch.sequence_ids) == list(range(100, 110))
+        assert records[0] == TelemetryRecord(RecordType.UPDATE, 1000, 100, {
+            "seq_no": 100, "timestamp_ns": 1000, "device_id_ascii": "D000", "load": 0.0})
+        assert "load" not in records[3].data
+
+    def test_lazy_views(self):
+        batch = make_batch()
+
+        view = batch[-1]
+
+        assert view._data is None
+        assert (view.record_type, view.timestamp, view.sequence_id) == (RecordType.UPDATE, 1009, 109)
+        assert view.get("device_id_ascii") == "D009"
+        assert view._data is None
+        assert type(view.get("seq_no")) is int
+        assert view.to_record() == list(batch.records())[-1]
+        assert [v.sequence_id for v in batch] == list(batch.sequence_ids)
+        with pytest.raises(IndexError):
+            batch[10]
+
+    def test_typed_columns(self):
+        np = pytest.importorskip("numpy")
+        columns = make_batch().columns
+        columns["huge"] = [1 << 63] * 10
+        columns["mixed"] = [1, "a"] * 5
+
+        batch = TelemetryBatch(columns, RecordType.UPDATE, 100)
+
+        assert batch.columns["seq_no"].dtype == np.int64
+        assert batch.columns["huge"].dtype == np.uint64
+        assert batch.columns["load"].dtype == np.float64
+        assert batch.columns["mixed"].dtype == object
+        assert batch[1].data["mixed"] == "a"
+
+    def test_from_records_round_trip(self):
+        records = list(make_batch().records())
+        records[2].record_type = RecordType.EVENT
+
+        batch = TelemetryBatch.from_records(records)
+
+        assert list(batch.records()) == records
+        assert batch.record_type_list()[2] is RecordType.EVENT
+        assert batch[2].record_type is RecordType.EVENT
+
+    def test_invalid_batches(self):
+        with pytest.raises(ValueError, match="differ in length"):
+            TelemetryBatch({"timestamp_ns": [1, 2], "x": [1]}, RecordType.UPDATE, 0)
+        with pytest.raises(ValueError, match="timestamp"):
+            TelemetryBatch({"x": [1]}, RecordType.UPDATE, 0)
+        with pytest.raises(ValueError, match="consecutive"):
+            TelemetryBatch.from_records([TelemetryRecord(RecordType.UPDATE, 1, 1, {"a": 1}),
+                                         TelemetryRecord(RecordType.UPDATE, 1, 3, {"a": 1})])
+
+
+class TestBatchOutput:
+    """Test formatters and writers taking batches"""
+
+    def test_formatters(self):
+        formatter = OutputFormatter("batch_test")
+        batch = make_batch()
+
+        records = list(batch.records())
+
+        assert formatter.format_ndjson_batch(batch) == "".join(formatter.format_ndjson(r) for r in records)
+        assert formatter.format_influx_batch(batch) == "".join(formatter.format_influx_line(r) for r in records)
+        assert json.loads(formatter.format_ndjson_batch(batch).splitlines()[0])["seq_id"] == 100
+
+    def test_binary_writer_packs_columns(self, tmp_path):
+        pytest.importorskip("numpy")
+
+        class Codec:
+            packer = BinaryRecordPacker(BinarySchemaProcessor(SCHEMA))
+
+            def pack_record_enhanced(self, record):
+                return self.packer.pack_record(record.data)
+
+        batch = make_batch(50)
+        writer = RollingFileWriter(str(tmp_path / "out"), max_size_bytes=1 << 20, format="binary")
+        writer.write_batch(batch, Codec())
+        writer.close()
+
+        data = b"".join(p.read_bytes() for p in tmp_path.glob("out*.bin"))
+        assert data == b"".join(Codec.packer.pack_record(r.data) + b"\n" for r in batch.records())
+        assert writer.total_records_written == 50
+
+    def test_ndjson_writer(self, tmp_path):
+        batch = make_batch(5)
+        writer = RollingFileWriter(str(tmp_path / "out"), max_size_bytes=1 << 20, format="ndjson")
+        writer.write_batch(batch)
+        writer.close()
+
+        lines = [json.loads(line) for p in tmp_path.glob("out*") for line in p.read_text().splitlines()]
+        assert [line["seq_id"] for line in lines] == list(range(100, 105))
+
+    def test_generate_pack_write(self, tmp_path):
+        pytest.importorskip("numpy")
+        from telemetry_generator.gpu_accelerator import GPUAcceleratedGenerator
+        from telemetry_generator.gpu_batch_generator import GPUBatchGenerator
+
+        processor = BinarySchemaProcessor(SCHEMA)
+        packer = BinaryRecordPacker(processor)
+        batch = GPUBatchGenerator(processor, GPUAcceleratedGenerator(use_gpu=False)).generate_telemetry_batch(100)
+
+        packed = packer.pack_batch(batch)
+        writer = RollingFileWriter(str(tmp_path / "out"), max_size_bytes=1 << 20, format="binary")
+        writer.write_packed(packed)
+        writer.close()
+
+        data = b"".join(p.read_bytes() for p in tmp_path.glob("out*.bin"))
+        assert data == b"".join(packer.pack_record(r.data) + b"\n" for r in batch.records())
+
@@ -0,0 +1,114 @@
+# tests/test_timeseries.py
+"""
+Tests for the stateful time-series engine
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.data_generators import RecordDataPopulator
+from telemetry_generator.timeseries import MetricSeries, ProcessModel, TimeSeriesEngine
+
+
+SCHEMA = {
+    "schema_name": "series_test",
+    "endianness": "little",
+    "total_bits": 160,
+    "device_id_ascii": {"type": "bytes", "bits": 64, "pos": "0-63"},
+    "gpu_index": {"type": "uint8", "bits": 2, "pos": "64-65"},
+    "metric_id": {"type": "uint16", "bits": 16, "pos": "66-81"},
+    "value_type": {"type": "enum", "bits": 2, "pos": "82-83", "values": ["FLOAT32", "UINT64", "INT64", "BOOL"]},
+    "value_bits": {"type": "uint64", "bits": 64, "pos": "84-147"},
+    "series": {
+        "devices": 5,
+        "gpus_per_device": 8,
+        "seed": 11,
+        "metrics": [
+            {"metric_id": 10, "model": "ar1", "mean": 60, "phi": 0.9, "sigma": 0.5},
+            {"metric_id": 20, "model": "random_walk", "mean": 1000, "sigma": 5, "min": 900, "max": 1100}
+        ]
+    }
+}
+
+
+def as_float(value_bits):
+    return np.asarray(value_bits, dtype=np.uint32).view(np.float32).astype(np.float64)
+
+
+class TestTimeSeriesEngine:
+    """Test fleet layout and value processes"""
+
+    def test_fleet_from_schema(self):
+        engine = TimeSeriesEngine.from_schema(BinarySchemaProcessor(SCHEMA))
+
+        # gpu_index has 2 bits: 4 GPUs per device
+        assert engine.num_series == 5 * 4 * 2
+        columns = engine.next_batch(engine.num_series * 3)
+
+        assert set(columns) == {"device_id_ascii", "gpu_index", "metric_id", "value_type", "value_bits"}
+        assert len(set(columns["device_id_ascii"])) == 5
+        assert all(len(device) == 8 for device in columns["device_id_ascii"])
+        assert set(columns["gpu_index"].tolist()) == {0, 1, 2, 3}
+        assert set(columns["metric_id"].tolist()) == {10, 20}
+        series = set(zip(columns["device_id_ascii"], columns["gpu_index"].tolist(), columns["metric_id"].tolist()))
+        assert len(series) == engine.num_series
+        assert (columns["value_type"] == 0).all()
+
+    def test_no_series_block(self):
+        schema = {key: value for key, value in SCHEMA.items() if key != "series"}
+        assert TimeSeriesEngine.from_schema(BinarySchemaProcessor(schema)) is None
+
+    def test_series_are_correlated_and_bounded(self):
+        engine = TimeSeriesEngine.from_schema(BinarySchemaProcessor(SCHEMA))
+        steps = 200
+        values = as_float(engine.next_batch(engine.num_series * steps)["value_bits"])
+        by_series = values.reshape(steps, engine.num_series)
+
+        walk = by_series[:, 1::2]
+        assert walk.min() >= 900 and walk.max() <= 1100
+        # Consecutive values of a series are far closer than values across the fleet
+        step_change = np.abs(np.diff(by_series[:, 0::2], axis=0)).mean()
+        assert step_change < 1.0
+        assert abs(by_series[:, 0::2].mean() - 60) < 10
+
+    def test_batches_continue_state(self):
+        first = TimeSeriesEngine([MetricSeries(1)], devices=2, gpus_per_device=1, seed=3)
+        second = TimeSeriesEngine([MetricSeries(1)], devices=2, gpus_per_device=1, seed=3)
+
+        whole = first.next_batch(10)["value_bits"]
+        parts = np.concatenate([second.next_batch(3)["value_bits"], second.next_batch(7)["value_bits"]])
+
+        assert whole.tolist() == parts.tolist()
+
+    def test_seasonal_period(self):
+        metric = MetricSeries(1, ProcessModel.SEASONAL, mean=100, amplitude=50, period=20, sigma=0, spread=0)
+        engine = TimeSeriesEngine([metric], devices=1, gpus_per_device=1, seed=0)
+
+        values = as_float(engine.next_batch(40)["value_bits"])
+
+        assert np.allclose(values[:20], values[20:], atol=1e-3)
+        assert values.max() - values.min() > 90
+
+    def test_too_many_devices_for_id_length(self):
+        with pytest.raises(ValueError, match="40 distinct 1-character device IDs"):
+            TimeSeriesEngine([MetricSeries(1)], devices=40, device_id_length=1)
+
+    def test_invalid_metric(self):
+        with pytest.raises(ValueError):
+            MetricSeries.from_dict({"metric_id": 1, "model": "brownian"})
+        with pytest.raises(ValueError):
+            MetricSeries.from_dict({"metric_id": 1, "model": "ar1", "phi": 1.5})
+        with pytest.raises(ValueError):
+            MetricSeries.from_dict({"metric_id": 1, "colour": "blue"})
+
+    def test_populator_uses_engine(self):
+        populator = RecordDataPopulator(BinarySchemaProcessor(SCHEMA))
+        engine = TimeSeriesEngine.from_schema(BinarySchemaProcessor(SCHEMA))
+        expected = engine.next_batch(3)
+
+        rows = [populator.populate_record_data(seq, seq) for seq in range(3)]
+
+        assert [row["device_id_ascii"] for row in rows] == list(expected["device_id_ascii"])
+        assert [row["value_bits"] for row in rows] == expected["value_bits"].tolist()
@@ -0,0 +1,116 @@
+# tests/test_value_pools.py
+"""
+Tests for pre-generated device-ID and enum pools
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.data_generators import FieldDataGenerator, RecordDataPopulator
+from telemetry_generator.value_pools import DeviceIdPool, EnumTable, encode_ascii
+
+
+SCHEMA = {
+    "schema_name": "pool_test",
+    "endianness": "little",
+    "total_bits": 80,
+    "device_id_ascii": {"type": "bytes", "bits": 64, "pos": "0-63"},
+    "state": {"type": "enum", "bits": 3, "pos": "64-66", "values": ["idle", "busy", "down", "busy"]},
+    "device_pool": {"size": 50, "zipf": 1.2, "seed": 4}
+}
+
+
+class TestDeviceIdPool:
+    """Test the device fleet pool"""
+
+    def test_distinct_interned_ids(self):
+        pool = DeviceIdPool(size=200, seed=1)
+
+        assert len(set(pool.ids)) == 200
+        assert all(len(device_id) == 8 for device_id in pool.ids)
+        drawn = {pool.draw() for _ in range(1000)}
+        assert drawn <= set(pool.ids)
+        # Draws hand out the pool's own objects
+        assert all(any(device_id is pooled for pooled in pool.ids) for device_id in list(drawn)[:5])
+
+    def test_seeded_contents(self):
+        assert DeviceIdPool(size=20, seed=9).ids == DeviceIdPool(size=20, seed=9).ids
+
+    def test_zipf_popularity(self):
+        random.seed(3)
+        pool = DeviceIdPool(size=100, zipf_exponent=1.5, seed=2)
+
+        counts = Counter(pool.draw_index() for _ in range(20000))
+
+        assert counts[0] > counts[1] > counts[10]
+        assert counts[0] > 20000 * 0.3
+
+    def test_vectorized_draws(self):
+        np = pytest.importorskip("numpy")
+        pool = DeviceIdPool(size=100, zipf_exponent=1.5, seed=2)
+
+        batch = pool.draw_batch(5000, np.random.default_rng(0))
+
+        counts = Counter(batch.tolist())
+        assert set(counts) <= set(pool.ids)
+        assert counts.most_common(1)[0][0] == pool.ids[0]
+
+    def test_invalid_pool(self):
+        with pytest.raises(ValueError):
+            DeviceIdPool(size=0)
+        with pytest.raises(ValueError):
+            DeviceIdPool(size=100, length=1)
+
+    def test_pre_encoded_bytes_reused(self):
+        pool = DeviceIdPool(size=10, seed=5)
+        assert encode_ascii(pool.ids[3]) is pool.encoded[3]
+        assert encode_ascii("NOTPOOLED") == b"NOTPOOLED"
+
+
+class TestEnumTable:
+    """Test enum code tables"""
+
+    def test_table_cached_per_mapping(self):
+        field = {"enum": {"0": "a", "1": "b", "2": "a"}}
+
+        table = EnumTable.for_field(field)
+
+        assert EnumTable.for_field(field) is table
+        assert table.codes == (0, 1, 2)
+        assert table.code_of == {"a": 0, "b": 1}
+        assert EnumTable.for_field({"enum": {}}) is None
+
+    def test_generator_draws_codes(self):
+        field = {"enum": {"0": "a", "1": "b", "2": "c"}}
+        values = {FieldDataGenerator.generate_enum_value(field) for _ in range(200)}
+        assert values == {0, 1, 2}
+
+
+class TestPoolIntegration:
+    """Test pools used by the populator and packer"""
+
+    def test_populator_draws_from_schema_pool(self):
+        processor = BinarySchemaProcessor(SCHEMA)
+        populator = RecordDataPopulator(processor)
+
+        devices = {populator.populate_record_data(seq, seq)["device_id_ascii"] for seq in range(300)}
+
+        assert devices <= set(populator.device_pool.ids)
+        assert len(devices) < 50
+
+    def test_packer_enum_labels_and_pooled_ids(self):
+        processor = BinarySchemaProcessor(SCHEMA)
+        packer = BinaryRecordPacker(processor)
+        pool = DeviceIdPool(size=5, seed=6)
+        buffer = bytearray(packer.processor.total_bits // 8)
+
+        packer._pack_field(buffer, processor.fields_by_name["state"], "busy")
+        packer._pack_field(buffer, processor.fields_by_name["device_id_ascii"], pool.ids[0])
+
+        assert buffer[8] & 0b111 == 1
+        assert bytes(buffer[:8]) == pool.encoded[0]
+        assert packer.layout.enum_codes["state"] == {"idle": 0, "busy": 1, "down": 2}
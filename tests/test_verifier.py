@@ -0,0 +1,165 @@
+# tests/test_verifier.py
+"""
+Tests for binary file verification
+"""
+
+import gzip
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from telemetry_generator.cli import cli
+from telemetry_generator.binary_packer import BinaryRecordPacker
+from telemetry_generator.binary_schema import BinarySchemaProcessor
+from telemetry_generator.verifier import BinaryFileVerifier
+
+
+SCHEMA = {
+    "schema_name": "verify_test",
+    "endianness": "little",
+    "total_bits": 160,
+    "validation": {"crc32c": {"field": "crc32c", "range_bits": "0-159"}},
+    "seq_no": {"type": "uint16", "bits": 16, "pos": "0-15"},
+    "value": {"type": "uint16", "bits": 16, "pos": "16-31"},
+    "timestamp_ns": {"type": "uint64", "bits": 64, "pos": "32-95"},
+    "crc32c": {"type": "uint32", "bits": 32, "pos": "96-127"},
+    "device_id_ascii": {"type": "bytes", "bits": 32, "pos": "128-159"}
+}
+
+RECORD_SIZE = 20
+STRIDE = RECORD_SIZE + 1
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    return str(path)
+
+
+def packed_records(count=1000, first_seq=0):
+    packer = BinaryRecordPacker(BinarySchemaProcessor(SCHEMA))
+    return [
+        packer.pack_record({"seq_no": (first_seq + i) & 0xFFFF, "value": i * 7 & 0xFFFF,
+                            "timestamp_ns": 1_000_000 + 10 * i, "device_id_ascii": "GPU0"})
+        for i in range(count)
+    ]
+
+
+def write_records(path, records, opener=open):
+    with opener(path, 'wb') as f:
+        f.write(b"".join(record + b"\n" for record in records))
+    return str(path)
+
+
+def verify(schema_file, paths, **kwargs):
+    kwargs.setdefault("workers", 1)
+    kwargs.setdefault("block_size", 100 * STRIDE)
+    return BinaryFileVerifier(schema_file, **kwargs).verify(paths)
+
+
+def corrupt(record, offset):
+    return record[:offset] + bytes([record[offset] ^ 0x01]) + record[offset + 1:]
+
+
+class TestBinaryFileVerifier:
+    """Test per-file checks and their summaries"""
+
+    def test_clean_file(self, tmp_path, schema_file):
+        path = write_records(tmp_path / "clean.bin", packed_records(first_seq=65000))
+
+        report = verify(schema_file, [path])
+
+        assert report['ok'] and report['crc_checked']
+        assert report['records'] == 1000
+        assert report['files'][0]['error_count'] == 0
+        assert report['files'][0]['errors'] == []
+        assert report['records_per_second'] > 0
+
+    def test_errors_per_check(self, tmp_path, schema_file):
+        records = packed_records()
+        records[10] = corrupt(records[10], 3)                    # value bits, CRC now wrong
+        records[200], records[201] = records[201], records[200]  # out of order on a block boundary
+        records[500] = records[500][:RECORD_SIZE - 1]           # torn record shifts the framing
+        path = write_records(tmp_path / "bad.bin", records)
+
+        summary = verify(schema_file, [path], max_errors=5)['files'][0]
+
+        assert not summary['ok']
+        assert summary['crc_errors'] >= 1
+        assert summary['seq_no_errors'] >= 1 and summary['timestamp_errors'] >= 1
+        assert summary['framing_errors'] >= 1
+        assert summary['errors'][0] == {"record": 10, "check": "crc", "stored": summary['errors'][0]['stored'],
+                                        "computed": summary['errors'][0]['computed']}
+        assert {"record": 201, "check": "seq_no", "previous": 201, "value": 200} in summary['errors']
+        assert len(summary['errors']) == 5
+        assert summary['error_count'] > 5
+
+    def test_block_boundaries(self, tmp_path, schema_file):
+        records = packed_records()
+        records[300] = packed_records(300)[-1]  # repeats seq_no 299, at a block start
+        path = write_records(tmp_path / "dup.bin", records)
+
+        for workers in (1, 2):
+            summary = verify(schema_file, [path], workers=workers)['files'][0]
+            assert summary['seq_no_errors'] == 1
+            assert summary['seq_gaps'] == 1
+            assert summary['errors'] == [{"record": 300, "check": "seq_no", "previous": 299, "value": 299}]
+
+    def test_trailing_bytes_and_gzip(self, tmp_path, schema_file):
+        records = packed_records(250)
+        path = write_records(tmp_path / "data.bin.gz", records, gzip.open)
+        with open(tmp_path / "torn.bin", 'wb') as f:
+            f.write(b"".join(record + b"\n" for record in records) + records[0][:7])
+
+        report = verify(schema_file, [path, str(tmp_path / "torn.bin")])
+
+        compressed, torn = report['files']
+        assert compressed['ok'] and compressed['records'] == 250
+        assert not torn['ok'] and torn['trailing_bytes'] == 7 and torn['error_count'] == 0
+
+    def test_without_numpy(self, tmp_path, schema_file, monkeypatch):
+        records = packed_records()
+        records[42] = corrupt(records[42], 17)
+        records[700] = packed_records(1, first_seq=5)[0]
+        path = write_records(tmp_path / "data.bin", records)
+        expected = verify(schema_file, [path])['files']
+
+        import telemetry_generator.verifier as verifier
+        monkeypatch.setattr(verifier, "HAS_NUMPY", False)
+
+        assert verify(schema_file, [path])['files'] == expected
+
+    def test_invalid_settings(self, schema_file):
+        with pytest.raises(ValueError, match="workers"):
+            BinaryFileVerifier(schema_file, workers=0)
+        with pytest.raises(ValueError, match="block_size"):
+            BinaryFileVerifier(schema_file, block_size=0)
+
+
+class TestVerifyCommand:
+    """Test verify CLI command"""
+
+    def test_verify(self, tmp_path, schema_file):
+        path = write_records(tmp_path / "clean.bin", packed_records())
+        report_path = tmp_path / "report.json"
+
+        result = CliRunner().invoke(cli, ['verify', path, '--schema', schema_file, '--workers', '1',
+                                          '--report', str(report_path)])
+
+        assert result.exit_code == 0, result.output
+        assert "OK - 1,000 records" in result.output
+        assert "records/s" in result.output
+        assert json.loads(report_path.read_text())['ok'] is True
+
+    def test_verify_fails_on_errors(self, tmp_path, schema_file):
+        records = packed_records()
+        records[5] = corrupt(records[5], 0)
+        path = write_records(tmp_path / "bad.bin", records)
+
+        result = CliRunner().invoke(cli, ['verify', path, '--schema', schema_file, '--workers', '1'])
+
+        assert result.exit_code == 1
+        assert "FAILED" in result.output
+        assert "record 5: crc" in result.output